@@ -29,9 +29,10 @@ from enum import Enum
 
 import asyncpg
 import aiohttp
-from google import genai
 from google.genai import types as genai_types
 from dotenv import load_dotenv
+
+from ai.llm_gateway import get_llm_gateway
 load_dotenv()
 
 
@@ -185,8 +186,7 @@ class DocumentAnalysisAgent:
         self.db_config = db_config or DB_CONFIG
         self.gemini_api_key = gemini_api_key or GEMINI_API_KEY
 
-        # Initialize Gemini client
-        self._genai_client = genai.Client(api_key=self.gemini_api_key)
+        # Gemini calls go through the shared LLM gateway
         self._model_name = 'gemini-2.5-flash'
 
         # Connection pool (lazy initialization)
@@ -358,19 +358,14 @@ class DocumentAnalysisAgent:
             Parsed JSON response or None
         """
         try:
-            def _generate():
-                response = self._genai_client.models.generate_content(
-                    model=self._model_name,
-                    contents=prompt,
-                    config=genai_types.GenerateContentConfig(
-                        temperature=temperature,
-                        max_output_tokens=max_tokens,
-                        safety_settings=SAFETY_SETTINGS,
-                    ),
-                )
-                return response.text
-
-            response_text = await asyncio.to_thread(_generate)
+            response = await get_llm_gateway().generate(
+                prompt,
+                model=self._model_name,
+                temperature=temperature,
+                max_output_tokens=max_tokens,
+                safety_settings=SAFETY_SETTINGS,
+            )
+            response_text = response.text
 
             # Clean and parse JSON
             response_text = response_text.strip()
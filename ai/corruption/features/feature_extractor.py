@@ -28,6 +28,10 @@ from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+_EMPTY_WINNER_STATS = {'prev_wins': 0, 'prev_bids': 0, 'market_share': 0.0}
+_EMPTY_OVERALL_STATS = {'total_wins': 0, 'total_bids': 0, 'win_rate': 0.0, 'num_institutions': 0}
+_EMPTY_INSTITUTION_STATS = {'total_tenders': 0, 'single_bidder_rate': 0.0, 'avg_bidders': 0.0}
+
 
 @dataclass
 class FeatureVector:
@@ -64,6 +68,36 @@ class FeatureVector:
         return self.features.get(name)
 
 
+@dataclass
+class TenderBatchContext:
+    """
+    Everything the category extractors need for a set of tenders, loaded in
+    a handful of set-based queries (see FeatureExtractor._load_batch_context).
+
+    Aggregates are keyed by the lookup they replace, e.g. winner statistics
+    by (winner, institution, cutoff_date), so tenders sharing a key share
+    one computed row.
+    """
+    today: Any
+    tenders: Dict[str, Dict] = field(default_factory=dict)
+    bidders: Dict[str, List[Dict]] = field(default_factory=dict)
+    documents: Dict[str, List[Dict]] = field(default_factory=dict)
+    institution_avg_bidders: Dict[str, float] = field(default_factory=dict)
+    category_avg_bidders: Dict[str, float] = field(default_factory=dict)
+    institution_first_bid_date: Dict[str, Any] = field(default_factory=dict)
+    company_tender_counts: Dict[str, int] = field(default_factory=dict)
+    pair_co_occurrences: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    related_pairs: List[Tuple[str, str]] = field(default_factory=list)
+    winner_institution_stats: Dict[Tuple, Dict[str, Any]] = field(default_factory=dict)
+    winner_overall_stats: Dict[Tuple, Dict[str, Any]] = field(default_factory=dict)
+    institution_stats: Dict[Tuple, Dict[str, Any]] = field(default_factory=dict)
+    institution_monthly_counts: Dict[Tuple, int] = field(default_factory=dict)
+
+    def cutoff(self, tender_data: Dict):
+        """History cutoff for a tender: its publication date, else today."""
+        return tender_data.get('publication_date') or self.today
+
+
 class FeatureExtractor:
     """
     Extracts 150+ features from tender data for ML corruption detection.
@@ -83,13 +117,23 @@ class FeatureExtractor:
     - Document (15+ features)
     - Historical (25+ features)
 
+    Tenders, bidders, documents and all historical aggregates are loaded
+    per batch with set-based queries; the category extractors themselves are
+    pure functions of that context, so single-tender and batch extraction
+    produce identical features.
+
     Usage:
         extractor = FeatureExtractor(pool)
         features = await extractor.extract_features('12345/2024')
         X = features.feature_array  # Ready for sklearn/xgboost
         shap_values = explainer.shap_values(X)  # SHAP explainability
+
+        # Training / batch scoring
+        X, tender_ids = await extractor.extract_feature_matrix(all_ids)
     """
 
+    BATCH_SIZE = 500
+
     def __init__(self, pool: asyncpg.Pool):
         """
         Initialize feature extractor.
@@ -123,60 +167,16 @@ class FeatureExtractor:
         logger.info(f"Extracting features for tender {tender_id}")
 
         try:
-            # Get tender data
-            tender_data = await self._get_tender_data(tender_id)
+            batch = await self._load_batch_context([tender_id])
+            tender_data = batch.tenders.get(tender_id)
             if not tender_data:
                 raise ValueError(f"Tender {tender_id} not found")
 
-            # Extract all feature categories
-            features = {}
-
-            # 1. Competition features
-            competition_feats = await self._extract_competition_features(tender_id, tender_data)
-            features.update(competition_feats)
-
-            # 2. Price features
-            price_feats = await self._extract_price_features(tender_id, tender_data)
-            features.update(price_feats)
-
-            # 3. Timing features
-            timing_feats = await self._extract_timing_features(tender_id, tender_data)
-            features.update(timing_feats)
-
-            # 4. Relationship features
-            relationship_feats = await self._extract_relationship_features(tender_id, tender_data)
-            features.update(relationship_feats)
-
-            # 5. Procedural features
-            procedural_feats = await self._extract_procedural_features(tender_id, tender_data)
-            features.update(procedural_feats)
-
-            # 6. Document features
-            document_feats = await self._extract_document_features(tender_id, tender_data)
-            features.update(document_feats)
-
-            # 7. Historical features
-            historical_feats = await self._extract_historical_features(tender_id, tender_data)
-            features.update(historical_feats)
-
-            # Convert to ordered array (same order as feature_names)
+            features = self._compute_features(tender_id, tender_data, batch)
             feature_array = np.array([
                 features.get(name, 0.0) for name in self.feature_names
             ], dtype=np.float32)
 
-            # Build metadata
-            metadata = {}
-            if include_metadata:
-                metadata = {
-                    'title': tender_data.get('title'),
-                    'procuring_entity': tender_data.get('procuring_entity'),
-                    'winner': tender_data.get('winner'),
-                    'estimated_value_mkd': float(tender_data.get('estimated_value_mkd') or 0),
-                    'actual_value_mkd': float(tender_data.get('actual_value_mkd') or 0),
-                    'publication_date': str(tender_data.get('publication_date')) if tender_data.get('publication_date') else None,
-                    'status': tender_data.get('status')
-                }
-
             logger.info(f"Extracted {len(features)} features for {tender_id}")
 
             return FeatureVector(
@@ -184,7 +184,7 @@ class FeatureExtractor:
                 features=features,
                 feature_array=feature_array,
                 feature_names=self.feature_names,
-                metadata=metadata
+                metadata=self._build_metadata(tender_data) if include_metadata else {}
             )
 
         except Exception as e:
@@ -194,14 +194,19 @@ class FeatureExtractor:
     async def extract_features_batch(
         self,
         tender_ids: List[str],
-        include_metadata: bool = True
+        include_metadata: bool = True,
+        batch_size: Optional[int] = None
     ) -> List[FeatureVector]:
         """
         Extract features for multiple tenders in batch.
 
+        Data is loaded once per chunk of ``batch_size`` tenders instead of
+        once per tender. Unknown tender IDs are skipped.
+
         Args:
             tender_ids: List of tender IDs
             include_metadata: Whether to include metadata
+            batch_size: Tenders per bulk load (default BATCH_SIZE)
 
         Returns:
             List of FeatureVector objects
@@ -209,25 +214,145 @@ class FeatureExtractor:
         logger.info(f"Extracting features for {len(tender_ids)} tenders")
 
         results = []
-        for tender_id in tender_ids:
-            try:
-                features = await self.extract_features(tender_id, include_metadata)
-                results.append(features)
-            except Exception as e:
-                logger.warning(f"Failed to extract features for {tender_id}: {e}")
-                # Continue with other tenders
+        async for chunk_ids, batch in self._iter_batches(tender_ids, batch_size):
+            for tender_id in chunk_ids:
+                tender_data = batch.tenders.get(tender_id)
+                if not tender_data:
+                    logger.warning(f"Failed to extract features for {tender_id}: tender not found")
+                    continue
+                try:
+                    features = self._compute_features(tender_id, tender_data, batch)
+                except Exception as e:
+                    logger.warning(f"Failed to extract features for {tender_id}: {e}")
+                    # Continue with other tenders
+                    continue
+
+                results.append(FeatureVector(
+                    tender_id=tender_id,
+                    features=features,
+                    feature_array=np.array(
+                        [features.get(name, 0.0) for name in self.feature_names],
+                        dtype=np.float32
+                    ),
+                    feature_names=self.feature_names,
+                    metadata=self._build_metadata(tender_data) if include_metadata else {}
+                ))
 
         logger.info(f"Successfully extracted features for {len(results)}/{len(tender_ids)} tenders")
         return results
 
+    async def extract_feature_matrix(
+        self,
+        tender_ids: List[str],
+        batch_size: Optional[int] = None
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Extract features straight into a float32 matrix.
+
+        This is the path for training and batch scoring: no per-tender
+        FeatureVector objects, rows written directly into a preallocated
+        (n_tenders, n_features) array in feature_names order.
+
+        Args:
+            tender_ids: List of tender IDs
+            batch_size: Tenders per bulk load (default BATCH_SIZE)
+
+        Returns:
+            Tuple of (matrix, tender IDs of the rows). Tenders that are
+            missing or fail extraction are dropped.
+        """
+        X = np.zeros((len(tender_ids), len(self.feature_names)), dtype=np.float32)
+        valid_ids: List[str] = []
+        failed = 0
+
+        async for chunk_ids, batch in self._iter_batches(tender_ids, batch_size):
+            for tender_id in chunk_ids:
+                tender_data = batch.tenders.get(tender_id)
+                if not tender_data:
+                    failed += 1
+                    continue
+                try:
+                    features = self._compute_features(tender_id, tender_data, batch)
+                except Exception as e:
+                    failed += 1
+                    if failed <= 5:
+                        logger.warning(f"Failed to extract features for {tender_id}: {e}")
+                    continue
+
+                row = X[len(valid_ids)]
+                for j, name in enumerate(self.feature_names):
+                    row[j] = features.get(name, 0.0)
+                valid_ids.append(tender_id)
+
+        logger.info(
+            f"Feature matrix: {len(valid_ids)}/{len(tender_ids)} tenders x "
+            f"{len(self.feature_names)} features ({failed} failed)"
+        )
+        return X[:len(valid_ids)], valid_ids
+
+    async def _iter_batches(self, tender_ids: List[str], batch_size: Optional[int]):
+        """Yield (chunk_ids, TenderBatchContext) for consecutive chunks."""
+        batch_size = batch_size or self.BATCH_SIZE
+        for i in range(0, len(tender_ids), batch_size):
+            chunk_ids = tender_ids[i:i + batch_size]
+            batch = await self._load_batch_context(chunk_ids)
+            yield chunk_ids, batch
+            if len(tender_ids) > batch_size:
+                logger.info(f"Extracted features for {min(i + batch_size, len(tender_ids))}/{len(tender_ids)} tenders")
+
+    def _compute_features(
+        self,
+        tender_id: str,
+        tender_data: Dict,
+        batch: TenderBatchContext
+    ) -> Dict[str, float]:
+        """Run all seven category extractors against a loaded batch context."""
+        features = {}
+
+        # 1. Competition features
+        features.update(self._extract_competition_features(tender_id, tender_data, batch))
+
+        # 2. Price features
+        features.update(self._extract_price_features(tender_id, tender_data, batch))
+
+        # 3. Timing features
+        features.update(self._extract_timing_features(tender_id, tender_data, batch))
+
+        # 4. Relationship features
+        features.update(self._extract_relationship_features(tender_id, tender_data, batch))
+
+        # 5. Procedural features
+        features.update(self._extract_procedural_features(tender_id, tender_data, batch))
+
+        # 6. Document features
+        features.update(self._extract_document_features(tender_id, tender_data, batch))
+
+        # 7. Historical features
+        features.update(self._extract_historical_features(tender_id, tender_data, batch))
+
+        return features
+
+    def _build_metadata(self, tender_data: Dict) -> Dict[str, Any]:
+        """Metadata attached to a FeatureVector"""
+        return {
+            'title': tender_data.get('title'),
+            'procuring_entity': tender_data.get('procuring_entity'),
+            'winner': tender_data.get('winner'),
+            'estimated_value_mkd': float(tender_data.get('estimated_value_mkd') or 0),
+            'actual_value_mkd': float(tender_data.get('actual_value_mkd') or 0),
+            'publication_date': str(tender_data.get('publication_date')) if tender_data.get('publication_date') else None,
+            'status': tender_data.get('status')
+        }
+
     # =========================================================================
     # Feature Category Extraction Methods
     # =========================================================================
 
-    async def _extract_competition_features(
+    def _extract_competition_features(
         self,
         tender_id: str,
-        tender_data: Dict
+        tender_data: Dict,
+        batch: TenderBatchContext
     ) -> Dict[str, float]:
         """
         Extract competition-related features.
@@ -243,8 +368,7 @@ class FeatureExtractor:
         """
         features = {}
 
-        # Get bidder data
-        bidders = await self._get_bidder_data(tender_id)
+        bidders = batch.bidders.get(tender_id, [])
         num_bidders = len(bidders)
 
         # Basic counts
@@ -254,14 +378,14 @@ class FeatureExtractor:
         features['two_bidders'] = 1.0 if num_bidders == 2 else 0.0
 
         # Bidder count relative to institution average
-        avg_bidders = await self._get_institution_avg_bidders(tender_data.get('procuring_entity'))
+        avg_bidders = batch.institution_avg_bidders.get(tender_data.get('procuring_entity'))
         if avg_bidders and avg_bidders > 0:
             features['bidders_vs_institution_avg'] = num_bidders / avg_bidders
         else:
             features['bidders_vs_institution_avg'] = 0.0
 
         # Bidder count relative to category average
-        avg_bidders_category = await self._get_category_avg_bidders(tender_data.get('category'))
+        avg_bidders_category = batch.category_avg_bidders.get(tender_data.get('category'))
         if avg_bidders_category and avg_bidders_category > 0:
             features['bidders_vs_category_avg'] = num_bidders / avg_bidders_category
         else:
@@ -302,10 +426,11 @@ class FeatureExtractor:
         # New vs returning bidders
         bidder_companies = [b['company_name'] for b in bidders if b.get('company_name')]
         if bidder_companies:
-            new_bidders = await self._count_new_bidders(
+            new_bidders = self._count_new_bidders(
                 bidder_companies,
                 tender_data.get('procuring_entity'),
-                tender_data.get('publication_date')
+                tender_data.get('publication_date'),
+                batch
             )
             features['new_bidders_count'] = float(new_bidders)
             features['new_bidders_ratio'] = new_bidders / len(bidder_companies)
@@ -315,17 +440,18 @@ class FeatureExtractor:
 
         # Bidder clustering (same companies always bid together)
         if num_bidders >= 2:
-            clustering_score = await self._calculate_bidder_clustering(bidder_companies)
+            clustering_score = self._calculate_bidder_clustering(bidder_companies, batch)
             features['bidder_clustering_score'] = clustering_score
         else:
             features['bidder_clustering_score'] = 0.0
 
         return features
 
-    async def _extract_price_features(
+    def _extract_price_features(
         self,
         tender_id: str,
-        tender_data: Dict
+        tender_data: Dict,
+        batch: TenderBatchContext
     ) -> Dict[str, float]:
         """
         Extract price-related features.
@@ -343,8 +469,8 @@ class FeatureExtractor:
         estimated_value = float(tender_data.get('estimated_value_mkd') or 0)
         actual_value = float(tender_data.get('actual_value_mkd') or 0)
 
-        # Get all bids
-        bidders = await self._get_bidder_data(tender_id)
+        # All bids
+        bidders = batch.bidders.get(tender_id, [])
         bid_amounts = [float(b.get('bid_amount_mkd') or 0) for b in bidders if b.get('bid_amount_mkd')]
 
         # Basic price features
@@ -451,10 +577,11 @@ class FeatureExtractor:
 
         return features
 
-    async def _extract_timing_features(
+    def _extract_timing_features(
         self,
         tender_id: str,
-        tender_data: Dict
+        tender_data: Dict,
+        batch: TenderBatchContext
     ) -> Dict[str, float]:
         """
         Extract timing-related features.
@@ -521,10 +648,11 @@ class FeatureExtractor:
 
         return features
 
-    async def _extract_relationship_features(
+    def _extract_relationship_features(
         self,
         tender_id: str,
-        tender_data: Dict
+        tender_data: Dict,
+        batch: TenderBatchContext
     ) -> Dict[str, float]:
         """
         Extract relationship and pattern features.
@@ -540,11 +668,12 @@ class FeatureExtractor:
 
         winner = tender_data.get('winner')
         institution = tender_data.get('procuring_entity')
-        pub_date = tender_data.get('publication_date')
 
         if winner and institution:
             # Repeat winner analysis
-            win_stats = await self._get_winner_statistics(winner, institution, pub_date)
+            win_stats = batch.winner_institution_stats.get(
+                (winner, institution, batch.cutoff(tender_data)), _EMPTY_WINNER_STATS
+            )
 
             features['winner_prev_wins_at_institution'] = float(win_stats['prev_wins'])
             features['winner_prev_bids_at_institution'] = float(win_stats['prev_bids'])
@@ -563,7 +692,9 @@ class FeatureExtractor:
             features['winner_dominant_supplier'] = 1.0 if win_stats['market_share'] > 0.5 else 0.0
 
             # Overall win statistics
-            overall_stats = await self._get_overall_winner_statistics(winner, pub_date)
+            overall_stats = batch.winner_overall_stats.get(
+                (winner, batch.cutoff(tender_data)), _EMPTY_OVERALL_STATS
+            )
             features['winner_total_wins'] = float(overall_stats['total_wins'])
             features['winner_total_bids'] = float(overall_stats['total_bids'])
             features['winner_overall_win_rate'] = overall_stats['win_rate']
@@ -583,12 +714,12 @@ class FeatureExtractor:
                 features[key] = 0.0
 
         # Bidder relationship analysis
-        bidders = await self._get_bidder_data(tender_id)
+        bidders = batch.bidders.get(tender_id, [])
         bidder_companies = [b['company_name'] for b in bidders if b.get('company_name')]
 
         if len(bidder_companies) >= 2:
             # Check for known relationships
-            relationships = await self._check_bidder_relationships(bidder_companies)
+            relationships = self._check_bidder_relationships(bidder_companies, batch)
             features['num_related_bidder_pairs'] = float(relationships['related_pairs'])
             features['has_related_bidders'] = 1.0 if relationships['related_pairs'] > 0 else 0.0
             features['all_bidders_related'] = 1.0 if relationships['all_related'] else 0.0
@@ -598,17 +729,20 @@ class FeatureExtractor:
             features['all_bidders_related'] = 0.0
 
         # Institution patterns
-        institution_stats = await self._get_institution_statistics(institution, pub_date)
+        institution_stats = batch.institution_stats.get(
+            (institution, batch.cutoff(tender_data)), _EMPTY_INSTITUTION_STATS
+        ) if institution else _EMPTY_INSTITUTION_STATS
         features['institution_total_tenders'] = float(institution_stats['total_tenders'])
         features['institution_single_bidder_rate'] = institution_stats['single_bidder_rate']
         features['institution_avg_bidders'] = institution_stats['avg_bidders']
 
         return features
 
-    async def _extract_procedural_features(
+    def _extract_procedural_features(
         self,
         tender_id: str,
-        tender_data: Dict
+        tender_data: Dict,
+        batch: TenderBatchContext
     ) -> Dict[str, float]:
         """
         Extract procedural features.
@@ -665,10 +799,11 @@ class FeatureExtractor:
 
         return features
 
-    async def _extract_document_features(
+    def _extract_document_features(
         self,
         tender_id: str,
-        tender_data: Dict
+        tender_data: Dict,
+        batch: TenderBatchContext
     ) -> Dict[str, float]:
         """
         Extract document-related features.
@@ -681,8 +816,7 @@ class FeatureExtractor:
         """
         features = {}
 
-        # Get document data
-        documents = await self._get_document_data(tender_id)
+        documents = batch.documents.get(tender_id, [])
 
         features['num_documents'] = float(len(documents))
         features['has_documents'] = 1.0 if len(documents) > 0 else 0.0
@@ -699,7 +833,7 @@ class FeatureExtractor:
             features['doc_extraction_success_rate'] = 0.0
 
         # Total content length (complexity proxy)
-        total_content_length = sum(len(d.get('content_text') or '') for d in documents)
+        total_content_length = sum(d.get('content_length') or 0 for d in documents)
         features['total_doc_content_length'] = float(total_content_length)
         features['avg_doc_content_length'] = total_content_length / len(documents) if len(documents) > 0 else 0.0
 
@@ -710,10 +844,11 @@ class FeatureExtractor:
 
         return features
 
-    async def _extract_historical_features(
+    def _extract_historical_features(
         self,
         tender_id: str,
-        tender_data: Dict
+        tender_data: Dict,
+        batch: TenderBatchContext
     ) -> Dict[str, float]:
         """
         Extract historical and temporal features.
@@ -731,7 +866,7 @@ class FeatureExtractor:
 
         # Tender age
         if pub_date:
-            age_days = (datetime.utcnow().date() - pub_date).days
+            age_days = (batch.today - pub_date).days
             features['tender_age_days'] = float(age_days)
             features['tender_very_recent'] = 1.0 if age_days <= 30 else 0.0
             features['tender_recent'] = 1.0 if age_days <= 90 else 0.0
@@ -750,7 +885,7 @@ class FeatureExtractor:
         # Institution historical patterns
         institution = tender_data.get('procuring_entity')
         if institution:
-            inst_patterns = await self._get_institution_temporal_patterns(institution, pub_date)
+            inst_patterns = self._get_institution_temporal_patterns(institution, pub_date, batch)
             features['institution_tenders_same_month'] = float(inst_patterns['tenders_same_month'])
             features['institution_tenders_prev_month'] = float(inst_patterns['tenders_prev_month'])
             features['institution_activity_spike'] = inst_patterns['activity_spike']
@@ -762,13 +897,23 @@ class FeatureExtractor:
         return features
 
     # =========================================================================
-    # Helper Methods - Database Queries
+    # Batch Loading - Database Queries
     # =========================================================================
 
-    async def _get_tender_data(self, tender_id: str) -> Optional[Dict]:
-        """Get all tender data from database"""
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow("""
+    async def _load_batch_context(self, tender_ids: List[str]) -> TenderBatchContext:
+        """
+        Load tenders, bidders, documents and every historical aggregate the
+        category extractors need for a set of tenders.
+
+        Two rounds of concurrent set-based queries: base rows first, then one
+        query per aggregate over the distinct keys found in those rows.
+        """
+        batch = TenderBatchContext(today=datetime.utcnow().date())
+        if not tender_ids:
+            return batch
+
+        tender_rows, bidder_rows, document_rows = await asyncio.gather(
+            self._fetch("""
                 SELECT
                     tender_id, title, description, category, procuring_entity,
                     opening_date, closing_date, publication_date,
@@ -779,263 +924,366 @@ class FeatureExtractor:
                     amendment_count, last_amendment_date,
                     scraped_at, scrape_count
                 FROM tenders
-                WHERE tender_id = $1
-            """, tender_id)
-            return dict(row) if row else None
-
-    async def _get_bidder_data(self, tender_id: str) -> List[Dict]:
-        """Get all bidders for a tender"""
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch("""
+                WHERE tender_id = ANY($1::text[])
+            """, tender_ids),
+            self._fetch("""
                 SELECT
-                    company_name, company_tax_id, bid_amount_mkd,
+                    tender_id, company_name, company_tax_id, bid_amount_mkd,
                     is_winner, rank, disqualified, disqualification_reason
                 FROM tender_bidders
-                WHERE tender_id = $1
-                ORDER BY rank NULLS LAST, bid_amount_mkd ASC
-            """, tender_id)
-            return [dict(row) for row in rows]
-
-    async def _get_document_data(self, tender_id: str) -> List[Dict]:
-        """Get all documents for a tender"""
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch("""
+                WHERE tender_id = ANY($1::text[])
+                ORDER BY tender_id, rank NULLS LAST, bid_amount_mkd ASC
+            """, tender_ids),
+            self._fetch("""
                 SELECT
-                    doc_type, file_name, content_text,
+                    tender_id, doc_type, file_name,
+                    COALESCE(LENGTH(content_text), 0) AS content_length,
                     extraction_status, file_size_bytes, page_count
                 FROM documents
-                WHERE tender_id = $1
-            """, tender_id)
-            return [dict(row) for row in rows]
-
-    async def _get_institution_avg_bidders(self, institution: Optional[str]) -> Optional[float]:
-        """Get average number of bidders for an institution"""
-        if not institution:
-            return None
-
+                WHERE tender_id = ANY($1::text[])
+            """, tender_ids),
+        )
+
+        for row in tender_rows:
+            batch.tenders[row['tender_id']] = dict(row)
+        for row in bidder_rows:
+            batch.bidders.setdefault(row['tender_id'], []).append(dict(row))
+        for row in document_rows:
+            batch.documents.setdefault(row['tender_id'], []).append(dict(row))
+
+        # Distinct aggregate keys across the batch
+        institutions, categories, companies = set(), set(), set()
+        pairs = set()
+        winner_inst_keys, winner_keys, inst_keys = set(), set(), set()
+
+        for tender_id, t in batch.tenders.items():
+            institution = t.get('procuring_entity')
+            winner = t.get('winner')
+            cutoff = batch.cutoff(t)
+            if institution:
+                institutions.add(institution)
+                inst_keys.add((institution, cutoff))
+            if t.get('category'):
+                categories.add(t['category'])
+            if winner and institution:
+                winner_inst_keys.add((winner, institution, cutoff))
+                winner_keys.add((winner, cutoff))
+
+            bidders = batch.bidders.get(tender_id, [])
+            bidder_companies = [b['company_name'] for b in bidders if b.get('company_name')]
+            if len(bidder_companies) >= 2:
+                companies.update(bidder_companies)
+                for i, company_a in enumerate(bidder_companies):
+                    for company_b in bidder_companies[i + 1:]:
+                        pairs.add(tuple(sorted((company_a, company_b))))
+
+        await asyncio.gather(
+            self._load_bidder_averages(batch, institutions, categories),
+            self._load_institution_first_bids(batch, institutions),
+            self._load_co_occurrences(batch, companies, pairs),
+            self._load_relationships(batch, companies),
+            self._load_winner_statistics(batch, winner_inst_keys),
+            self._load_overall_winner_statistics(batch, winner_keys),
+            self._load_institution_statistics(batch, inst_keys),
+            self._load_institution_monthly_counts(batch, institutions),
+        )
+
+        return batch
+
+    async def _fetch(self, query: str, *args) -> List[asyncpg.Record]:
+        """Run a query on its own pool connection (lets loaders run concurrently)"""
         async with self.pool.acquire() as conn:
-            result = await conn.fetchval("""
-                SELECT AVG(num_bidders)
+            return await conn.fetch(query, *args)
+
+    async def _load_bidder_averages(
+        self,
+        batch: TenderBatchContext,
+        institutions: set,
+        categories: set
+    ):
+        """Average number of bidders per institution and per category"""
+        inst_rows, cat_rows = await asyncio.gather(
+            self._fetch("""
+                SELECT procuring_entity AS key, AVG(num_bidders) AS avg_bidders
                 FROM tenders
-                WHERE procuring_entity = $1
+                WHERE procuring_entity = ANY($1::text[])
                   AND num_bidders > 0
                   AND status IN ('awarded', 'closed')
-            """, institution)
-            return float(result) if result else None
-
-    async def _get_category_avg_bidders(self, category: Optional[str]) -> Optional[float]:
-        """Get average number of bidders for a category"""
-        if not category:
-            return None
-
-        async with self.pool.acquire() as conn:
-            result = await conn.fetchval("""
-                SELECT AVG(num_bidders)
+                GROUP BY procuring_entity
+            """, list(institutions)),
+            self._fetch("""
+                SELECT category AS key, AVG(num_bidders) AS avg_bidders
                 FROM tenders
-                WHERE category = $1
+                WHERE category = ANY($1::text[])
                   AND num_bidders > 0
                   AND status IN ('awarded', 'closed')
-            """, category)
-            return float(result) if result else None
-
-    async def _count_new_bidders(
-        self,
-        bidder_companies: List[str],
-        institution: Optional[str],
-        pub_date: Optional[datetime.date]
-    ) -> int:
-        """Count how many bidders are new (never bid at this institution before)"""
-        if not institution or not pub_date or not bidder_companies:
-            return 0
-
-        async with self.pool.acquire() as conn:
-            result = await conn.fetchval("""
-                SELECT COUNT(DISTINCT company_name)
-                FROM unnest($1::text[]) AS company_name
-                WHERE NOT EXISTS (
-                    SELECT 1
-                    FROM tender_bidders tb
-                    JOIN tenders t ON tb.tender_id = t.tender_id
-                    WHERE tb.company_name = company_name
-                      AND t.procuring_entity = $2
-                      AND t.publication_date < $3
-                )
-            """, bidder_companies, institution, pub_date)
-            return int(result) if result else 0
+                GROUP BY category
+            """, list(categories)),
+        )
+        batch.institution_avg_bidders = {
+            r['key']: float(r['avg_bidders']) for r in inst_rows if r['avg_bidders']
+        }
+        batch.category_avg_bidders = {
+            r['key']: float(r['avg_bidders']) for r in cat_rows if r['avg_bidders']
+        }
 
-    async def _calculate_bidder_clustering(self, bidder_companies: List[str]) -> float:
-        """
-        Calculate bidder clustering score (how often these companies bid together).
-        Returns score 0.0-1.0 where higher = more clustering
-        """
-        if len(bidder_companies) < 2:
-            return 0.0
+    async def _load_institution_first_bids(self, batch: TenderBatchContext, institutions: set):
+        """Earliest publication date of a tender with bids, per institution"""
+        rows = await self._fetch("""
+            SELECT t.procuring_entity, MIN(t.publication_date) AS first_bid_date
+            FROM tenders t
+            WHERE t.procuring_entity = ANY($1::text[])
+              AND EXISTS (SELECT 1 FROM tender_bidders tb WHERE tb.tender_id = t.tender_id)
+            GROUP BY t.procuring_entity
+        """, list(institutions))
+        batch.institution_first_bid_date = {
+            r['procuring_entity']: r['first_bid_date'] for r in rows if r['first_bid_date']
+        }
 
-        async with self.pool.acquire() as conn:
-            # For each pair of companies, calculate co-occurrence rate
-            clustering_scores = []
-
-            for i, company_a in enumerate(bidder_companies):
-                for company_b in bidder_companies[i+1:]:
-                    # Count tenders where both bid
-                    co_occurrences = await conn.fetchval("""
-                        SELECT COUNT(DISTINCT tb1.tender_id)
-                        FROM tender_bidders tb1
-                        JOIN tender_bidders tb2 ON tb1.tender_id = tb2.tender_id
-                        WHERE tb1.company_name = $1
-                          AND tb2.company_name = $2
-                    """, company_a, company_b)
-
-                    # Count total tenders for each company
-                    total_a = await conn.fetchval("""
-                        SELECT COUNT(DISTINCT tender_id)
-                        FROM tender_bidders
-                        WHERE company_name = $1
-                    """, company_a)
-
-                    total_b = await conn.fetchval("""
-                        SELECT COUNT(DISTINCT tender_id)
-                        FROM tender_bidders
-                        WHERE company_name = $1
-                    """, company_b)
-
-                    # Calculate overlap rate
-                    if total_a and total_b:
-                        overlap = co_occurrences / min(total_a, total_b)
-                        clustering_scores.append(overlap)
-
-            # Return average clustering score
-            return float(np.mean(clustering_scores)) if clustering_scores else 0.0
-
-    async def _get_winner_statistics(
+    async def _load_co_occurrences(
         self,
-        winner: str,
-        institution: str,
-        pub_date: Optional[datetime.date]
-    ) -> Dict[str, Any]:
-        """Get winner statistics at this institution (before this tender)"""
-        cutoff_date = pub_date if pub_date else datetime.utcnow().date()
+        batch: TenderBatchContext,
+        companies: set,
+        pairs: set
+    ):
+        """Tender counts per company and co-bid counts per company pair"""
+        if not pairs:
+            return
+
+        pair_a = [a for a, _ in pairs]
+        pair_b = [b for _, b in pairs]
+        total_rows, pair_rows = await asyncio.gather(
+            self._fetch("""
+                SELECT company_name, COUNT(DISTINCT tender_id) AS total
+                FROM tender_bidders
+                WHERE company_name = ANY($1::text[])
+                GROUP BY company_name
+            """, list(companies)),
+            self._fetch("""
+                SELECT p.a, p.b, COUNT(DISTINCT tb1.tender_id) AS co_occurrences
+                FROM unnest($1::text[], $2::text[]) AS p(a, b)
+                JOIN tender_bidders tb1 ON tb1.company_name = p.a
+                JOIN tender_bidders tb2 ON tb2.tender_id = tb1.tender_id
+                                       AND tb2.company_name = p.b
+                GROUP BY p.a, p.b
+            """, pair_a, pair_b),
+        )
+        batch.company_tender_counts = {r['company_name']: int(r['total']) for r in total_rows}
+        batch.pair_co_occurrences = {
+            (r['a'], r['b']): int(r['co_occurrences']) for r in pair_rows
+        }
 
-        async with self.pool.acquire() as conn:
-            # Previous wins and bids
-            stats = await conn.fetchrow("""
+    async def _load_relationships(self, batch: TenderBatchContext, companies: set):
+        """Known company relationships among all bidders in the batch"""
+        if len(companies) < 2:
+            return
+
+        rows = await self._fetch("""
+            SELECT company_a, company_b
+            FROM company_relationships
+            WHERE company_a = ANY($1::text[]) AND company_b = ANY($1::text[])
+        """, list(companies))
+        batch.related_pairs = [(r['company_a'], r['company_b']) for r in rows]
+
+    async def _load_winner_statistics(self, batch: TenderBatchContext, keys: set):
+        """Winner statistics at the institution before each cutoff date"""
+        if not keys:
+            return
+
+        keys = list(keys)
+        rows = await self._fetch("""
+            SELECT k.idx, s.prev_wins, s.prev_bids, s.total_institution_tenders
+            FROM unnest($1::int[], $2::text[], $3::text[], $4::date[])
+                 AS k(idx, winner, institution, cutoff)
+            CROSS JOIN LATERAL (
                 SELECT
-                    COUNT(*) FILTER (WHERE t.winner = $1) as prev_wins,
-                    COUNT(*) FILTER (WHERE tb.company_name = $1) as prev_bids,
+                    COUNT(*) FILTER (WHERE t.winner = k.winner) as prev_wins,
+                    COUNT(*) FILTER (WHERE tb.company_name = k.winner) as prev_bids,
                     COUNT(*) as total_institution_tenders
                 FROM tenders t
                 LEFT JOIN tender_bidders tb ON t.tender_id = tb.tender_id
-                WHERE t.procuring_entity = $2
-                  AND t.publication_date < $3
+                WHERE t.procuring_entity = k.institution
+                  AND t.publication_date < k.cutoff
                   AND t.status IN ('awarded', 'closed')
-            """, winner, institution, cutoff_date)
-
-            prev_wins = int(stats['prev_wins'] or 0)
-            prev_bids = int(stats['prev_bids'] or 0)
-            total_tenders = int(stats['total_institution_tenders'] or 0)
-
-            market_share = prev_wins / total_tenders if total_tenders > 0 else 0.0
+            ) s
+        """, list(range(len(keys))), [k[0] for k in keys], [k[1] for k in keys], [k[2] for k in keys])
 
-            return {
+        for r in rows:
+            prev_wins = int(r['prev_wins'] or 0)
+            total_tenders = int(r['total_institution_tenders'] or 0)
+            batch.winner_institution_stats[keys[r['idx']]] = {
                 'prev_wins': prev_wins,
-                'prev_bids': prev_bids,
-                'market_share': market_share
+                'prev_bids': int(r['prev_bids'] or 0),
+                'market_share': prev_wins / total_tenders if total_tenders > 0 else 0.0
             }
 
-    async def _get_overall_winner_statistics(
-        self,
-        winner: str,
-        pub_date: Optional[datetime.date]
-    ) -> Dict[str, Any]:
-        """Get overall winner statistics across all institutions"""
-        cutoff_date = pub_date if pub_date else datetime.utcnow().date()
+    async def _load_overall_winner_statistics(self, batch: TenderBatchContext, keys: set):
+        """Winner statistics across all institutions before each cutoff date"""
+        if not keys:
+            return
 
-        async with self.pool.acquire() as conn:
-            stats = await conn.fetchrow("""
+        keys = list(keys)
+        rows = await self._fetch("""
+            SELECT k.idx, s.total_wins, s.total_bids, s.num_institutions
+            FROM unnest($1::int[], $2::text[], $3::date[]) AS k(idx, winner, cutoff)
+            CROSS JOIN LATERAL (
                 SELECT
-                    COUNT(*) FILTER (WHERE t.winner = $1) as total_wins,
-                    COUNT(*) FILTER (WHERE tb.company_name = $1) as total_bids,
-                    COUNT(DISTINCT t.procuring_entity) FILTER (WHERE t.winner = $1) as num_institutions
+                    COUNT(*) FILTER (WHERE t.winner = k.winner) as total_wins,
+                    COUNT(*) FILTER (WHERE tb.company_name = k.winner) as total_bids,
+                    COUNT(DISTINCT t.procuring_entity) FILTER (WHERE t.winner = k.winner) as num_institutions
                 FROM tenders t
                 LEFT JOIN tender_bidders tb ON t.tender_id = tb.tender_id
-                WHERE t.publication_date < $2
+                WHERE t.publication_date < k.cutoff
                   AND t.status IN ('awarded', 'closed')
-            """, winner, cutoff_date)
-
-            total_wins = int(stats['total_wins'] or 0)
-            total_bids = int(stats['total_bids'] or 0)
-
-            return {
+                  AND (t.winner = k.winner OR tb.company_name = k.winner)
+            ) s
+        """, list(range(len(keys))), [k[0] for k in keys], [k[1] for k in keys])
+
+        for r in rows:
+            total_wins = int(r['total_wins'] or 0)
+            total_bids = int(r['total_bids'] or 0)
+            batch.winner_overall_stats[keys[r['idx']]] = {
                 'total_wins': total_wins,
                 'total_bids': total_bids,
                 'win_rate': total_wins / total_bids if total_bids > 0 else 0.0,
-                'num_institutions': int(stats['num_institutions'] or 0)
-            }
-
-    async def _check_bidder_relationships(self, bidder_companies: List[str]) -> Dict[str, Any]:
-        """Check for known relationships between bidders"""
-        if len(bidder_companies) < 2:
-            return {'related_pairs': 0, 'all_related': False}
-
-        async with self.pool.acquire() as conn:
-            # Count related pairs
-            related_count = await conn.fetchval("""
-                SELECT COUNT(*)
-                FROM company_relationships
-                WHERE (company_a = ANY($1::text[]) AND company_b = ANY($1::text[]))
-                   OR (company_b = ANY($1::text[]) AND company_a = ANY($1::text[]))
-            """, bidder_companies)
-
-            # Check if all are related (network)
-            max_possible_pairs = len(bidder_companies) * (len(bidder_companies) - 1) / 2
-            all_related = related_count == max_possible_pairs if max_possible_pairs > 0 else False
-
-            return {
-                'related_pairs': int(related_count or 0),
-                'all_related': all_related
+                'num_institutions': int(r['num_institutions'] or 0)
             }
 
-    async def _get_institution_statistics(
-        self,
-        institution: Optional[str],
-        pub_date: Optional[datetime.date]
-    ) -> Dict[str, Any]:
-        """Get institution statistics"""
-        if not institution:
-            return {
-                'total_tenders': 0,
-                'single_bidder_rate': 0.0,
-                'avg_bidders': 0.0
-            }
+    async def _load_institution_statistics(self, batch: TenderBatchContext, keys: set):
+        """Institution tender counts and bidder averages before each cutoff date"""
+        if not keys:
+            return
 
-        cutoff_date = pub_date if pub_date else datetime.utcnow().date()
-
-        async with self.pool.acquire() as conn:
-            stats = await conn.fetchrow("""
+        keys = list(keys)
+        rows = await self._fetch("""
+            SELECT k.idx, s.total_tenders, s.single_bidder_count, s.avg_bidders
+            FROM unnest($1::int[], $2::text[], $3::date[]) AS k(idx, institution, cutoff)
+            CROSS JOIN LATERAL (
                 SELECT
                     COUNT(*) as total_tenders,
                     COUNT(*) FILTER (WHERE num_bidders = 1) as single_bidder_count,
                     AVG(num_bidders) as avg_bidders
                 FROM tenders
-                WHERE procuring_entity = $1
-                  AND publication_date < $2
+                WHERE procuring_entity = k.institution
+                  AND publication_date < k.cutoff
                   AND status IN ('awarded', 'closed')
                   AND num_bidders > 0
-            """, institution, cutoff_date)
+            ) s
+        """, list(range(len(keys))), [k[0] for k in keys], [k[1] for k in keys])
 
-            total = int(stats['total_tenders'] or 0)
-            single_bidder = int(stats['single_bidder_count'] or 0)
-
-            return {
+        for r in rows:
+            total = int(r['total_tenders'] or 0)
+            single_bidder = int(r['single_bidder_count'] or 0)
+            batch.institution_stats[keys[r['idx']]] = {
                 'total_tenders': total,
                 'single_bidder_rate': single_bidder / total if total > 0 else 0.0,
-                'avg_bidders': float(stats['avg_bidders'] or 0.0)
+                'avg_bidders': float(r['avg_bidders'] or 0.0)
             }
 
-    async def _get_institution_temporal_patterns(
+    async def _load_institution_monthly_counts(self, batch: TenderBatchContext, institutions: set):
+        """Tenders per institution per publication month"""
+        if not institutions:
+            return
+
+        rows = await self._fetch("""
+            SELECT
+                procuring_entity,
+                EXTRACT(YEAR FROM publication_date)::int AS year,
+                EXTRACT(MONTH FROM publication_date)::int AS month,
+                COUNT(*) AS tenders
+            FROM tenders
+            WHERE procuring_entity = ANY($1::text[])
+              AND publication_date IS NOT NULL
+            GROUP BY 1, 2, 3
+        """, list(institutions))
+        batch.institution_monthly_counts = {
+            (r['procuring_entity'], r['year'], r['month']): int(r['tenders']) for r in rows
+        }
+
+    # =========================================================================
+    # Helper Methods - Lookups on the Batch Context
+    # =========================================================================
+
+    def _count_new_bidders(
+        self,
+        bidder_companies: List[str],
+        institution: Optional[str],
+        pub_date: Optional[datetime.date],
+        batch: TenderBatchContext
+    ) -> int:
+        """
+        Count how many bidders are new at this institution.
+
+        Matches the original per-tender query, whose unqualified
+        ``company_name`` in the NOT EXISTS subquery resolved to
+        ``tb.company_name``: every bidder counts as new only when the
+        institution had no bids at all before pub_date. Kept as-is so the
+        trained models see the same feature distribution.
+        """
+        if not institution or not pub_date or not bidder_companies:
+            return 0
+
+        first_bid_date = batch.institution_first_bid_date.get(institution)
+        if first_bid_date is not None and first_bid_date < pub_date:
+            return 0
+        return len(set(bidder_companies))
+
+    def _calculate_bidder_clustering(
+        self,
+        bidder_companies: List[str],
+        batch: TenderBatchContext
+    ) -> float:
+        """
+        Calculate bidder clustering score (how often these companies bid together).
+        Returns score 0.0-1.0 where higher = more clustering
+        """
+        if len(bidder_companies) < 2:
+            return 0.0
+
+        # For each pair of companies, calculate co-occurrence rate
+        clustering_scores = []
+        for i, company_a in enumerate(bidder_companies):
+            for company_b in bidder_companies[i+1:]:
+                co_occurrences = batch.pair_co_occurrences.get(
+                    tuple(sorted((company_a, company_b))), 0
+                )
+                total_a = batch.company_tender_counts.get(company_a)
+                total_b = batch.company_tender_counts.get(company_b)
+
+                # Calculate overlap rate
+                if total_a and total_b:
+                    overlap = co_occurrences / min(total_a, total_b)
+                    clustering_scores.append(overlap)
+
+        # Return average clustering score
+        return float(np.mean(clustering_scores)) if clustering_scores else 0.0
+
+    def _check_bidder_relationships(
+        self,
+        bidder_companies: List[str],
+        batch: TenderBatchContext
+    ) -> Dict[str, Any]:
+        """Check for known relationships between bidders"""
+        if len(bidder_companies) < 2:
+            return {'related_pairs': 0, 'all_related': False}
+
+        members = set(bidder_companies)
+        related_count = sum(1 for a, b in batch.related_pairs if a in members and b in members)
+
+        # Check if all are related (network)
+        max_possible_pairs = len(bidder_companies) * (len(bidder_companies) - 1) / 2
+        all_related = related_count == max_possible_pairs if max_possible_pairs > 0 else False
+
+        return {
+            'related_pairs': related_count,
+            'all_related': all_related
+        }
+
+    def _get_institution_temporal_patterns(
         self,
         institution: str,
-        pub_date: Optional[datetime.date]
+        pub_date: Optional[datetime.date],
+        batch: TenderBatchContext
     ) -> Dict[str, Any]:
         """Get institution temporal activity patterns"""
         if not pub_date:
@@ -1045,34 +1293,20 @@ class FeatureExtractor:
                 'activity_spike': 0.0
             }
 
-        async with self.pool.acquire() as conn:
-            # Tenders in same month
-            same_month = await conn.fetchval("""
-                SELECT COUNT(*)
-                FROM tenders
-                WHERE procuring_entity = $1
-                  AND EXTRACT(YEAR FROM publication_date) = $2
-                  AND EXTRACT(MONTH FROM publication_date) = $3
-            """, institution, pub_date.year, pub_date.month)
-
-            # Tenders in previous month
-            prev_month_date = (pub_date.replace(day=1) - timedelta(days=1))
-            prev_month = await conn.fetchval("""
-                SELECT COUNT(*)
-                FROM tenders
-                WHERE procuring_entity = $1
-                  AND EXTRACT(YEAR FROM publication_date) = $2
-                  AND EXTRACT(MONTH FROM publication_date) = $3
-            """, institution, prev_month_date.year, prev_month_date.month)
+        counts = batch.institution_monthly_counts
+        same_month = counts.get((institution, pub_date.year, pub_date.month), 0)
 
-            # Calculate spike (activity > 2x previous month)
-            spike = 1.0 if (prev_month and same_month and same_month > 2 * prev_month) else 0.0
+        prev_month_date = (pub_date.replace(day=1) - timedelta(days=1))
+        prev_month = counts.get((institution, prev_month_date.year, prev_month_date.month), 0)
 
-            return {
-                'tenders_same_month': int(same_month or 0),
-                'tenders_prev_month': int(prev_month or 0),
-                'activity_spike': spike
-            }
+        # Calculate spike (activity > 2x previous month)
+        spike = 1.0 if (prev_month and same_month and same_month > 2 * prev_month) else 0.0
+
+        return {
+            'tenders_same_month': same_month,
+            'tenders_prev_month': prev_month,
+            'activity_spike': spike
+        }
 
     # =========================================================================
     # Feature Name Management
@@ -11,6 +11,10 @@ to detect corruption patterns such as:
 Components:
 - RelationshipGraph: In-memory graph engine using NetworkX
 - RelationshipExtractor: Async SQL-based edge extraction from tender data
+- SparseCentralityEngine: SciPy PageRank and exact parallel betweenness
+  used by batch_graph_build
+- GraphIndex / RelationshipGraphService: Process-resident CSR index over
+  unified_edges for path and neighborhood queries in the API
 - batch_graph_build: CLI script for nightly graph rebuild
 
 Author: nabavkidata.com
@@ -19,5 +23,14 @@ License: Proprietary
 
 from .relationship_graph import RelationshipGraph
 from .relationship_extractor import RelationshipExtractor
+from .graph_index import GraphIndex, RelationshipGraphService, get_graph_service
+from .sparse_centrality import SparseCentralityEngine
 
-__all__ = ['RelationshipGraph', 'RelationshipExtractor']
+__all__ = [
+    'RelationshipGraph',
+    'RelationshipExtractor',
+    'GraphIndex',
+    'RelationshipGraphService',
+    'get_graph_service',
+    'SparseCentralityEngine',
+]
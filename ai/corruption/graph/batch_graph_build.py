@@ -18,6 +18,16 @@ Usage:
     # Custom Louvain resolution
     python batch_graph_build.py --resolution 1.5
 
+    # NetworkX centrality (sampled betweenness) instead of the sparse engine
+    python batch_graph_build.py --centrality-backend networkx
+
+    # Limit betweenness worker processes
+    python batch_graph_build.py --workers 4
+
+    # Row-by-row upserts / keep edges not seen in this run
+    python batch_graph_build.py --upsert-mode row
+    python batch_graph_build.py --no-prune
+
     # Dry run (compute metrics but do not write to DB)
     python batch_graph_build.py --dry-run
 
@@ -35,7 +45,7 @@ import logging
 import asyncio
 import argparse
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 import asyncpg
@@ -49,6 +59,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from graph.relationship_extractor import RelationshipExtractor
 from graph.relationship_graph import RelationshipGraph
+from graph.graph_index import publish_graph_version
+from graph.sparse_centrality import SparseCentralityEngine
 
 # Configure logging
 logging.basicConfig(
@@ -66,6 +78,29 @@ DATABASE_URL = os.getenv(
 # Batch upsert size
 UPSERT_BATCH_SIZE = 500
 
+# Centrality backends selectable with --centrality-backend
+CENTRALITY_BACKENDS = ("sparse", "networkx")
+
+# Upsert modes selectable with --upsert-mode
+UPSERT_MODES = ("bulk", "row")
+
+# Pruning is skipped if it would delete more than this fraction of existing
+# edges (guards against a partial extraction wiping the table)
+PRUNE_MAX_FRACTION = 0.5
+
+
+def _prune_allowed(stale: int, existing: int, what: str) -> bool:
+    """True if deleting stale of existing rows stays under PRUNE_MAX_FRACTION."""
+    if not stale:
+        return False
+    if existing and stale > existing * PRUNE_MAX_FRACTION:
+        logger.warning(
+            f"  Skipping prune: {stale}/{existing} {what} not seen in this run "
+            f"exceeds {PRUNE_MAX_FRACTION:.0%}"
+        )
+        return False
+    return True
+
 
 async def ensure_tables_exist(conn) -> None:
     """Ensure the unified_edges and entity_centrality_cache tables exist."""
@@ -86,6 +121,9 @@ async def ensure_tables_exist(conn) -> None:
             UNIQUE(source_id, target_id, edge_type)
         )
     """)
+    await conn.execute(
+        "ALTER TABLE unified_edges ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW()"
+    )
 
     await conn.execute("""
         CREATE TABLE IF NOT EXISTS entity_centrality_cache (
@@ -102,6 +140,16 @@ async def ensure_tables_exist(conn) -> None:
         )
     """)
 
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS unified_graph_versions (
+            version_id BIGSERIAL PRIMARY KEY,
+            published_at TIMESTAMP DEFAULT NOW(),
+            edge_count INTEGER,
+            node_count INTEGER,
+            stats JSONB DEFAULT '{}'
+        )
+    """)
+
     logger.info("Tables verified/created")
 
 
@@ -143,7 +191,8 @@ async def upsert_edges(conn, edges: List[Dict[str, Any]]) -> int:
                     metadata = EXCLUDED.metadata,
                     source_type = EXCLUDED.source_type,
                     target_type = EXCLUDED.target_type,
-                    last_seen = NOW()
+                    last_seen = NOW(),
+                    updated_at = NOW()
                 """,
                 edge["source_id"],
                 edge.get("source_type", "company"),
@@ -169,6 +218,7 @@ async def upsert_centrality(
     communities: Dict[str, int],
     node_types: Dict[str, str],
     graph: RelationshipGraph,
+    degrees: Optional[Dict[str, Tuple[int, int, int]]] = None,
 ) -> int:
     """
     Upsert centrality metrics into entity_centrality_cache.
@@ -180,6 +230,7 @@ async def upsert_centrality(
         communities: Dict of entity_id -> community_id
         node_types: Dict of entity_id -> entity_type
         graph: The RelationshipGraph (for degree computation)
+        degrees: Optional precomputed entity_id -> (degree, in_degree, out_degree)
 
     Returns:
         Number of entities upserted
@@ -204,7 +255,9 @@ async def upsert_centrality(
             degree = 0
             in_deg = 0
             out_deg = 0
-            if graph.has_node(entity_id):
+            if degrees is not None:
+                degree, in_deg, out_deg = degrees.get(entity_id, (0, 0, 0))
+            elif graph.has_node(entity_id):
                 degree = graph._undirected_graph.degree(entity_id)
                 in_deg = graph._graph.in_degree(entity_id)
                 out_deg = graph._graph.out_degree(entity_id)
@@ -246,6 +299,251 @@ async def upsert_centrality(
     return upserted
 
 
+async def upsert_edges_bulk(
+    conn,
+    edges: List[Dict[str, Any]],
+    prune: bool = True,
+) -> Tuple[int, int]:
+    """
+    Bulk upsert edges via a COPY-loaded staging table.
+
+    All rows are COPYed into a temporary table and merged with a single
+    INSERT ... SELECT ... ON CONFLICT; updated_at only moves for edges whose
+    values changed.  With prune=True, edges absent from this run are deleted
+    in the same transaction.
+
+    Args:
+        conn: asyncpg connection
+        edges: List of edge dicts from RelationshipExtractor
+        prune: Delete unified_edges rows not present in edges
+            (skipped above PRUNE_MAX_FRACTION of existing rows)
+
+    Returns:
+        Tuple of (edges upserted, edges deleted)
+    """
+    if not edges:
+        return 0, 0
+
+    records = [
+        (
+            i,
+            edge["source_id"],
+            edge.get("source_type", "company"),
+            edge["target_id"],
+            edge.get("target_type", "company"),
+            edge["edge_type"],
+            float(edge.get("weight", 1.0)),
+            int(edge.get("tender_count", 0) or 0),
+            float(edge.get("total_value", 0) or 0),
+            json.dumps(edge.get("metadata", {}), default=str),
+        )
+        for i, edge in enumerate(edges)
+    ]
+
+    async with conn.transaction():
+        await conn.execute("""
+            CREATE TEMP TABLE unified_edges_staging (
+                ord INTEGER,
+                source_id TEXT,
+                source_type TEXT,
+                target_id TEXT,
+                target_type TEXT,
+                edge_type TEXT,
+                weight FLOAT,
+                tender_count INTEGER,
+                total_value FLOAT8,
+                metadata TEXT
+            ) ON COMMIT DROP
+        """)
+        await conn.copy_records_to_table(
+            "unified_edges_staging",
+            records=records,
+            columns=[
+                "ord", "source_id", "source_type", "target_id", "target_type",
+                "edge_type", "weight", "tender_count", "total_value", "metadata",
+            ],
+        )
+        logger.info(f"  Staged {len(records)} edges")
+
+        # Counted before the merge so newly inserted edges do not dilute the
+        # stale fraction
+        existing = stale = 0
+        if prune:
+            existing = await conn.fetchval("SELECT COUNT(*) FROM unified_edges")
+            stale = await conn.fetchval("""
+                SELECT COUNT(*)
+                FROM unified_edges u
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM unified_edges_staging s
+                    WHERE s.source_id = u.source_id
+                      AND s.target_id = u.target_id
+                      AND s.edge_type = u.edge_type
+                )
+            """)
+
+        # Duplicate keys: the last occurrence wins, as with row-by-row upserts
+        result = await conn.execute("""
+            INSERT INTO unified_edges
+                (source_id, source_type, target_id, target_type, edge_type,
+                 weight, tender_count, total_value, metadata, last_seen, updated_at)
+            SELECT DISTINCT ON (source_id, target_id, edge_type)
+                source_id, source_type, target_id, target_type, edge_type,
+                weight, tender_count, total_value::numeric(18,2), metadata::jsonb,
+                NOW(), NOW()
+            FROM unified_edges_staging
+            ORDER BY source_id, target_id, edge_type, ord DESC
+            ON CONFLICT (source_id, target_id, edge_type) DO UPDATE SET
+                weight = EXCLUDED.weight,
+                tender_count = EXCLUDED.tender_count,
+                total_value = EXCLUDED.total_value,
+                metadata = EXCLUDED.metadata,
+                source_type = EXCLUDED.source_type,
+                target_type = EXCLUDED.target_type,
+                last_seen = NOW(),
+                updated_at = CASE
+                    WHEN (unified_edges.weight, unified_edges.tender_count,
+                          unified_edges.total_value, unified_edges.metadata,
+                          unified_edges.source_type, unified_edges.target_type)
+                         IS DISTINCT FROM
+                         (EXCLUDED.weight, EXCLUDED.tender_count,
+                          EXCLUDED.total_value, EXCLUDED.metadata,
+                          EXCLUDED.source_type, EXCLUDED.target_type)
+                    THEN NOW()
+                    ELSE unified_edges.updated_at
+                END
+        """)
+        upserted = int(result.split()[-1])
+
+        deleted = 0
+        if prune and _prune_allowed(stale, existing, "edges"):
+            result = await conn.execute("""
+                DELETE FROM unified_edges u
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM unified_edges_staging s
+                    WHERE s.source_id = u.source_id
+                      AND s.target_id = u.target_id
+                      AND s.edge_type = u.edge_type
+                )
+            """)
+            deleted = int(result.split()[-1])
+
+    return upserted, deleted
+
+
+async def upsert_centrality_bulk(
+    conn,
+    pagerank: Dict[str, float],
+    betweenness: Dict[str, float],
+    communities: Dict[str, int],
+    node_types: Dict[str, str],
+    degrees: Dict[str, Tuple[int, int, int]],
+    prune: bool = True,
+) -> Tuple[int, int]:
+    """
+    Bulk upsert centrality metrics via a COPY-loaded staging table.
+
+    Args:
+        conn: asyncpg connection
+        pagerank: Dict of entity_id -> pagerank score
+        betweenness: Dict of entity_id -> betweenness score
+        communities: Dict of entity_id -> community_id
+        node_types: Dict of entity_id -> entity_type
+        degrees: Dict of entity_id -> (degree, in_degree, out_degree)
+        prune: Delete cache rows for entities no longer in the graph
+            (skipped above PRUNE_MAX_FRACTION of existing rows)
+
+    Returns:
+        Tuple of (entities upserted, entities deleted)
+    """
+    all_entities = sorted(set(pagerank.keys()) | set(betweenness.keys()))
+    if not all_entities:
+        return 0, 0
+
+    records = []
+    for entity_id in all_entities:
+        degree, in_deg, out_deg = degrees.get(entity_id, (0, 0, 0))
+        community = communities.get(entity_id)
+        records.append((
+            entity_id,
+            node_types.get(entity_id, "company"),
+            entity_id,  # entity_name = entity_id (name is the identifier)
+            float(pagerank.get(entity_id, 0)),
+            float(betweenness.get(entity_id, 0)),
+            int(degree),
+            int(in_deg),
+            int(out_deg),
+            int(community) if community is not None else None,
+        ))
+
+    async with conn.transaction():
+        await conn.execute("""
+            CREATE TEMP TABLE entity_centrality_staging (
+                entity_id TEXT,
+                entity_type TEXT,
+                entity_name TEXT,
+                pagerank FLOAT,
+                betweenness FLOAT,
+                degree INTEGER,
+                in_degree INTEGER,
+                out_degree INTEGER,
+                community_id INTEGER
+            ) ON COMMIT DROP
+        """)
+        await conn.copy_records_to_table(
+            "entity_centrality_staging",
+            records=records,
+            columns=[
+                "entity_id", "entity_type", "entity_name", "pagerank", "betweenness",
+                "degree", "in_degree", "out_degree", "community_id",
+            ],
+        )
+
+        existing = stale = 0
+        if prune:
+            existing = await conn.fetchval("SELECT COUNT(*) FROM entity_centrality_cache")
+            stale = await conn.fetchval("""
+                SELECT COUNT(*)
+                FROM entity_centrality_cache c
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM entity_centrality_staging s
+                    WHERE s.entity_id = c.entity_id
+                )
+            """)
+
+        result = await conn.execute("""
+            INSERT INTO entity_centrality_cache
+                (entity_id, entity_type, entity_name, pagerank, betweenness,
+                 degree, in_degree, out_degree, community_id, updated_at)
+            SELECT entity_id, entity_type, entity_name, pagerank, betweenness,
+                   degree, in_degree, out_degree, community_id, NOW()
+            FROM entity_centrality_staging
+            ON CONFLICT (entity_id) DO UPDATE SET
+                entity_type = EXCLUDED.entity_type,
+                entity_name = EXCLUDED.entity_name,
+                pagerank = EXCLUDED.pagerank,
+                betweenness = EXCLUDED.betweenness,
+                degree = EXCLUDED.degree,
+                in_degree = EXCLUDED.in_degree,
+                out_degree = EXCLUDED.out_degree,
+                community_id = EXCLUDED.community_id,
+                updated_at = NOW()
+        """)
+        upserted = int(result.split()[-1])
+
+        deleted = 0
+        if prune and _prune_allowed(stale, existing, "entities"):
+            result = await conn.execute("""
+                DELETE FROM entity_centrality_cache c
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM entity_centrality_staging s
+                    WHERE s.entity_id = c.entity_id
+                )
+            """)
+            deleted = int(result.split()[-1])
+
+    return upserted, deleted
+
+
 async def load_edges_from_db(pool: asyncpg.Pool) -> List[Dict[str, Any]]:
     """Load existing edges from the unified_edges table."""
     query = """
@@ -284,6 +582,10 @@ async def run_batch(
     centrality_only: bool = False,
     dry_run: bool = False,
     resolution: float = 1.0,
+    centrality_backend: str = "sparse",
+    workers: Optional[int] = None,
+    upsert_mode: str = "bulk",
+    prune: bool = True,
 ) -> Dict[str, Any]:
     """
     Run the full batch graph build pipeline.
@@ -292,7 +594,9 @@ async def run_batch(
         1. Extract edges from procurement data (unless skip_extraction)
         2. Build in-memory RelationshipGraph
         3. Compute PageRank, betweenness centrality, communities
-        4. Upsert edges to unified_edges table (unless centrality_only)
+        4. Upsert edges to unified_edges table (unless centrality_only),
+           pruning edges not seen in this run, and publish a new
+           unified_graph_versions row
         5. Upsert centrality to entity_centrality_cache table
 
     Args:
@@ -300,6 +604,14 @@ async def run_batch(
         centrality_only: If True, skip edge upsert (only update centrality cache)
         dry_run: If True, compute metrics but do not write to DB
         resolution: Louvain community detection resolution parameter
+        centrality_backend: "sparse" (SciPy PageRank, exact parallel betweenness)
+            or "networkx" (RelationshipGraph methods, sampled betweenness)
+        workers: Betweenness worker processes for the sparse backend
+            (default: all CPUs)
+        upsert_mode: "bulk" (COPY into staging tables, one merge statement)
+            or "row" (one INSERT ... ON CONFLICT per row)
+        prune: In bulk mode, delete edges and centrality rows not produced
+            by this run
 
     Returns:
         Dict with summary statistics
@@ -314,6 +626,8 @@ async def run_batch(
         "skip_extraction": skip_extraction,
         "centrality_only": centrality_only,
         "dry_run": dry_run,
+        "centrality_backend": centrality_backend,
+        "upsert_mode": upsert_mode,
     }
 
     logger.info("=" * 70)
@@ -356,10 +670,17 @@ async def run_batch(
             f"{graph_stats['connected_components']} components"
         )
 
+        degrees = None
+        if centrality_backend == "sparse":
+            engine = SparseCentralityEngine(graph)
+            degrees = engine.compute_degrees()
+        else:
+            engine = graph
+
         # Step 3a: Compute PageRank
-        logger.info("Step 3a: Computing PageRank...")
+        logger.info(f"Step 3a: Computing PageRank ({centrality_backend})...")
         t0 = datetime.utcnow()
-        pagerank = graph.compute_pagerank()
+        pagerank = engine.compute_pagerank()
         pr_time = (datetime.utcnow() - t0).total_seconds()
         stats["pagerank_time_sec"] = round(pr_time, 2)
         logger.info(f"  PageRank computed in {pr_time:.1f}s for {len(pagerank)} nodes")
@@ -371,9 +692,12 @@ async def run_batch(
             logger.info(f"    {entity_id}: {score:.6f}")
 
         # Step 3b: Compute betweenness centrality
-        logger.info("Step 3b: Computing betweenness centrality...")
+        logger.info(f"Step 3b: Computing betweenness centrality ({centrality_backend})...")
         t0 = datetime.utcnow()
-        betweenness = graph.compute_betweenness_centrality()
+        if centrality_backend == "sparse":
+            betweenness = engine.compute_betweenness_centrality(workers=workers)
+        else:
+            betweenness = engine.compute_betweenness_centrality()
         bc_time = (datetime.utcnow() - t0).total_seconds()
         stats["betweenness_time_sec"] = round(bc_time, 2)
         logger.info(f"  Betweenness computed in {bc_time:.1f}s for {len(betweenness)} nodes")
@@ -396,11 +720,27 @@ async def run_batch(
 
         # Step 4: Upsert edges to DB
         if not dry_run and not centrality_only:
-            logger.info(f"Step 4: Upserting {len(edges)} edges to unified_edges...")
+            logger.info(f"Step 4: Upserting {len(edges)} edges to unified_edges ({upsert_mode})...")
+            n_deleted = 0
             async with pool.acquire() as conn:
-                n_upserted = await upsert_edges(conn, edges)
+                if upsert_mode == "bulk":
+                    n_upserted, n_deleted = await upsert_edges_bulk(conn, edges, prune=prune)
+                else:
+                    n_upserted = await upsert_edges(conn, edges)
             stats["edges_upserted"] = n_upserted
-            logger.info(f"  Upserted {n_upserted} edges")
+            stats["edges_deleted"] = n_deleted
+            logger.info(f"  Upserted {n_upserted} edges, deleted {n_deleted} stale edges")
+
+            # Resident graph indexes in the API refresh from this version
+            async with pool.acquire() as conn:
+                version_id = await publish_graph_version(conn, {
+                    "edge_count": graph_stats["edge_count"],
+                    "node_count": graph_stats["node_count"],
+                    "edges_upserted": n_upserted,
+                    "edges_deleted": n_deleted,
+                })
+            stats["graph_version"] = version_id
+            logger.info(f"  Published graph version {version_id}")
         else:
             reason = "dry_run" if dry_run else "centrality_only"
             logger.info(f"Step 4: Skipping edge upsert ({reason})")
@@ -408,12 +748,29 @@ async def run_batch(
 
         # Step 5: Upsert centrality to DB
         if not dry_run:
-            logger.info("Step 5: Upserting centrality metrics...")
+            logger.info(f"Step 5: Upserting centrality metrics ({upsert_mode})...")
             node_types = {node: graph.get_node_type(node) for node in pagerank}
             async with pool.acquire() as conn:
-                n_centrality = await upsert_centrality(
-                    conn, pagerank, betweenness, community_map, node_types, graph
-                )
+                if upsert_mode == "bulk":
+                    if degrees is None:
+                        degrees = {
+                            node: (
+                                graph._undirected_graph.degree(node),
+                                graph._graph.in_degree(node),
+                                graph._graph.out_degree(node),
+                            )
+                            for node in pagerank
+                        }
+                    n_centrality, n_centrality_deleted = await upsert_centrality_bulk(
+                        conn, pagerank, betweenness, community_map, node_types, degrees,
+                        prune=prune,
+                    )
+                    stats["centrality_deleted"] = n_centrality_deleted
+                else:
+                    n_centrality = await upsert_centrality(
+                        conn, pagerank, betweenness, community_map, node_types, graph,
+                        degrees=degrees,
+                    )
             stats["centrality_upserted"] = n_centrality
             logger.info(f"  Upserted {n_centrality} entity centrality records")
         else:
@@ -473,6 +830,29 @@ def main():
         default=1.0,
         help="Louvain community detection resolution (default: 1.0, higher = more communities)",
     )
+    parser.add_argument(
+        "--centrality-backend",
+        choices=CENTRALITY_BACKENDS,
+        default="sparse",
+        help="Centrality engine: sparse (exact, parallel betweenness) or networkx (sampled)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for sparse betweenness (default: all CPUs)",
+    )
+    parser.add_argument(
+        "--upsert-mode",
+        choices=UPSERT_MODES,
+        default="bulk",
+        help="bulk: COPY into staging tables and merge; row: one upsert per row",
+    )
+    parser.add_argument(
+        "--no-prune",
+        action="store_true",
+        help="In bulk mode, keep edges/centrality rows not produced by this run",
+    )
 
     args = parser.parse_args()
 
@@ -481,6 +861,10 @@ def main():
         centrality_only=args.centrality_only,
         dry_run=args.dry_run,
         resolution=args.resolution,
+        centrality_backend=args.centrality_backend,
+        workers=args.workers,
+        upsert_mode=args.upsert_mode,
+        prune=not args.no_prune,
     ))
 
     # Print final stats as JSON
@@ -0,0 +1,525 @@
+"""
+Resident Relationship Graph Index
+
+Process-resident, versioned index over the unified_edges table for the
+investigator endpoints (shortest path, k-hop neighborhood, connections).
+Instead of scanning unified_edges and building a NetworkX MultiDiGraph per
+request, every API worker keeps one compact index in memory:
+
+- entity names mapped to dense integer ids
+- per-edge columns as NumPy arrays (one row per unified_edges row)
+- an undirected CSR adjacency with per-pair weights summed over edge types
+  and directions (the same weighting RelationshipGraph.shortest_path uses)
+- a CSR of incident edge ids per node for connection / subgraph queries
+
+batch_graph_build.run_batch publishes a row in unified_graph_versions after
+writing edges. RelationshipGraphService polls that row (at most every
+GRAPH_INDEX_CHECK_INTERVAL seconds) and, when a new version appears, fetches
+only edges whose updated_at is newer than the version it already holds,
+merges them by (source_id, target_id, edge_type) and swaps in a rebuilt
+index. If any newer version deleted edges (stats.edges_deleted), the index
+is reloaded in full instead.
+
+Usage:
+    service = get_graph_service()
+    index = await service.get_index(pool)
+    result = index.shortest_path("CompanyA", "InstitutionX")
+    depths = index.k_hop("CompanyA", hops=2)
+
+Author: nabavkidata.com
+License: Proprietary
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncpg
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Seconds between version checks against unified_graph_versions
+GRAPH_INDEX_CHECK_INTERVAL = float(os.getenv("GRAPH_INDEX_CHECK_INTERVAL", "60"))
+
+# Same floor RelationshipGraph.shortest_path applies before inverting weights
+MIN_PATH_WEIGHT = 0.001
+
+_COLUMNS = [
+    "source_id", "source_type", "target_id", "target_type", "edge_type",
+    "weight", "tender_count", "total_value", "metadata",
+]
+_EDGE_COLUMNS = ", ".join(_COLUMNS)
+
+
+class GraphIndex:
+    """
+    Immutable, array-backed view of the unified relationship graph.
+
+    Built once per graph version and shared by all requests in the process;
+    queries never touch the database.
+    """
+
+    def __init__(
+        self,
+        edges: Dict[str, List[Any]],
+        version: Optional[int] = None,
+        published_at: Optional[datetime] = None,
+    ):
+        """
+        Args:
+            edges: Column lists keyed like unified_edges columns
+                (source_id, source_type, target_id, target_type, edge_type,
+                weight, tender_count, total_value, metadata)
+            version: unified_graph_versions.version_id this index reflects
+            published_at: Publish time of that version
+        """
+        self.version = version
+        self.published_at = published_at
+        self.built_at = datetime.utcnow()
+
+        sources = edges["source_id"]
+        targets = edges["target_id"]
+
+        # Dense node ids; first seen type wins (as in RelationshipGraph)
+        self.names: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        self.node_types: List[str] = []
+        src = np.empty(len(sources), dtype=np.int32)
+        dst = np.empty(len(sources), dtype=np.int32)
+        for i, (s, s_type, t, t_type) in enumerate(
+            zip(sources, edges["source_type"], targets, edges["target_type"])
+        ):
+            src[i] = self._intern(s, s_type)
+            dst[i] = self._intern(t, t_type)
+
+        self.src = src
+        self.dst = dst
+        self.edge_source_types = edges["source_type"]
+        self.edge_target_types = edges["target_type"]
+        self.edge_types = edges["edge_type"]
+        self.weight = np.asarray(edges["weight"], dtype=np.float64)
+        self.tender_count = np.asarray(edges["tender_count"], dtype=np.int64)
+        self.total_value = np.asarray(edges["total_value"], dtype=np.float64)
+        self._metadata = edges["metadata"]
+
+        n = len(self.names)
+
+        # Incident edges per node (self-loops listed once)
+        loops = src == dst
+        ends = np.concatenate([src, dst[~loops]])
+        edge_ids = np.concatenate([
+            np.arange(len(src), dtype=np.int64),
+            np.nonzero(~loops)[0].astype(np.int64),
+        ])
+        order = np.argsort(ends, kind="stable")
+        self.incident_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=n), out=self.incident_offsets[1:])
+        self.incident_edges = edge_ids[order]
+
+        # Undirected adjacency: one entry per node pair, weights summed
+        lo = np.minimum(src, dst).astype(np.int64)
+        hi = np.maximum(src, dst).astype(np.int64)
+        pair_keys, inverse = np.unique(lo * max(n, 1) + hi, return_inverse=True)
+        pair_weight = np.bincount(inverse, weights=self.weight, minlength=len(pair_keys))
+        pair_lo = pair_keys // max(n, 1)
+        pair_hi = pair_keys % max(n, 1)
+        distance = 1.0 / np.maximum(pair_weight, MIN_PATH_WEIGHT)
+
+        not_loop = pair_lo != pair_hi
+        adj_from = np.concatenate([pair_lo, pair_hi[not_loop]])
+        adj_to = np.concatenate([pair_hi, pair_lo[not_loop]])
+        adj_dist = np.concatenate([distance, distance[not_loop]])
+        order = np.argsort(adj_from, kind="stable")
+        self.offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(adj_from, minlength=n), out=self.offsets[1:])
+        self.neighbors = adj_to[order].astype(np.int32)
+        self.distances = adj_dist[order]
+
+        logger.info(
+            f"GraphIndex built: {n} nodes, {len(src)} edges, "
+            f"{len(pair_keys)} node pairs (version={version})"
+        )
+
+    def _intern(self, name: str, node_type: str) -> int:
+        idx = self.node_index.get(name)
+        if idx is None:
+            idx = len(self.names)
+            self.node_index[name] = idx
+            self.names.append(name)
+            self.node_types.append(node_type or "company")
+        return idx
+
+    # ------------------------------------------------------------------
+    # Basic accessors
+    # ------------------------------------------------------------------
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.src.shape[0])
+
+    def has_node(self, entity_id: str) -> bool:
+        return entity_id in self.node_index
+
+    def edge(self, edge_id: int) -> Dict[str, Any]:
+        """Edge as a dict shaped like a unified_edges row."""
+        metadata = self._metadata[edge_id]
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata) if metadata else {}
+        elif metadata is None:
+            metadata = {}
+        return {
+            "source_id": self.names[self.src[edge_id]],
+            "source_type": self.edge_source_types[edge_id],
+            "target_id": self.names[self.dst[edge_id]],
+            "target_type": self.edge_target_types[edge_id],
+            "edge_type": self.edge_types[edge_id],
+            "weight": float(self.weight[edge_id]),
+            "tender_count": int(self.tender_count[edge_id]),
+            "total_value": float(self.total_value[edge_id]),
+            "metadata": metadata,
+        }
+
+    def _incident(self, node: int) -> np.ndarray:
+        return self.incident_edges[self.incident_offsets[node]:self.incident_offsets[node + 1]]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def incident_edges_of(self, entity_id: str) -> List[Dict[str, Any]]:
+        """All edges touching entity_id, strongest first."""
+        node = self.node_index.get(entity_id)
+        if node is None:
+            return []
+        edge_ids = self._incident(node)
+        edge_ids = edge_ids[np.argsort(-self.weight[edge_ids], kind="stable")]
+        return [self.edge(int(e)) for e in edge_ids]
+
+    def k_hop(self, entity_id: str, hops: int) -> Dict[str, int]:
+        """BFS over the undirected adjacency; returns {entity_id: depth}."""
+        start = self.node_index.get(entity_id)
+        if start is None:
+            return {}
+
+        depth = {start: 0}
+        frontier = [start]
+        for d in range(1, hops + 1):
+            next_frontier = []
+            for node in frontier:
+                for nb in self.neighbors[self.offsets[node]:self.offsets[node + 1]].tolist():
+                    if nb not in depth:
+                        depth[nb] = d
+                        next_frontier.append(nb)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return {self.names[node]: d for node, d in depth.items()}
+
+    def subgraph_edges(self, entity_ids: List[str]) -> List[Dict[str, Any]]:
+        """Edges with both endpoints in entity_ids."""
+        nodes = [self.node_index[e] for e in entity_ids if e in self.node_index]
+        if not nodes:
+            return []
+        member = np.zeros(self.node_count, dtype=bool)
+        member[nodes] = True
+        candidates = np.unique(np.concatenate([self._incident(n) for n in nodes]))
+        inside = candidates[member[self.src[candidates]] & member[self.dst[candidates]]]
+        return [self.edge(int(e)) for e in inside]
+
+    def shortest_path(self, source_id: str, target_id: str) -> Dict[str, Any]:
+        """
+        Weighted shortest path using bidirectional Dijkstra.
+
+        Distances are 1 / (summed pair weight), so stronger connections are
+        shorter, matching RelationshipGraph.shortest_path.
+
+        Returns:
+            Dict with found, path, edges, total_weight, hop_count
+        """
+        source = self.node_index.get(source_id)
+        target = self.node_index.get(target_id)
+        if source is None or target is None:
+            return {
+                "found": False,
+                "path": [],
+                "edges": [],
+                "total_weight": 0,
+                "hop_count": 0,
+                "error": "One or both entities not found in graph",
+            }
+
+        nodes = self._bidirectional_dijkstra(source, target)
+        if nodes is None:
+            return {
+                "found": False,
+                "path": [],
+                "edges": [],
+                "total_weight": 0,
+                "hop_count": 0,
+            }
+
+        path = [self.names[n] for n in nodes]
+        edges = []
+        total_weight = 0.0
+        for u, v in zip(nodes, nodes[1:]):
+            path_edges = []
+            for a, b in ((u, v), (v, u)):
+                incident = self._incident(a)
+                for e in incident[(self.src[incident] == a) & (self.dst[incident] == b)].tolist():
+                    path_edges.append({
+                        "source": self.names[a],
+                        "target": self.names[b],
+                        "edge_type": self.edge_types[e],
+                        "weight": float(self.weight[e]),
+                        "tender_count": int(self.tender_count[e]),
+                        "total_value": float(self.total_value[e]),
+                    })
+            if path_edges:
+                strongest = max(path_edges, key=lambda e: e["weight"])
+                total_weight += strongest["weight"]
+                edges.append({
+                    "source": self.names[u],
+                    "target": self.names[v],
+                    "all_edges": path_edges,
+                    "strongest_edge_type": strongest["edge_type"],
+                    "strongest_weight": strongest["weight"],
+                })
+
+        return {
+            "found": True,
+            "path": path,
+            "edges": edges,
+            "total_weight": round(total_weight, 4),
+            "hop_count": len(path) - 1,
+        }
+
+    def _bidirectional_dijkstra(self, source: int, target: int) -> Optional[List[int]]:
+        if source == target:
+            return [source]
+
+        dist = ({source: 0.0}, {target: 0.0})
+        pred = ({source: None}, {target: None})
+        done = (set(), set())
+        heaps = ([(0.0, source)], [(0.0, target)])
+        best = float("inf")
+        meet = None
+
+        while heaps[0] and heaps[1]:
+            # A path through unsettled nodes can no longer beat best
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            d, node = heapq.heappop(heaps[side])
+            if node in done[side]:
+                continue
+            done[side].add(node)
+
+            start, end = self.offsets[node], self.offsets[node + 1]
+            for nb, w in zip(self.neighbors[start:end].tolist(), self.distances[start:end].tolist()):
+                nd = d + w
+                if nd < dist[side].get(nb, float("inf")):
+                    dist[side][nb] = nd
+                    pred[side][nb] = node
+                    heapq.heappush(heaps[side], (nd, nb))
+                other = dist[1 - side].get(nb)
+                if other is not None and nd + other < best:
+                    best = nd + other
+                    meet = nb
+
+        if meet is None:
+            return None
+
+        path = []
+        node = meet
+        while node is not None:
+            path.append(node)
+            node = pred[0][node]
+        path.reverse()
+        node = pred[1][meet]
+        while node is not None:
+            path.append(node)
+            node = pred[1][node]
+        return path
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "published_at": self.published_at.isoformat() if self.published_at else None,
+            "built_at": self.built_at.isoformat(),
+            "node_count": self.node_count,
+            "edge_count": self.edge_count,
+        }
+
+
+class RelationshipGraphService:
+    """
+    Holds the current GraphIndex for this process and keeps it in sync with
+    the latest published graph version.
+
+    Queries always run against a complete index; a refresh builds a new
+    index and swaps the reference, so in-flight requests keep the old one.
+    """
+
+    def __init__(self, check_interval: float = GRAPH_INDEX_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._index: Optional[GraphIndex] = None
+        self._lock = asyncio.Lock()
+        self._last_check = 0.0
+        # Edge columns and (source, target, edge_type) -> row position
+        self._columns: Dict[str, List[Any]] = {}
+        self._positions: Dict[Tuple[str, str, str], int] = {}
+
+    async def get_index(self, pool) -> GraphIndex:
+        """Return the resident index, loading or refreshing it if needed."""
+        if self._index is not None and time.monotonic() - self._last_check < self.check_interval:
+            return self._index
+
+        async with self._lock:
+            if self._index is None or time.monotonic() - self._last_check >= self.check_interval:
+                await self._sync(pool)
+        return self._index
+
+    async def refresh(self, pool) -> GraphIndex:
+        """Check for a new version now, regardless of the check interval."""
+        async with self._lock:
+            await self._sync(pool)
+        return self._index
+
+    def get_status(self) -> Dict[str, Any]:
+        if self._index is None:
+            return {"loaded": False}
+        return {"loaded": True, **self._index.get_stats()}
+
+    async def _sync(self, pool) -> None:
+        async with pool.acquire() as conn:
+            latest = await self._latest_version(conn)
+
+            if self._index is None:
+                rows = await conn.fetch(f"SELECT {_EDGE_COLUMNS} FROM unified_edges")
+                self._reset()
+                self._merge(rows)
+                logger.info(f"Graph index loaded: {len(rows)} edges (version={latest and latest['version_id']})")
+            elif latest is not None and latest["version_id"] != self._index.version:
+                since = self._index.published_at
+                if since is None or await self._edges_pruned_since(conn, self._index.version):
+                    # Deleted edges cannot be seen incrementally; reload everything
+                    rows = await conn.fetch(f"SELECT {_EDGE_COLUMNS} FROM unified_edges")
+                    self._reset()
+                else:
+                    rows = await conn.fetch(
+                        f"SELECT {_EDGE_COLUMNS} FROM unified_edges WHERE updated_at > $1",
+                        since,
+                    )
+                self._merge(rows)
+                logger.info(
+                    f"Graph index refreshed to version {latest['version_id']}: "
+                    f"{len(rows)} edges fetched"
+                )
+            else:
+                self._last_check = time.monotonic()
+                return
+
+        self._index = GraphIndex(
+            self._columns,
+            version=latest["version_id"] if latest else None,
+            published_at=latest["published_at"] if latest else None,
+        )
+        self._last_check = time.monotonic()
+
+    async def _latest_version(self, conn) -> Optional[Dict[str, Any]]:
+        try:
+            row = await conn.fetchrow("""
+                SELECT version_id, published_at
+                FROM unified_graph_versions
+                ORDER BY version_id DESC
+                LIMIT 1
+            """)
+        except asyncpg.exceptions.UndefinedTableError:
+            logger.warning("unified_graph_versions missing; graph index will not auto-refresh")
+            return None
+        return dict(row) if row else None
+
+    async def _edges_pruned_since(self, conn, version: Optional[int]) -> bool:
+        if version is None:
+            return True
+        return bool(await conn.fetchval("""
+            SELECT COALESCE(bool_or(COALESCE((stats->>'edges_deleted')::int, 0) > 0), FALSE)
+            FROM unified_graph_versions
+            WHERE version_id > $1
+        """, version))
+
+    def _reset(self) -> None:
+        self._columns = {k: [] for k in _COLUMNS}
+        self._positions = {}
+
+    def _merge(self, rows) -> None:
+        # Columns are rebuilt as new lists so the published index stays immutable
+        columns = {k: list(v) for k, v in self._columns.items()}
+        for row in rows:
+            key = (row["source_id"], row["target_id"], row["edge_type"])
+            values = {
+                "source_id": row["source_id"],
+                "source_type": row["source_type"] or "company",
+                "target_id": row["target_id"],
+                "target_type": row["target_type"] or "company",
+                "edge_type": row["edge_type"],
+                "weight": float(row["weight"] if row["weight"] is not None else 1.0),
+                "tender_count": row["tender_count"] or 0,
+                "total_value": float(row["total_value"] or 0),
+                "metadata": row["metadata"],
+            }
+            pos = self._positions.get(key)
+            if pos is None:
+                self._positions[key] = len(columns["source_id"])
+                for name, value in values.items():
+                    columns[name].append(value)
+            else:
+                for name, value in values.items():
+                    columns[name][pos] = value
+        self._columns = columns
+
+
+_service: Optional[RelationshipGraphService] = None
+
+
+def get_graph_service() -> RelationshipGraphService:
+    """Process-wide RelationshipGraphService."""
+    global _service
+    if _service is None:
+        _service = RelationshipGraphService()
+    return _service
+
+
+async def publish_graph_version(conn, stats: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Record that unified_edges has a new consistent version.
+
+    Called by batch_graph_build after its edge writes are committed; resident
+    indexes pick the version up on their next check.
+
+    Returns:
+        The new version_id
+    """
+    stats = stats or {}
+    return await conn.fetchval(
+        """
+        INSERT INTO unified_graph_versions (edge_count, node_count, stats)
+        VALUES ($1, $2, $3::jsonb)
+        RETURNING version_id
+        """,
+        stats.get("edge_count"),
+        stats.get("node_count"),
+        json.dumps(stats, default=str),
+    )
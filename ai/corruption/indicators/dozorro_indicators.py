@@ -84,6 +84,7 @@ class Indicator(ABC):
         self.category: str = "Unknown"
         self.weight: float = 1.0  # Default weight, can be learned
         self.base_threshold: float = 50.0  # Default threshold
+        self.batch_concurrency: int = 4  # Concurrent per-tender calls in calculate_batch
 
     @abstractmethod
     async def calculate(self, tender_id: str, context: Optional[Dict] = None) -> IndicatorResult:
@@ -99,20 +100,65 @@ class Indicator(ABC):
         """
         pass
 
-    async def calculate_batch(self, tender_ids: List[str]) -> List[IndicatorResult]:
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
         """
         Calculate indicator for multiple tenders efficiently.
 
-        Default implementation runs serially; override for batch optimization.
+        Default implementation evaluates tenders concurrently (bounded by
+        ``batch_concurrency``), handing each call its slice of the shared
+        batch context. Override with a set-based query for indicators that
+        aggregate over other tenders.
+
+        Args:
+            tender_ids: Tenders to analyze
+            context: Optional per-tender context keyed by tender_id
+                (see ``IndicatorRegistry.load_batch_context``)
+
+        Returns:
+            Mapping of tender_id to IndicatorResult (failed tenders omitted)
         """
-        results = []
-        for tender_id in tender_ids:
-            try:
-                result = await self.calculate(tender_id)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error calculating {self.name} for {tender_id}: {e}")
-        return results
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def _calculate_one(tender_id: str) -> Tuple[str, Optional[IndicatorResult]]:
+            async with semaphore:
+                try:
+                    tender_context = context.get(tender_id) if context else None
+                    return tender_id, await self.calculate(tender_id, tender_context)
+                except Exception as e:
+                    logger.error(f"Error calculating {self.name} for {tender_id}: {e}")
+                    return tender_id, None
+
+        pairs = await asyncio.gather(*(_calculate_one(tid) for tid in tender_ids))
+        return {tender_id: result for tender_id, result in pairs if result is not None}
+
+    async def _batch_entities(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, str]:
+        """
+        Procuring entity of each tender in a batch (tenders without one omitted).
+
+        Read from the shared batch context when it covers the batch, otherwise
+        fetched in one query.
+        """
+        if context is not None and all(tender_id in context for tender_id in tender_ids):
+            tenders = [context[tender_id].get('tender') for tender_id in tender_ids]
+        else:
+            tenders = await self.pool.fetch("""
+                SELECT tender_id, procuring_entity
+                FROM tenders
+                WHERE tender_id = ANY($1::text[])
+            """, tender_ids)
+        return {
+            tender['tender_id']: tender['procuring_entity']
+            for tender in tenders
+            if tender and tender['procuring_entity'] is not None
+        }
 
     async def get_adaptive_threshold(self, market_segment: str = "default") -> float:
         """
@@ -146,6 +192,28 @@ class Indicator(ABC):
         )
 
 
+def _positive_bids(bids: List[Dict]) -> List[Dict]:
+    """Bids with a positive amount, ordered by amount (mirrors `bid_amount_mkd > 0` queries)."""
+    return sorted(
+        (b for b in bids if b['bid_amount_mkd'] is not None and b['bid_amount_mkd'] > 0),
+        key=lambda b: b['bid_amount_mkd']
+    )
+
+
+def _bid_array(bids: List[Dict]) -> Optional[Dict]:
+    """Context equivalent of `array_agg(bid_amount_mkd) ... HAVING COUNT(*) >= 3`."""
+    amounts = [b['bid_amount_mkd'] for b in _positive_bids(bids)]
+    return {'bids': amounts} if len(amounts) >= 3 else None
+
+
+def _group_rows(rows, key: str = 'tender_id') -> Dict[Any, List]:
+    """Rows of a batch query grouped by key, keeping the query's row order."""
+    grouped: Dict[Any, List] = {}
+    for row in rows:
+        grouped.setdefault(row[key], []).append(row)
+    return grouped
+
+
 # ============================================================================
 # COMPETITION INDICATORS (10)
 # ============================================================================
@@ -188,6 +256,41 @@ class SingleBidderIndicator(Indicator):
         """
 
         row = await self.pool.fetchrow(query, tender_id)
+        return self._evaluate(row)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Previous wins via one hash join instead of a correlated subquery per tender
+        query = """
+            SELECT
+                t.tender_id,
+                t.num_bidders,
+                t.estimated_value_mkd,
+                t.actual_value_mkd,
+                t.winner,
+                t.procuring_entity,
+                t.procedure_type,
+                COUNT(t2.tender_id) as previous_wins
+            FROM tenders t
+            LEFT JOIN tenders t2
+              ON t.num_bidders = 1
+             AND t2.procuring_entity = t.procuring_entity
+             AND t2.winner = t.winner
+             AND t2.publication_date < t.publication_date
+             AND t2.publication_date >= t.publication_date - INTERVAL '12 months'
+             AND t2.status IN ('awarded', 'completed')
+            WHERE t.tender_id = ANY($1::text[])
+            GROUP BY t.tender_id
+        """
+
+        rows = await self.pool.fetch(query, tender_ids)
+        by_tender = {row['tender_id']: row for row in rows}
+        return {tender_id: self._evaluate(by_tender.get(tender_id)) for tender_id in tender_ids}
+
+    def _evaluate(self, row) -> IndicatorResult:
         if not row or row['num_bidders'] != 1:
             return self._create_result(0, {}, "Multiple bidders present")
 
@@ -270,6 +373,49 @@ class LowParticipationIndicator(Indicator):
         """
 
         row = await self.pool.fetchrow(query, tender_id)
+        return self._evaluate(row)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Category statistics computed once per distinct CPV code in the batch
+        query = """
+            WITH tender_data AS (
+                SELECT tender_id, num_bidders, estimated_value_mkd, cpv_code
+                FROM tenders
+                WHERE tender_id = ANY($1::text[])
+            ),
+            category_stats AS (
+                SELECT
+                    t.cpv_code,
+                    AVG(t.num_bidders) as avg_bidders,
+                    STDDEV(t.num_bidders) as stddev_bidders,
+                    COUNT(*) as sample_size
+                FROM tenders t
+                WHERE t.cpv_code IN (SELECT DISTINCT cpv_code FROM tender_data)
+                  AND t.status IN ('awarded', 'completed')
+                  AND t.num_bidders > 0
+                  AND t.publication_date >= CURRENT_DATE - INTERVAL '12 months'
+                GROUP BY t.cpv_code
+            )
+            SELECT
+                td.tender_id,
+                td.num_bidders,
+                td.estimated_value_mkd,
+                cs.avg_bidders,
+                cs.stddev_bidders,
+                cs.sample_size
+            FROM tender_data td
+            JOIN category_stats cs ON cs.cpv_code = td.cpv_code
+        """
+
+        rows = await self.pool.fetch(query, tender_ids)
+        by_tender = {row['tender_id']: row for row in rows}
+        return {tender_id: self._evaluate(by_tender.get(tender_id)) for tender_id in tender_ids}
+
+    def _evaluate(self, row) -> IndicatorResult:
         if not row or not row['avg_bidders']:
             return self._create_result(0, {}, "Insufficient market data")
 
@@ -323,15 +469,14 @@ class SameBidderSetIndicator(Indicator):
 
     async def calculate(self, tender_id: str, context: Optional[Dict] = None) -> IndicatorResult:
         query = """
-            WITH tender_bidders AS (
+            WITH own_bidders AS (
                 SELECT company_name
                 FROM tender_bidders
                 WHERE tender_id = $1
-                ORDER BY company_name
             ),
             bidder_set AS (
                 SELECT array_agg(company_name ORDER BY company_name) as companies
-                FROM tender_bidders
+                FROM own_bidders
             ),
             matching_sets AS (
                 SELECT
@@ -353,7 +498,7 @@ class SameBidderSetIndicator(Indicator):
             SELECT
                 bs.companies,
                 COUNT(*) as match_count,
-                array_agg(ms.tender_id ORDER BY ms.publication_date DESC) as matching_tenders,
+                array_agg(ms.tender_id ORDER BY ms.publication_date DESC, ms.tender_id) as matching_tenders,
                 array_agg(ms.procuring_entity) as entities
             FROM bidder_set bs
             CROSS JOIN matching_sets ms
@@ -361,6 +506,50 @@ class SameBidderSetIndicator(Indicator):
         """
 
         row = await self.pool.fetchrow(query, tender_id)
+        return self._evaluate(row)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Recent bidder sets aggregated once and matched to the batch by equality
+        query = """
+            WITH batch_sets AS (
+                SELECT tender_id, array_agg(company_name ORDER BY company_name) as companies
+                FROM tender_bidders
+                WHERE tender_id = ANY($1::text[])
+                GROUP BY tender_id
+            ),
+            recent_sets AS (
+                SELECT
+                    t.tender_id,
+                    t.publication_date,
+                    t.procuring_entity,
+                    array_agg(tb.company_name ORDER BY tb.company_name) as companies
+                FROM tenders t
+                JOIN tender_bidders tb ON tb.tender_id = t.tender_id
+                WHERE t.publication_date >= CURRENT_DATE - INTERVAL '24 months'
+                GROUP BY t.tender_id, t.publication_date, t.procuring_entity
+            )
+            SELECT
+                bs.tender_id,
+                bs.companies,
+                COUNT(*) as match_count,
+                array_agg(rs.tender_id ORDER BY rs.publication_date DESC, rs.tender_id) as matching_tenders,
+                array_agg(rs.procuring_entity) as entities
+            FROM batch_sets bs
+            JOIN recent_sets rs
+              ON rs.companies = bs.companies
+             AND rs.tender_id != bs.tender_id
+            GROUP BY bs.tender_id, bs.companies
+        """
+
+        rows = await self.pool.fetch(query, tender_ids)
+        by_tender = {row['tender_id']: row for row in rows}
+        return {tender_id: self._evaluate(by_tender.get(tender_id)) for tender_id in tender_ids}
+
+    def _evaluate(self, row) -> IndicatorResult:
         if not row or not row['match_count']:
             return self._create_result(0, {}, "No repeated bidder sets found")
 
@@ -383,7 +572,7 @@ class SameBidderSetIndicator(Indicator):
             'match_count': match_count,
             'companies': companies,
             'matching_tenders': row['matching_tenders'][:5],  # First 5
-            'entities_involved': list(set(row['entities']))
+            'entities_involved': sorted(set(row['entities']), key=str)
         }
 
         description = f"Истиот сет од {len(companies)} компании се јавува заедно {match_count} пати"
@@ -431,9 +620,50 @@ class BidderDiversityIndicator(Indicator):
                 total_bids,
                 bid_count::float / total_bids as probability
             FROM bidder_counts
+            ORDER BY company_name
         """
 
         rows = await self.pool.fetch(query, tender_id)
+        return self._evaluate(rows)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Bidder distribution computed once per procuring entity in the batch
+        query = """
+            WITH bidder_counts AS (
+                SELECT
+                    t.procuring_entity,
+                    tb.company_name,
+                    COUNT(*) as bid_count,
+                    SUM(COUNT(*)) OVER (PARTITION BY t.procuring_entity) as total_bids
+                FROM tender_bidders tb
+                JOIN tenders t ON tb.tender_id = t.tender_id
+                WHERE t.procuring_entity = ANY($1::text[])
+                  AND t.publication_date >= CURRENT_DATE - INTERVAL '12 months'
+                GROUP BY t.procuring_entity, tb.company_name
+            )
+            SELECT
+                procuring_entity,
+                company_name,
+                bid_count,
+                total_bids,
+                bid_count::float / total_bids as probability
+            FROM bidder_counts
+            ORDER BY procuring_entity, company_name
+        """
+
+        entities = await self._batch_entities(tender_ids, context)
+        rows = await self.pool.fetch(query, sorted(set(entities.values()))) if entities else []
+        by_entity = _group_rows(rows, 'procuring_entity')
+        return {
+            tender_id: self._evaluate(by_entity.get(entities.get(tender_id), []))
+            for tender_id in tender_ids
+        }
+
+    def _evaluate(self, rows) -> IndicatorResult:
         if not rows or len(rows) < 2:
             return self._create_result(0, {}, "Insufficient data for diversity analysis")
 
@@ -526,6 +756,53 @@ class NewBidderRateIndicator(Indicator):
         """
 
         row = await self.pool.fetchrow(query, tender_id)
+        return self._evaluate(row)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # One pass over each entity's bidders per distinct (entity, publication date)
+        query = """
+            WITH batch AS (
+                SELECT tender_id, procuring_entity, publication_date
+                FROM tenders
+                WHERE tender_id = ANY($1::text[])
+            ),
+            key_stats AS (
+                SELECT
+                    k.procuring_entity,
+                    k.publication_date,
+                    COUNT(*) FILTER (WHERE c.recent) as recent_count,
+                    COUNT(*) FILTER (WHERE c.historical) as historical_count,
+                    COUNT(*) FILTER (WHERE c.recent AND NOT c.historical) as new_entrant_count
+                FROM (SELECT DISTINCT procuring_entity, publication_date FROM batch) k
+                CROSS JOIN LATERAL (
+                    SELECT
+                        tb.company_name,
+                        bool_or(t.publication_date >= k.publication_date - INTERVAL '12 months') as recent,
+                        bool_or(t.publication_date < k.publication_date - INTERVAL '12 months') as historical
+                    FROM tender_bidders tb
+                    JOIN tenders t ON tb.tender_id = t.tender_id
+                    WHERE t.procuring_entity = k.procuring_entity
+                      AND t.publication_date < k.publication_date
+                    GROUP BY tb.company_name
+                ) c
+                GROUP BY k.procuring_entity, k.publication_date
+            )
+            SELECT b.tender_id, ks.recent_count, ks.historical_count, ks.new_entrant_count
+            FROM batch b
+            JOIN key_stats ks
+              ON ks.procuring_entity = b.procuring_entity
+             AND ks.publication_date = b.publication_date
+        """
+
+        rows = await self.pool.fetch(query, tender_ids)
+        by_tender = {row['tender_id']: row for row in rows}
+        return {tender_id: self._evaluate(by_tender.get(tender_id)) for tender_id in tender_ids}
+
+    def _evaluate(self, row) -> IndicatorResult:
         if not row or not row['recent_count']:
             return self._create_result(0, {}, "Insufficient bidder history")
 
@@ -602,10 +879,53 @@ class MarketConcentrationIndicator(Indicator):
                 market_share_pct,
                 POWER(market_share_pct, 2) as market_share_squared
             FROM market_shares
-            ORDER BY market_share_pct DESC
+            ORDER BY market_share_pct DESC, company
         """
 
         rows = await self.pool.fetch(query, tender_id)
+        return self._evaluate(rows)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Market shares computed once per procuring entity in the batch
+        query = """
+            WITH market_shares AS (
+                SELECT
+                    t.procuring_entity,
+                    t.winner as company,
+                    COUNT(*) as wins,
+                    SUM(t.actual_value_mkd) as total_value,
+                    COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY t.procuring_entity) as market_share_pct
+                FROM tenders t
+                WHERE t.procuring_entity = ANY($1::text[])
+                  AND t.status IN ('awarded', 'completed')
+                  AND t.winner IS NOT NULL
+                  AND t.publication_date >= CURRENT_DATE - INTERVAL '24 months'
+                GROUP BY t.procuring_entity, t.winner
+            )
+            SELECT
+                procuring_entity,
+                company,
+                wins,
+                total_value,
+                market_share_pct,
+                POWER(market_share_pct, 2) as market_share_squared
+            FROM market_shares
+            ORDER BY procuring_entity, market_share_pct DESC, company
+        """
+
+        entities = await self._batch_entities(tender_ids, context)
+        rows = await self.pool.fetch(query, sorted(set(entities.values()))) if entities else []
+        by_entity = _group_rows(rows, 'procuring_entity')
+        return {
+            tender_id: self._evaluate(by_entity.get(entities.get(tender_id), []))
+            for tender_id in tender_ids
+        }
+
+    def _evaluate(self, rows) -> IndicatorResult:
         if not rows or len(rows) < 2:
             return self._create_result(0, {}, "Insufficient market data")
 
@@ -697,6 +1017,54 @@ class BidderTurnoverIndicator(Indicator):
         """
 
         row = await self.pool.fetchrow(query, tender_id)
+        return self._evaluate(row)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # One pass over each entity's bidders per distinct (entity, publication date)
+        query = """
+            WITH batch AS (
+                SELECT tender_id, procuring_entity, publication_date
+                FROM tenders
+                WHERE tender_id = ANY($1::text[])
+            ),
+            key_stats AS (
+                SELECT
+                    k.procuring_entity,
+                    k.publication_date,
+                    COUNT(*) FILTER (WHERE c.period1) as period1_count,
+                    COUNT(*) FILTER (WHERE c.period2) as period2_count,
+                    COUNT(*) FILTER (WHERE c.period1 AND c.period2) as retained_count
+                FROM (SELECT DISTINCT procuring_entity, publication_date FROM batch) k
+                CROSS JOIN LATERAL (
+                    SELECT
+                        tb.company_name,
+                        bool_or(t.publication_date < k.publication_date - INTERVAL '6 months') as period1,
+                        bool_or(t.publication_date >= k.publication_date - INTERVAL '6 months') as period2
+                    FROM tender_bidders tb
+                    JOIN tenders t ON tb.tender_id = t.tender_id
+                    WHERE t.procuring_entity = k.procuring_entity
+                      AND t.publication_date >= k.publication_date - INTERVAL '12 months'
+                      AND t.publication_date < k.publication_date
+                    GROUP BY tb.company_name
+                ) c
+                GROUP BY k.procuring_entity, k.publication_date
+            )
+            SELECT b.tender_id, ks.period1_count, ks.period2_count, ks.retained_count
+            FROM batch b
+            JOIN key_stats ks
+              ON ks.procuring_entity = b.procuring_entity
+             AND ks.publication_date = b.publication_date
+        """
+
+        rows = await self.pool.fetch(query, tender_ids)
+        by_tender = {row['tender_id']: row for row in rows}
+        return {tender_id: self._evaluate(by_tender.get(tender_id)) for tender_id in tender_ids}
+
+    def _evaluate(self, row) -> IndicatorResult:
         if not row or not row['period1_count']:
             return self._create_result(0, {}, "Insufficient history for turnover analysis")
 
@@ -749,19 +1117,40 @@ class GeographicConcentrationIndicator(Indicator):
         query = """
             SELECT
                 tb.company_name,
-                tb.company_city,
-                COUNT(*) OVER (PARTITION BY tb.company_city) as city_count,
-                COUNT(*) OVER () as total_bidders
+                tb.company_city
             FROM tender_bidders tb
             WHERE tb.tender_id = $1
               AND tb.company_city IS NOT NULL
+            ORDER BY tb.company_city, tb.company_name
         """
 
         rows = await self.pool.fetch(query, tender_id)
+        return self._evaluate(rows)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        query = """
+            SELECT
+                tb.tender_id,
+                tb.company_name,
+                tb.company_city
+            FROM tender_bidders tb
+            WHERE tb.tender_id = ANY($1::text[])
+              AND tb.company_city IS NOT NULL
+            ORDER BY tb.tender_id, tb.company_city, tb.company_name
+        """
+
+        by_tender = _group_rows(await self.pool.fetch(query, tender_ids))
+        return {tender_id: self._evaluate(by_tender.get(tender_id, [])) for tender_id in tender_ids}
+
+    def _evaluate(self, rows) -> IndicatorResult:
         if not rows or len(rows) < 2:
             return self._create_result(0, {}, "Insufficient geographic data")
 
-        total_bidders = rows[0]['total_bidders']
+        total_bidders = len(rows)
         cities = {}
 
         for row in rows:
@@ -843,6 +1232,38 @@ class BidderExperienceIndicator(Indicator):
         """
 
         rows = await self.pool.fetch(query, tender_id)
+        return self._evaluate(rows)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Prior bidding history of every (tender, bidder) pair in one grouped join
+        query = """
+            WITH batch_bidders AS (
+                SELECT DISTINCT tb.tender_id, tb.company_name, t.publication_date
+                FROM tender_bidders tb
+                JOIN tenders t ON t.tender_id = tb.tender_id
+                WHERE tb.tender_id = ANY($1::text[])
+            )
+            SELECT
+                bb.tender_id,
+                bb.company_name,
+                COUNT(DISTINCT t.tender_id) as total_bids,
+                COUNT(DISTINCT CASE WHEN tb.is_winner THEN t.tender_id END) as wins,
+                MIN(t.publication_date) as first_bid_date
+            FROM batch_bidders bb
+            JOIN tender_bidders tb ON tb.company_name = bb.company_name
+            JOIN tenders t ON tb.tender_id = t.tender_id
+            WHERE t.publication_date < bb.publication_date
+            GROUP BY bb.tender_id, bb.company_name
+        """
+
+        by_tender = _group_rows(await self.pool.fetch(query, tender_ids))
+        return {tender_id: self._evaluate(by_tender.get(tender_id, [])) for tender_id in tender_ids}
+
+    def _evaluate(self, rows) -> IndicatorResult:
         if not rows:
             return self._create_result(75, {'inexperienced_count': 'all'}, "Сите понудувачи се нови (нема историја)")
 
@@ -911,7 +1332,6 @@ class CompetitionTrendIndicator(Indicator):
                   AND t.publication_date >= CURRENT_DATE - INTERVAL '12 months'
                 GROUP BY DATE_TRUNC('month', t.publication_date)
                 HAVING COUNT(*) >= 3  -- At least 3 tenders per month
-                ORDER BY month
             )
             SELECT
                 month,
@@ -919,9 +1339,51 @@ class CompetitionTrendIndicator(Indicator):
                 tender_count,
                 ROW_NUMBER() OVER (ORDER BY month) as month_number
             FROM monthly_competition
+            ORDER BY month
         """
 
         rows = await self.pool.fetch(query, tender_id)
+        return self._evaluate(rows)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Monthly series computed once per procuring entity in the batch
+        query = """
+            WITH monthly_competition AS (
+                SELECT
+                    t.procuring_entity,
+                    DATE_TRUNC('month', t.publication_date) as month,
+                    AVG(t.num_bidders) as avg_bidders,
+                    COUNT(*) as tender_count
+                FROM tenders t
+                WHERE t.procuring_entity = ANY($1::text[])
+                  AND t.status IN ('awarded', 'completed', 'active')
+                  AND t.publication_date >= CURRENT_DATE - INTERVAL '12 months'
+                GROUP BY t.procuring_entity, DATE_TRUNC('month', t.publication_date)
+                HAVING COUNT(*) >= 3  -- At least 3 tenders per month
+            )
+            SELECT
+                procuring_entity,
+                month,
+                avg_bidders,
+                tender_count,
+                ROW_NUMBER() OVER (PARTITION BY procuring_entity ORDER BY month) as month_number
+            FROM monthly_competition
+            ORDER BY procuring_entity, month
+        """
+
+        entities = await self._batch_entities(tender_ids, context)
+        rows = await self.pool.fetch(query, sorted(set(entities.values()))) if entities else []
+        by_entity = _group_rows(rows, 'procuring_entity')
+        return {
+            tender_id: self._evaluate(by_entity.get(entities.get(tender_id), []))
+            for tender_id in tender_ids
+        }
+
+    def _evaluate(self, rows) -> IndicatorResult:
         if not rows or len(rows) < 3:
             return self._create_result(0, {}, "Insufficient data for trend analysis")
 
@@ -995,7 +1457,12 @@ class PriceDeviationIndicator(Indicator):
               AND t.actual_value_mkd > 0
         """
 
-        row = await self.pool.fetchrow(query, tender_id)
+        if context is not None and 'tender' in context:
+            row = context['tender']
+            if row and not ((row['estimated_value_mkd'] or 0) > 0 and (row['actual_value_mkd'] or 0) > 0):
+                row = None
+        else:
+            row = await self.pool.fetchrow(query, tender_id)
         if not row:
             return self._create_result(0, {}, "Missing price data")
 
@@ -1064,7 +1531,10 @@ class BidClusteringIndicator(Indicator):
             ORDER BY tb.bid_amount_mkd
         """
 
-        rows = await self.pool.fetch(query, tender_id)
+        if context is not None and 'bids' in context:
+            rows = _positive_bids(context['bids'])
+        else:
+            rows = await self.pool.fetch(query, tender_id)
         if not rows or len(rows) < 3:
             return self._create_result(0, {}, "Insufficient bids for clustering analysis")
 
@@ -1137,7 +1607,10 @@ class CoverBiddingIndicator(Indicator):
             ORDER BY tb.bid_amount_mkd
         """
 
-        rows = await self.pool.fetch(query, tender_id)
+        if context is not None and 'bids' in context:
+            rows = _positive_bids(context['bids'])
+        else:
+            rows = await self.pool.fetch(query, tender_id)
         if not rows or len(rows) < 2:
             return self._create_result(0, {}, "Insufficient bids for cover bid analysis")
 
@@ -1211,7 +1684,10 @@ class RoundNumberIndicator(Indicator):
               AND tb.bid_amount_mkd > 0
         """
 
-        rows = await self.pool.fetch(query, tender_id)
+        if context is not None and 'bids' in context:
+            rows = _positive_bids(context['bids'])
+        else:
+            rows = await self.pool.fetch(query, tender_id)
         if not rows or len(rows) < 2:
             return self._create_result(0, {}, "Insufficient bids for round number analysis")
 
@@ -1283,7 +1759,21 @@ class PriceFixingIndicator(Indicator):
             ORDER BY COUNT(*) DESC
         """
 
-        rows = await self.pool.fetch(query, tender_id)
+        if context is not None and 'bids' in context:
+            groups: Dict[Any, List[str]] = {}
+            for bid in _positive_bids(context['bids']):
+                groups.setdefault(bid['bid_amount_mkd'], []).append(bid['company_name'])
+            rows = sorted(
+                (
+                    {'bid_amount_mkd': amount, 'companies': companies, 'count': len(companies)}
+                    for amount, companies in groups.items()
+                    if len(companies) > 1
+                ),
+                key=lambda group: group['count'],
+                reverse=True
+            )
+        else:
+            rows = await self.pool.fetch(query, tender_id)
         if not rows:
             return self._create_result(0, {}, "No identical bids found")
 
@@ -1368,6 +1858,45 @@ class BelowMarketPricingIndicator(Indicator):
         """
 
         row = await self.pool.fetchrow(query, tender_id)
+        return self._evaluate(row)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Market statistics exclude the tender itself, so they stay per tender,
+        # but in a single LATERAL query instead of one round trip each
+        query = """
+            SELECT
+                td.tender_id,
+                td.actual_value_mkd,
+                td.estimated_value_mkd,
+                mp.market_avg,
+                mp.market_stddev,
+                mp.sample_size
+            FROM tenders td
+            CROSS JOIN LATERAL (
+                SELECT
+                    AVG(t.actual_value_mkd) as market_avg,
+                    STDDEV(t.actual_value_mkd) as market_stddev,
+                    COUNT(*) as sample_size
+                FROM tenders t
+                WHERE t.cpv_code = td.cpv_code
+                  AND t.status IN ('awarded', 'completed')
+                  AND t.actual_value_mkd > 0
+                  AND t.publication_date >= CURRENT_DATE - INTERVAL '12 months'
+                  AND t.tender_id != td.tender_id
+            ) mp
+            WHERE td.tender_id = ANY($1::text[])
+              AND td.actual_value_mkd > 0
+        """
+
+        rows = await self.pool.fetch(query, tender_ids)
+        by_tender = {row['tender_id']: row for row in rows}
+        return {tender_id: self._evaluate(by_tender.get(tender_id)) for tender_id in tender_ids}
+
+    def _evaluate(self, row) -> IndicatorResult:
         if not row or not row['market_avg'] or row['sample_size'] < 5:
             return self._create_result(0, {}, "Insufficient market data")
 
@@ -1435,7 +1964,10 @@ class PriceVarianceIndicator(Indicator):
             HAVING COUNT(*) >= 3
         """
 
-        row = await self.pool.fetchrow(query, tender_id)
+        if context is not None and 'bids' in context:
+            row = _bid_array(context['bids'])
+        else:
+            row = await self.pool.fetchrow(query, tender_id)
         if not row or not row['bids']:
             return self._create_result(0, {}, "Insufficient bids for variance analysis")
 
@@ -1524,7 +2056,18 @@ class WinnerZScoreIndicator(Indicator):
             CROSS JOIN bid_stats bs
         """
 
-        row = await self.pool.fetchrow(query, tender_id)
+        if context is not None and 'bids' in context:
+            row = None
+            amounts = [float(b['bid_amount_mkd']) for b in _positive_bids(context['bids'])]
+            winners = [b for b in context['bids'] if b['is_winner'] and b['bid_amount_mkd'] is not None]
+            if len(amounts) >= 3 and winners:
+                row = {
+                    'winner_bid': winners[0]['bid_amount_mkd'],
+                    'mean_bid': statistics.mean(amounts),
+                    'stddev_bid': statistics.stdev(amounts),
+                }
+        else:
+            row = await self.pool.fetchrow(query, tender_id)
         if not row or not row['stddev_bid']:
             return self._create_result(0, {}, "Insufficient data for Z-score")
 
@@ -1591,7 +2134,17 @@ class EstimateMatchIndicator(Indicator):
               AND ABS(tb.bid_amount_mkd - t.estimated_value_mkd) / t.estimated_value_mkd < 0.01
         """
 
-        rows = await self.pool.fetch(query, tender_id)
+        if context is not None and 'bids' in context:
+            rows = []
+            tender = context.get('tender')
+            estimated = tender['estimated_value_mkd'] if tender else None
+            if estimated and estimated > 0:
+                for bid in _positive_bids(context['bids']):
+                    deviation = abs(bid['bid_amount_mkd'] - estimated) / estimated
+                    if deviation < 0.01:
+                        rows.append({**bid, 'estimated_value_mkd': estimated, 'deviation': deviation})
+        else:
+            rows = await self.pool.fetch(query, tender_id)
         if not rows:
             return self._create_result(0, {}, "No bids matching estimate")
 
@@ -1648,7 +2201,10 @@ class PriceSequenceIndicator(Indicator):
             HAVING COUNT(*) >= 3
         """
 
-        row = await self.pool.fetchrow(query, tender_id)
+        if context is not None and 'bids' in context:
+            row = _bid_array(context['bids'])
+        else:
+            row = await self.pool.fetchrow(query, tender_id)
         if not row or not row['bids'] or len(row['bids']) < 3:
             return self._create_result(0, {}, "Insufficient bids for sequence analysis")
 
@@ -1722,7 +2278,14 @@ class ShortDeadlineIndicator(Indicator):
               AND t.closing_date IS NOT NULL
         """
 
-        row = await self.pool.fetchrow(query, tender_id)
+        if context is not None and 'tender' in context:
+            row = context['tender']
+            if row and row['publication_date'] and row['closing_date']:
+                row = {**row, 'days_open': row['closing_date'] - row['publication_date']}
+            else:
+                row = None
+        else:
+            row = await self.pool.fetchrow(query, tender_id)
         if not row:
             return self._create_result(0, {}, "Missing deadline data")
 
@@ -1792,7 +2355,15 @@ class WeekendPublicationIndicator(Indicator):
               AND t.publication_date IS NOT NULL
         """
 
-        row = await self.pool.fetchrow(query, tender_id)
+        if context is not None and 'tender' in context:
+            row = context['tender']
+            if row and row['publication_date']:
+                # isoweekday() % 7 matches PostgreSQL DOW (0=Sunday)
+                row = {**row, 'day_of_week': row['publication_date'].isoweekday() % 7}
+            else:
+                row = None
+        else:
+            row = await self.pool.fetchrow(query, tender_id)
         if not row:
             return self._create_result(0, {}, "Missing publication date")
 
@@ -1860,7 +2431,12 @@ class ElectionCycleIndicator(Indicator):
               AND t.publication_date IS NOT NULL
         """
 
-        row = await self.pool.fetchrow(query, tender_id)
+        if context is not None and 'tender' in context:
+            row = context['tender']
+            if row and not row['publication_date']:
+                row = None
+        else:
+            row = await self.pool.fetchrow(query, tender_id)
         if not row:
             return self._create_result(0, {}, "Missing publication date")
 
@@ -1952,6 +2528,67 @@ class SeasonalPatternIndicator(Indicator):
         """
 
         row = await self.pool.fetchrow(query, tender_id)
+        return self._evaluate(row)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Monthly distribution computed once per (entity, year) in the batch
+        query = """
+            WITH batch AS (
+                SELECT
+                    tender_id,
+                    procuring_entity,
+                    EXTRACT(YEAR FROM publication_date) as pub_year,
+                    EXTRACT(MONTH FROM publication_date) as pub_month
+                FROM tenders
+                WHERE tender_id = ANY($1::text[])
+            ),
+            monthly_distribution AS (
+                SELECT
+                    t.procuring_entity,
+                    EXTRACT(YEAR FROM t.publication_date) as year,
+                    EXTRACT(MONTH FROM t.publication_date) as month,
+                    COUNT(*) as tender_count
+                FROM tenders t
+                WHERE (t.procuring_entity, EXTRACT(YEAR FROM t.publication_date)) IN (
+                    SELECT DISTINCT procuring_entity, pub_year FROM batch
+                )
+                GROUP BY t.procuring_entity, EXTRACT(YEAR FROM t.publication_date),
+                         EXTRACT(MONTH FROM t.publication_date)
+            ),
+            stats AS (
+                SELECT
+                    procuring_entity,
+                    year,
+                    AVG(tender_count) as avg_monthly,
+                    STDDEV(tender_count) as stddev_monthly
+                FROM monthly_distribution
+                GROUP BY procuring_entity, year
+            )
+            SELECT
+                b.tender_id,
+                b.pub_month,
+                md.tender_count,
+                s.avg_monthly,
+                s.stddev_monthly
+            FROM batch b
+            JOIN stats s
+              ON s.procuring_entity = b.procuring_entity
+             AND s.year = b.pub_year
+            LEFT JOIN monthly_distribution md
+              ON md.procuring_entity = b.procuring_entity
+             AND md.year = b.pub_year
+             AND md.month = b.pub_month
+        """
+
+        rows = await self.pool.fetch(query, tender_ids)
+        by_tender = {row['tender_id']: row for row in rows}
+        return {tender_id: self._evaluate(by_tender.get(tender_id)) for tender_id in tender_ids}
+
+    def _evaluate(self, row) -> IndicatorResult:
         if not row or not row['stddev_monthly']:
             return self._create_result(0, {}, "Insufficient seasonal data")
 
@@ -2022,6 +2659,33 @@ class AmendmentTimingIndicator(Indicator):
         """
 
         rows = await self.pool.fetch(query, tender_id)
+        return self._evaluate(rows)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        query = """
+            SELECT
+                t.tender_id,
+                t.publication_date,
+                t.closing_date,
+                ta.amendment_date,
+                ta.amendment_type,
+                ta.description,
+                t.closing_date - ta.amendment_date as days_before_close
+            FROM tenders t
+            JOIN tender_amendments ta ON t.tender_id = ta.tender_id
+            WHERE t.tender_id = ANY($1::text[])
+              AND ta.amendment_date IS NOT NULL
+            ORDER BY t.tender_id, ta.amendment_date DESC
+        """
+
+        by_tender = _group_rows(await self.pool.fetch(query, tender_ids))
+        return {tender_id: self._evaluate(by_tender.get(tender_id, [])) for tender_id in tender_ids}
+
+    def _evaluate(self, rows) -> IndicatorResult:
         if not rows:
             return self._create_result(0, {}, "No amendments found")
 
@@ -2091,9 +2755,36 @@ class LastMinuteSubmissionIndicator(Indicator):
             WHERE t.tender_id = $1
               AND tb.submission_date IS NOT NULL
               AND t.closing_date IS NOT NULL
+            ORDER BY tb.submission_date, tb.company_name
         """
 
         rows = await self.pool.fetch(query, tender_id)
+        return self._evaluate(rows)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        query = """
+            SELECT
+                t.tender_id,
+                t.closing_date,
+                tb.company_name,
+                tb.submission_date,
+                t.closing_date - tb.submission_date as time_before_close
+            FROM tenders t
+            JOIN tender_bidders tb ON t.tender_id = tb.tender_id
+            WHERE t.tender_id = ANY($1::text[])
+              AND tb.submission_date IS NOT NULL
+              AND t.closing_date IS NOT NULL
+            ORDER BY t.tender_id, tb.submission_date, tb.company_name
+        """
+
+        by_tender = _group_rows(await self.pool.fetch(query, tender_ids))
+        return {tender_id: self._evaluate(by_tender.get(tender_id, [])) for tender_id in tender_ids}
+
+    def _evaluate(self, rows) -> IndicatorResult:
         if not rows:
             return self._create_result(0, {}, "No submission timestamps available", confidence=0.5)
 
@@ -2186,6 +2877,54 @@ class ProcessDurationIndicator(Indicator):
         """
 
         row = await self.pool.fetchrow(query, tender_id)
+        return self._evaluate(row)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Duration statistics computed once per procedure type in the batch
+        query = """
+            WITH tender_data AS (
+                SELECT
+                    t.tender_id,
+                    t.award_date - t.publication_date as process_duration,
+                    t.procedure_type,
+                    t.estimated_value_mkd
+                FROM tenders t
+                WHERE t.tender_id = ANY($1::text[])
+                  AND t.publication_date IS NOT NULL
+                  AND t.award_date IS NOT NULL
+            ),
+            category_stats AS (
+                SELECT
+                    t.procedure_type,
+                    AVG(t.award_date - t.publication_date) as avg_duration,
+                    STDDEV(EXTRACT(EPOCH FROM (t.award_date - t.publication_date))) as stddev_duration
+                FROM tenders t
+                WHERE t.procedure_type IN (SELECT DISTINCT procedure_type FROM tender_data)
+                  AND t.award_date IS NOT NULL
+                  AND t.publication_date IS NOT NULL
+                  AND t.publication_date >= CURRENT_DATE - INTERVAL '12 months'
+                GROUP BY t.procedure_type
+            )
+            SELECT
+                td.tender_id,
+                td.process_duration,
+                cs.avg_duration,
+                cs.stddev_duration,
+                td.procedure_type,
+                td.estimated_value_mkd
+            FROM tender_data td
+            JOIN category_stats cs ON cs.procedure_type = td.procedure_type
+        """
+
+        rows = await self.pool.fetch(query, tender_ids)
+        by_tender = {row['tender_id']: row for row in rows}
+        return {tender_id: self._evaluate(by_tender.get(tender_id)) for tender_id in tender_ids}
+
+    def _evaluate(self, row) -> IndicatorResult:
         if not row or not row['avg_duration']:
             return self._create_result(0, {}, "Insufficient process duration data")
 
@@ -2236,46 +2975,39 @@ class PublicationPatternIndicator(Indicator):
         self.base_threshold = 65.0
 
     async def calculate(self, tender_id: str, context: Optional[Dict] = None) -> IndicatorResult:
+        # Only the tender's own publication time is scored
         query = """
-            WITH tender_info AS (
-                SELECT
-                    procuring_entity,
-                    EXTRACT(HOUR FROM publication_date) as pub_hour,
-                    EXTRACT(DOW FROM publication_date) as pub_dow
-                FROM tenders
-                WHERE tender_id = $1
-                  AND publication_date IS NOT NULL
-            ),
-            entity_pattern AS (
-                SELECT
-                    EXTRACT(HOUR FROM t.publication_date) as hour,
-                    COUNT(*) as count
-                FROM tenders t
-                CROSS JOIN tender_info ti
-                WHERE t.procuring_entity = ti.procuring_entity
-                  AND t.publication_date >= CURRENT_DATE - INTERVAL '12 months'
-                GROUP BY EXTRACT(HOUR FROM t.publication_date)
-            )
             SELECT
-                ti.pub_hour,
-                ti.pub_dow,
-                ep.hour,
-                ep.count
-            FROM tender_info ti
-            LEFT JOIN entity_pattern ep ON ep.hour = ti.pub_hour
+                EXTRACT(HOUR FROM publication_date) as pub_hour,
+                EXTRACT(DOW FROM publication_date) as pub_dow
+            FROM tenders
+            WHERE tender_id = $1
+              AND publication_date IS NOT NULL
         """
 
-        rows = await self.pool.fetch(query, tender_id)
-        if not rows:
+        if context is not None and 'tender' in context:
+            row = context['tender']
+            if row and row['publication_date']:
+                published = row['publication_date']
+                # A DATE has no time part (EXTRACT(HOUR) gives 0); isoweekday() % 7 matches DOW
+                row = {
+                    'pub_hour': getattr(published, 'hour', 0),
+                    'pub_dow': published.isoweekday() % 7,
+                }
+            else:
+                row = None
+        else:
+            row = await self.pool.fetchrow(query, tender_id)
+        if not row:
             return self._create_result(0, {}, "No publication pattern data", confidence=0.5)
 
-        pub_hour = int(rows[0]['pub_hour']) if rows[0]['pub_hour'] else 12
+        pub_hour = int(row['pub_hour']) if row['pub_hour'] else 12
 
         # Off-hours = before 8am or after 6pm
         is_off_hours = pub_hour < 8 or pub_hour >= 18
 
         # Weekend
-        pub_dow = int(rows[0]['pub_dow']) if rows[0]['pub_dow'] else 3
+        pub_dow = int(row['pub_dow']) if row['pub_dow'] else 3
         is_weekend = pub_dow == 0 or pub_dow == 6
 
         if is_off_hours and is_weekend:
@@ -2329,6 +3061,30 @@ class DeadlineExtensionIndicator(Indicator):
         """
 
         rows = await self.pool.fetch(query, tender_id)
+        return self._evaluate(rows)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        query = """
+            SELECT
+                ta.tender_id,
+                ta.amendment_date,
+                ta.description,
+                ta.old_value,
+                ta.new_value
+            FROM tender_amendments ta
+            WHERE ta.tender_id = ANY($1::text[])
+              AND ta.amendment_type = 'deadline_extension'
+            ORDER BY ta.tender_id, ta.amendment_date
+        """
+
+        by_tender = _group_rows(await self.pool.fetch(query, tender_ids))
+        return {tender_id: self._evaluate(by_tender.get(tender_id, [])) for tender_id in tender_ids}
+
+    def _evaluate(self, rows) -> IndicatorResult:
         if not rows:
             return self._create_result(0, {}, "No deadline extensions")
 
@@ -2382,10 +3138,33 @@ class SubmissionClusteringIndicator(Indicator):
             FROM tender_bidders tb
             WHERE tb.tender_id = $1
               AND tb.submission_date IS NOT NULL
-            ORDER BY tb.submission_date
+            ORDER BY tb.submission_date, tb.company_name
         """
 
         rows = await self.pool.fetch(query, tender_id)
+        return self._evaluate(rows)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        query = """
+            SELECT
+                tb.tender_id,
+                tb.company_name,
+                tb.submission_date,
+                EXTRACT(EPOCH FROM tb.submission_date) as submission_timestamp
+            FROM tender_bidders tb
+            WHERE tb.tender_id = ANY($1::text[])
+              AND tb.submission_date IS NOT NULL
+            ORDER BY tb.tender_id, tb.submission_date, tb.company_name
+        """
+
+        by_tender = _group_rows(await self.pool.fetch(query, tender_ids))
+        return {tender_id: self._evaluate(by_tender.get(tender_id, [])) for tender_id in tender_ids}
+
+    def _evaluate(self, rows) -> IndicatorResult:
         if not rows or len(rows) < 2:
             return self._create_result(0, {}, "Insufficient submission data", confidence=0.5)
 
@@ -2479,6 +3258,58 @@ class RepeatWinnerIndicator(Indicator):
         """
 
         row = await self.pool.fetchrow(query, tender_id)
+        return self._evaluate(row)
+
+    async def calculate_batch(
+        self,
+        tender_ids: List[str],
+        context: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, IndicatorResult]:
+        # Win counts per (entity, winner) and totals per entity, aggregated once
+        query = """
+            WITH tender_info AS (
+                SELECT tender_id, winner, procuring_entity
+                FROM tenders
+                WHERE tender_id = ANY($1::text[])
+                  AND winner IS NOT NULL
+            ),
+            awarded AS (
+                SELECT t.procuring_entity, t.winner, t.actual_value_mkd
+                FROM tenders t
+                WHERE t.procuring_entity IN (SELECT DISTINCT procuring_entity FROM tender_info)
+                  AND t.status IN ('awarded', 'completed')
+                  AND t.winner IS NOT NULL
+                  AND t.publication_date >= CURRENT_DATE - INTERVAL '24 months'
+            ),
+            entity_totals AS (
+                SELECT procuring_entity, COUNT(*) as total_tenders
+                FROM awarded
+                GROUP BY procuring_entity
+            ),
+            winner_stats AS (
+                SELECT procuring_entity, winner, COUNT(*) as wins, SUM(actual_value_mkd) as total_value
+                FROM awarded
+                GROUP BY procuring_entity, winner
+            )
+            SELECT
+                ti.tender_id,
+                ti.winner,
+                COALESCE(ws.wins, 0) as wins,
+                ws.total_value,
+                et.total_tenders,
+                (COALESCE(ws.wins, 0) * 100.0 / et.total_tenders) as win_pct
+            FROM tender_info ti
+            JOIN entity_totals et ON et.procuring_entity = ti.procuring_entity
+            LEFT JOIN winner_stats ws
+              ON ws.procuring_entity = ti.procuring_entity
+             AND ws.winner = ti.winner
+        """
+
+        rows = await self.pool.fetch(query, tender_ids)
+        by_tender = {row['tender_id']: row for row in rows}
+        return {tender_id: self._evaluate(by_tender.get(tender_id)) for tender_id in tender_ids}
+
+    def _evaluate(self, row) -> IndicatorResult:
         if not row or not row['total_tenders'] or row['total_tenders'] < 5:
             return self._create_result(0, {}, "Insufficient tender history")
 
@@ -2591,6 +3422,102 @@ class IndicatorRegistry:
                 logger.error(f"Error running {name} on {tender_id}: {e}")
         return results
 
+    async def load_batch_context(self, tender_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Prefetch tender rows and bids for a set of tenders in two queries.
+
+        Returns:
+            Mapping of tender_id to {'tender': dict or None, 'bids': [dict, ...]},
+            consumed by indicators that accept a `context` argument.
+        """
+        tender_rows = await self.pool.fetch("""
+            SELECT
+                tender_id,
+                num_bidders,
+                estimated_value_mkd,
+                actual_value_mkd,
+                winner,
+                procuring_entity,
+                procedure_type,
+                cpv_code,
+                publication_date,
+                closing_date
+            FROM tenders
+            WHERE tender_id = ANY($1::text[])
+        """, tender_ids)
+        bid_rows = await self.pool.fetch("""
+            SELECT
+                tender_id,
+                company_name,
+                bid_amount_mkd,
+                is_winner,
+                bid_rank
+            FROM tender_bidders
+            WHERE tender_id = ANY($1::text[])
+            ORDER BY tender_id, bid_amount_mkd
+        """, tender_ids)
+
+        context = {tender_id: {'tender': None, 'bids': []} for tender_id in tender_ids}
+        for row in tender_rows:
+            context[row['tender_id']]['tender'] = dict(row)
+        for row in bid_rows:
+            context[row['tender_id']]['bids'].append(dict(row))
+        return context
+
+    async def run_batch(
+        self,
+        tender_ids: List[str],
+        chunk_size: int = 2000,
+        triggered_only: bool = True
+    ) -> Dict[str, List[IndicatorResult]]:
+        """
+        Run all registered indicators over a set of tenders.
+
+        Tenders are processed in chunks; for each chunk the shared context is
+        loaded once and every indicator's `calculate_batch` runs concurrently
+        on the pool.
+
+        Args:
+            tender_ids: Tenders to analyze
+            chunk_size: Tenders per chunk (bounds memory and ANY() array size)
+            triggered_only: Keep only triggered results, like `run_all`
+
+        Returns:
+            Mapping of tender_id to its indicator results, in registration order
+        """
+        results: Dict[str, List[IndicatorResult]] = {tender_id: [] for tender_id in tender_ids}
+
+        for start in range(0, len(tender_ids), chunk_size):
+            chunk = tender_ids[start:start + chunk_size]
+            context = await self.load_batch_context(chunk)
+
+            batches = await asyncio.gather(*(
+                self._run_indicator_batch(indicator, chunk, context)
+                for indicator in self.indicators.values()
+            ))
+
+            for batch in batches:
+                for tender_id, result in batch.items():
+                    if result.triggered or not triggered_only:
+                        results[tender_id].append(result)
+
+            logger.info(f"Indicator batch: {min(start + chunk_size, len(tender_ids))}/{len(tender_ids)} tenders")
+
+        return results
+
+    async def _run_indicator_batch(
+        self,
+        indicator: Indicator,
+        tender_ids: List[str],
+        context: Dict[str, Dict]
+    ) -> Dict[str, IndicatorResult]:
+        """Run one indicator over a chunk, isolating failures to that indicator."""
+        try:
+            return await indicator.calculate_batch(tender_ids, context)
+        except Exception as e:
+            logger.error(f"Error running {indicator.name} batch of {len(tender_ids)} tenders: {e}")
+            return {}
+
     async def run_category(self, tender_id: str, category: str) -> List[IndicatorResult]:
         """Run all indicators in a specific category."""
         results = []
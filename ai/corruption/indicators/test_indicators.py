@@ -134,6 +134,53 @@ async def test_single_indicator():
         await pool.close()
 
 
+async def test_batch_matches_per_tender(sample_size: int = 50):
+    """run_batch must give every indicator the same result as calculate()."""
+    pool = await asyncpg.create_pool(DB_URL, min_size=1, max_size=5, command_timeout=300)
+
+    try:
+        registry = IndicatorRegistry(pool)
+
+        rows = await pool.fetch("""
+            SELECT tender_id
+            FROM tenders
+            WHERE publication_date >= CURRENT_DATE - INTERVAL '12 months'
+            ORDER BY publication_date DESC
+            LIMIT $1
+        """, sample_size)
+        tender_ids = [row['tender_id'] for row in rows]
+
+        batch = await registry.run_batch(tender_ids, chunk_size=20, triggered_only=False)
+
+        mismatches = []
+        for tender_id in tender_ids:
+            batch_results = {r.indicator_name: r.to_dict() for r in batch[tender_id]}
+            for name, indicator in registry.indicators.items():
+                try:
+                    expected = (await indicator.calculate(tender_id)).to_dict()
+                except Exception as e:
+                    if name not in batch_results:
+                        continue  # fails either way; run_batch logs and omits it
+                    expected = f"error: {e}"
+                actual = batch_results.get(name, "missing from batch")
+                if actual != expected:
+                    mismatches.append((tender_id, name, expected, actual))
+
+        print("\n" + "="*60)
+        print(f"BATCH vs PER-TENDER: {len(tender_ids)} tenders x {len(registry.indicators)} indicators")
+        print("="*60)
+        for tender_id, name, expected, actual in mismatches[:20]:
+            print(f"\n{name} on {tender_id}")
+            print(f"  per-tender: {expected}")
+            print(f"  batch:      {actual}")
+
+        assert not mismatches, f"{len(mismatches)} batch results differ from calculate()"
+        print("\nAll batch results match")
+
+    finally:
+        await pool.close()
+
+
 if __name__ == "__main__":
     print("\n" + "="*60)
     print("TESTING DOZORRO-STYLE INDICATORS")
@@ -146,6 +193,10 @@ if __name__ == "__main__":
     print("Testing single indicator...")
     asyncio.run(test_single_indicator())
 
+    print("\n" + "="*60)
+    print("Comparing batch and per-tender results...")
+    asyncio.run(test_batch_matches_per_tender())
+
     print("\n" + "="*60)
     print("Tests complete!")
     print("="*60 + "\n")
@@ -180,10 +180,16 @@ try:
         BidderGraph,
         GraphNode,
         GraphEdge,
+        CSRAdjacency,
         build_graph_from_db,
         save_graph,
         load_graph
     )
+    from ai.corruption.ml_models.graph_snapshot import (
+        GraphSnapshot,
+        write_graph_snapshot,
+        load_graph_snapshot
+    )
     _GRAPH_BUILDER_AVAILABLE = True
 except ImportError as e:
     _GRAPH_BUILDER_AVAILABLE = False
@@ -191,6 +197,10 @@ except ImportError as e:
     BidderGraph = None
     GraphNode = None
     GraphEdge = None
+    CSRAdjacency = None
+    GraphSnapshot = None
+    write_graph_snapshot = None
+    load_graph_snapshot = None
     build_graph_from_db = None
     save_graph = None
     load_graph = None
@@ -496,9 +506,13 @@ __all__ = [
     'BidderGraph',
     'GraphNode',
     'GraphEdge',
+    'CSRAdjacency',
     'build_graph_from_db',
     'save_graph',
     'load_graph',
+    'GraphSnapshot',
+    'write_graph_snapshot',
+    'load_graph_snapshot',
     # GNN Collusion Model
     'CollusionGNN',
     'CollusionGNNTrainer',
@@ -0,0 +1,529 @@
+"""
+Batch Scoring Engine
+
+Scores tenders with every active corruption model and stores the results in
+the ml_predictions table. Replaces batch_predict.py and batch_predict_real.py.
+
+- Tender IDs are streamed in tender_id order from a server-side cursor
+  (no OFFSET paging, no up-front COUNT queries).
+- Features for each chunk are written straight into a float32 matrix by
+  FeatureExtractor.extract_feature_matrix, and every model scores the whole
+  chunk with one predict_proba call.
+- Each chunk is COPYed into a staging table and upserted into ml_predictions
+  in the same transaction that advances the shard's checkpoint
+  (ml_scoring_checkpoints, migration 058), so --resume continues right after
+  the last chunk that was written.
+- --workers N splits the tender keyspace into N hash shards, each scored by
+  its own process with its own connection pool.
+
+Models are the active model_registry versions (joblib packages with
+model/imputer/scaler/feature_names), falling back to xgboost_real.joblib and
+random_forest_real.joblib. XGBoost is the primary score when present.
+
+Usage:
+    python3 batch_scoring.py                          # tenders without a prediction
+    python3 batch_scoring.py --reprocess --workers 4  # rescore everything
+    python3 batch_scoring.py --reprocess --workers 4 --resume
+
+Author: nabavkidata.com
+License: Proprietary
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import asyncio
+import argparse
+import multiprocessing
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+import joblib
+import numpy as np
+from dotenv import load_dotenv
+load_dotenv()
+
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from features.feature_extractor import FeatureExtractor
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Paths
+MODELS_DIR = Path(__file__).parent / "models"
+DEFAULT_PACKAGES = {
+    'xgboost': MODELS_DIR / "xgboost_real.joblib",
+    'random_forest': MODELS_DIR / "random_forest_real.joblib",
+}
+
+# Database connection
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# ml_predictions.model_version written by this engine
+MODEL_VERSION = 'xgboost_rf_v1'
+
+# Preferred primary model (risk_score / confidence), then the rest
+PRIMARY_ORDER = ('xgboost', 'random_forest')
+
+SCORED_STATUSES = ['awarded', 'closed', 'completed']
+
+RISK_THRESHOLDS = np.array([0.2, 0.4, 0.6, 0.8])
+RISK_LEVELS = np.array(['minimal', 'low', 'medium', 'high', 'critical'])
+
+STAGE_COLUMNS = ['tender_id', 'risk_score', 'risk_level', 'confidence', 'model_scores', 'top_features']
+
+
+@dataclass
+class ScoringModel:
+    """A trained model plus the mapping from extractor columns to its inputs."""
+    name: str
+    estimator: Any
+    columns: np.ndarray  # extractor column per model feature, -1 = not extracted
+    feature_names: List[str]
+    imputer: Any = None
+    scaler: Any = None
+    version: Optional[str] = None
+
+    @classmethod
+    def from_package(
+        cls,
+        name: str,
+        package: Dict[str, Any],
+        extractor_features: Sequence[str],
+        version: Optional[str] = None
+    ) -> "ScoringModel":
+        index = {fname: i for i, fname in enumerate(extractor_features)}
+        feature_names = list(package['feature_names'])
+        columns = np.array([index.get(fname, -1) for fname in feature_names], dtype=np.int64)
+        missing = int((columns < 0).sum())
+        if missing:
+            logger.warning(f"{name}: {missing} model features are not extracted, using 0")
+        return cls(
+            name=name,
+            estimator=package['model'],
+            columns=columns,
+            feature_names=feature_names,
+            imputer=package.get('imputer'),
+            scaler=package.get('scaler'),
+            version=version,
+        )
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class probability for every row of the extractor matrix."""
+        present = self.columns >= 0
+        if present.all():
+            Xm = X[:, self.columns]
+        else:
+            Xm = np.zeros((len(X), len(self.columns)), dtype=np.float32)
+            Xm[:, present] = X[:, self.columns[present]]
+        Xm = np.nan_to_num(Xm, nan=0, posinf=0, neginf=0)
+        if self.imputer is not None:
+            Xm = self.imputer.transform(Xm)
+        if self.scaler is not None:
+            Xm = self.scaler.transform(Xm)
+        return self.estimator.predict_proba(Xm)[:, 1]
+
+
+@dataclass
+class ScoringStats:
+    """Running totals for one shard."""
+    processed: int = 0
+    failed: int = 0
+    high_risk: int = 0
+    critical: int = 0
+    score_sum: float = 0.0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'processed': self.processed,
+            'failed': self.failed,
+            'high_risk': self.high_risk,
+            'critical': self.critical,
+            'score_sum': self.score_sum,
+            'elapsed': self.elapsed,
+        }
+
+
+def risk_levels(probs: np.ndarray) -> np.ndarray:
+    """Vectorized probability -> risk level."""
+    return RISK_LEVELS[np.searchsorted(RISK_THRESHOLDS, probs, side='right')]
+
+
+async def load_scoring_models(
+    pool: asyncpg.Pool,
+    extractor_features: Sequence[str]
+) -> List[ScoringModel]:
+    """Active model_registry versions, falling back to the default packages."""
+    paths: Dict[str, Tuple[Path, Optional[str]]] = {
+        name: (path, None) for name, path in DEFAULT_PACKAGES.items()
+    }
+    try:
+        async with pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT model_name, version_id, model_path
+                FROM model_registry
+                WHERE is_active = TRUE
+            """)
+        for row in rows:
+            path = Path(row['model_path'])
+            if path.suffix == '.joblib' and path.exists():
+                paths[row['model_name']] = (path, row['version_id'])
+    except Exception as e:
+        logger.info(f"model_registry not available, using default model files: {e}")
+
+    models = []
+    for name, (path, version) in paths.items():
+        if not path.exists():
+            continue
+        package = joblib.load(path)
+        if not isinstance(package, dict) or 'feature_names' not in package:
+            logger.warning(f"Skipping {name} ({path.name}): not a model package with feature_names")
+            continue
+        models.append(ScoringModel.from_package(name, package, extractor_features, version))
+        logger.info(f"Loaded {name} ({path.name}, {len(package['feature_names'])} features)")
+
+    order = {name: i for i, name in enumerate(PRIMARY_ORDER)}
+    models.sort(key=lambda m: order.get(m.name, len(order)))
+    return models
+
+
+def score_chunk(
+    models: List[ScoringModel],
+    X: np.ndarray,
+    tender_ids: List[str]
+) -> Tuple[List[tuple], np.ndarray]:
+    """
+    Score one feature matrix with every model.
+
+    Returns:
+        Tuple of (staging records in STAGE_COLUMNS order, primary probabilities)
+    """
+    if not tender_ids:
+        return [], np.zeros(0)
+
+    probs = np.column_stack([model.score(X) for model in models])
+    primary = probs[:, 0]
+    levels = risk_levels(primary)
+    names = [model.name for model in models]
+    top_features = json.dumps(models[0].feature_names[:10])
+
+    records = [
+        (
+            tender_id,
+            float(round(primary[i] * 100, 2)),
+            str(levels[i]),
+            float(round(primary[i], 3)),
+            json.dumps({name: float(p) for name, p in zip(names, probs[i])}),
+            top_features,
+        )
+        for i, tender_id in enumerate(tender_ids)
+    ]
+    return records, primary
+
+
+async def stream_tender_ids(
+    conn: asyncpg.Connection,
+    chunk_size: int,
+    shard: int = 0,
+    shards: int = 1,
+    after: Optional[str] = None,
+    reprocess: bool = False,
+    limit: Optional[int] = None
+):
+    """Yield chunks of tender IDs from a server-side cursor, in tender_id order."""
+    params: List[Any] = [SCORED_STATUSES]
+    conditions = ["t.status = ANY($1::text[])"]
+
+    if after is not None:
+        params.append(after)
+        conditions.append(f"t.tender_id > ${len(params)}")
+    if shards > 1:
+        params.extend([shards, shard])
+        conditions.append(f"mod(abs(hashtext(t.tender_id)::bigint), ${len(params) - 1}) = ${len(params)}")
+    if not reprocess:
+        params.append(MODEL_VERSION)
+        conditions.append(f"""NOT EXISTS (
+            SELECT 1 FROM ml_predictions mp
+            WHERE mp.tender_id = t.tender_id AND mp.model_version = ${len(params)}
+        )""")
+
+    query = f"""
+        SELECT t.tender_id
+        FROM tenders t
+        WHERE {' AND '.join(conditions)}
+        ORDER BY t.tender_id
+    """
+    if limit is not None:
+        params.append(limit)
+        query += f" LIMIT ${len(params)}"
+
+    # Cursors only exist inside a transaction
+    async with conn.transaction():
+        chunk: List[str] = []
+        async for row in conn.cursor(query, *params, prefetch=chunk_size):
+            chunk.append(row['tender_id'])
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+async def prepare_writer(conn: asyncpg.Connection):
+    """Per-connection staging table for COPY (emptied on every commit)."""
+    await conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS ml_scoring_stage (
+            tender_id TEXT,
+            risk_score DOUBLE PRECISION,
+            risk_level TEXT,
+            confidence DOUBLE PRECISION,
+            model_scores TEXT,
+            top_features TEXT
+        ) ON COMMIT DELETE ROWS
+    """)
+
+
+async def write_chunk(
+    conn: asyncpg.Connection,
+    records: List[tuple],
+    checkpoint: Tuple[str, int, int],
+    last_tender_id: str,
+    processed: int
+):
+    """COPY one chunk into ml_predictions and advance the checkpoint atomically."""
+    run_name, shard, shards = checkpoint
+    async with conn.transaction():
+        if records:
+            await conn.copy_records_to_table('ml_scoring_stage', records=records, columns=STAGE_COLUMNS)
+            await conn.execute("""
+                INSERT INTO ml_predictions (
+                    tender_id, risk_score, risk_level, confidence,
+                    model_scores, top_features, feature_importance,
+                    model_version, ensemble_type, predicted_at
+                )
+                SELECT tender_id, risk_score, risk_level, confidence,
+                       model_scores::jsonb, top_features::jsonb, '{}'::jsonb,
+                       $1, 'ensemble', NOW()
+                FROM ml_scoring_stage
+                ON CONFLICT (tender_id, model_version)
+                DO UPDATE SET
+                    risk_score = EXCLUDED.risk_score,
+                    risk_level = EXCLUDED.risk_level,
+                    confidence = EXCLUDED.confidence,
+                    model_scores = EXCLUDED.model_scores,
+                    top_features = EXCLUDED.top_features,
+                    feature_importance = EXCLUDED.feature_importance,
+                    predicted_at = EXCLUDED.predicted_at,
+                    updated_at = now()
+            """, MODEL_VERSION)
+
+        await conn.execute("""
+            UPDATE ml_scoring_checkpoints
+            SET last_tender_id = $4, processed_count = $5, updated_at = NOW()
+            WHERE run_name = $1 AND shard_count = $2 AND shard = $3
+        """, run_name, shards, shard, last_tender_id, processed)
+
+
+async def load_checkpoint(
+    conn: asyncpg.Connection,
+    run_name: str,
+    shard: int,
+    shards: int,
+    resume: bool
+) -> Optional[asyncpg.Record]:
+    """Existing checkpoint when resuming; otherwise start the shard over."""
+    if resume:
+        row = await conn.fetchrow("""
+            SELECT last_tender_id, processed_count, completed
+            FROM ml_scoring_checkpoints
+            WHERE run_name = $1 AND shard_count = $2 AND shard = $3
+        """, run_name, shards, shard)
+        if row is not None:
+            return row
+
+    await conn.execute("""
+        INSERT INTO ml_scoring_checkpoints (run_name, shard, shard_count)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (run_name, shard_count, shard) DO UPDATE SET
+            last_tender_id = NULL,
+            processed_count = 0,
+            completed = FALSE,
+            started_at = NOW(),
+            updated_at = NOW()
+    """, run_name, shard, shards)
+    return None
+
+
+async def score_shard(
+    shard: int = 0,
+    shards: int = 1,
+    run_name: str = MODEL_VERSION,
+    chunk_size: int = 2000,
+    reprocess: bool = False,
+    resume: bool = False,
+    max_tenders: Optional[int] = None,
+    database_url: Optional[str] = None
+) -> Dict[str, Any]:
+    """Score one hash shard of the tender keyspace."""
+    label = f"[shard {shard + 1}/{shards}]" if shards > 1 else ""
+    stats = ScoringStats()
+
+    pool = await asyncpg.create_pool(database_url or DATABASE_URL, min_size=3, max_size=4, command_timeout=600)
+    try:
+        extractor = FeatureExtractor(pool)
+        models = await load_scoring_models(pool, extractor.feature_names)
+        if not models:
+            logger.error("No models loaded. Please train models first.")
+            return stats.to_dict()
+
+        async with pool.acquire() as reader, pool.acquire() as writer:
+            await prepare_writer(writer)
+
+            checkpoint = await load_checkpoint(writer, run_name, shard, shards, resume)
+            after = None
+            if checkpoint is not None:
+                if checkpoint['completed']:
+                    logger.info(f"{label} Run '{run_name}' already completed, nothing to resume")
+                    return stats.to_dict()
+                after = checkpoint['last_tender_id']
+                logger.info(f"{label} Resuming after {after} ({checkpoint['processed_count']:,} done before)")
+
+            pending_write: Optional[asyncio.Task] = None
+            chunks = stream_tender_ids(reader, chunk_size, shard, shards, after, reprocess, max_tenders)
+
+            async for chunk in chunks:
+                X, valid_ids = await extractor.extract_feature_matrix(chunk)
+                records, primary = await asyncio.to_thread(score_chunk, models, X, valid_ids)
+
+                stats.failed += len(chunk) - len(valid_ids)
+                stats.high_risk += int((primary >= 0.6).sum())
+                stats.critical += int((primary >= 0.8).sum())
+                stats.score_sum += float(primary.sum()) * 100
+
+                # Write chunk N while chunk N+1 is being extracted
+                if pending_write is not None:
+                    await pending_write
+                stats.processed += len(valid_ids)
+                pending_write = asyncio.create_task(write_chunk(
+                    writer, records, (run_name, shard, shards), chunk[-1],
+                    stats.processed + (checkpoint['processed_count'] if checkpoint else 0)
+                ))
+
+                logger.info(
+                    f"{label} Scored {stats.processed:,} tenders "
+                    f"({stats.rate:.1f} tenders/sec, {stats.failed} failed)"
+                )
+
+            if pending_write is not None:
+                await pending_write
+
+            await writer.execute("""
+                UPDATE ml_scoring_checkpoints
+                SET completed = TRUE, updated_at = NOW()
+                WHERE run_name = $1 AND shard_count = $2 AND shard = $3
+            """, run_name, shards, shard)
+
+        logger.info(
+            f"{label} Completed! Scored {stats.processed:,} tenders in {stats.elapsed:.0f}s "
+            f"({stats.rate:.1f} tenders/sec), {stats.failed} failed"
+        )
+        return stats.to_dict()
+
+    finally:
+        await pool.close()
+
+
+def _score_shard_process(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker process entry point."""
+    return asyncio.run(score_shard(**kwargs))
+
+
+def run_scoring(workers: int = 1, max_tenders: Optional[int] = None, **kwargs) -> Dict[str, Any]:
+    """
+    Score all shards (one process per shard when workers > 1).
+
+    Returns:
+        Summary dictionary with totals and tenders/sec
+    """
+    started = time.monotonic()
+    workers = max(1, workers)
+
+    if workers == 1:
+        results = [asyncio.run(score_shard(max_tenders=max_tenders, **kwargs))]
+    else:
+        per_shard = -(-max_tenders // workers) if max_tenders else None
+        jobs = [
+            dict(kwargs, shard=shard, shards=workers, max_tenders=per_shard)
+            for shard in range(workers)
+        ]
+        with multiprocessing.get_context('spawn').Pool(workers) as procs:
+            results = procs.map(_score_shard_process, jobs)
+
+    elapsed = time.monotonic() - started
+    processed = sum(r['processed'] for r in results)
+    return {
+        'total_processed': processed,
+        'failed': sum(r['failed'] for r in results),
+        'high_risk_count': sum(r['high_risk'] for r in results),
+        'critical_count': sum(r['critical'] for r in results),
+        'average_score': sum(r['score_sum'] for r in results) / processed if processed else 0.0,
+        'elapsed_seconds': elapsed,
+        'tenders_per_second': processed / elapsed if elapsed > 0 else 0.0,
+        'workers': workers,
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Score tenders with all active corruption models')
+    parser.add_argument('--chunk-size', type=int, default=2000, help='Tenders per feature matrix / COPY')
+    parser.add_argument('--max-tenders', type=int, default=None, help='Max tenders to process')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (hash shards)')
+    parser.add_argument('--reprocess', action='store_true', help='Rescore tenders that already have predictions')
+    parser.add_argument('--resume', action='store_true', help='Continue from the last checkpoint of --run-name')
+    parser.add_argument('--run-name', type=str, default=MODEL_VERSION, help='Checkpoint name')
+
+    args = parser.parse_args()
+
+    summary = run_scoring(
+        workers=args.workers,
+        max_tenders=args.max_tenders,
+        run_name=args.run_name,
+        chunk_size=args.chunk_size,
+        reprocess=args.reprocess,
+        resume=args.resume,
+    )
+
+    print("\n" + "=" * 60)
+    print("SCORING SUMMARY")
+    print("=" * 60)
+    print(f"Total Processed: {summary['total_processed']}")
+    print(f"Failed:          {summary['failed']}")
+    print(f"High Risk:       {summary['high_risk_count']}")
+    print(f"Critical:        {summary['critical_count']}")
+    print(f"Average Score:   {summary['average_score']:.1f}")
+    print(f"Tenders/sec:     {summary['tenders_per_second']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -49,6 +49,12 @@ _GRAPH_INFO_PATH = _ML_MODELS_DIR / "graph_info.json"
 _MODEL_PATH = _ML_MODELS_DIR / "gnn_collusion.pt"
 _ONNX_EMBEDDINGS_PATH = _ML_MODELS_DIR / "gnn_node_embeddings.npz"
 
+# Seconds between checks of gnn_graph_cache for a rebuilt snapshot; a company
+# missing from the mapped snapshot triggers an earlier check, at most every
+# _SNAPSHOT_MISS_RECHECK seconds
+GRAPH_SNAPSHOT_REFRESH_INTERVAL = int(os.getenv("GRAPH_SNAPSHOT_REFRESH_INTERVAL", "300"))
+_SNAPSHOT_MISS_RECHECK = 30
+
 # Optional dependency flags
 _TORCH_AVAILABLE = False
 _PYG_AVAILABLE = False
@@ -110,9 +116,14 @@ class GNNInferenceService:
 
         # JSON fallback data
         self._clusters: Optional[List[Dict]] = None
+        self._company_cluster_idx: Optional[Dict[str, int]] = None
         self._node_predictions: Optional[Dict] = None
         self._graph_info: Optional[Dict] = None
 
+        # Memory-mapped co-bidding graph snapshot (graph_cache.py)
+        self._graph_snapshot = None
+        self._snapshot_checked_at: float = 0.0
+
         # Shared across modes
         self._node_names: Optional[List[str]] = None
         self._node_name_to_idx: Optional[Dict[str, int]] = None
@@ -161,6 +172,9 @@ class GNNInferenceService:
             self.mode = "json_fallback"
             logger.info("GNN Inference: JSON fallback loaded")
 
+        if pool is not None:
+            await self._load_graph_snapshot(pool)
+
         self._loaded = True
         self._initialized_at = datetime.utcnow().isoformat()
         elapsed = time.monotonic() - start
@@ -175,6 +189,8 @@ class GNNInferenceService:
         self._classifier_weights = None
         self._classifier_bias = None
         self._clusters = None
+        self._company_cluster_idx = None
+        self._graph_snapshot = None
         self._node_predictions = None
         self._loaded = False
         logger.info("GNNInferenceService cleaned up")
@@ -225,7 +241,15 @@ class GNNInferenceService:
         if not self._loaded:
             await self.initialize(self._pool)
 
-        # Try DB cache first
+        # Mapped graph snapshot first, then a live DB query
+        snapshot = self._graph_snapshot
+        hit = snapshot is not None and company_name in snapshot.node_index
+        if await self._refresh_graph_snapshot(miss=not hit):
+            snapshot = self._graph_snapshot
+            hit = snapshot is not None and company_name in snapshot.node_index
+        if hit:
+            return self._network_from_snapshot(company_name, depth)
+
         if self._pool is not None:
             return await self._network_from_db(company_name, depth)
 
@@ -269,6 +293,7 @@ class GNNInferenceService:
             "model_checkpoint_exists": _MODEL_PATH.exists(),
             "onnx_embeddings_exist": _ONNX_EMBEDDINGS_PATH.exists(),
             "json_files_exist": _CLUSTERS_PATH.exists() and _NODE_PREDICTIONS_PATH.exists(),
+            "graph_snapshot_version": self._graph_snapshot.version if self._graph_snapshot else None,
         }
 
     # ------------------------------------------------------------------
@@ -544,17 +569,126 @@ class GNNInferenceService:
 
         return self._clusters
 
+    def _cluster_for_company(self, company_name: str) -> Optional[Dict]:
+        """Return the first cluster containing this company (O(1) after first call)."""
+        clusters = self._load_clusters_data()
+        if self._company_cluster_idx is None:
+            index: Dict[str, int] = {}
+            for i, c in enumerate(clusters):
+                for comp in c.get("companies", []):
+                    index.setdefault(comp, i)
+            self._company_cluster_idx = index
+        i = self._company_cluster_idx.get(company_name)
+        return clusters[i] if i is not None else None
+
     def _find_cluster_for_company(self, company_name: str) -> Optional[str]:
         """Find the cluster_id that contains this company (if any)."""
-        for c in self._load_clusters_data():
-            if company_name in c.get("companies", []):
-                return c.get("cluster_id")
-        return None
+        c = self._cluster_for_company(company_name)
+        return c.get("cluster_id") if c else None
 
     # ------------------------------------------------------------------
     # Network helpers
     # ------------------------------------------------------------------
 
+    async def _load_graph_snapshot(self, pool):
+        """Map the cached binary graph snapshot, if one is available."""
+        self._snapshot_checked_at = time.monotonic()
+        try:
+            from ai.corruption.ml_models.graph_cache import get_cached_graph
+            self._graph_snapshot = await get_cached_graph(pool)
+        except Exception as e:
+            logger.warning(f"Graph snapshot not loaded: {e}")
+            self._graph_snapshot = None
+
+    async def _refresh_graph_snapshot(self, miss: bool = False) -> bool:
+        """
+        Re-map the snapshot if gnn_graph_cache points at a different one.
+
+        Checked every GRAPH_SNAPSHOT_REFRESH_INTERVAL seconds, or after
+        _SNAPSHOT_MISS_RECHECK seconds when a lookup missed. A failed or
+        stale reload keeps the current snapshot.
+
+        Returns:
+            True if a new snapshot was mapped
+        """
+        if self._pool is None:
+            return False
+        elapsed = time.monotonic() - self._snapshot_checked_at
+        interval = _SNAPSHOT_MISS_RECHECK if miss else GRAPH_SNAPSHOT_REFRESH_INTERVAL
+        if elapsed < interval:
+            return False
+        self._snapshot_checked_at = time.monotonic()
+
+        try:
+            from ai.corruption.ml_models.graph_cache import CACHE_KEY, get_cached_graph
+            async with self._pool.acquire() as conn:
+                checksum = await conn.fetchval(
+                    "SELECT snapshot_checksum FROM gnn_graph_cache WHERE cache_key = $1",
+                    CACHE_KEY,
+                )
+            current = self._graph_snapshot
+            if checksum is None or (current is not None and current.checksum == checksum):
+                return False
+            snapshot = await get_cached_graph(self._pool)
+        except Exception as e:
+            logger.warning(f"Graph snapshot refresh failed: {e}")
+            return False
+
+        if snapshot is None:
+            return False
+        self._graph_snapshot = snapshot
+        logger.info(f"Graph snapshot refreshed to version {snapshot.version}")
+        return True
+
+    def _network_from_snapshot(
+        self, company_name: str, depth: int = 2, max_nodes: int = 31
+    ) -> Dict[str, Any]:
+        """Build the ego-network (up to ``depth`` hops) from the mapped snapshot."""
+        snapshot = self._graph_snapshot
+        center = snapshot.node_index[company_name]
+        # Strongest co-bidders first, as the DB path's ORDER BY co_bid_count DESC
+        hops = snapshot.adjacency.k_hop(
+            center, max(1, depth), max_nodes=max_nodes, edge_weight=snapshot.edge_weight
+        )
+
+        members = np.fromiter(hops.keys(), dtype=np.int64)
+        in_ego = np.zeros(snapshot.num_nodes(), dtype=bool)
+        in_ego[members] = True
+        src, dst = snapshot.edge_index[0], snapshot.edge_index[1]
+        ego_edges = np.flatnonzero(in_ego[src] & in_ego[dst])
+
+        nodes = []
+        for idx, hop in hops.items():
+            node = {
+                "id": snapshot.names[idx],
+                "name": snapshot.names[idx],
+                "type": "company",
+                "risk_score": None,
+                "risk_level": None,
+            }
+            if idx == center:
+                node["metadata"] = {"center": True}
+            else:
+                node["metadata"] = {"hop": hop}
+            nodes.append(node)
+
+        edges = [
+            {
+                "source": snapshot.names[int(src[k])],
+                "target": snapshot.names[int(dst[k])],
+                "type": "co_bid",
+                "weight": float(snapshot.edge_weight[k]),
+            }
+            for k in ego_edges
+        ]
+
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "center_node": company_name,
+            "cluster_id": self._find_cluster_for_company(company_name),
+        }
+
     async def _network_from_db(
         self, company_name: str, depth: int = 2
     ) -> Dict[str, Any]:
@@ -635,37 +769,37 @@ class GNNInferenceService:
 
     def _network_from_clusters(self, company_name: str) -> Dict[str, Any]:
         """Build a minimal network from cluster data (JSON fallback)."""
-        for c in self._load_clusters_data():
+        c = self._cluster_for_company(company_name)
+        if c is not None:
             companies = c.get("companies", [])
-            if company_name in companies:
-                nodes = [
-                    {
-                        "id": comp,
-                        "name": comp,
-                        "type": "company",
-                        "risk_score": c.get("confidence", 50.0) / 100,
-                        "risk_level": _risk_level(c.get("confidence", 50.0) / 100),
-                    }
-                    for comp in companies
-                ]
-                edges = []
-                for i, c1 in enumerate(companies):
-                    for c2 in companies[i + 1:]:
-                        edges.append(
-                            {
-                                "source": c1,
-                                "target": c2,
-                                "type": "co_bid",
-                                "weight": 1.0,
-                            }
-                        )
-
-                return {
-                    "nodes": nodes,
-                    "edges": edges,
-                    "center_node": company_name,
-                    "cluster_id": c.get("cluster_id"),
+            nodes = [
+                {
+                    "id": comp,
+                    "name": comp,
+                    "type": "company",
+                    "risk_score": c.get("confidence", 50.0) / 100,
+                    "risk_level": _risk_level(c.get("confidence", 50.0) / 100),
                 }
+                for comp in companies
+            ]
+            edges = []
+            for i, c1 in enumerate(companies):
+                for c2 in companies[i + 1:]:
+                    edges.append(
+                        {
+                            "source": c1,
+                            "target": c2,
+                            "type": "co_bid",
+                            "weight": 1.0,
+                        }
+                    )
+
+            return {
+                "nodes": nodes,
+                "edges": edges,
+                "center_node": company_name,
+                "cluster_id": c.get("cluster_id"),
+            }
 
         # Company not found in any cluster
         return {
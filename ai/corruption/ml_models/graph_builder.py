@@ -31,6 +31,7 @@ from typing import Dict, List, Optional, Tuple, Any, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict
+from pathlib import Path
 import json
 
 # Try importing PyTorch Geometric (optional - for export)
@@ -54,7 +55,7 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphNode:
     """Represents a node in the graph."""
     node_id: int
@@ -64,7 +65,7 @@ class GraphNode:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphEdge:
     """Represents an edge in the graph."""
     source: int
@@ -75,6 +76,189 @@ class GraphEdge:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+class CSRAdjacency:
+    """
+    Compressed sparse row adjacency index over an undirected edge list.
+
+    Every edge (u, v) is stored in both directions. For node u its neighbors
+    are ``neighbors[offsets[u]:offsets[u + 1]]`` and ``edge_ids`` holds the
+    matching row in ``edge_index`` / ``edge_attr``, so neighbor lookup is
+    O(degree) and per-edge features are a fancy-index away.
+
+    Attributes:
+        num_nodes: Number of nodes
+        offsets: int64 array [num_nodes + 1]
+        neighbors: int64 array [2 * num_edges]
+        edge_ids: int64 array [2 * num_edges]
+    """
+
+    def __init__(self, edge_index: np.ndarray, num_nodes: int):
+        edge_index = np.asarray(edge_index, dtype=np.int64).reshape(2, -1)
+        num_edges = edge_index.shape[1]
+
+        src = np.concatenate([edge_index[0], edge_index[1]])
+        dst = np.concatenate([edge_index[1], edge_index[0]])
+        eid = np.concatenate([np.arange(num_edges, dtype=np.int64)] * 2)
+
+        order = np.argsort(src, kind='stable')
+        counts = np.bincount(src, minlength=num_nodes) if num_edges else np.zeros(num_nodes, dtype=np.int64)
+
+        self.num_nodes = num_nodes
+        self.offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self.neighbors = dst[order]
+        self.edge_ids = eid[order]
+
+    def neighbors_of(self, node_id: int) -> np.ndarray:
+        """Neighbor node IDs of a node (with multiplicity for parallel edges)."""
+        return self.neighbors[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def edges_of(self, node_id: int) -> np.ndarray:
+        """Edge IDs incident to a node, aligned with neighbors_of()."""
+        return self.edge_ids[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def degrees(self) -> np.ndarray:
+        """Degree of every node."""
+        return np.diff(self.offsets)
+
+    def k_hop(
+        self,
+        node_id: int,
+        k: int,
+        max_nodes: Optional[int] = None,
+        edge_weight: Optional[np.ndarray] = None,
+    ) -> Dict[int, int]:
+        """
+        Breadth-first expansion up to k hops.
+
+        Args:
+            node_id: Start node
+            k: Maximum hop distance
+            max_nodes: Stop once this many nodes have been reached
+            edge_weight: Optional per-edge weights; when truncating to
+                max_nodes, the nodes of a hop are kept in descending order of
+                their strongest edge from the previous hop (otherwise by ID)
+
+        Returns:
+            Mapping of reached node ID to hop distance (start node at 0)
+        """
+        visited = np.zeros(self.num_nodes, dtype=bool)
+        visited[node_id] = True
+        hops = {node_id: 0}
+        frontier = np.array([node_id], dtype=np.int64)
+
+        for hop in range(1, k + 1):
+            if frontier.size == 0:
+                break
+            starts = self.offsets[frontier]
+            ends = self.offsets[frontier + 1]
+            reached = np.concatenate([self.neighbors[a:b] for a, b in zip(starts, ends)])
+            if edge_weight is not None:
+                eids = np.concatenate([self.edge_ids[a:b] for a, b in zip(starts, ends)])
+                fresh = ~visited[reached]
+                reached = reached[fresh]
+                weight = np.asarray(edge_weight)[eids[fresh]]
+                # Strongest edge per node, then strongest nodes first
+                order = np.argsort(-weight, kind='stable')
+                reached, first = np.unique(reached[order], return_index=True)
+                reached = reached[np.argsort(first, kind='stable')]
+            else:
+                reached = np.unique(reached)
+                reached = reached[~visited[reached]]
+            if max_nodes is not None:
+                reached = reached[:max(0, max_nodes - len(hops))]
+            visited[reached] = True
+            for n in reached.tolist():
+                hops[n] = hop
+            frontier = reached
+            if max_nodes is not None and len(hops) >= max_nodes:
+                break
+
+        return hops
+
+    def connected_components(self) -> np.ndarray:
+        """Component label per node (iterative BFS over the CSR arrays)."""
+        labels = np.full(self.num_nodes, -1, dtype=np.int64)
+        current = 0
+        for start in range(self.num_nodes):
+            if labels[start] >= 0:
+                continue
+            labels[start] = current
+            frontier = np.array([start], dtype=np.int64)
+            while frontier.size:
+                reached = np.concatenate([
+                    self.neighbors[self.offsets[n]:self.offsets[n + 1]] for n in frontier
+                ])
+                reached = np.unique(reached)
+                reached = reached[labels[reached] < 0]
+                labels[reached] = current
+                frontier = reached
+            current += 1
+        return labels
+
+    def core_numbers(self) -> np.ndarray:
+        """
+        k-core number of every node.
+
+        Batagelj-Zaversnik bucket peeling in O(N + E): nodes are kept sorted
+        by current degree in one array with bucket start offsets, so taking
+        the minimum-degree node and decrementing a neighbor are O(1).
+        Degrees are simple-graph degrees (parallel edges and self-loops are
+        ignored).
+        """
+        n = self.num_nodes
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        src = np.repeat(np.arange(n, dtype=np.int64), self.degrees())
+        keep = src != self.neighbors
+        pairs = np.unique(np.stack([src[keep], self.neighbors[keep]]), axis=1) if keep.any() \
+            else np.zeros((2, 0), dtype=np.int64)
+        counts = np.bincount(pairs[0], minlength=n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        offsets = offsets.tolist()
+        nbrs = pairs[1].tolist()
+
+        degree = counts.tolist()
+        max_degree = max(degree)
+
+        # bin_start[d]: first position of degree-d nodes in vert
+        bin_start = [0] * (max_degree + 1)
+        for d in degree:
+            bin_start[d] += 1
+        start = 0
+        for d in range(max_degree + 1):
+            start, bin_start[d] = start + bin_start[d], start
+
+        vert = [0] * n
+        pos = [0] * n
+        for v in range(n):
+            pos[v] = bin_start[degree[v]]
+            vert[pos[v]] = v
+            bin_start[degree[v]] += 1
+        for d in range(max_degree, 0, -1):
+            bin_start[d] = bin_start[d - 1]
+        bin_start[0] = 0
+
+        for i in range(n):
+            v = vert[i]
+            dv = degree[v]
+            for u in nbrs[offsets[v]:offsets[v + 1]]:
+                du = degree[u]
+                if du > dv:
+                    # Swap u with the first node of its bin, then shrink the bin
+                    pu, pw = pos[u], bin_start[du]
+                    w = vert[pw]
+                    if u != w:
+                        vert[pu], vert[pw] = w, u
+                        pos[u], pos[w] = pw, pu
+                    bin_start[du] += 1
+                    degree[u] = du - 1
+
+        return np.asarray(degree, dtype=np.int64)
+
+
 @dataclass
 class BidderGraph:
     """
@@ -100,6 +284,19 @@ class BidderGraph:
     node_labels: Optional[np.ndarray] = None
     edge_labels: Optional[np.ndarray] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _adjacency: Optional[CSRAdjacency] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def adjacency(self) -> CSRAdjacency:
+        """CSR adjacency index, built from edge_index on first use."""
+        if self._adjacency is None:
+            self.build_adjacency()
+        return self._adjacency
+
+    def build_adjacency(self) -> CSRAdjacency:
+        """(Re)build the CSR index; call after mutating edge_index."""
+        self._adjacency = CSRAdjacency(self.edge_index, len(self.nodes))
+        return self._adjacency
 
     def to_pyg_data(self) -> Optional['Data']:
         """Convert to PyTorch Geometric Data object."""
@@ -207,14 +404,23 @@ class BidderGraph:
         return None
 
     def get_neighbors(self, node_id: int) -> List[int]:
-        """Get neighbor node IDs."""
-        neighbors = []
-        for edge in self.edges:
-            if edge.source == node_id:
-                neighbors.append(edge.target)
-            elif edge.target == node_id:
-                neighbors.append(edge.source)
-        return neighbors
+        """Get neighbor node IDs (O(degree) via the CSR index)."""
+        return self.adjacency.neighbors_of(node_id).tolist()
+
+    def get_k_hop_neighbors(
+        self,
+        node_id: int,
+        k: int = 2,
+        max_nodes: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Get nodes within k hops as {node_id: hop_distance}."""
+        return self.adjacency.k_hop(node_id, k, max_nodes=max_nodes)
+
+    def get_edge_features(self, node_id: int) -> np.ndarray:
+        """Edge feature rows [degree, num_edge_features] for a node's incident edges."""
+        if self.edge_attr.ndim != 2 or self.edge_attr.shape[0] != self.edge_index.shape[1]:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self.edge_attr[self.adjacency.edges_of(node_id)]
 
     def num_nodes(self) -> int:
         return len(self.nodes)
@@ -310,12 +516,20 @@ class GraphBuilder:
         # Step 2: Build node index
         node_index = {c['company_name']: i for i, c in enumerate(companies)}
 
-        # Step 3: Get co-bidding pairs
-        co_bids = await self._get_co_bidding_pairs(
-            companies=list(node_index.keys()),
-            time_window_days=time_window_days,
-            min_co_bids=min_co_bids
-        )
+        # Step 3: Get co-bidding pairs (edge features come from the same
+        # self-join aggregation, not one query per pair)
+        if include_edge_features:
+            co_bids = await self._get_co_bidding_pairs_with_features(
+                companies=list(node_index.keys()),
+                time_window_days=time_window_days,
+                min_co_bids=min_co_bids
+            )
+        else:
+            co_bids = await self._get_co_bidding_pairs(
+                companies=list(node_index.keys()),
+                time_window_days=time_window_days,
+                min_co_bids=min_co_bids
+            )
         logger.info(f"Found {len(co_bids)} co-bidding pairs")
 
         # Step 4: Build nodes with features
@@ -345,12 +559,14 @@ class GraphBuilder:
                 continue
 
             edge_features = {}
+            metadata = {
+                'co_bid_count': pair['co_bid_count'],
+                'common_tenders': pair.get('common_tenders', [])[:5]
+            }
             if include_edge_features:
-                edge_features = await self._calculate_edge_features(
-                    pair['company_a'],
-                    pair['company_b'],
-                    time_window_days
-                )
+                edge_features = self._edge_features_from_row(pair)
+                if pair.get('most_recent_date'):
+                    metadata['most_recent_date'] = _as_datetime(pair['most_recent_date'])
 
             edge = GraphEdge(
                 source=src_idx,
@@ -358,10 +574,7 @@ class GraphBuilder:
                 edge_type='co_bid',
                 weight=float(pair['co_bid_count']),
                 features=edge_features,
-                metadata={
-                    'co_bid_count': pair['co_bid_count'],
-                    'common_tenders': pair.get('common_tenders', [])[:5]
-                }
+                metadata=metadata
             )
             edges.append(edge)
 
@@ -752,6 +965,73 @@ class GraphBuilder:
             rows = await conn.fetch(query, timedelta(days=time_window_days), companies, min_co_bids)
             return [dict(row) for row in rows]
 
+    async def _get_co_bidding_pairs_with_features(
+        self,
+        companies: List[str],
+        time_window_days: int,
+        min_co_bids: int
+    ) -> List[Dict]:
+        """
+        Get co-bidding pairs together with their edge features.
+
+        Computes co_bid_count, co_bid_rate, bid_amount_similarity and
+        same_winner_rate for every pair in one self-join aggregation over
+        tender_bidders, with the same definitions as _calculate_edge_features.
+        """
+        query = """
+            WITH company_tenders AS (
+                SELECT
+                    tb.company_name,
+                    tb.tender_id,
+                    tb.is_winner,
+                    tb.bid_amount_mkd,
+                    t.publication_date
+                FROM tender_bidders tb
+                JOIN tenders t ON tb.tender_id = t.tender_id
+                WHERE t.publication_date >= CURRENT_DATE - $1::interval
+                  AND tb.company_name = ANY($2::text[])
+            ),
+            company_totals AS (
+                SELECT company_name, COUNT(DISTINCT tender_id) as total_bids
+                FROM tender_bidders
+                WHERE company_name = ANY($2::text[])
+                GROUP BY company_name
+            ),
+            pairs AS (
+                SELECT
+                    ct1.company_name as company_a,
+                    ct2.company_name as company_b,
+                    COUNT(*) as co_bid_count,
+                    array_agg(ct1.tender_id ORDER BY ct1.tender_id) as common_tenders,
+                    AVG(CASE
+                        WHEN ct1.bid_amount_mkd > 0 AND ct2.bid_amount_mkd > 0
+                        THEN 1 - ABS(ct1.bid_amount_mkd - ct2.bid_amount_mkd)
+                                 / GREATEST(ct1.bid_amount_mkd, ct2.bid_amount_mkd)
+                        ELSE 0
+                    END) as bid_amount_similarity,
+                    SUM(CASE WHEN ct1.is_winner OR ct2.is_winner THEN 1 ELSE 0 END)::float
+                        / COUNT(*) as same_winner_rate,
+                    MAX(ct1.publication_date) as most_recent_date
+                FROM company_tenders ct1
+                JOIN company_tenders ct2
+                    ON ct1.tender_id = ct2.tender_id
+                    AND ct1.company_name < ct2.company_name
+                GROUP BY ct1.company_name, ct2.company_name
+                HAVING COUNT(*) >= $3
+            )
+            SELECT
+                p.*,
+                p.co_bid_count / GREATEST(ta.total_bids, tb.total_bids, 1)::float as co_bid_rate
+            FROM pairs p
+            LEFT JOIN company_totals ta ON ta.company_name = p.company_a
+            LEFT JOIN company_totals tb ON tb.company_name = p.company_b
+            ORDER BY p.co_bid_count DESC
+        """
+
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(query, timedelta(days=time_window_days), companies, min_co_bids)
+            return [dict(row) for row in rows]
+
     async def _get_bid_edges(
         self,
         companies: List[str],
@@ -844,14 +1124,18 @@ class GraphBuilder:
             if not row:
                 return {f: 0.0 for f in self.EDGE_FEATURES}
 
-            return {
-                'co_bid_count': float(row['co_bid_count'] or 0),
-                'co_bid_rate': float(row['co_bid_rate'] or 0),
-                'time_proximity': 1.0,  # Will be computed with temporal decay
-                'same_winner_rate': float(row['same_winner_rate'] or 0),
-                'bid_amount_similarity': float(row['bid_amount_similarity'] or 0),
-                'sequential_wins': 0.0  # TODO: Implement sequential win detection
-            }
+            return self._edge_features_from_row(row)
+
+    def _edge_features_from_row(self, row) -> Dict[str, float]:
+        """Build the EDGE_FEATURES dict from an aggregated pair row."""
+        return {
+            'co_bid_count': float(row['co_bid_count'] or 0),
+            'co_bid_rate': float(row['co_bid_rate'] or 0),
+            'time_proximity': 1.0,  # Will be computed with temporal decay
+            'same_winner_rate': float(row['same_winner_rate'] or 0),
+            'bid_amount_similarity': float(row['bid_amount_similarity'] or 0),
+            'sequential_wins': 0.0  # TODO: Implement sequential win detection
+        }
 
     async def _get_collusion_labels(self, companies: List[str]) -> Optional[np.ndarray]:
         """
@@ -943,38 +1227,45 @@ class GraphBuilder:
 
     async def compute_graph_statistics(self, graph: BidderGraph) -> Dict[str, Any]:
         """
-        Compute various graph statistics using NetworkX.
+        Compute various graph statistics.
+
+        Counts, degrees and components come from the CSR index; NetworkX is
+        only used (on a structure-only graph) for clustering and betweenness.
 
         Returns:
             Dictionary with graph metrics
         """
-        if not NETWORKX_AVAILABLE:
-            logger.warning("NetworkX not available for graph statistics")
+        num_nodes = graph.num_nodes()
+        if num_nodes == 0:
             return {}
 
-        G = graph.to_networkx()
-        if G is None or len(G) == 0:
-            return {}
+        adjacency = graph.adjacency
+        unique_edges = _unique_undirected_edges(graph.edge_index)
+        num_edges = unique_edges.shape[1]
+
+        labels = adjacency.connected_components()
+        component_sizes = np.bincount(labels)
 
         stats = {
-            'num_nodes': G.number_of_nodes(),
-            'num_edges': G.number_of_edges(),
-            'density': nx.density(G),
-            'is_connected': nx.is_connected(G) if G.number_of_nodes() > 0 else False
+            'num_nodes': num_nodes,
+            'num_edges': num_edges,
+            'density': (2.0 * num_edges / (num_nodes * (num_nodes - 1))) if num_nodes > 1 else 0.0,
+            'is_connected': len(component_sizes) == 1,
+            'num_components': len(component_sizes),
+            'largest_component_size': int(component_sizes.max()),
         }
 
-        # Connected components
-        if G.number_of_nodes() > 0:
-            components = list(nx.connected_components(G))
-            stats['num_components'] = len(components)
-            stats['largest_component_size'] = max(len(c) for c in components)
+        # Degree statistics (simple-graph degrees, as NetworkX reports them)
+        degrees = np.bincount(unique_edges.ravel(), minlength=num_nodes)
+        stats['avg_degree'] = float(np.mean(degrees))
+        stats['max_degree'] = int(degrees.max())
+        stats['degree_std'] = float(np.std(degrees))
 
-        # Degree statistics
-        degrees = [d for n, d in G.degree()]
-        if degrees:
-            stats['avg_degree'] = np.mean(degrees)
-            stats['max_degree'] = max(degrees)
-            stats['degree_std'] = np.std(degrees)
+        if not NETWORKX_AVAILABLE:
+            logger.warning("NetworkX not available for clustering/centrality statistics")
+            return stats
+
+        G = _structural_networkx(num_nodes, unique_edges)
 
         # Clustering coefficient
         try:
@@ -983,7 +1274,7 @@ class GraphBuilder:
             stats['avg_clustering'] = 0.0
 
         # Centrality measures (sample if graph is large)
-        if G.number_of_nodes() <= 1000:
+        if num_nodes <= 1000:
             try:
                 betweenness = nx.betweenness_centrality(G)
                 stats['max_betweenness'] = max(betweenness.values()) if betweenness else 0
@@ -1002,6 +1293,10 @@ class GraphBuilder:
         """
         Find dense subgraphs that might indicate collusion clusters.
 
+        Nodes outside the (min_size - 1)-core cannot belong to a clique of
+        min_size nodes, so they are pruned via the CSR index before clique
+        enumeration.
+
         Args:
             graph: The co-bidding graph
             min_size: Minimum cluster size
@@ -1013,10 +1308,19 @@ class GraphBuilder:
         if not NETWORKX_AVAILABLE:
             return []
 
-        G = graph.to_networkx()
-        if G is None or len(G) < min_size:
+        if graph.num_nodes() < min_size:
             return []
 
+        unique_edges = _unique_undirected_edges(graph.edge_index)
+        core = graph.adjacency.core_numbers()
+        keep = core >= (min_size - 1)
+        unique_edges = unique_edges[:, keep[unique_edges[0]] & keep[unique_edges[1]]]
+        if unique_edges.shape[1] == 0:
+            return []
+
+        G = nx.Graph()
+        G.add_edges_from(unique_edges.T.tolist())
+
         dense_subgraphs = []
 
         # Find cliques (complete subgraphs)
@@ -1036,6 +1340,32 @@ class GraphBuilder:
 # Utility Functions
 # =============================================================================
 
+def _unique_undirected_edges(edge_index: np.ndarray) -> np.ndarray:
+    """Deduplicated (min, max) pairs without self-loops, shape [2, num_unique]."""
+    edge_index = np.asarray(edge_index, dtype=np.int64).reshape(2, -1)
+    lo = np.minimum(edge_index[0], edge_index[1])
+    hi = np.maximum(edge_index[0], edge_index[1])
+    pairs = np.stack([lo, hi])[:, lo != hi]
+    if pairs.shape[1] == 0:
+        return pairs
+    return np.unique(pairs, axis=1)
+
+
+def _structural_networkx(num_nodes: int, unique_edges: np.ndarray) -> 'nx.Graph':
+    """Attribute-free NetworkX graph, much cheaper than BidderGraph.to_networkx()."""
+    G = nx.Graph()
+    G.add_nodes_from(range(num_nodes))
+    G.add_edges_from(unique_edges.T.tolist())
+    return G
+
+
+def _as_datetime(value) -> datetime:
+    """Promote a DATE column value to datetime (temporal decay subtracts from utcnow)."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, datetime.min.time())
+
+
 async def build_graph_from_db(
     pool: asyncpg.Pool,
     graph_type: str = 'co_bidding',
@@ -1065,7 +1395,13 @@ async def build_graph_from_db(
 
 
 def save_graph(graph: BidderGraph, path: str):
-    """Save graph to file (supports .pt for PyTorch, .gpickle for NetworkX)."""
+    """
+    Save graph to file.
+
+    Supports .pt for PyTorch, .gpickle for NetworkX and .pkl/.pickle for
+    legacy pickles; any other path is treated as a snapshot directory and
+    gets a new binary snapshot version (see graph_snapshot.py).
+    """
     import pickle
 
     if path.endswith('.pt') and TORCH_AVAILABLE:
@@ -1075,20 +1411,41 @@ def save_graph(graph: BidderGraph, path: str):
     elif path.endswith('.gpickle') and NETWORKX_AVAILABLE:
         G = graph.to_networkx()
         nx.write_gpickle(G, path)
-    else:
-        # Save as pickle
+    elif path.endswith(('.pkl', '.pickle')):
         with open(path, 'wb') as f:
             pickle.dump(graph, f)
+    else:
+        from ai.corruption.ml_models.graph_snapshot import write_graph_snapshot
+        target = Path(path)
+        manifest = write_graph_snapshot(
+            graph,
+            cache_key=target.name,
+            root=target.parent,
+            node_feature_names=GraphBuilder.BIDDER_FEATURES,
+            edge_feature_names=GraphBuilder.EDGE_FEATURES,
+        )
+        path = manifest['path']
 
     logger.info(f"Saved graph to {path}")
 
 
 def load_graph(path: str) -> BidderGraph:
-    """Load graph from file."""
+    """Load graph from a snapshot directory or a legacy pickle file."""
     import pickle
 
-    with open(path, 'rb') as f:
-        graph = pickle.load(f)
+    if Path(path).is_dir():
+        from ai.corruption.ml_models.graph_snapshot import (
+            SnapshotError, latest_snapshot_path, load_graph_snapshot,
+        )
+        snapshot_dir = Path(path)
+        if not (snapshot_dir / 'manifest.json').exists():
+            snapshot_dir = latest_snapshot_path(snapshot_dir.name, root=snapshot_dir.parent)
+            if snapshot_dir is None:
+                raise SnapshotError(f"No graph snapshot under {path}")
+        graph = load_graph_snapshot(snapshot_dir).to_bidder_graph()
+    else:
+        with open(path, 'rb') as f:
+            graph = pickle.load(f)
 
     logger.info(f"Loaded graph from {path}")
     return graph
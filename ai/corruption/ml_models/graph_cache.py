@@ -1,12 +1,14 @@
 """
 Graph Cache Manager
 
-Caches the co-bidding graph in PostgreSQL JSONB tables (gnn_graph_cache,
-gnn_predictions_cache).  Rebuilt daily by cron; the API reads the cached
-version for fast inference.
+Caches the co-bidding graph as a binary, memory-mapped snapshot on disk
+(see graph_snapshot.py) and records it in PostgreSQL (gnn_graph_cache), next
+to per-company predictions (gnn_predictions_cache).  Rebuilt daily by cron;
+the API maps the cached snapshot for fast inference.
 
 The cache stores:
-- Serialized graph: node list, edge list, node_index mapping, node features
+- Graph snapshot: node features, edge index/features, name -> id table
+  (gnn_graph_cache keeps only the manifest, path and checksum)
 - Per-company risk predictions
 - Cluster membership
 
@@ -14,19 +16,32 @@ Usage:
     from graph_cache import build_and_cache_graph, get_cached_graph
 
     pool = await get_asyncpg_pool()
-    graph_dict = await get_cached_graph(pool)
+    snapshot = await get_cached_graph(pool)
     # or force rebuild:
-    graph_dict = await build_and_cache_graph(pool)
+    meta = await build_and_cache_graph(pool)
 """
 
 import json
 import logging
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import numpy as np
 
+try:
+    from ai.corruption.ml_models.graph_snapshot import (
+        GraphSnapshot, SnapshotError, load_graph_snapshot, write_graph_snapshot,
+    )
+except ImportError:
+    # Fallback for when running from backend/ directory
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+    from ai.corruption.ml_models.graph_snapshot import (
+        GraphSnapshot, SnapshotError, load_graph_snapshot, write_graph_snapshot,
+    )
+
 logger = logging.getLogger(__name__)
 
 # Default parameters that match the training pipeline
@@ -52,7 +67,8 @@ async def build_and_cache_graph(
     Build co-bidding graph from tender_bidders table and cache in DB.
 
     This is intended to be called from a daily cron job.  It builds the
-    graph, serializes it to JSON, and stores it in gnn_graph_cache.
+    graph, writes a new binary snapshot version, and records the snapshot
+    manifest (path, checksum, counts) in gnn_graph_cache.
 
     Args:
         pool: asyncpg connection pool
@@ -79,37 +95,49 @@ async def build_and_cache_graph(
         min_co_bids=min_co_bids,
         time_window_days=time_window_days,
         min_bids_per_company=min_bids_per_company,
-        include_edge_features=False,  # lighter for cache
+        include_edge_features=True,  # single aggregation query, no per-edge round-trips
         include_labels=False,
     )
 
     node_count = graph.num_nodes()
     edge_count = graph.num_edges()
 
-    # Serialize to a JSON-friendly dict
-    serialized = _serialize_graph(graph)
+    # Write the binary snapshot; the DB row only carries its manifest
+    cache_key = f"co_bidding_{time_window_days}d"
+    manifest = write_graph_snapshot(
+        graph,
+        cache_key=cache_key,
+        node_feature_names=GraphBuilder.BIDDER_FEATURES,
+        edge_feature_names=GraphBuilder.EDGE_FEATURES,
+    )
 
     duration = time.monotonic() - start
 
-    # Store in DB
-    cache_key = f"co_bidding_{time_window_days}d"
     async with pool.acquire() as conn:
         await conn.execute(
             """
-            INSERT INTO gnn_graph_cache (cache_key, graph_data, node_count, edge_count, built_at, build_duration_seconds)
-            VALUES ($1, $2::jsonb, $3, $4, NOW(), $5)
+            INSERT INTO gnn_graph_cache
+                (cache_key, graph_data, node_count, edge_count, built_at, build_duration_seconds,
+                 snapshot_path, snapshot_version, snapshot_checksum)
+            VALUES ($1, $2::jsonb, $3, $4, NOW(), $5, $6, $7, $8)
             ON CONFLICT (cache_key) DO UPDATE SET
                 graph_data = EXCLUDED.graph_data,
                 node_count = EXCLUDED.node_count,
                 edge_count = EXCLUDED.edge_count,
                 built_at = NOW(),
-                build_duration_seconds = EXCLUDED.build_duration_seconds
+                build_duration_seconds = EXCLUDED.build_duration_seconds,
+                snapshot_path = EXCLUDED.snapshot_path,
+                snapshot_version = EXCLUDED.snapshot_version,
+                snapshot_checksum = EXCLUDED.snapshot_checksum
             """,
             cache_key,
-            json.dumps(serialized),
+            json.dumps(manifest),
             node_count,
             edge_count,
             duration,
+            manifest["path"],
+            manifest["version"],
+            manifest["checksum"],
         )
 
     logger.info(
@@ -123,6 +151,8 @@ async def build_and_cache_graph(
         "edge_count": edge_count,
         "built_at": datetime.utcnow().isoformat(),
         "build_duration_seconds": round(duration, 2),
+        "snapshot_path": manifest["path"],
+        "snapshot_version": manifest["version"],
     }
 
 
@@ -130,11 +160,13 @@ async def get_cached_graph(
     pool,
     cache_key: str = CACHE_KEY,
     max_age_hours: int = CACHE_TTL_HOURS,
-) -> Optional[Dict[str, Any]]:
+) -> Optional[GraphSnapshot]:
     """
-    Load cached graph from DB.  Returns None if cache is missing or stale.
+    Map the cached graph snapshot.  Returns None if cache is missing or stale.
 
-    Falls back to building the graph if the cache is older than max_age_hours.
+    The DB row points at the snapshot directory and carries its checksum;
+    the arrays themselves are memory-mapped read-only, so all workers on a
+    host share the same pages.
 
     Args:
         pool: asyncpg connection pool
@@ -142,12 +174,12 @@ async def get_cached_graph(
         max_age_hours: Maximum acceptable cache age in hours
 
     Returns:
-        Deserialized graph dict, or None if not available.
+        GraphSnapshot, or None if not available.
     """
     async with pool.acquire() as conn:
         row = await conn.fetchrow(
             """
-            SELECT graph_data, node_count, edge_count, built_at
+            SELECT snapshot_path, snapshot_checksum, node_count, edge_count, built_at
             FROM gnn_graph_cache
             WHERE cache_key = $1
               AND built_at >= NOW() - $2::interval
@@ -160,16 +192,22 @@ async def get_cached_graph(
         logger.info(f"Graph cache miss or stale (key={cache_key})")
         return None
 
-    graph_data = row["graph_data"]
-    if isinstance(graph_data, str):
-        graph_data = json.loads(graph_data)
+    if not row["snapshot_path"]:
+        logger.info(f"Graph cache row predates binary snapshots, rebuild needed (key={cache_key})")
+        return None
+
+    try:
+        snapshot = load_graph_snapshot(row["snapshot_path"], checksum=row["snapshot_checksum"])
+    except SnapshotError as e:
+        logger.warning(f"Graph snapshot unusable (key={cache_key}): {e}")
+        return None
 
     logger.info(
         f"Graph cache hit: {row['node_count']} nodes, "
         f"{row['edge_count']} edges, built {row['built_at']}"
     )
 
-    return graph_data
+    return snapshot
 
 
 async def cache_predictions(
@@ -278,7 +316,8 @@ async def get_cache_status(pool) -> Dict[str, Any]:
     """Return metadata about the current cache state."""
     graph_row = await pool.fetchrow(
         """
-        SELECT cache_key, node_count, edge_count, built_at, build_duration_seconds
+        SELECT cache_key, node_count, edge_count, built_at, build_duration_seconds,
+               snapshot_version, snapshot_path
         FROM gnn_graph_cache
         ORDER BY built_at DESC LIMIT 1
         """
@@ -296,69 +335,3 @@ async def get_cache_status(pool) -> Dict[str, Any]:
         "graph": dict(graph_row) if graph_row else None,
         "predictions": dict(pred_row) if pred_row else None,
     }
-
-
-# ---------------------------------------------------------------------------
-# Internal helpers
-# ---------------------------------------------------------------------------
-
-
-def _serialize_graph(graph) -> Dict[str, Any]:
-    """
-    Serialize a BidderGraph to a JSON-safe dict.
-
-    We keep:
-      - node_index: {name -> int}
-      - nodes: [{name, node_type, features, metadata}]
-      - edges: [{source, target, weight, edge_type}]
-      - node_features: [[float, ...], ...] (2-D list)
-      - metadata: graph-level metadata
-    """
-    nodes = []
-    for n in graph.nodes:
-        nodes.append({
-            "node_id": n.node_id,
-            "name": n.name,
-            "node_type": n.node_type,
-            "features": {k: _to_native(v) for k, v in n.features.items()},
-            "metadata": {k: _to_native(v) for k, v in n.metadata.items()},
-        })
-
-    edges = []
-    for e in graph.edges:
-        edges.append({
-            "source": int(e.source),
-            "target": int(e.target),
-            "edge_type": e.edge_type,
-            "weight": float(e.weight),
-        })
-
-    # Store raw node features as a 2-D list for numpy reconstruction
-    nf = graph.node_features
-    if isinstance(nf, np.ndarray) and nf.size > 0:
-        node_features_list = nf.tolist()
-    else:
-        node_features_list = []
-
-    return {
-        "node_index": graph.node_index,
-        "nodes": nodes,
-        "edges": edges,
-        "node_features": node_features_list,
-        "metadata": {k: _to_native(v) for k, v in graph.metadata.items()},
-    }
-
-
-def _to_native(value):
-    """Convert numpy scalars / dates to JSON-serializable Python types."""
-    if isinstance(value, (np.floating, np.float32, np.float64)):
-        return float(value)
-    if isinstance(value, (np.integer, np.int32, np.int64)):
-        return int(value)
-    if isinstance(value, np.ndarray):
-        return value.tolist()
-    if isinstance(value, datetime):
-        return value.isoformat()
-    if isinstance(value, timedelta):
-        return value.total_seconds()
-    return value
@@ -0,0 +1,365 @@
+"""
+Binary Graph Snapshots
+
+On-disk snapshot format for the co-bidding graph, replacing the JSONB /
+pickle caches.  A snapshot is a versioned directory of plain NumPy arrays
+plus a small JSON manifest:
+
+    <root>/<cache_key>/<version>/
+        manifest.json       format version, counts, per-file sha256, checksum
+        names.json          node names and node types (row order = node id)
+        node_features.npy   float32 [num_nodes, num_node_features]
+        edge_index.npy      int64   [2, num_edges]
+        edge_attr.npy       float32 [num_edges, num_edge_features]
+        edge_weight.npy     float32 [num_edges]
+
+Arrays are loaded with ``np.load(mmap_mode='r')``, so every API worker maps
+the same read-only pages instead of parsing and holding its own copy.  The
+database row (gnn_graph_cache) only stores the manifest metadata and the
+checksum.
+
+Usage:
+    from graph_snapshot import write_graph_snapshot, load_graph_snapshot
+
+    manifest = write_graph_snapshot(graph, cache_key="co_bidding_730d")
+    snapshot = load_graph_snapshot(manifest["path"], checksum=manifest["checksum"])
+    neighbors = snapshot.adjacency.neighbors_of(snapshot.node_index["Alkaloid"])
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_ROOT = Path(
+    os.getenv("GNN_SNAPSHOT_DIR", str(Path(__file__).parent / "models" / "snapshots"))
+)
+SNAPSHOT_KEEP_VERSIONS = 2  # Previous version stays for workers still mapping it
+
+_ARRAY_FILES = ("node_features", "edge_index", "edge_attr", "edge_weight")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, incompatible or corrupt."""
+
+
+@dataclass
+class GraphSnapshot:
+    """
+    Read-only, memory-mapped view of a co-bidding graph snapshot.
+
+    Attributes:
+        path: Snapshot directory
+        manifest: Parsed manifest.json
+        names: Node names (index = node id)
+        node_types: Node types (index = node id)
+        node_index: Mapping from node name to node id
+        node_features, edge_index, edge_attr, edge_weight: Memory-mapped arrays
+    """
+    path: Path
+    manifest: Dict[str, Any]
+    names: List[str]
+    node_types: List[str]
+    node_index: Dict[str, int]
+    node_features: np.ndarray
+    edge_index: np.ndarray
+    edge_attr: np.ndarray
+    edge_weight: np.ndarray
+    _adjacency: Any = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    @property
+    def checksum(self) -> str:
+        return self.manifest["checksum"]
+
+    def num_nodes(self) -> int:
+        return len(self.names)
+
+    def num_edges(self) -> int:
+        return int(self.edge_index.shape[1])
+
+    @property
+    def adjacency(self):
+        """CSR adjacency index (built on first use, private to this worker)."""
+        if self._adjacency is None:
+            self._adjacency = _graph_builder().CSRAdjacency(self.edge_index, self.num_nodes())
+        return self._adjacency
+
+    def to_bidder_graph(self):
+        """Materialize a full BidderGraph (copies arrays out of the mapping)."""
+        gb = _graph_builder()
+        BidderGraph, GraphEdge, GraphNode = gb.BidderGraph, gb.GraphEdge, gb.GraphNode
+
+        node_feature_names = self.manifest.get("node_feature_names") or []
+        edge_feature_names = self.manifest.get("edge_feature_names") or []
+        node_features = np.array(self.node_features)
+        edge_attr = np.array(self.edge_attr)
+
+        nodes = [
+            GraphNode(
+                node_id=i,
+                node_type=self.node_types[i],
+                name=name,
+                features=dict(zip(node_feature_names, node_features[i].tolist()))
+                if node_features.ndim == 2 else {},
+            )
+            for i, name in enumerate(self.names)
+        ]
+        edges = [
+            GraphEdge(
+                source=int(src),
+                target=int(dst),
+                edge_type=self.manifest.get("edge_type", "co_bid"),
+                weight=float(w),
+                features=dict(zip(edge_feature_names, edge_attr[k].tolist()))
+                if edge_attr.ndim == 2 and edge_attr.shape[0] else {},
+            )
+            for k, (src, dst, w) in enumerate(
+                zip(self.edge_index[0].tolist(), self.edge_index[1].tolist(), self.edge_weight.tolist())
+            )
+        ]
+
+        return BidderGraph(
+            nodes=nodes,
+            edges=edges,
+            node_features=node_features,
+            edge_index=np.array(self.edge_index),
+            edge_attr=edge_attr,
+            node_index=dict(self.node_index),
+            metadata=dict(self.manifest.get("metadata", {})),
+        )
+
+
+def write_graph_snapshot(
+    graph,
+    cache_key: str,
+    root: Optional[Path] = None,
+    node_feature_names: Optional[List[str]] = None,
+    edge_feature_names: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Write a BidderGraph as a new snapshot version.
+
+    The snapshot is assembled in a temporary directory and renamed into
+    place, so readers never see a partial version.  Older versions beyond
+    SNAPSHOT_KEEP_VERSIONS are removed.
+
+    Args:
+        graph: BidderGraph to persist
+        cache_key: Logical cache key (subdirectory name)
+        root: Snapshot root directory (default SNAPSHOT_ROOT)
+        node_feature_names: Column names of graph.node_features
+        edge_feature_names: Column names of graph.edge_attr
+
+    Returns:
+        The manifest dict, with an added "path" entry
+    """
+    root = Path(root or SNAPSHOT_ROOT)
+    key_dir = root / cache_key
+    key_dir.mkdir(parents=True, exist_ok=True)
+
+    num_edges = int(np.asarray(graph.edge_index).reshape(2, -1).shape[1])
+    edge_attr = np.asarray(graph.edge_attr, dtype=np.float32)
+    if edge_attr.ndim != 2 or edge_attr.shape[0] != num_edges:
+        edge_attr = np.zeros((num_edges, 0), dtype=np.float32)
+
+    arrays = {
+        "node_features": np.ascontiguousarray(graph.node_features, dtype=np.float32),
+        "edge_index": np.ascontiguousarray(np.asarray(graph.edge_index).reshape(2, -1), dtype=np.int64),
+        "edge_attr": np.ascontiguousarray(edge_attr),
+        "edge_weight": np.array([e.weight for e in graph.edges], dtype=np.float32)
+        if len(graph.edges) == num_edges else np.ones(num_edges, dtype=np.float32),
+    }
+    names = {
+        "names": [n.name for n in graph.nodes],
+        "node_types": [n.node_type for n in graph.nodes],
+    }
+
+    version = datetime.utcnow().strftime("%Y%m%dT%H%M%S%fZ")
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=key_dir))
+    try:
+        os.chmod(tmp_dir, 0o755)  # mkdtemp is owner-only; workers may run as another user
+        files = {}
+        for name, array in arrays.items():
+            np.save(tmp_dir / f"{name}.npy", array, allow_pickle=False)
+            files[name] = {
+                "file": f"{name}.npy",
+                "dtype": str(array.dtype),
+                "shape": list(array.shape),
+                "sha256": _sha256_file(tmp_dir / f"{name}.npy"),
+            }
+        with open(tmp_dir / "names.json", "w", encoding="utf-8") as f:
+            json.dump(names, f, ensure_ascii=False)
+        files["names"] = {"file": "names.json", "sha256": _sha256_file(tmp_dir / "names.json")}
+
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "cache_key": cache_key,
+            "version": version,
+            "node_count": len(graph.nodes),
+            "edge_count": num_edges,
+            "edge_type": graph.edges[0].edge_type if graph.edges else "co_bid",
+            "node_feature_names": list(node_feature_names or []),
+            "edge_feature_names": list(edge_feature_names or []),
+            "files": files,
+            "checksum": _combined_checksum(files),
+            "metadata": {k: _json_safe(v) for k, v in graph.metadata.items()},
+        }
+        with open(tmp_dir / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        final_dir = key_dir / version
+        os.replace(tmp_dir, final_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    _prune_versions(key_dir, keep=SNAPSHOT_KEEP_VERSIONS)
+
+    logger.info(
+        f"Graph snapshot written: {manifest['node_count']} nodes, "
+        f"{manifest['edge_count']} edges -> {final_dir}"
+    )
+    manifest["path"] = str(final_dir)
+    return manifest
+
+
+def load_graph_snapshot(
+    path,
+    checksum: Optional[str] = None,
+    verify: bool = False,
+    mmap: bool = True,
+) -> GraphSnapshot:
+    """
+    Open a snapshot directory.
+
+    Args:
+        path: Snapshot version directory
+        checksum: Expected manifest checksum (e.g. from gnn_graph_cache)
+        verify: Re-hash every file against the manifest (reads all pages)
+        mmap: Memory-map arrays read-only instead of loading them
+
+    Returns:
+        GraphSnapshot
+
+    Raises:
+        SnapshotError: if the snapshot is missing, incompatible or corrupt
+    """
+    path = Path(path)
+    manifest_path = path / "manifest.json"
+    if not manifest_path.exists():
+        raise SnapshotError(f"No snapshot manifest at {path}")
+
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(
+            f"Unsupported snapshot format {manifest.get('format_version')} at {path}"
+        )
+    if checksum is not None and manifest.get("checksum") != checksum:
+        raise SnapshotError(f"Snapshot checksum mismatch at {path}")
+
+    files = manifest["files"]
+    if verify:
+        for name, info in files.items():
+            if _sha256_file(path / info["file"]) != info["sha256"]:
+                raise SnapshotError(f"Snapshot file {info['file']} is corrupt at {path}")
+
+    mmap_mode = "r" if mmap else None
+    arrays = {}
+    for name in _ARRAY_FILES:
+        array = np.load(path / files[name]["file"], mmap_mode=mmap_mode, allow_pickle=False)
+        if list(array.shape) != files[name]["shape"]:
+            raise SnapshotError(f"Snapshot array {name} has unexpected shape at {path}")
+        arrays[name] = array
+
+    with open(path / files["names"]["file"], encoding="utf-8") as f:
+        names = json.load(f)
+
+    return GraphSnapshot(
+        path=path,
+        manifest=manifest,
+        names=names["names"],
+        node_types=names["node_types"],
+        node_index={name: i for i, name in enumerate(names["names"])},
+        **arrays,
+    )
+
+
+def latest_snapshot_path(cache_key: str, root: Optional[Path] = None) -> Optional[Path]:
+    """Return the newest complete snapshot directory for cache_key, if any."""
+    key_dir = Path(root or SNAPSHOT_ROOT) / cache_key
+    versions = _list_versions(key_dir)
+    return versions[-1] if versions else None
+
+
+# ---------------------------------------------------------------------------
+# Internal helpers
+# ---------------------------------------------------------------------------
+
+
+def _graph_builder():
+    try:
+        from ai.corruption.ml_models import graph_builder
+    except ImportError:
+        # Fallback for when running from backend/ directory
+        import sys
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+        from ai.corruption.ml_models import graph_builder
+    return graph_builder
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _combined_checksum(files: Dict[str, Dict[str, Any]]) -> str:
+    h = hashlib.sha256()
+    for name in sorted(files):
+        h.update(f"{name}:{files[name]['sha256']}\n".encode())
+    return h.hexdigest()
+
+
+def _list_versions(key_dir: Path) -> List[Path]:
+    if not key_dir.is_dir():
+        return []
+    return sorted(
+        p for p in key_dir.iterdir()
+        if p.is_dir() and not p.name.startswith(".") and (p / "manifest.json").exists()
+    )
+
+
+def _prune_versions(key_dir: Path, keep: int):
+    for old in _list_versions(key_dir)[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _json_safe(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list, str, int, float, bool)) or value is None:
+        return value
+    return str(value)
@@ -0,0 +1,324 @@
+"""
+Resident Corruption Prediction Service
+
+Keeps the trained corruption models warm for the lifetime of the API process
+instead of building a CorruptionPredictor (own connection pool + unpickled
+models) on every /corruption/predict request.
+
+- Models are loaded once at startup and share the app's asyncpg pool.
+- Concurrent single-tender predictions are coalesced by a micro-batcher: the
+  first request opens a batch, requests arriving within ML_PREDICT_MAX_WAIT_MS
+  (or until ML_PREDICT_MAX_BATCH) join it, and the whole batch goes through
+  one feature extraction query and one predict_proba call per model.
+- Every ML_MODEL_RELOAD_INTERVAL seconds the active versions in
+  model_registry and the model file mtimes are compared with the loaded set;
+  on a change a new predictor is loaded in the background and swapped in.
+  Batches already running finish on the old models.
+
+Usage (inside FastAPI):
+
+    from ai.corruption.ml_models.prediction_service import PredictionService
+
+    @app.on_event("startup")
+    async def startup():
+        await PredictionService.get_instance().initialize(pool=pool)
+
+    result = await PredictionService.get_instance().predict(tender_id)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ai.corruption.ml_models.predict_pipeline import (
+    MODEL_FILES,
+    CorruptionPredictor,
+    PredictionResult
+)
+
+logger = logging.getLogger(__name__)
+
+_MODELS_DIR = Path(__file__).parent / "models"
+
+ML_PREDICT_MAX_BATCH = int(os.getenv("ML_PREDICT_MAX_BATCH", "64"))
+ML_PREDICT_MAX_WAIT_MS = float(os.getenv("ML_PREDICT_MAX_WAIT_MS", "5"))
+ML_MODEL_RELOAD_INTERVAL = int(os.getenv("ML_MODEL_RELOAD_INTERVAL", "60"))  # seconds, 0 = never
+
+_Pending = Tuple[str, asyncio.Future]
+
+
+class PredictionService:
+    """
+    Singleton, process-wide corruption predictor with micro-batching.
+
+    Attributes:
+        max_batch: Largest number of tenders scored together
+        max_wait: Seconds a batch stays open for more requests
+    """
+
+    _instance: Optional["PredictionService"] = None
+
+    def __init__(
+        self,
+        models_dir: Optional[str] = None,
+        max_batch: int = ML_PREDICT_MAX_BATCH,
+        max_wait_ms: float = ML_PREDICT_MAX_WAIT_MS,
+        reload_interval: int = ML_MODEL_RELOAD_INTERVAL
+    ):
+        self.models_dir = Path(models_dir) if models_dir else _MODELS_DIR
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.reload_interval = reload_interval
+
+        self._pool = None
+        self._predictor: Optional[CorruptionPredictor] = None
+        self._signature: Optional[Tuple] = None
+        self._loaded_at: Optional[str] = None
+        self._init_lock = asyncio.Lock()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._reload_task: Optional[asyncio.Task] = None
+
+        # Counters for get_status()
+        self._batches = 0
+        self._predictions = 0
+        self._reloads = 0
+
+    # ------------------------------------------------------------------
+    # Singleton
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def get_instance(cls) -> "PredictionService":
+        """Return the singleton instance (create if needed)."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def loaded(self) -> bool:
+        return self._predictor is not None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def initialize(self, pool):
+        """
+        Load the models and start the batcher and reload watcher.
+
+        Args:
+            pool: The app's asyncpg pool (shared, never closed here)
+        """
+        async with self._init_lock:
+            if self._predictor is not None:
+                return
+
+            start = time.monotonic()
+            self._pool = pool
+            self._signature = await self._model_signature()
+            self._predictor = await self._load_predictor()
+            self._loaded_at = datetime.utcnow().isoformat()
+
+            self._queue = asyncio.Queue()
+            self._batch_task = asyncio.create_task(self._batch_loop())
+            if self.reload_interval > 0:
+                self._reload_task = asyncio.create_task(self._reload_loop())
+
+            logger.info(
+                f"PredictionService initialized in {time.monotonic() - start:.2f}s "
+                f"({len(self._predictor.models)} models)"
+            )
+
+    async def cleanup(self):
+        """Stop background tasks and drop the loaded models."""
+        for task in (self._batch_task, self._reload_task):
+            if task is not None:
+                task.cancel()
+        for task in (self._batch_task, self._reload_task):
+            if task is not None:
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+
+        self._batch_task = None
+        self._reload_task = None
+        self._queue = None
+        self._predictor = None
+        logger.info("PredictionService cleaned up")
+
+    # ------------------------------------------------------------------
+    # Public prediction API
+    # ------------------------------------------------------------------
+
+    async def predict(self, tender_id: str) -> Optional[PredictionResult]:
+        """
+        Predict one tender; coalesced with concurrent calls.
+
+        Returns None when features could not be extracted.
+        """
+        if self._queue is None:
+            raise RuntimeError("PredictionService is not initialized")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((tender_id, future))
+        return await future
+
+    async def predict_many(self, tender_ids: Sequence[str]) -> List[PredictionResult]:
+        """Predict a known list of tenders directly, in max_batch chunks."""
+        if self._predictor is None:
+            raise RuntimeError("PredictionService is not initialized")
+
+        results: List[PredictionResult] = []
+        for i in range(0, len(tender_ids), self.max_batch):
+            results.extend(await self._score(list(tender_ids[i:i + self.max_batch])))
+        return results
+
+    def get_status(self) -> Dict[str, Any]:
+        """Loaded models, model versions and batching counters."""
+        predictor = self._predictor
+        return {
+            "loaded": predictor is not None,
+            "models": sorted(predictor.models) if predictor else [],
+            "loaded_at": self._loaded_at,
+            "active_versions": dict(self._signature[0]) if self._signature else {},
+            "reloads": self._reloads,
+            "batches": self._batches,
+            "predictions": self._predictions,
+            "avg_batch_size": round(self._predictions / self._batches, 2) if self._batches else 0,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+    # ------------------------------------------------------------------
+    # Micro-batching
+    # ------------------------------------------------------------------
+
+    async def _batch_loop(self):
+        """Collect queued requests into batches and score them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[_Pending] = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    # Still take whatever is already waiting
+                    if self._queue.empty():
+                        break
+                    batch.append(self._queue.get_nowait())
+                    continue
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch: List[_Pending]):
+        """Score one batch and resolve every waiting future."""
+        pending = [(tid, fut) for tid, fut in batch if not fut.cancelled()]
+        if not pending:
+            return
+
+        tender_ids = list(dict.fromkeys(tid for tid, _ in pending))
+        outcomes: Dict[str, Any] = {}
+        try:
+            for r in await self._score(tender_ids):
+                outcomes[r.tender_id] = r
+            for tender_id in tender_ids:
+                outcomes.setdefault(tender_id, None)
+        except Exception as e:
+            if len(tender_ids) == 1:
+                outcomes[tender_ids[0]] = e
+            else:
+                # Isolate the failing tender(s): score one by one so a single
+                # bad request does not fail everyone it was batched with
+                logger.warning(f"Prediction batch of {len(tender_ids)} failed ({e}), retrying individually")
+                for tender_id in tender_ids:
+                    try:
+                        results = await self._score([tender_id])
+                        outcomes[tender_id] = results[0] if results else None
+                    except Exception as single_error:
+                        outcomes[tender_id] = single_error
+
+        for tender_id, future in pending:
+            if future.done():
+                continue
+            outcome = outcomes.get(tender_id)
+            if isinstance(outcome, Exception):
+                logger.error(f"Prediction for {tender_id} failed: {outcome}")
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    async def _score(self, tender_ids: List[str]) -> List[PredictionResult]:
+        """One feature query and one vectorized scoring pass."""
+        predictor = self._predictor
+        feature_vectors = await predictor.feature_extractor.extract_features_batch(tender_ids)
+        results = await asyncio.to_thread(predictor.score_features, feature_vectors)
+        self._batches += 1
+        self._predictions += len(tender_ids)
+        return results
+
+    # ------------------------------------------------------------------
+    # Hot reload
+    # ------------------------------------------------------------------
+
+    async def _load_predictor(self) -> CorruptionPredictor:
+        predictor = CorruptionPredictor(models_dir=str(self.models_dir), pool=self._pool)
+        await predictor.initialize()
+        return predictor
+
+    async def _model_signature(self) -> Tuple:
+        """(active registry versions, model file mtimes) - changes trigger a reload."""
+        versions: Tuple = ()
+        try:
+            async with self._pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT model_name, version_id FROM model_registry
+                    WHERE is_active = TRUE
+                """)
+            versions = tuple(sorted((r['model_name'], str(r['version_id'])) for r in rows))
+        except Exception as e:
+            logger.debug(f"model_registry not readable: {e}")
+
+        mtimes = []
+        for filename in ["scaler.pkl", "feature_names.json", *MODEL_FILES.values()]:
+            path = self.models_dir / filename
+            if path.exists():
+                mtimes.append((filename, path.stat().st_mtime_ns))
+        return versions, tuple(mtimes)
+
+    async def reload_if_changed(self) -> bool:
+        """Swap in freshly loaded models if the active set changed."""
+        signature = await self._model_signature()
+        if signature == self._signature:
+            return False
+
+        logger.info("Model set changed - reloading corruption models")
+        self._predictor = await self._load_predictor()
+        self._signature = signature
+        self._loaded_at = datetime.utcnow().isoformat()
+        self._reloads += 1
+        return True
+
+    async def _reload_loop(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await self.reload_if_changed()
+            except Exception as e:
+                logger.error(f"Model reload failed, keeping current models: {e}")
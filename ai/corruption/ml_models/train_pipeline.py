@@ -44,6 +44,11 @@ from ai.corruption.ml_models.tracking import (
     CorruptionMLflowTracker, TrainingConfig, ModelMetrics,
     calculate_metrics, get_tracker
 )
+from ai.corruption.ml_models.predict_pipeline import (
+    ANOMALY_MAPPING,
+    anomaly_probability,
+    model_scores
+)
 
 logger = logging.getLogger(__name__)
 
@@ -697,9 +702,8 @@ class CorruptionTrainingPipeline:
 
         # Predict (anomaly = -1, normal = 1)
         def predict_and_score(X):
-            raw_scores = model.decision_function(X)
-            # Convert to probability-like scores (0-1, higher = more anomalous)
-            scores = 1 - (raw_scores - raw_scores.min()) / (raw_scores.max() - raw_scores.min() + 1e-10)
+            # Probability-like scores (0-1, higher = more anomalous), same mapping as serving
+            scores = anomaly_probability(model.decision_function(X))
             predictions = (model.predict(X) == -1).astype(int)  # -1 = anomaly = 1
             return predictions, scores
 
@@ -751,23 +755,7 @@ class CorruptionTrainingPipeline:
 
         # Get predictions from each base model
         def get_predictions(model_result, X):
-            model = model_result.model
-            model_type = model_result.model_type
-
-            if model_type == 'neural_network':
-                import torch
-                model.eval()
-                with torch.no_grad():
-                    device = next(model.parameters()).device
-                    X_t = torch.FloatTensor(X).to(device)
-                    proba = model(X_t).cpu().numpy().flatten()
-            elif model_type == 'isolation_forest':
-                raw_scores = model.decision_function(X)
-                proba = 1 - (raw_scores - raw_scores.min()) / (raw_scores.max() - raw_scores.min() + 1e-10)
-            else:
-                proba = model.predict_proba(X)[:, 1]
-
-            return proba
+            return model_scores(model_result.model_type, model_result.model, X)
 
         # Stack predictions
         train_preds = np.column_stack([
@@ -805,7 +793,8 @@ class CorruptionTrainingPipeline:
         ensemble = {
             'meta_model': meta_model,
             'base_models': [m.model for m in base_models],
-            'base_model_types': [m.model_type for m in base_models]
+            'base_model_types': [m.model_type for m in base_models],
+            'anomaly_mapping': ANOMALY_MAPPING
         }
 
         elapsed = (datetime.utcnow() - start_time).total_seconds()
@@ -944,8 +933,7 @@ class CorruptionTrainingPipeline:
                     if model_name != 'anomaly':
                         test_proba = result.model.predict_proba(data.X_test)[:, 1]
                     else:
-                        raw_scores = result.model.decision_function(data.X_test)
-                        test_proba = 1 - (raw_scores - raw_scores.min()) / (raw_scores.max() - raw_scores.min() + 1e-10)
+                        test_proba = anomaly_probability(result.model.decision_function(data.X_test))
 
                     self.tracker.log_roc_curve(data.y_test, test_proba)
                     self.tracker.log_precision_recall_curve(data.y_test, test_proba)
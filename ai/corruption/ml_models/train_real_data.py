@@ -135,32 +135,17 @@ async def extract_features_for_dataset(
     extractor = FeatureExtractor(pool)
     feature_names = extractor.feature_names
 
-    all_features = []
-    valid_ids = []
-    failed = 0
+    features, valid_ids = await extractor.extract_feature_matrix(tender_ids, batch_size=batch_size)
 
-    for i in range(0, len(tender_ids), batch_size):
-        batch_ids = tender_ids[i:i+batch_size]
-
-        for tender_id in batch_ids:
-            try:
-                fv = await extractor.extract_features(tender_id, include_metadata=False)
-                all_features.append(fv.feature_array)
-                valid_ids.append(tender_id)
-            except Exception as e:
-                failed += 1
-                if failed <= 5:
-                    logger.warning(f"Failed to extract features for {tender_id}: {e}")
-
-        if (i + batch_size) % 500 == 0:
-            logger.info(f"Extracted features for {i + batch_size}/{len(tender_ids)} tenders")
-
-    logger.info(f"Feature extraction complete: {len(valid_ids)} success, {failed} failed")
+    logger.info(
+        f"Feature extraction complete: {len(valid_ids)} success, "
+        f"{len(tender_ids) - len(valid_ids)} failed"
+    )
 
-    if not all_features:
+    if not valid_ids:
         raise ValueError("No features could be extracted")
 
-    return np.array(all_features), feature_names, valid_ids
+    return features, feature_names, valid_ids
 def preprocess_features(
     X_train: np.ndarray,
     X_test: np.ndarray
@@ -237,39 +237,21 @@ class TrainingDataExtractor:
         Returns:
             Tuple of (feature_matrix, feature_names, successful_tender_ids)
         """
-        features_list = []
-        successful_ids = []
-        failed_count = 0
-
         total = len(tender_ids)
-        for i, tender_id in enumerate(tender_ids):
-            if show_progress and (i + 1) % 100 == 0:
-                logger.info(f"Extracting features: {i + 1}/{total} ({(i+1)/total*100:.1f}%)")
-
-            try:
-                feature_vector = await self.feature_extractor.extract_features(
-                    tender_id, include_metadata=False
-                )
-                features_list.append(feature_vector.feature_array)
-                successful_ids.append(tender_id)
-            except Exception as e:
-                failed_count += 1
-                if failed_count <= 5:
-                    logger.warning(f"Failed to extract features for {tender_id}: {e}")
-
-        if failed_count > 5:
-            logger.warning(f"... and {failed_count - 5} more failures")
-
-        if not features_list:
+
+        # Bulk-loaded in chunks; progress is logged per chunk by the extractor
+        feature_matrix, successful_ids = await self.feature_extractor.extract_feature_matrix(tender_ids)
+
+        if not successful_ids:
             raise ValueError("Failed to extract features for any tender")
 
-        feature_matrix = np.vstack(features_list)
         feature_names = self.feature_extractor.feature_names
 
-        logger.info(
-            f"Extracted features for {len(successful_ids)}/{total} tenders "
-            f"({len(features_list[0])} features each)"
-        )
+        if show_progress:
+            logger.info(
+                f"Extracted features for {len(successful_ids)}/{total} tenders "
+                f"({feature_matrix.shape[1]} features each)"
+            )
 
         return feature_matrix, feature_names, successful_ids
 
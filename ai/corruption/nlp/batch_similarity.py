@@ -1,14 +1,33 @@
 """
 Batch Specification Similarity Computation
 
-Runs as a cron job (weekly) to pre-compute specification similarity pairs
-and institution reuse statistics. Results are stored in the database
-for fast API queries.
+Pre-computes specification similarity pairs and institution reuse
+statistics. Results are stored in the database for fast API queries.
+
+Similarity is cosine similarity between tender centroids (the mean chunk
+vector per tender), stored in tender_centroids and kept current by triggers
+on embeddings (migration 059). Two modes:
+
+- all (weekly): every centroid is loaded into a float32 matrix and top-k
+  neighbours are found with blocked matrix multiplies, then pairs and
+  institution stats are written in bulk.
+- incremental (after every embeddings run): only tenders whose centroid
+  changed since their pairs were computed are looked up, through the HNSW
+  index on tender_centroids.
+- copies: document texts are MinHashed and LSH candidate pairs confirmed
+  with common-block matching (copy_detection.py); copied_fraction is
+  written onto the pairs, so every institution is scanned for cloned specs.
 
 Usage:
     # Process all tenders with embeddings (default: top-5 most similar per tender)
     python batch_similarity.py
 
+    # Only tenders whose embeddings changed since the last run
+    python batch_similarity.py --mode incremental
+
+    # Scan document texts for copy-pasted specifications
+    python batch_similarity.py --mode copies
+
     # Limit to specific number of tenders
     python batch_similarity.py --limit 1000
 
@@ -31,9 +50,10 @@ import logging
 import os
 import sys
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 import asyncpg
+import numpy as np
 from dotenv import load_dotenv
 
 # Load .env from multiple possible locations
@@ -47,9 +67,112 @@ for env_path in env_paths:
         load_dotenv(env_path)
         break
 
+# Project root, for the ai.corruption.nlp package when run as a script
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from ai.corruption.nlp.spec_similarity import SpecSimilarityAnalyzer
+
 logger = logging.getLogger(__name__)
 
 
+def parse_vector(value) -> np.ndarray:
+    """pgvector text ('[0.1,0.2,...]') -> float32 array"""
+    return np.array(value.strip("[]").split(","), dtype=np.float32)
+
+
+def blocked_top_k(
+    matrix: np.ndarray,
+    query_rows: Sequence[int],
+    top_k: int,
+    min_similarity: float,
+    block_size: int = 256,
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Top-k most similar rows for each query row of a row-normalized matrix.
+
+    Scores block_size query rows at a time against the whole matrix with
+    one float32 matrix multiply, so memory stays at block_size x N.
+
+    Yields:
+        (source rows, neighbour rows, similarity) arrays per block, only
+        for pairs at or above min_similarity. A row is never its own
+        neighbour.
+    """
+    k = min(top_k, len(matrix) - 1)
+    if k <= 0:
+        return
+
+    query_rows = np.asarray(query_rows, dtype=np.int64)
+    for start in range(0, len(query_rows), block_size):
+        rows = query_rows[start:start + block_size]
+        scores = matrix[rows] @ matrix.T
+        scores[np.arange(len(rows)), rows] = -np.inf
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        hit_i, hit_j = np.nonzero(top_scores >= min_similarity)
+        yield rows[hit_i], top[hit_i, hit_j], top_scores[hit_i, hit_j]
+
+
+def classify_pair(
+    tender_id: str,
+    similar_tender_id: str,
+    sim_score: float,
+    source: Tuple[Optional[str], Optional[str]],
+    similar: Tuple[Optional[str], Optional[str]],
+) -> Dict:
+    """
+    Build a spec_similarity_pairs row from two tenders' (institution, winner).
+    """
+    source_institution, source_winner = source
+    institution, winner = similar
+
+    same_inst = (
+        institution == source_institution
+        if source_institution
+        else False
+    )
+    same_winner = (
+        winner is not None
+        and source_winner is not None
+        and winner == source_winner
+    )
+    cross_inst = not same_inst
+
+    # Classify detection type
+    if cross_inst and sim_score >= 0.95:
+        detection_type = "clone"
+    elif same_inst and sim_score >= 0.92:
+        detection_type = "reuse"
+    else:
+        detection_type = "template"
+
+    # Ensure canonical ordering (tender_id_1 < tender_id_2) to avoid duplicates
+    return {
+        "tender_id_1": min(tender_id, similar_tender_id),
+        "tender_id_2": max(tender_id, similar_tender_id),
+        "similarity_score": round(sim_score, 4),
+        "same_institution": same_inst,
+        "same_winner": same_winner,
+        "cross_institution": cross_inst,
+        "detection_type": detection_type,
+    }
+
+
+def dedupe_pairs(pairs: List[Dict]) -> List[Dict]:
+    """Keep the first pair per (tender_id_1, tender_id_2)."""
+    seen = set()
+    unique_pairs = []
+    for pair in pairs:
+        key = (pair["tender_id_1"], pair["tender_id_2"])
+        if key not in seen:
+            seen.add(key)
+            unique_pairs.append(pair)
+    return unique_pairs
+
+
 class BatchSimilarityProcessor:
     """
     Batch processor for computing specification similarity pairs
@@ -62,13 +185,17 @@ class BatchSimilarityProcessor:
         min_similarity: float = 0.85,
         top_k: int = 5,
         batch_size: int = 100,
+        block_size: int = 256,
+        write_batch_size: int = 5000,
     ):
         """
         Args:
             database_url: PostgreSQL connection string
             min_similarity: Minimum cosine similarity to store (0-1)
             top_k: Number of most similar tenders to find per tender
-            batch_size: Number of tenders to process per batch
+            batch_size: Number of tenders per ANN query (incremental mode)
+            block_size: Centroid rows per matrix multiply (all mode)
+            write_batch_size: Pairs per bulk UPSERT
         """
         self.database_url = database_url or os.getenv("DATABASE_URL", "")
         if not self.database_url:
@@ -81,6 +208,8 @@ class BatchSimilarityProcessor:
         self.min_similarity = min_similarity
         self.top_k = top_k
         self.batch_size = batch_size
+        self.block_size = block_size
+        self.write_batch_size = write_batch_size
         self.pool: Optional[asyncpg.Pool] = None
 
     async def connect(self):
@@ -141,32 +270,44 @@ class BatchSimilarityProcessor:
         self,
         limit: Optional[int] = None,
         institution: Optional[str] = None,
+        stale_only: bool = False,
     ) -> List[str]:
         """
-        Get list of tender IDs that have embeddings.
+        Get list of tender IDs that have a stored centroid.
 
         Args:
             limit: Maximum number of tenders
             institution: Filter by institution name
+            stale_only: Only tenders whose pairs predate their centroid
 
         Returns:
             List of tender IDs
         """
         async with self.pool.acquire() as conn:
             query = """
-                SELECT DISTINCT e.tender_id
-                FROM embeddings e
-                JOIN tenders t ON e.tender_id = t.tender_id
+                SELECT c.tender_id
+                FROM tender_centroids c
+                JOIN tenders t ON c.tender_id = t.tender_id
             """
+            conditions = []
             params = []
             param_count = 0
 
             if institution:
                 param_count += 1
-                query += f" WHERE t.procuring_entity = ${param_count}"
+                conditions.append(f"t.procuring_entity = ${param_count}")
                 params.append(institution)
 
-            query += " ORDER BY e.tender_id"
+            if stale_only:
+                conditions.append(
+                    "(c.similarity_computed_at IS NULL"
+                    " OR c.similarity_computed_at < c.updated_at)"
+                )
+
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+
+            query += " ORDER BY c.tender_id"
 
             if limit:
                 param_count += 1
@@ -178,14 +319,58 @@ class BatchSimilarityProcessor:
             logger.info(f"Found {len(tender_ids)} tenders with embeddings")
             return tender_ids
 
-    async def compute_similarities_for_tender(
-        self, tender_id: str
+    async def get_tender_info(
+        self, tender_ids: Sequence[str]
+    ) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """(institution, winner) per tender, in one query."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT tender_id, procuring_entity, winner
+                FROM tenders
+                WHERE tender_id = ANY($1::text[])
+                """,
+                list(tender_ids),
+            )
+        return {
+            r["tender_id"]: (r["procuring_entity"], r["winner"]) for r in rows
+        }
+
+    async def load_centroids(self) -> Tuple[List[str], np.ndarray]:
+        """
+        All stored centroids as a row-normalized float32 matrix.
+
+        Returns:
+            Tuple of (tender IDs, matrix aligned with them)
+        """
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT tender_id, centroid::text AS centroid
+                FROM tender_centroids
+                ORDER BY tender_id
+                """
+            )
+
+        if not rows:
+            return [], np.zeros((0, 0), dtype=np.float32)
+
+        matrix = np.vstack([parse_vector(r["centroid"]) for r in rows])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        logger.info(f"Loaded {len(rows)} tender centroids")
+        return [r["tender_id"] for r in rows], matrix
+
+    async def compute_similarities_for_tenders(
+        self, tender_ids: Sequence[str]
     ) -> List[Dict]:
         """
-        Find top-K most similar tenders for a given tender using pgvector.
+        Find top-K most similar tenders for each given tender through the
+        HNSW index on tender_centroids (one query for the whole batch).
 
         Args:
-            tender_id: The tender to find similarities for
+            tender_ids: The tenders to find similarities for
 
         Returns:
             List of similarity dicts ready for database insertion
@@ -193,84 +378,102 @@ class BatchSimilarityProcessor:
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
                 """
-                WITH target_vector AS (
-                    SELECT AVG(vector) as avg_vec
-                    FROM embeddings
-                    WHERE tender_id = $1
-                ),
-                target_info AS (
-                    SELECT procuring_entity, winner
-                    FROM tenders
-                    WHERE tender_id = $1
-                )
                 SELECT
-                    e2.tender_id as similar_tender_id,
-                    1 - (AVG(e2.vector) <=> (SELECT avg_vec FROM target_vector)) as similarity_score,
-                    t2.procuring_entity,
-                    t2.winner,
-                    (SELECT procuring_entity FROM target_info) as source_institution,
-                    (SELECT winner FROM target_info) as source_winner
-                FROM embeddings e2
-                JOIN tenders t2 ON e2.tender_id = t2.tender_id
-                WHERE e2.tender_id != $1
-                GROUP BY e2.tender_id, t2.procuring_entity, t2.winner
-                HAVING 1 - (AVG(e2.vector) <=> (SELECT avg_vec FROM target_vector)) >= $2
-                ORDER BY similarity_score DESC
-                LIMIT $3
+                    c1.tender_id AS tender_id,
+                    n.tender_id AS similar_tender_id,
+                    1 - (n.centroid <=> c1.centroid) AS similarity_score
+                FROM tender_centroids c1
+                CROSS JOIN LATERAL (
+                    SELECT c2.tender_id, c2.centroid
+                    FROM tender_centroids c2
+                    WHERE c2.tender_id <> c1.tender_id
+                    ORDER BY c2.centroid <=> c1.centroid
+                    LIMIT $2
+                ) n
+                WHERE c1.tender_id = ANY($1::text[])
                 """,
-                tender_id,
-                self.min_similarity,
+                list(tender_ids),
                 self.top_k,
             )
 
-            results = []
-            for row in rows:
-                sim_score = float(row["similarity_score"])
-                same_inst = (
-                    row["procuring_entity"] == row["source_institution"]
-                    if row["source_institution"]
-                    else False
-                )
-                same_winner = (
-                    row["winner"] is not None
-                    and row["source_winner"] is not None
-                    and row["winner"] == row["source_winner"]
-                )
-                cross_inst = not same_inst
-
-                # Classify detection type
-                if cross_inst and sim_score >= 0.95:
-                    detection_type = "clone"
-                elif same_inst and sim_score >= 0.92:
-                    detection_type = "reuse"
-                else:
-                    detection_type = "template"
-
-                # Ensure canonical ordering (tender_id_1 < tender_id_2) to avoid duplicates
-                t1 = min(tender_id, row["similar_tender_id"])
-                t2 = max(tender_id, row["similar_tender_id"])
-
-                results.append(
-                    {
-                        "tender_id_1": t1,
-                        "tender_id_2": t2,
-                        "similarity_score": round(sim_score, 4),
-                        "same_institution": same_inst,
-                        "same_winner": same_winner,
-                        "cross_institution": cross_inst,
-                        "detection_type": detection_type,
-                    }
-                )
+        rows = [r for r in rows if r["similarity_score"] >= self.min_similarity]
+        info = await self.get_tender_info(
+            {r["tender_id"] for r in rows} | {r["similar_tender_id"] for r in rows}
+        )
+        return [
+            classify_pair(
+                r["tender_id"],
+                r["similar_tender_id"],
+                float(r["similarity_score"]),
+                info.get(r["tender_id"], (None, None)),
+                info.get(r["similar_tender_id"], (None, None)),
+            )
+            for r in rows
+        ]
+
+    async def compute_similarities_for_tender(
+        self, tender_id: str
+    ) -> List[Dict]:
+        """
+        Find top-K most similar tenders for a given tender using pgvector.
 
-            return results
+        Args:
+            tender_id: The tender to find similarities for
+
+        Returns:
+            List of similarity dicts ready for database insertion
+        """
+        return await self.compute_similarities_for_tenders([tender_id])
+
+    async def compute_all_pairs(
+        self, tender_ids: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
+        """
+        Blocked all-pairs top-K over the in-memory centroid matrix.
+
+        Args:
+            tender_ids: Tenders to find neighbours for (default: all). Their
+                neighbours are searched among all stored centroids.
+
+        Returns:
+            List of unique similarity dicts ready for database insertion
+        """
+        ids, matrix = await self.load_centroids()
+        if not ids:
+            return []
+
+        if tender_ids is None:
+            query_rows = np.arange(len(ids))
+        else:
+            index = {tid: i for i, tid in enumerate(ids)}
+            query_rows = [index[tid] for tid in tender_ids if tid in index]
+
+        hits = []
+        for src, dst, scores in blocked_top_k(
+            matrix, query_rows, self.top_k, self.min_similarity, self.block_size
+        ):
+            hits.extend(zip(src.tolist(), dst.tolist(), scores.tolist()))
+
+        info = await self.get_tender_info(
+            {ids[i] for i, _, _ in hits} | {ids[j] for _, j, _ in hits}
+        )
+        return dedupe_pairs([
+            classify_pair(
+                ids[i],
+                ids[j],
+                score,
+                info.get(ids[i], (None, None)),
+                info.get(ids[j], (None, None)),
+            )
+            for i, j, score in hits
+        ])
 
     async def store_similarity_pairs(self, pairs: List[Dict]) -> int:
         """
-        Store similarity pairs in the database.
-        Uses UPSERT to handle duplicates.
+        Store similarity pairs in the database with one bulk UPSERT.
 
         Args:
-            pairs: List of similarity pair dicts
+            pairs: List of unique similarity pair dicts
 
         Returns:
             Number of pairs stored/updated
@@ -280,38 +483,142 @@ class BatchSimilarityProcessor:
 
         stored = 0
         async with self.pool.acquire() as conn:
-            for pair in pairs:
-                try:
-                    await conn.execute(
-                        """
-                        INSERT INTO spec_similarity_pairs
-                            (tender_id_1, tender_id_2, similarity_score,
-                             same_institution, same_winner, cross_institution,
-                             detection_type, detected_at)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
-                        ON CONFLICT (tender_id_1, tender_id_2)
-                        DO UPDATE SET
-                            similarity_score = EXCLUDED.similarity_score,
-                            same_institution = EXCLUDED.same_institution,
-                            same_winner = EXCLUDED.same_winner,
-                            cross_institution = EXCLUDED.cross_institution,
-                            detection_type = EXCLUDED.detection_type,
-                            detected_at = NOW()
-                        """,
-                        pair["tender_id_1"],
-                        pair["tender_id_2"],
-                        pair["similarity_score"],
-                        pair["same_institution"],
-                        pair["same_winner"],
-                        pair["cross_institution"],
-                        pair["detection_type"],
-                    )
-                    stored += 1
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to store pair {pair['tender_id_1']}-"
-                        f"{pair['tender_id_2']}: {e}"
+            for start in range(0, len(pairs), self.write_batch_size):
+                chunk = pairs[start:start + self.write_batch_size]
+                await conn.execute(
+                    """
+                    INSERT INTO spec_similarity_pairs
+                        (tender_id_1, tender_id_2, similarity_score,
+                         same_institution, same_winner, cross_institution,
+                         detection_type, detected_at)
+                    SELECT *, NOW()
+                    FROM unnest(
+                        $1::text[], $2::text[], $3::float8[],
+                        $4::boolean[], $5::boolean[], $6::boolean[], $7::text[]
                     )
+                    ON CONFLICT (tender_id_1, tender_id_2)
+                    DO UPDATE SET
+                        similarity_score = EXCLUDED.similarity_score,
+                        same_institution = EXCLUDED.same_institution,
+                        same_winner = EXCLUDED.same_winner,
+                        cross_institution = EXCLUDED.cross_institution,
+                        detection_type = EXCLUDED.detection_type,
+                        detected_at = NOW()
+                    """,
+                    [p["tender_id_1"] for p in chunk],
+                    [p["tender_id_2"] for p in chunk],
+                    [p["similarity_score"] for p in chunk],
+                    [p["same_institution"] for p in chunk],
+                    [p["same_winner"] for p in chunk],
+                    [p["cross_institution"] for p in chunk],
+                    [p["detection_type"] for p in chunk],
+                )
+                stored += len(chunk)
+
+        return stored
+
+    async def mark_computed(self, tender_ids: Sequence[str], computed_at) -> None:
+        """Record that these tenders' pairs reflect centroids as of computed_at."""
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE tender_centroids
+                SET similarity_computed_at = $2
+                WHERE tender_id = ANY($1::text[])
+                """,
+                list(tender_ids),
+                computed_at,
+            )
+
+    async def compute_copy_pairs(
+        self,
+        limit: Optional[int] = None,
+        institution: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Copy-pasted specification pairs from a MinHash/LSH scan of document
+        texts.
+
+        Copied fraction is a text-overlap measure, not a cosine similarity,
+        so these pairs are not run through classify_pair's cosine thresholds.
+
+        Returns:
+            List of pair dicts with copied_fraction set
+        """
+        copies = await SpecSimilarityAnalyzer().find_copied_specs(
+            self.pool, institution=institution, limit=limit
+        )
+        info = await self.get_tender_info(
+            {c["tender_id_1"] for c in copies} | {c["tender_id_2"] for c in copies}
+        )
+
+        pairs = []
+        for copy in copies:
+            inst1, winner1 = info.get(copy["tender_id_1"], (None, None))
+            inst2, winner2 = info.get(copy["tender_id_2"], (None, None))
+            same_inst = bool(inst1) and inst1 == inst2
+            pairs.append({
+                "tender_id_1": min(copy["tender_id_1"], copy["tender_id_2"]),
+                "tender_id_2": max(copy["tender_id_1"], copy["tender_id_2"]),
+                "same_institution": same_inst,
+                "same_winner": winner1 is not None and winner1 == winner2,
+                "cross_institution": not same_inst,
+                "copied_fraction": copy["copied_fraction"],
+            })
+        return pairs
+
+    async def store_copy_pairs(self, pairs: List[Dict]) -> int:
+        """
+        Record copied_fraction on similarity pairs.
+
+        Pairs the embedding pass already found keep their similarity_score
+        and detection_type. Pairs it has not found are inserted with
+        detection_type 'copy' and, as similarity_score, the cosine between
+        the two tenders' centroids (0 when either has none), so the column
+        stays on one scale.
+
+        Returns:
+            Number of pairs stored/updated
+        """
+        if not pairs:
+            return 0
+
+        stored = 0
+        async with self.pool.acquire() as conn:
+            for start in range(0, len(pairs), self.write_batch_size):
+                chunk = pairs[start:start + self.write_batch_size]
+                await conn.execute(
+                    """
+                    INSERT INTO spec_similarity_pairs
+                        (tender_id_1, tender_id_2, similarity_score,
+                         same_institution, same_winner, cross_institution,
+                         detection_type, copied_fraction, detected_at)
+                    SELECT p.tender_id_1, p.tender_id_2,
+                           COALESCE(1 - (c1.centroid <=> c2.centroid), 0),
+                           p.same_institution, p.same_winner, p.cross_institution,
+                           'copy', p.copied_fraction, NOW()
+                    FROM unnest(
+                        $1::text[], $2::text[],
+                        $3::boolean[], $4::boolean[], $5::boolean[],
+                        $6::float8[]
+                    ) AS p(tender_id_1, tender_id_2,
+                           same_institution, same_winner, cross_institution,
+                           copied_fraction)
+                    LEFT JOIN tender_centroids c1 ON c1.tender_id = p.tender_id_1
+                    LEFT JOIN tender_centroids c2 ON c2.tender_id = p.tender_id_2
+                    ON CONFLICT (tender_id_1, tender_id_2)
+                    DO UPDATE SET
+                        copied_fraction = EXCLUDED.copied_fraction,
+                        detected_at = NOW()
+                    """,
+                    [p["tender_id_1"] for p in chunk],
+                    [p["tender_id_2"] for p in chunk],
+                    [p["same_institution"] for p in chunk],
+                    [p["same_winner"] for p in chunk],
+                    [p["cross_institution"] for p in chunk],
+                    [p["copied_fraction"] for p in chunk],
+                )
+                stored += len(chunk)
 
         return stored
 
@@ -326,13 +633,13 @@ class BatchSimilarityProcessor:
             # Get all institutions that have tenders with embeddings
             institutions = await conn.fetch(
                 """
-                SELECT DISTINCT t.procuring_entity as institution,
-                       COUNT(DISTINCT e.tender_id) as total_specs
-                FROM embeddings e
-                JOIN tenders t ON e.tender_id = t.tender_id
+                SELECT t.procuring_entity as institution,
+                       COUNT(*) as total_specs
+                FROM tender_centroids c
+                JOIN tenders t ON c.tender_id = t.tender_id
                 WHERE t.procuring_entity IS NOT NULL
                 GROUP BY t.procuring_entity
-                HAVING COUNT(DISTINCT e.tender_id) >= 2
+                HAVING COUNT(*) >= 2
                 ORDER BY total_specs DESC
                 """
             )
@@ -435,6 +742,7 @@ class BatchSimilarityProcessor:
         limit: Optional[int] = None,
         institution: Optional[str] = None,
         dry_run: bool = False,
+        mode: str = "all",
     ) -> Dict[str, int]:
         """
         Main entry point: compute similarity pairs and institution stats.
@@ -443,6 +751,10 @@ class BatchSimilarityProcessor:
             limit: Maximum number of tenders to process
             institution: Only process this institution's tenders
             dry_run: Compute but don't store results
+            mode: "all" (blocked all-pairs over every centroid, plus
+                institution stats), "incremental" (ANN lookups for
+                tenders whose centroid changed since their last run) or
+                "copies" (MinHash/LSH copy-paste scan of document texts)
 
         Returns:
             Statistics dict with counts
@@ -453,9 +765,31 @@ class BatchSimilarityProcessor:
         if not dry_run:
             await self.ensure_tables_exist()
 
+        if mode == "copies":
+            pairs = await self.compute_copy_pairs(limit=limit, institution=institution)
+            stored = 0 if dry_run else await self.store_copy_pairs(pairs)
+            elapsed = round(time.time() - start_time, 1)
+            await self.close()
+            logger.info(
+                f"Copy scan complete: {len(pairs)} copied pairs, "
+                f"{stored} stored, {elapsed}s elapsed"
+            )
+            return {
+                "tenders_processed": len({p["tender_id_1"] for p in pairs} | {p["tender_id_2"] for p in pairs}),
+                "pairs_found": len(pairs),
+                "pairs_stored": stored,
+                "institutions_processed": 0,
+                "elapsed_seconds": elapsed,
+            }
+
+        async with self.pool.acquire() as conn:
+            computed_at = await conn.fetchval("SELECT NOW()::timestamp")
+
         # Get tenders with embeddings
         tender_ids = await self.get_tenders_with_embeddings(
-            limit=limit, institution=institution
+            limit=limit,
+            institution=institution,
+            stale_only=(mode == "incremental"),
         )
 
         if not tender_ids:
@@ -469,56 +803,29 @@ class BatchSimilarityProcessor:
                 "elapsed_seconds": 0,
             }
 
-        total_pairs_found = 0
-        total_pairs_stored = 0
-
-        # Process in batches
-        for batch_start in range(0, len(tender_ids), self.batch_size):
-            batch = tender_ids[batch_start : batch_start + self.batch_size]
-            batch_num = batch_start // self.batch_size + 1
-            total_batches = (
-                len(tender_ids) + self.batch_size - 1
-            ) // self.batch_size
-
-            logger.info(
-                f"Processing batch {batch_num}/{total_batches} "
-                f"({len(batch)} tenders)"
-            )
-
-            batch_pairs = []
-            for tender_id in batch:
-                try:
-                    pairs = await self.compute_similarities_for_tender(
-                        tender_id
-                    )
-                    batch_pairs.extend(pairs)
-                    total_pairs_found += len(pairs)
-                except Exception as e:
-                    logger.warning(
-                        f"Error computing similarities for {tender_id}: {e}"
-                    )
+        if mode == "incremental":
+            pairs = []
+            for batch_start in range(0, len(tender_ids), self.batch_size):
+                batch = tender_ids[batch_start : batch_start + self.batch_size]
+                pairs.extend(await self.compute_similarities_for_tenders(batch))
+            pairs = dedupe_pairs(pairs)
+        else:
+            restrict = tender_ids if (limit or institution) else None
+            pairs = await self.compute_all_pairs(restrict)
 
-            # Deduplicate by (tender_id_1, tender_id_2) within batch
-            seen = set()
-            unique_pairs = []
-            for pair in batch_pairs:
-                key = (pair["tender_id_1"], pair["tender_id_2"])
-                if key not in seen:
-                    seen.add(key)
-                    unique_pairs.append(pair)
-
-            if not dry_run and unique_pairs:
-                stored = await self.store_similarity_pairs(unique_pairs)
-                total_pairs_stored += stored
+        logger.info(
+            f"Found {len(pairs)} unique pairs for {len(tender_ids)} tenders "
+            f"({mode} mode)"
+        )
 
-            logger.info(
-                f"Batch {batch_num}: {len(unique_pairs)} unique pairs "
-                f"found, {total_pairs_stored} total stored"
-            )
+        total_pairs_stored = 0
+        if not dry_run:
+            total_pairs_stored = await self.store_similarity_pairs(pairs)
+            await self.mark_computed(tender_ids, computed_at)
 
-        # Compute institution reuse stats
+        # Compute institution reuse stats (full runs only)
         institutions_processed = 0
-        if not dry_run:
+        if not dry_run and mode == "all":
             institutions_processed = await self.compute_institution_stats()
 
         elapsed = round(time.time() - start_time, 1)
@@ -526,7 +833,7 @@ class BatchSimilarityProcessor:
 
         stats = {
             "tenders_processed": len(tender_ids),
-            "pairs_found": total_pairs_found,
+            "pairs_found": len(pairs),
             "pairs_stored": total_pairs_stored,
             "institutions_processed": institutions_processed,
             "elapsed_seconds": elapsed,
@@ -576,7 +883,22 @@ async def main():
         "--batch-size",
         type=int,
         default=100,
-        help="Tenders per processing batch (default 100)",
+        help="Tenders per ANN query in incremental mode (default 100)",
+    )
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=256,
+        help="Centroid rows per matrix multiply in all mode (default 256)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["all", "incremental", "copies"],
+        default="all",
+        help=(
+            "all: every tender (weekly); incremental: changed tenders only; "
+            "copies: copy-paste scan of document texts"
+        ),
     )
     parser.add_argument(
         "--dry-run",
@@ -596,12 +918,14 @@ async def main():
         min_similarity=args.min_similarity,
         top_k=args.top_k,
         batch_size=args.batch_size,
+        block_size=args.block_size,
     )
 
     stats = await processor.run(
         limit=args.limit,
         institution=args.institution,
         dry_run=args.dry_run,
+        mode=args.mode,
     )
 
     print("\n" + "=" * 60)
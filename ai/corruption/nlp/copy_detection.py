@@ -0,0 +1,282 @@
+"""
+Copy-Paste Detection for Specification Texts
+
+Finds copied specification text across a whole document corpus without
+comparing every pair of documents:
+
+1. Word shingles - each normalized text becomes the set of hashes of its
+   k-word windows.
+2. MinHash / LSH - a fixed-size MinHash signature estimates Jaccard
+   similarity between shingle sets; banding the signatures into an LSH
+   index yields candidate pairs in roughly linear time.
+3. Common blocks - candidate pairs are confirmed with greedy string tiling
+   anchored on exact character k-grams (the anchor length is the minimum
+   reported block length). Both texts are tiled, so each character of
+   either text belongs to at most one block; the cost is roughly linear in
+   the text lengths instead of the quadratic difflib.SequenceMatcher.
+   Unlike SequenceMatcher, sections copied out of order are all found.
+
+compare_texts() returns the same similarity_ratio / copied_sections /
+copied_fraction / is_suspicious dict that SpecSimilarityAnalyzer.detect_copy_paste
+has always returned.
+
+Author: nabavkidata.com
+License: Proprietary
+"""
+
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Set, Tuple
+
+import numpy as np
+
+# Words per shingle
+SHINGLE_SIZE = 5
+
+# MinHash signature length and LSH banding (bands * rows == NUM_PERM).
+# 32 bands of 4 rows puts the 50% candidate threshold near Jaccard 0.42.
+NUM_PERM = 128
+LSH_BANDS = 32
+
+# Blocks shorter than this (characters) are not reported as copied
+MIN_BLOCK_LENGTH = 30
+
+# Unused occurrences of an anchor k-gram in the source text tried per position
+MAX_ANCHOR_CANDIDATES = 8
+
+# LSH buckets with more keys than this are skipped by candidate_pairs: they
+# hold boilerplate shared by huge numbers of documents, and pairing them is
+# quadratic in the bucket size. Their keys still pair through other bands.
+MAX_BUCKET_SIZE = 200
+
+_PRIME = np.uint64(4294967291)  # largest prime < 2**32; (a * x + b) stays < 2**64
+
+
+def word_shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """
+    Hashes of the size-word windows of an already normalized text.
+
+    Texts shorter than size words give one shingle for the whole text.
+    """
+    words = text.split()
+    if not words:
+        return set()
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))}
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+class MinHasher:
+    """
+    MinHash signatures from universal hashes (a * x + b) mod p.
+
+    Signatures are comparable only between hashers with the same num_perm
+    and seed.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[int], chunk_size: int = 4096) -> np.ndarray:
+        """uint32 signature; all-max for an empty shingle set."""
+        values = np.fromiter(shingles, dtype=np.uint64)
+        signature = np.full(self.num_perm, int(_PRIME), dtype=np.uint64)
+        values %= _PRIME
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start:start + chunk_size, None]
+            hashed = (chunk * self._a + self._b) % _PRIME
+            np.minimum(signature, hashed.min(axis=0), out=signature)
+        return signature.astype(np.uint32)
+
+
+def estimated_jaccard(sig1: np.ndarray, sig2: np.ndarray) -> float:
+    """Fraction of equal signature slots."""
+    return float(np.mean(sig1 == sig2))
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures.
+
+    Keys whose signatures agree on every row of at least one band share a
+    bucket and become candidate pairs.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = NUM_PERM,
+        bands: int = LSH_BANDS,
+        max_bucket_size: int = MAX_BUCKET_SIZE,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_bucket_size = max_bucket_size
+        self.skipped_buckets = 0
+        self._buckets: Dict[Tuple[int, bytes], List[Hashable]] = defaultdict(list)
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, key: Hashable, signature: np.ndarray):
+        self.signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].append(key)
+
+    def query(self, signature: np.ndarray) -> Set[Hashable]:
+        """Keys sharing at least one band with signature."""
+        found: Set[Hashable] = set()
+        for band_key in self._band_keys(signature):
+            found.update(self._buckets.get(band_key, ()))
+        return found
+
+    def candidate_pairs(self, min_jaccard: float = 0.0) -> List[Tuple[Hashable, Hashable, float]]:
+        """
+        All (key1, key2, estimated Jaccard) pairs sharing a bucket, with
+        key1 < key2, filtered by estimated Jaccard.
+
+        Buckets larger than max_bucket_size are skipped and counted in
+        skipped_buckets.
+        """
+        seen: Set[Tuple[Hashable, Hashable]] = set()
+        pairs = []
+        self.skipped_buckets = 0
+        for keys in self._buckets.values():
+            if len(keys) < 2:
+                continue
+            if len(keys) > self.max_bucket_size:
+                self.skipped_buckets += 1
+                continue
+            for i, key1 in enumerate(keys):
+                for key2 in keys[i + 1:]:
+                    pair = (key1, key2) if key1 < key2 else (key2, key1)
+                    if pair in seen:
+                        continue
+                    seen.add(pair)
+                    jaccard = estimated_jaccard(self.signatures[key1], self.signatures[key2])
+                    if jaccard >= min_jaccard:
+                        pairs.append((pair[0], pair[1], jaccard))
+        return pairs
+
+
+def _extend(text1: str, i: int, text2: str, j: int, start: int) -> int:
+    """Length of the common run at text1[i:], text2[j:] (known >= start)."""
+    length = start
+    step = 256
+    limit = min(len(text1) - i, len(text2) - j)
+    while step:
+        while length + step <= limit and text1[i + length:i + length + step] == text2[j + length:j + length + step]:
+            length += step
+        step //= 4
+    return length
+
+
+def common_blocks(text1: str, text2: str, min_length: int = MIN_BLOCK_LENGTH) -> List[Tuple[int, int, int]]:
+    """
+    Blocks of text1 that occur verbatim in text2, non-overlapping in both.
+
+    Greedy string tiling: every min_length-character window of text2 is
+    indexed; text1 is scanned left to right and each matching window is
+    extended to its full length, after which the scan resumes past the
+    block. Matched text2 characters are marked and never matched again, so
+    a short text2 repeated inside a long text1 is counted once. Runs in
+    roughly linear time (bounded candidates per anchor).
+
+    Returns:
+        (start in text1, start in text2, length) tuples, in text1 order
+    """
+    if len(text1) < min_length or len(text2) < min_length:
+        return []
+
+    anchors: Dict[str, List[int]] = defaultdict(list)
+    for j in range(len(text2) - min_length + 1):
+        anchors[text2[j:j + min_length]].append(j)
+
+    used2 = bytearray(len(text2))
+    blocks = []
+    i = 0
+    last = len(text1) - min_length
+    while i <= last:
+        positions = anchors.get(text1[i:i + min_length])
+        best_j, best_len = 0, 0
+        if positions:
+            tried = skipped = 0
+            for j in positions:
+                if used2[j]:
+                    skipped += 1
+                    continue
+                length = _extend(text1, i, text2, j, min_length)
+                stop = used2.find(1, j, j + length)
+                if stop != -1:
+                    length = stop - j
+                if length >= min_length and length > best_len:
+                    best_j, best_len = j, length
+                tried += 1
+                if tried == MAX_ANCHOR_CANDIDATES:
+                    break
+            if skipped * 2 > len(positions):
+                # Drop consumed occurrences so later lookups stay cheap
+                positions[:] = [j for j in positions if not used2[j]]
+        if not best_len:
+            i += 1
+            continue
+        blocks.append((i, best_j, best_len))
+        used2[best_j:best_j + best_len] = b"\x01" * best_len
+        i += best_len
+
+    return blocks
+
+
+def compare_texts(norm1: str, norm2: str, min_length: int = MIN_BLOCK_LENGTH) -> Dict[str, Any]:
+    """
+    Copied-section report for two normalized texts.
+
+    Returns:
+        Dict with:
+        - similarity_ratio: 2 * matched / (len1 + len2), 0-1
+        - copied_sections: list of {text, length} for copied blocks
+        - copied_fraction: fraction of text1 that's copied from text2
+        - is_suspicious: True if > 60% copied
+    """
+    if not norm1 or not norm2:
+        return {
+            "similarity_ratio": 0.0,
+            "copied_sections": [],
+            "copied_fraction": 0.0,
+            "is_suspicious": False,
+        }
+
+    blocks = common_blocks(norm1, norm2, min_length)
+    total_copied_chars = sum(length for _, _, length in blocks)
+
+    copied_sections = [
+        {
+            "text": norm1[a:a + length][:200],  # Truncate for API response
+            "length": length,
+        }
+        for a, _, length in blocks
+    ]
+
+    similarity_ratio = min(1.0, 2.0 * total_copied_chars / (len(norm1) + len(norm2)))
+    copied_fraction = total_copied_chars / max(len(norm1), 1)
+
+    return {
+        "similarity_ratio": round(similarity_ratio, 4),
+        "copied_sections": sorted(
+            copied_sections, key=lambda x: x["length"], reverse=True
+        )[:20],  # Top 20 longest copied sections
+        "copied_fraction": round(copied_fraction, 4),
+        "is_suspicious": copied_fraction > 0.60,
+    }
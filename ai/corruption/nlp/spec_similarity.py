@@ -11,7 +11,8 @@ Patterns detected:
 3. Specifications matching a previous winner's proposal
 
 Uses pgvector cosine similarity on existing 768-dim Gemini embeddings
-and Python's difflib.SequenceMatcher for detailed text comparison.
+for similar-spec search, and word-shingle MinHash/LSH plus linear-time
+common-block matching (copy_detection.py) for copy-paste detection.
 
 Author: nabavkidata.com
 License: Proprietary
@@ -20,11 +21,12 @@ License: Proprietary
 import logging
 import re
 import unicodedata
-from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional
 
 import asyncpg
 
+from .copy_detection import LSHIndex, MinHasher, compare_texts, word_shingles
+
 logger = logging.getLogger(__name__)
 
 
@@ -167,7 +169,7 @@ class SpecSimilarityAnalyzer:
     async def detect_copy_paste(self, text1: str, text2: str) -> Dict[str, Any]:
         """
         Detailed text diff between two specifications.
-        Uses sequence matching to find copied sections.
+        Uses linear-time common-block matching to find copied sections.
 
         Args:
             text1: First specification text
@@ -180,47 +182,117 @@ class SpecSimilarityAnalyzer:
             - copied_fraction: fraction of text1 that's copied from text2
             - is_suspicious: True if > 60% copied
         """
-        norm1 = _normalize_text(text1)
-        norm2 = _normalize_text(text2)
-
-        if not norm1 or not norm2:
-            return {
-                "similarity_ratio": 0.0,
-                "copied_sections": [],
-                "copied_fraction": 0.0,
-                "is_suspicious": False,
-            }
+        return compare_texts(_normalize_text(text1), _normalize_text(text2))
 
-        # Use SequenceMatcher for detailed comparison
-        matcher = SequenceMatcher(None, norm1, norm2, autojunk=False)
-        similarity_ratio = matcher.ratio()
+    async def find_copied_specs(
+        self,
+        pool: asyncpg.Pool,
+        institution: Optional[str] = None,
+        min_jaccard: float = 0.5,
+        min_copied_fraction: float = 0.6,
+        limit: Optional[int] = None,
+        confirm_batch_size: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Scan the document corpus for copy-pasted specifications.
 
-        # Find matching blocks (copied sections)
-        copied_sections = []
-        total_copied_chars = 0
+        Every tender's extracted document text is MinHashed while it streams
+        from a server-side cursor (only the 128-slot signatures are kept).
+        LSH candidate pairs whose estimated shingle Jaccard is at least
+        min_jaccard are confirmed with the common-block matcher.
 
-        for block in matcher.get_matching_blocks():
-            # block is (i, j, size) -- position in text1, text2, and length
-            if block.size >= 30:  # Only report blocks of 30+ chars
-                copied_text = norm1[block.a : block.a + block.size]
-                copied_sections.append(
-                    {
-                        "text": copied_text[:200],  # Truncate for API response
-                        "length": block.size,
-                    }
+        Args:
+            pool: asyncpg connection pool
+            institution: Only scan this institution's tenders
+            min_jaccard: Minimum estimated shingle Jaccard for a candidate
+            min_copied_fraction: Minimum copied fraction to report
+            limit: Maximum tenders to scan
+            confirm_batch_size: Candidate pairs whose texts are loaded at once
+
+        Returns:
+            List of dicts with tender_id_1, tender_id_2, estimated_jaccard
+            and the detect_copy_paste fields, copied_fraction measured on the
+            shorter text, highest first
+        """
+        hasher = MinHasher()
+        index = LSHIndex()
+        lengths: Dict[str, int] = {}
+
+        query = """
+            SELECT d.tender_id,
+                   string_agg(d.content_text, E'\\n\\n' ORDER BY d.doc_id) AS text
+            FROM documents d
+            JOIN tenders t ON t.tender_id = d.tender_id
+            WHERE d.extraction_status = 'success'
+              AND d.content_text IS NOT NULL
+        """
+        params: List[Any] = []
+        if institution:
+            params.append(institution)
+            query += f" AND t.procuring_entity = ${len(params)}"
+        query += " GROUP BY d.tender_id ORDER BY d.tender_id"
+        if limit:
+            params.append(limit)
+            query += f" LIMIT ${len(params)}"
+
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                async for row in conn.cursor(query, *params, prefetch=200):
+                    norm = _normalize_text(row["text"])
+                    shingles = word_shingles(norm)
+                    if not shingles:
+                        continue
+                    index.add(row["tender_id"], hasher.signature(shingles))
+                    lengths[row["tender_id"]] = len(norm)
+
+        candidates = index.candidate_pairs(min_jaccard)
+        logger.info(
+            f"Copy scan: {len(index)} tenders signed, {len(candidates)} "
+            f"candidate pairs (Jaccard >= {min_jaccard})"
+        )
+
+        results = []
+        for start in range(0, len(candidates), confirm_batch_size):
+            batch = candidates[start:start + confirm_batch_size]
+            needed = {tid for pair in batch for tid in pair[:2]}
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT tender_id,
+                           string_agg(content_text, E'\\n\\n' ORDER BY doc_id) AS text
+                    FROM documents
+                    WHERE tender_id = ANY($1::text[])
+                      AND extraction_status = 'success'
+                      AND content_text IS NOT NULL
+                    GROUP BY tender_id
+                    """,
+                    list(needed),
                 )
-                total_copied_chars += block.size
-
-        copied_fraction = total_copied_chars / max(len(norm1), 1)
-
-        return {
-            "similarity_ratio": round(similarity_ratio, 4),
-            "copied_sections": sorted(
-                copied_sections, key=lambda x: x["length"], reverse=True
-            )[:20],  # Top 20 longest copied sections
-            "copied_fraction": round(copied_fraction, 4),
-            "is_suspicious": copied_fraction > 0.60,
-        }
+            texts = {r["tender_id"]: _normalize_text(r["text"]) for r in rows}
+
+            for tender_id_1, tender_id_2, jaccard in batch:
+                if tender_id_1 not in texts or tender_id_2 not in texts:
+                    continue
+                # Fraction of the shorter spec found in the longer one
+                if lengths[tender_id_1] <= lengths[tender_id_2]:
+                    result = compare_texts(texts[tender_id_1], texts[tender_id_2])
+                else:
+                    result = compare_texts(texts[tender_id_2], texts[tender_id_1])
+                if result["copied_fraction"] < min_copied_fraction:
+                    continue
+                results.append({
+                    "tender_id_1": tender_id_1,
+                    "tender_id_2": tender_id_2,
+                    "estimated_jaccard": round(jaccard, 4),
+                    **result,
+                })
+
+        results.sort(key=lambda r: r["copied_fraction"], reverse=True)
+        logger.info(
+            f"Copy scan confirmed {len(results)} pairs "
+            f"(copied_fraction >= {min_copied_fraction})"
+        )
+        return results
 
     async def find_cross_institution_clones(
         self,
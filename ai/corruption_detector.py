@@ -40,6 +40,7 @@ from collections import defaultdict
 import json
 import statistics
 import math
+import time
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -84,7 +85,7 @@ class SingleBidderDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find all tenders with single bidder and score them"""
         logger.info("Running single bidder detection...")
 
@@ -124,11 +125,12 @@ class SingleBidderDetector:
               AND t.status IN ('awarded', 'completed')
               AND t.winner IS NOT NULL
               AND t.estimated_value_mkd > 500000
+              AND ($1::text[] IS NULL OR t.tender_id = ANY($1::text[]))
             ORDER BY t.estimated_value_mkd DESC
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -194,7 +196,7 @@ class RepeatWinnerDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find companies with suspiciously high win rates at specific institutions"""
         logger.info("Running repeat winner detection...")
 
@@ -216,6 +218,9 @@ class RepeatWinnerDetector:
                 WHERE (t.status = 'awarded' OR t.status = 'completed')
                   AND t.winner IS NOT NULL
                   AND t.winner != ''
+                  AND ($1::text[] IS NULL OR (t.procuring_entity, t.winner) IN (
+                      SELECT procuring_entity, winner FROM tenders WHERE tender_id = ANY($1::text[])
+                  ))
                 GROUP BY t.procuring_entity, t.winner
                 HAVING COUNT(*) >= 5
                    AND COUNT(*) * 100.0 /
@@ -230,7 +235,7 @@ class RepeatWinnerDetector:
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -303,7 +308,7 @@ class PriceAnomalyDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Analyze bid prices for anomalies"""
         logger.info("Running price anomaly detection...")
 
@@ -324,6 +329,7 @@ class PriceAnomalyDetector:
                 JOIN tenders t ON tb.tender_id = t.tender_id
                 WHERE tb.bid_amount_mkd > 0
                   AND t.estimated_value_mkd > 0
+                  AND ($1::text[] IS NULL OR tb.tender_id = ANY($1::text[]))
                 GROUP BY tb.tender_id, t.title, t.procuring_entity, t.estimated_value_mkd
                 HAVING COUNT(*) >= 3
             )
@@ -352,7 +358,7 @@ class PriceAnomalyDetector:
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -444,12 +450,17 @@ class BidderClusteringDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find suspicious bidder clustering patterns"""
         logger.info("Running bidder clustering detection...")
 
         query = """
-            WITH bidder_pairs AS (
+            WITH scope_companies AS (
+                SELECT DISTINCT company_name
+                FROM tender_bidders
+                WHERE tender_id = ANY($1::text[])
+            ),
+            bidder_pairs AS (
                 SELECT
                     t1.company_name as company_a,
                     t2.company_name as company_b,
@@ -461,6 +472,10 @@ class BidderClusteringDetector:
                 JOIN tender_bidders t2 ON t1.tender_id = t2.tender_id
                     AND t1.company_name < t2.company_name
                 WHERE t1.company_name != t2.company_name
+                  AND ($1::text[] IS NULL OR (
+                      t1.company_name IN (SELECT company_name FROM scope_companies)
+                      AND t2.company_name IN (SELECT company_name FROM scope_companies)
+                  ))
                 GROUP BY t1.company_name, t2.company_name
                 HAVING COUNT(DISTINCT t1.tender_id) >= 5
             ),
@@ -488,7 +503,7 @@ class BidderClusteringDetector:
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -574,7 +589,7 @@ class ShortDeadlineDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find tenders with suspiciously short deadlines using statistical thresholds"""
         logger.info("Running short deadline detection (statistical thresholds)...")
 
@@ -595,11 +610,12 @@ class ShortDeadlineDetector:
               AND status IN ('awarded', 'closed', 'completed')
               AND closing_date IS NOT NULL
               AND publication_date IS NOT NULL
+              AND ($2::text[] IS NULL OR tender_id = ANY($2::text[]))
             ORDER BY (closing_date - publication_date) ASC, estimated_value_mkd DESC
         """
 
         try:
-            rows = await self.pool.fetch(query, self.P25_DAYS)
+            rows = await self.pool.fetch(query, self.P25_DAYS, scope)
             flags = []
 
             for row in rows:
@@ -711,7 +727,7 @@ class ProcedureTypeDetector:
             return 'Unknown'
         return self.PROCEDURE_NORMALIZATION.get(raw_type.strip(), raw_type.strip())
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Flag tenders using non-competitive procedures"""
         logger.info("Running procedure type risk detection...")
 
@@ -728,10 +744,11 @@ class ProcedureTypeDetector:
             WHERE procedure_type IS NOT NULL
               AND procedure_type != ''
               AND status IN ('awarded', 'completed')
+              AND ($1::text[] IS NULL OR tender_id = ANY($1::text[]))
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -821,7 +838,7 @@ class IdenticalBidDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find tenders where multiple companies submitted identical bid amounts"""
         logger.info("Running identical bid detection (R028)...")
 
@@ -834,6 +851,7 @@ class IdenticalBidDetector:
                     COUNT(DISTINCT tb.company_name) as num_identical
                 FROM tender_bidders tb
                 WHERE tb.bid_amount_mkd > 0
+                  AND ($1::text[] IS NULL OR tb.tender_id = ANY($1::text[]))
                 GROUP BY tb.tender_id, tb.bid_amount_mkd
                 HAVING COUNT(DISTINCT tb.company_name) > 1
             )
@@ -853,7 +871,7 @@ class IdenticalBidDetector:
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -922,7 +940,7 @@ class ProfessionalLoserDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find tenders where professional losers participated"""
         logger.info("Running professional loser detection (R025)...")
 
@@ -959,11 +977,12 @@ class ProfessionalLoserDetector:
             WHERE NOT tb.is_winner
               AND t.status IN ('awarded', 'completed')
               AND t.winner IS NOT NULL
+              AND ($1::text[] IS NULL OR tb.tender_id = ANY($1::text[]))
             ORDER BY pl.total_bids DESC
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             # Check for bidder clusters to apply bonus
@@ -1052,7 +1071,7 @@ class ContractSplittingDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find potential contract splitting patterns"""
         logger.info("Running contract splitting detection...")
 
@@ -1076,6 +1095,9 @@ class ContractSplittingDetector:
                   AND winner IS NOT NULL AND winner != ''
                   AND estimated_value_mkd > 0
                   AND publication_date IS NOT NULL
+                  AND ($1::text[] IS NULL OR (procuring_entity, winner) IN (
+                      SELECT procuring_entity, winner FROM tenders WHERE tender_id = ANY($1::text[])
+                  ))
                 GROUP BY procuring_entity, winner, DATE_TRUNC('quarter', publication_date)
                 HAVING COUNT(*) >= 3
                   AND MAX(estimated_value_mkd) < 1000000
@@ -1086,7 +1108,7 @@ class ContractSplittingDetector:
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -1160,7 +1182,7 @@ class ShortDecisionDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find tenders with suspiciously fast award decisions"""
         logger.info("Running short decision period detection...")
 
@@ -1181,11 +1203,12 @@ class ShortDecisionDetector:
               AND (contract_signing_date - closing_date) < 3
               AND (contract_signing_date - closing_date) >= 0
               AND status IN ('awarded', 'completed')
+              AND ($1::text[] IS NULL OR tender_id = ANY($1::text[]))
             ORDER BY (contract_signing_date - closing_date) ASC, estimated_value_mkd DESC
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -1264,7 +1287,7 @@ class StrategicDisqualificationDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find tenders with strategic disqualification patterns"""
         logger.info("Running strategic disqualification detection (R035/R036)...")
 
@@ -1285,6 +1308,7 @@ class StrategicDisqualificationDetector:
             FROM tender_bidders tb
             JOIN tenders t ON tb.tender_id = t.tender_id
             WHERE t.status IN ('awarded', 'completed')
+              AND ($1::text[] IS NULL OR tb.tender_id = ANY($1::text[]))
             GROUP BY tb.tender_id, t.title, t.procuring_entity, t.winner, t.estimated_value_mkd
             HAVING SUM(CASE WHEN tb.disqualified THEN 1 ELSE 0 END) >= 2
               AND SUM(CASE WHEN tb.disqualified THEN 1 ELSE 0 END) =
@@ -1292,7 +1316,7 @@ class StrategicDisqualificationDetector:
         """
 
         try:
-            rows = await self.pool.fetch(r035_query)
+            rows = await self.pool.fetch(r035_query, scope)
             for row in rows:
                 score = 70
                 severity = 'high'
@@ -1341,6 +1365,7 @@ class StrategicDisqualificationDetector:
                     ) as price_rank
                 FROM tender_bidders tb
                 WHERE tb.bid_amount_mkd > 0
+                  AND ($1::text[] IS NULL OR tb.tender_id = ANY($1::text[]))
             )
             SELECT
                 lb.tender_id,
@@ -1366,7 +1391,7 @@ class StrategicDisqualificationDetector:
         """
 
         try:
-            rows = await self.pool.fetch(r036_query)
+            rows = await self.pool.fetch(r036_query, scope)
             for row in rows:
                 score = 55
                 severity = 'medium'
@@ -1416,7 +1441,7 @@ class ContractValueGrowthDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find tenders with significant contract value growth"""
         logger.info("Running contract value growth detection...")
 
@@ -1435,11 +1460,12 @@ class ContractValueGrowthDetector:
               AND estimated_value_mkd > 0
               AND actual_value_mkd > estimated_value_mkd * 1.2
               AND status IN ('awarded', 'completed')
+              AND ($1::text[] IS NULL OR tender_id = ANY($1::text[]))
             ORDER BY (actual_value_mkd / estimated_value_mkd) DESC
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -1514,7 +1540,7 @@ class BidRotationDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find bid rotation patterns at institutions"""
         logger.info("Running bid rotation detection...")
 
@@ -1534,6 +1560,9 @@ class BidRotationDetector:
                 WHERE status IN ('awarded', 'completed')
                   AND winner IS NOT NULL AND winner != ''
                   AND publication_date IS NOT NULL
+                  AND ($1::text[] IS NULL OR procuring_entity IN (
+                      SELECT procuring_entity FROM tenders WHERE tender_id = ANY($1::text[])
+                  ))
             ),
             institution_stats AS (
                 SELECT
@@ -1553,7 +1582,7 @@ class BidRotationDetector:
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -1662,7 +1691,7 @@ class ThresholdManipulationDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find tenders with values clustering just below thresholds"""
         logger.info("Running threshold manipulation detection...")
 
@@ -1688,11 +1717,14 @@ class ThresholdManipulationDetector:
             WHERE ({where_clause})
               AND estimated_value_mkd > 0
               AND status IN ('awarded', 'completed', 'active', 'closed')
+              AND ($1::text[] IS NULL OR procuring_entity IN (
+                  SELECT procuring_entity FROM tenders WHERE tender_id = ANY($1::text[])
+              ))
             ORDER BY estimated_value_mkd DESC
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             # Count how many times each buyer is just below each threshold
@@ -1794,7 +1826,7 @@ class LateAmendmentDetector:
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
-    async def detect(self) -> List[CorruptionFlag]:
+    async def detect(self, scope: Optional[List[str]] = None) -> List[CorruptionFlag]:
         """Find tenders with late amendments"""
         logger.info("Running late amendment detection...")
 
@@ -1816,11 +1848,12 @@ class LateAmendmentDetector:
               AND t.closing_date IS NOT NULL
               AND (t.closing_date - t.last_amendment_date) <= 3
               AND t.status IN ('awarded', 'completed', 'active', 'closed')
+              AND ($1::text[] IS NULL OR t.tender_id = ANY($1::text[]))
             ORDER BY (t.closing_date - t.last_amendment_date) ASC
         """
 
         try:
-            rows = await self.pool.fetch(query)
+            rows = await self.pool.fetch(query, scope)
             flags = []
 
             for row in rows:
@@ -2000,6 +2033,12 @@ class CorruptionAnalyzer:
     Coordinates all detection modules and manages database operations.
     """
 
+    # Statement timeout for scope expansion and result writes
+    SWAP_TIMEOUT = 1800
+
+    # Tenders whose flags and risk score are replaced per transaction
+    REPLACE_BATCH_SIZE = 5000
+
     def __init__(self, db_url: Optional[str] = None):
         self.db_url = db_url or DB_URL
         if not self.db_url:
@@ -2030,7 +2069,12 @@ class CorruptionAnalyzer:
 
     async def run_full_analysis(self) -> Dict[str, int]:
         """
-        Run all corruption detection algorithms and save results to database.
+        Run all corruption detection algorithms over the whole database and
+        replace all stored results.
+
+        Results are replaced in batches of REPLACE_BATCH_SIZE tenders, each in
+        its own short transaction, so no lock or snapshot is held for the
+        whole rebuild. Every tender's flags and risk score change together.
 
         Returns:
             Dictionary with counts of each flag type detected
@@ -2039,6 +2083,105 @@ class CorruptionAnalyzer:
         logger.info("Starting full corruption detection analysis")
         logger.info("=" * 60)
 
+        run_id, watermark = await self._start_run('full')
+
+        try:
+            all_flags, stats = await self._run_detectors()
+
+            stored = await self.pool.fetch("""
+                SELECT tender_id FROM corruption_flags
+                UNION
+                SELECT tender_id FROM tender_risk_scores
+            """, timeout=self.SWAP_TIMEOUT)
+            tender_ids = {row['tender_id'] for row in stored}
+            tender_ids.update(flag.tender_id for flag in all_flags)
+
+            logger.info(f"Replacing stored results with {len(all_flags)} flags...")
+            await self._replace_results(all_flags, sorted(tender_ids))
+        except Exception:
+            await self._finish_run(run_id, 'failed')
+            raise
+
+        await self._finish_run(run_id, 'completed', flags_written=len(all_flags))
+
+        logger.info("=" * 60)
+        logger.info(f"Analysis complete! Total flags: {len(all_flags)}")
+        logger.info("=" * 60)
+
+        return stats
+
+    async def run_incremental_analysis(self, since: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Re-evaluate only tenders changed since the last completed run.
+
+        The scope is the changed tenders plus every tender sharing their
+        procuring entity, winner or bidders, since group-level detectors
+        (repeat winner, rotation, clustering, splitting...) depend on those.
+        Every detector is limited to the scope in SQL; group-level ones keep
+        only the entity/winner/company groups that contain a scoped tender.
+        Results are replaced in the same per-tender batches as a full run.
+        Falls back to a full rebuild when no previous run is recorded.
+
+        Args:
+            since: Override the watermark (defaults to the last completed run)
+
+        Returns:
+            Dictionary with counts of each flag type detected within the scope
+        """
+        watermark = since or await self._get_last_watermark()
+        if watermark is None:
+            logger.info("No completed analysis run recorded - running full rebuild")
+            return await self.run_full_analysis()
+
+        logger.info("=" * 60)
+        logger.info(f"Starting incremental corruption analysis (changes since {watermark})")
+        logger.info("=" * 60)
+
+        run_id, _ = await self._start_run('incremental')
+
+        try:
+            changed = await self._get_changed_tenders(watermark)
+            if not changed:
+                logger.info("No tenders changed since last run")
+                await self._finish_run(run_id, 'completed')
+                return {}
+
+            scope = await self._expand_scope(changed)
+            logger.info(f"{len(changed)} changed tenders -> {len(scope)} tenders in scope")
+
+            all_flags, _ = await self._run_detectors(scope)
+            # Group flags sit on one tender of the group, which may be outside the scope
+            scope_set = set(scope)
+            all_flags = [flag for flag in all_flags if flag.tender_id in scope_set]
+
+            stats: Dict[str, int] = defaultdict(int)
+            for flag in all_flags:
+                stats[flag.flag_type] += 1
+
+            logger.info(f"Replacing results for {len(scope)} tenders with {len(all_flags)} flags...")
+            await self._replace_results(all_flags, scope)
+        except Exception:
+            await self._finish_run(run_id, 'failed')
+            raise
+
+        await self._finish_run(
+            run_id, 'completed',
+            changed_tenders=len(changed),
+            scoped_tenders=len(scope),
+            flags_written=len(all_flags)
+        )
+
+        logger.info("=" * 60)
+        logger.info(f"Incremental analysis complete! Flags in scope: {len(all_flags)}")
+        logger.info("=" * 60)
+
+        return dict(stats)
+
+    async def _run_detectors(
+        self,
+        scope: Optional[List[str]] = None
+    ) -> Tuple[List[CorruptionFlag], Dict[str, int]]:
+        """Run all 15 detectors, optionally scoped to a set of tender IDs"""
         all_flags = []
         stats = {}
 
@@ -2063,7 +2206,7 @@ class CorruptionAnalyzer:
 
         for detector_name, detector in detectors:
             try:
-                flags = await detector.detect()
+                flags = await detector.detect(scope=scope)
                 all_flags.extend(flags)
                 stats[detector_name] = len(flags)
                 logger.info(f"✓ {detector_name}: {len(flags)} flags")
@@ -2071,28 +2214,113 @@ class CorruptionAnalyzer:
                 logger.error(f"✗ {detector_name} failed: {e}")
                 stats[detector_name] = 0
 
-        # Clear old flags (TRUNCATE is instant vs DELETE which times out on 100K+ rows)
-        logger.info("Clearing old corruption flags...")
-        async with self.pool.acquire() as conn:
-            await conn.execute("TRUNCATE corruption_flags")
-            await conn.execute("TRUNCATE tender_risk_scores")
+        return all_flags, stats
 
-        # Save all flags to database
-        logger.info(f"Saving {len(all_flags)} flags to database...")
-        await self._save_flags(all_flags)
+    async def _replace_results(self, flags: List[CorruptionFlag], tender_ids: List[str]):
+        """
+        Replace flags and risk scores for the given tenders.
 
-        # Calculate and save risk scores
-        logger.info("Calculating tender risk scores...")
-        await self._calculate_risk_scores()
+        Tenders are processed in batches of REPLACE_BATCH_SIZE; each batch is
+        one transaction, so a tender's old flags and score stay visible to
+        readers until its batch commits.
+        """
+        flags_by_tender: Dict[str, List[CorruptionFlag]] = defaultdict(list)
+        for flag in flags:
+            flags_by_tender[flag.tender_id].append(flag)
 
-        logger.info("=" * 60)
-        logger.info(f"Analysis complete! Total flags: {len(all_flags)}")
-        logger.info("=" * 60)
+        batch_size = self.REPLACE_BATCH_SIZE
+        async with self.pool.acquire() as conn:
+            for i in range(0, len(tender_ids), batch_size):
+                batch = tender_ids[i:i + batch_size]
+                async with conn.transaction():
+                    await conn.execute(
+                        "DELETE FROM corruption_flags WHERE tender_id = ANY($1::text[])",
+                        batch, timeout=self.SWAP_TIMEOUT
+                    )
+                    await conn.execute(
+                        "DELETE FROM tender_risk_scores WHERE tender_id = ANY($1::text[])",
+                        batch, timeout=self.SWAP_TIMEOUT
+                    )
+                    await self._save_flags([f for tid in batch for f in flags_by_tender.get(tid, ())], conn)
+                    await self._calculate_risk_scores(conn, batch)
 
-        return stats
+                logger.info(
+                    f"Replaced results for {min(i + batch_size, len(tender_ids))}/{len(tender_ids)} tenders"
+                )
 
-    async def _save_flags(self, flags: List[CorruptionFlag]):
-        """Save corruption flags to database in batches"""
+    async def _get_last_watermark(self) -> Optional[datetime]:
+        """Watermark of the most recent completed analysis run"""
+        return await self.pool.fetchval("""
+            SELECT MAX(watermark)
+            FROM corruption_analysis_runs
+            WHERE status = 'completed'
+        """)
+
+    async def _start_run(self, mode: str) -> Tuple[int, datetime]:
+        """Record a run start; the watermark is DB time before detectors run"""
+        row = await self.pool.fetchrow("""
+            INSERT INTO corruption_analysis_runs (mode, watermark)
+            VALUES ($1, NOW())
+            RETURNING run_id, watermark
+        """, mode)
+        return row['run_id'], row['watermark']
+
+    async def _finish_run(
+        self,
+        run_id: int,
+        status: str,
+        changed_tenders: int = 0,
+        scoped_tenders: int = 0,
+        flags_written: int = 0
+    ):
+        """Mark a run as completed or failed"""
+        await self.pool.execute("""
+            UPDATE corruption_analysis_runs
+            SET status = $2,
+                changed_tenders = $3,
+                scoped_tenders = $4,
+                flags_written = $5,
+                finished_at = NOW()
+            WHERE run_id = $1
+        """, run_id, status, changed_tenders, scoped_tenders, flags_written)
+
+    async def _get_changed_tenders(self, watermark: datetime) -> List[str]:
+        """Tenders updated, or with bids added, after the watermark"""
+        rows = await self.pool.fetch("""
+            SELECT tender_id FROM tenders WHERE updated_at > $1
+            UNION
+            SELECT tender_id FROM tender_bidders WHERE created_at > $1
+        """, watermark)
+        return [row['tender_id'] for row in rows]
+
+    async def _expand_scope(self, changed: List[str]) -> List[str]:
+        """Changed tenders plus tenders sharing their entity, winner or bidders"""
+        rows = await self.pool.fetch("""
+            WITH changed AS (
+                SELECT tender_id, procuring_entity, winner
+                FROM tenders
+                WHERE tender_id = ANY($1::text[])
+            ),
+            touched_companies AS (
+                SELECT DISTINCT company_name
+                FROM tender_bidders
+                WHERE tender_id = ANY($1::text[])
+            )
+            SELECT tender_id FROM changed
+            UNION
+            SELECT t.tender_id
+            FROM tenders t
+            WHERE t.procuring_entity IN (SELECT procuring_entity FROM changed)
+               OR t.winner IN (SELECT winner FROM changed)
+            UNION
+            SELECT tb.tender_id
+            FROM tender_bidders tb
+            WHERE tb.company_name IN (SELECT company_name FROM touched_companies)
+        """, changed, timeout=self.SWAP_TIMEOUT)
+        return [row['tender_id'] for row in rows]
+
+    async def _save_flags(self, flags: List[CorruptionFlag], conn: asyncpg.Connection):
+        """Save corruption flags in batches on the given (transactional) connection"""
         if not flags:
             return
 
@@ -2106,30 +2334,29 @@ class CorruptionAnalyzer:
         total_saved = 0
 
         try:
-            async with self.pool.acquire() as conn:
-                for i in range(0, len(flags), batch_size):
-                    batch = flags[i:i + batch_size]
-                    await conn.executemany(query, [
-                        (
-                            flag.tender_id,
-                            flag.flag_type,
-                            flag.severity,
-                            flag.score,
-                            json.dumps(flag.evidence),
-                            flag.description
-                        )
-                        for flag in batch
-                    ])
-                    total_saved += len(batch)
-                    logger.info(f"Saved batch {i // batch_size + 1}: {total_saved}/{len(flags)} flags")
+            for i in range(0, len(flags), batch_size):
+                batch = flags[i:i + batch_size]
+                await conn.executemany(query, [
+                    (
+                        flag.tender_id,
+                        flag.flag_type,
+                        flag.severity,
+                        flag.score,
+                        json.dumps(flag.evidence),
+                        flag.description
+                    )
+                    for flag in batch
+                ])
+                total_saved += len(batch)
+                logger.info(f"Saved batch {i // batch_size + 1}: {total_saved}/{len(flags)} flags")
 
             logger.info(f"Saved {len(flags)} flags to database")
         except Exception as e:
             logger.error(f"Error saving flags: {e}")
             raise
 
-    async def _calculate_risk_scores(self):
-        """Calculate aggregate risk scores for all flagged tenders"""
+    async def _calculate_risk_scores(self, conn: asyncpg.Connection, scope: Optional[List[str]] = None):
+        """Calculate aggregate risk scores for flagged tenders (all, or those in scope)"""
         query = """
             SELECT
                 tender_id,
@@ -2144,53 +2371,85 @@ class CorruptionAnalyzer:
                 COUNT(*) as flag_count
             FROM corruption_flags
             WHERE false_positive = FALSE
+              AND ($1::text[] IS NULL OR tender_id = ANY($1::text[]))
             GROUP BY tender_id
         """
 
         try:
-            async with self.pool.acquire() as conn:
-                rows = await conn.fetch(query)
-
-                for row in rows:
-                    # Reconstruct flags for scoring
-                    # Handle JSON parsing - asyncpg may return as string or list
-                    flags_data = row['flags']
-                    if isinstance(flags_data, str):
-                        flags_data = json.loads(flags_data)
-
-                    flags = [
-                        CorruptionFlag(
-                            tender_id=row['tender_id'],
-                            flag_type=f['flag_type'],
-                            severity=f['severity'],
-                            score=f['score'],
-                            evidence={},
-                            description=f.get('description', '')
-                        )
-                        for f in flags_data if isinstance(f, dict)
-                    ]
-
-                    risk_score, risk_level = CorruptionScorer.calculate_score(flags)
-
-                    # Save to database
-                    await conn.execute("""
-                        INSERT INTO tender_risk_scores
-                        (tender_id, risk_score, risk_level, flag_count, flags_summary)
-                        VALUES ($1, $2, $3, $4, $5)
-                        ON CONFLICT (tender_id) DO UPDATE SET
-                            risk_score = $2,
-                            risk_level = $3,
-                            flag_count = $4,
-                            flags_summary = $5,
-                            last_analyzed = CURRENT_TIMESTAMP
-                    """, row['tender_id'], risk_score, risk_level, row['flag_count'], json.dumps(flags_data))
-
-            logger.info(f"Calculated risk scores for {len(rows)} tenders")
+            started = time.monotonic()
+            rows = await conn.fetch(query, scope, timeout=self.SWAP_TIMEOUT)
+
+            # Score everything in memory, then write with one COPY + one merge
+            records = []
+            for row in rows:
+                # Reconstruct flags for scoring
+                # Handle JSON parsing - asyncpg may return as string or list
+                flags_data = row['flags']
+                if isinstance(flags_data, str):
+                    flags_data = json.loads(flags_data)
+
+                flags = [
+                    CorruptionFlag(
+                        tender_id=row['tender_id'],
+                        flag_type=f['flag_type'],
+                        severity=f['severity'],
+                        score=f['score'],
+                        evidence={},
+                        description=f.get('description', '')
+                    )
+                    for f in flags_data if isinstance(f, dict)
+                ]
+
+                risk_score, risk_level = CorruptionScorer.calculate_score(flags)
+                records.append((row['tender_id'], risk_score, risk_level, row['flag_count'], json.dumps(flags_data)))
+
+            await self._write_risk_scores(conn, records)
+
+            elapsed = time.monotonic() - started
+            rate = len(records) / elapsed if elapsed > 0 else 0
+            logger.info(f"Calculated risk scores for {len(records)} tenders in {elapsed:.1f}s ({rate:,.0f} rows/sec)")
 
         except Exception as e:
             logger.error(f"Error calculating risk scores: {e}")
             raise
 
+    async def _write_risk_scores(self, conn: asyncpg.Connection, records: List[Tuple]):
+        """
+        Bulk upsert (tender_id, risk_score, risk_level, flag_count, flags_summary)
+        records: COPY into a temp staging table, then a single merge.
+        """
+        if not records:
+            return
+
+        async with conn.transaction():
+            await conn.execute("""
+                CREATE TEMP TABLE tender_risk_scores_staging (
+                    tender_id VARCHAR(100) PRIMARY KEY,
+                    risk_score INTEGER,
+                    risk_level VARCHAR(20),
+                    flag_count INTEGER,
+                    flags_summary JSONB
+                ) ON COMMIT DROP
+            """)
+            await conn.copy_records_to_table(
+                'tender_risk_scores_staging',
+                records=records,
+                columns=['tender_id', 'risk_score', 'risk_level', 'flag_count', 'flags_summary'],
+                timeout=self.SWAP_TIMEOUT
+            )
+            await conn.execute("""
+                INSERT INTO tender_risk_scores
+                (tender_id, risk_score, risk_level, flag_count, flags_summary)
+                SELECT tender_id, risk_score, risk_level, flag_count, flags_summary
+                FROM tender_risk_scores_staging
+                ON CONFLICT (tender_id) DO UPDATE SET
+                    risk_score = EXCLUDED.risk_score,
+                    risk_level = EXCLUDED.risk_level,
+                    flag_count = EXCLUDED.flag_count,
+                    flags_summary = EXCLUDED.flags_summary,
+                    last_analyzed = CURRENT_TIMESTAMP
+            """, timeout=self.SWAP_TIMEOUT)
+
     async def analyze_tender(self, tender_id: str) -> Optional[Dict]:
         """
         Get corruption analysis for a specific tender.
@@ -2363,8 +2622,11 @@ async def main():
             command = sys.argv[1]
 
             if command == 'analyze':
-                # Run full analysis
-                stats = await analyzer.run_full_analysis()
+                # Incremental by default; --full forces a complete rebuild
+                if '--full' in sys.argv[2:]:
+                    stats = await analyzer.run_full_analysis()
+                else:
+                    stats = await analyzer.run_incremental_analysis()
                 print("\n" + "=" * 60)
                 print("CORRUPTION DETECTION RESULTS")
                 print("=" * 60)
@@ -2397,7 +2659,8 @@ async def main():
                 print("Unknown command")
         else:
             print("Usage:")
-            print("  python corruption_detector.py analyze          # Run full analysis")
+            print("  python corruption_detector.py analyze          # Re-analyze tenders changed since last run")
+            print("  python corruption_detector.py analyze --full   # Full rebuild of all flags and scores")
             print("  python corruption_detector.py tender <id>      # Analyze specific tender")
             print("  python corruption_detector.py flagged [score]  # Get high-risk tenders")
             print("  python corruption_detector.py stats            # Get statistics")
@@ -40,6 +40,7 @@ from decimal import Decimal
 import re
 from google import genai
 from google.genai import types as genai_types
+from ai.llm_gateway import get_llm_gateway
 
 # Import existing agents
 from ai.agents.db_research_agent import (
@@ -943,14 +944,12 @@ Return your analysis in this EXACT JSON format:
 Focus on ACTIONABLE findings. Be thorough but factual. Only report findings you can support with evidence."""
 
         try:
-            response = self._genai_client.models.generate_content(
+            response = await get_llm_gateway().generate(
+                synthesis_prompt,
                 model=self.synthesis_model_name,
-                contents=synthesis_prompt,
-                config=genai_types.GenerateContentConfig(
-                    temperature=0.3,
-                    response_mime_type="application/json",
-                    safety_settings=SAFETY_SETTINGS,
-                ),
+                temperature=0.3,
+                response_mime_type="application/json",
+                safety_settings=SAFETY_SETTINGS,
             )
 
             synthesis = json.loads(response.text)
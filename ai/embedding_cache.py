@@ -0,0 +1,332 @@
+"""
+Content-addressed embedding cache
+
+Identical chunks (boilerplate legal clauses, repeated tender templates) are
+embedded once. Vectors are keyed by sha256(model key + normalized text) and
+kept in two layers:
+
+- an in-process LRU (bounded by entry count)
+- the embedding_cache table in PostgreSQL, shared by every worker and script
+
+Lookups go memory -> database -> embedding API; API results are written back
+to both layers. Hit/miss counters are kept per cache instance.
+
+Document chunks are cached without expiry. Search queries go through
+get_query_cache(), a process-wide instance with a TTL so that repeated and
+follow-up questions skip the embedding round-trip without the table growing
+unbounded.
+
+Usage:
+    cache = EmbeddingCache()
+    embedder = EmbeddingGenerator(cache=cache)
+    vectors = await embedder.generate_embeddings_batch(texts)
+    logger.info(cache.stats.summary())
+
+    # Or around any embedding function (sync or async, list in -> list out):
+    vectors = await cache.get_or_compute(texts, "text-embedding-3-small", embed_fn)
+"""
+import hashlib
+import inspect
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Normalize chunk text for hashing: NFC, collapsed whitespace, stripped"""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text or '')).strip()
+
+
+def content_hash(text: str, model_key: str) -> str:
+    """Cache key for a chunk under a given embedding model configuration"""
+    h = hashlib.sha256()
+    h.update(model_key.encode('utf-8'))
+    h.update(b'\x00')
+    h.update(normalize_text(text).encode('utf-8'))
+    return h.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for an EmbeddingCache"""
+    memory_hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.memory_hits + self.shared_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.memory_hits + self.shared_hits) / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'lookups': self.lookups,
+            'memory_hits': self.memory_hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'hit_rate': round(self.hit_rate, 4),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"Embedding cache: {self.hit_rate:.1%} hit rate "
+            f"({self.memory_hits} memory, {self.shared_hits} shared, "
+            f"{self.misses} misses, {self.writes} written)"
+        )
+
+
+class EmbeddingCache:
+    """
+    Two-layer (in-process LRU + PostgreSQL) content-addressed vector cache
+
+    Args:
+        pool: asyncpg pool or connection; defaults to the shared AI pool
+        memory_size: Max entries kept in the in-process LRU
+        shared: Whether to use the embedding_cache table at all
+        ttl_seconds: Entry lifetime in both layers (None = never expires)
+        namespace: Prefix for model keys, so caches with different lifetimes
+            never share (or prune) each other's rows
+    """
+
+    PRUNE_EVERY = 500  # Writes between deletes of expired shared rows
+
+    def __init__(
+        self,
+        pool=None,
+        memory_size: int = 20000,
+        shared: bool = True,
+        ttl_seconds: Optional[float] = None,
+        namespace: Optional[str] = None
+    ):
+        self._pool = pool
+        self.namespace = namespace
+        self.memory_size = memory_size
+        self.shared = shared
+        self.ttl_seconds = ttl_seconds
+        # key -> (vector, stored_at monotonic)
+        self._memory: 'OrderedDict[str, Tuple[List[float], float]]' = OrderedDict()
+        self.stats = CacheStats()
+        self._writes_since_prune = 0
+
+    def _scoped(self, model_key: str) -> str:
+        return f"{self.namespace}:{model_key}" if self.namespace else model_key
+
+    async def get_many(
+        self,
+        texts: Sequence[str],
+        model_key: str
+    ) -> List[Optional[List[float]]]:
+        """
+        Look up vectors for texts
+
+        Returns:
+            One entry per text: the cached vector, or None on a miss
+        """
+        keys = [content_hash(t, self._scoped(model_key)) for t in texts]
+        found: Dict[str, List[float]] = {}
+
+        now = time.monotonic()
+        for key in set(keys):
+            entry = self._memory.get(key)
+            if entry is None:
+                continue
+            if self.ttl_seconds is not None and now - entry[1] > self.ttl_seconds:
+                del self._memory[key]
+                continue
+            self._memory.move_to_end(key)
+            found[key] = entry[0]
+
+        missing = [k for k in set(keys) if k not in found]
+        if missing and self.shared:
+            try:
+                async with self._connection() as conn:
+                    rows = await conn.fetch("""
+                        SELECT content_hash, vector::real[] AS vector
+                        FROM embedding_cache
+                        WHERE content_hash = ANY($1::text[])
+                          AND ($2::float8 IS NULL
+                               OR created_at > NOW() - make_interval(secs => $2::float8))
+                    """, missing, self.ttl_seconds)
+                for row in rows:
+                    vector = list(row['vector'])
+                    found[row['content_hash']] = vector
+                    self._remember(row['content_hash'], vector)
+                shared_keys = {row['content_hash'] for row in rows}
+            except Exception as e:
+                logger.warning(f"Embedding cache lookup failed, continuing without it: {e}")
+                shared_keys = set()
+        else:
+            shared_keys = set()
+
+        results = []
+        for key in keys:
+            vector = found.get(key)
+            if vector is None:
+                self.stats.misses += 1
+            elif key in shared_keys:
+                self.stats.shared_hits += 1
+            else:
+                self.stats.memory_hits += 1
+            results.append(vector)
+        return results
+
+    async def put_many(
+        self,
+        texts: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        model_key: str
+    ):
+        """Store freshly generated vectors in both layers"""
+        scoped_key = self._scoped(model_key)
+        rows = {}
+        for text, vector in zip(texts, vectors):
+            key = content_hash(text, scoped_key)
+            vector = vector.tolist() if hasattr(vector, 'tolist') else list(vector)
+            self._remember(key, vector)
+            rows[key] = vector
+
+        if not rows or not self.shared:
+            return
+
+        try:
+            async with self._connection() as conn:
+                async with conn.transaction():
+                    await conn.execute("""
+                        CREATE TEMP TABLE embedding_cache_staging (
+                            content_hash TEXT,
+                            model TEXT,
+                            vector REAL[]
+                        ) ON COMMIT DROP
+                    """)
+                    await conn.copy_records_to_table(
+                        'embedding_cache_staging',
+                        records=[(key, scoped_key, vector) for key, vector in rows.items()],
+                        columns=['content_hash', 'model', 'vector']
+                    )
+                    # Conflicts only happen on races or expired rows; refresh them
+                    await conn.execute("""
+                        INSERT INTO embedding_cache (content_hash, model, vector)
+                        SELECT content_hash, model, vector::vector
+                        FROM embedding_cache_staging
+                        ON CONFLICT (content_hash) DO UPDATE
+                        SET vector = EXCLUDED.vector, created_at = NOW()
+                    """)
+            self.stats.writes += len(rows)
+            self._writes_since_prune += len(rows)
+            if self.ttl_seconds is not None and self._writes_since_prune >= self.PRUNE_EVERY:
+                await self.prune_expired(model_key)
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    async def prune_expired(self, model_key: str) -> int:
+        """Delete expired shared rows of this cache's namespace; returns rows deleted"""
+        self._writes_since_prune = 0
+        if self.ttl_seconds is None or not self.shared:
+            return 0
+        model_key = self._scoped(model_key)
+        async with self._connection() as conn:
+            result = await conn.execute("""
+                DELETE FROM embedding_cache
+                WHERE model = $1
+                  AND created_at < NOW() - make_interval(secs => $2::float8)
+            """, model_key, self.ttl_seconds)
+        deleted = int(result.split()[-1]) if result else 0
+        if deleted:
+            logger.info(f"Pruned {deleted} expired embedding cache rows for {model_key}")
+        return deleted
+
+    async def get_or_compute(
+        self,
+        texts: Sequence[str],
+        model_key: str,
+        compute: Callable[[List[str]], Any]
+    ) -> List[List[float]]:
+        """
+        Return vectors for texts, calling compute only for unique misses
+
+        Args:
+            texts: Texts to embed
+            model_key: Model configuration the vectors belong to
+            compute: Sync or async callable mapping a list of texts to vectors
+
+        Returns:
+            One vector per text, in input order
+        """
+        vectors = await self.get_many(texts, model_key)
+
+        pending: Dict[str, List[int]] = {}
+        for i, (text, vector) in enumerate(zip(texts, vectors)):
+            if vector is None:
+                pending.setdefault(normalize_text(text), []).append(i)
+
+        if pending:
+            unique_texts = [texts[positions[0]] for positions in pending.values()]
+            fresh = compute(unique_texts)
+            if inspect.isawaitable(fresh):
+                fresh = await fresh
+            await self.put_many(unique_texts, fresh, model_key)
+            for positions, vector in zip(pending.values(), fresh):
+                for i in positions:
+                    vectors[i] = vector
+
+        return vectors
+
+    def _remember(self, key: str, vector: List[float]):
+        self._memory[key] = (vector, time.monotonic())
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    @asynccontextmanager
+    async def _connection(self):
+        """Yield a connection whether we were given a pool, a connection or nothing"""
+        pool = self._pool
+        if pool is None:
+            # Resolve per call: the shared pool may be closed and recreated
+            from db_pool import get_pool
+            pool = await get_pool()
+
+        if hasattr(pool, 'acquire'):
+            async with pool.acquire() as conn:
+                yield conn
+        else:
+            yield pool
+
+
+_query_cache: Optional[EmbeddingCache] = None
+
+
+def get_query_cache() -> EmbeddingCache:
+    """
+    Process-wide cache for search query embeddings
+
+    Configured via QUERY_EMBEDDING_CACHE_SIZE (LRU entries, default 5000),
+    QUERY_EMBEDDING_CACHE_TTL (seconds, default 7 days) and
+    QUERY_EMBEDDING_CACHE_SHARED (use the embedding_cache table, default 1).
+    """
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = EmbeddingCache(
+            memory_size=int(os.getenv('QUERY_EMBEDDING_CACHE_SIZE', '5000')),
+            shared=os.getenv('QUERY_EMBEDDING_CACHE_SHARED', '1') == '1',
+            ttl_seconds=float(os.getenv('QUERY_EMBEDDING_CACHE_TTL', str(7 * 24 * 3600))),
+            # Own key space: pruning expired queries must not touch the
+            # permanent document-embedding rows of the same model
+            namespace='query'
+        )
+    return _query_cache
@@ -14,6 +14,7 @@ import logging
 import asyncio
 import asyncpg
 import json
+import uuid
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
@@ -22,6 +23,7 @@ from google.genai import types as genai_types
 
 # Import shared connection pool
 from db_pool import get_pool, get_connection
+from embedding_cache import EmbeddingCache
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -231,7 +233,8 @@ class EmbeddingGenerator:
         self,
         api_key: Optional[str] = None,
         model: str = "models/gemini-embedding-001",
-        batch_size: int = 100
+        batch_size: int = 100,
+        cache: Optional[EmbeddingCache] = None
     ):
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
         if not self.api_key:
@@ -242,6 +245,13 @@ class EmbeddingGenerator:
         self.model = model.replace('models/', '') if model.startswith('models/') else model
         self.batch_size = batch_size
         self.dimensions = 768  # gemini-embedding-001 dimensions
+        self.task_type = "RETRIEVAL_DOCUMENT"
+        self.cache = cache
+
+    @property
+    def cache_key(self) -> str:
+        """Model configuration the cached vectors are valid for"""
+        return f"{self.model}:{self.task_type}:{self.dimensions}"
 
     async def generate_embedding(self, text: str) -> List[float]:
         """
@@ -253,6 +263,9 @@ class EmbeddingGenerator:
         Returns:
             768-dimensional vector
         """
+        if self.cache is not None:
+            return (await self.generate_embeddings_batch([text]))[0]
+
         try:
             # Gemini API call (synchronous, so run in thread)
             result = await asyncio.to_thread(
@@ -260,8 +273,8 @@ class EmbeddingGenerator:
                 model=self.model,
                 contents=text,
                 config=genai_types.EmbedContentConfig(
-                    task_type="RETRIEVAL_DOCUMENT",
-                    output_dimensionality=768
+                    task_type=self.task_type,
+                    output_dimensionality=self.dimensions
                 )
             )
 
@@ -288,6 +301,18 @@ class EmbeddingGenerator:
         if not texts:
             return []
 
+        if self.cache is None:
+            return await self._request_embeddings(texts)
+
+        # Serve repeated chunks from the cache; only unique misses hit the API
+        vectors = await self.cache.get_or_compute(
+            texts, self.cache_key, self._request_embeddings
+        )
+        logger.debug(self.cache.stats.summary())
+        return vectors
+
+    async def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Call the Gemini API for texts (no caching)"""
         try:
             # Gemini batch embedding with retry for rate limits
             max_retries = 3
@@ -300,8 +325,8 @@ class EmbeddingGenerator:
                         model=self.model,
                         contents=texts,
                         config=genai_types.EmbedContentConfig(
-                            task_type="RETRIEVAL_DOCUMENT",
-                            output_dimensionality=768
+                            task_type=self.task_type,
+                            output_dimensionality=self.dimensions
                         )
                     )
                     break  # Success
@@ -373,6 +398,9 @@ class VectorStore:
     Uses shared connection pool to prevent connection exhaustion.
     """
 
+    # Rows per COPY round-trip in store_embeddings_bulk
+    BULK_BATCH_SIZE = 5000
+
     def __init__(self, database_url: str):
         # database_url kept for compatibility but we use shared pool
         self.database_url = database_url.replace('postgresql+asyncpg://', 'postgresql://')
@@ -471,6 +499,81 @@ class VectorStore:
         logger.info(f"Stored {len(embed_ids)} embeddings")
         return embed_ids
 
+    async def store_embeddings_bulk(
+        self,
+        embeddings: List[Tuple[TextChunk, List[float]]],
+        batch_size: Optional[int] = None
+    ) -> List[str]:
+        """
+        Store many embeddings with binary COPY
+
+        Vectors travel as binary float4[] arrays (no per-float string
+        formatting) into a temp staging table, then one INSERT ... SELECT
+        casts them to vector. embed_ids are generated client-side, so they
+        are returned in input order without a RETURNING round-trip. Each
+        batch commits on its own.
+
+        Args:
+            embeddings: List of (chunk, vector) tuples
+            batch_size: Rows per COPY (default BULK_BATCH_SIZE)
+
+        Returns:
+            List of embed_ids, aligned with ``embeddings``
+        """
+        batch_size = batch_size or self.BULK_BATCH_SIZE
+        embed_ids = [uuid.uuid4() for _ in embeddings]
+
+        async with self._pool.acquire() as conn:
+            for start in range(0, len(embeddings), batch_size):
+                batch = embeddings[start:start + batch_size]
+                records = [
+                    (
+                        embed_id,
+                        vector.tolist() if hasattr(vector, 'tolist') else vector,
+                        chunk.text,
+                        chunk.chunk_index,
+                        chunk.tender_id,
+                        chunk.doc_id,
+                        json.dumps(chunk.metadata or {})
+                    )
+                    for embed_id, (chunk, vector) in zip(embed_ids[start:start + batch_size], batch)
+                ]
+
+                async with conn.transaction():
+                    await conn.execute("""
+                        CREATE TEMP TABLE embeddings_staging (
+                            embed_id UUID,
+                            vector REAL[],
+                            chunk_text TEXT,
+                            chunk_index INTEGER,
+                            tender_id VARCHAR(100),
+                            doc_id UUID,
+                            metadata JSONB
+                        ) ON COMMIT DROP
+                    """)
+                    await conn.copy_records_to_table(
+                        'embeddings_staging',
+                        records=records,
+                        columns=['embed_id', 'vector', 'chunk_text', 'chunk_index',
+                                 'tender_id', 'doc_id', 'metadata']
+                    )
+                    await conn.execute("""
+                        INSERT INTO embeddings (
+                            embed_id, vector, chunk_text, chunk_index,
+                            tender_id, doc_id, metadata
+                        )
+                        SELECT
+                            embed_id, vector::vector, chunk_text, chunk_index,
+                            tender_id, doc_id, metadata
+                        FROM embeddings_staging
+                    """)
+
+                logger.info(
+                    f"Bulk stored {min(start + batch_size, len(embeddings))}/{len(embeddings)} embeddings"
+                )
+
+        return [str(embed_id) for embed_id in embed_ids]
+
     async def similarity_search(
         self,
         query_vector: List[float],
@@ -543,16 +646,21 @@ class EmbeddingsPipeline:
         database_url: Optional[str] = None,
         gemini_api_key: Optional[str] = None,
         chunk_size: int = 500,
-        batch_size: int = 100
+        batch_size: int = 100,
+        use_cache: Optional[bool] = None
     ):
         self.database_url = database_url or os.getenv('DATABASE_URL')
         if not self.database_url:
             raise ValueError("DATABASE_URL not set")
 
+        if use_cache is None:
+            use_cache = os.getenv('EMBEDDING_CACHE_ENABLED', '1') == '1'
+
         self.chunker = TextChunker(chunk_size=chunk_size)
         self.embedder = EmbeddingGenerator(
             api_key=gemini_api_key,
-            batch_size=batch_size
+            batch_size=batch_size,
+            cache=EmbeddingCache() if use_cache else None
         )
         self.vector_store = VectorStore(self.database_url)
 
@@ -600,7 +708,7 @@ class EmbeddingsPipeline:
             embeddings = await self.embedder.embed_chunks(chunks)
 
             # 3. Store in database
-            embed_ids = await self.vector_store.store_embeddings_batch(embeddings)
+            embed_ids = await self.vector_store.store_embeddings_bulk(embeddings)
 
             logger.info(
                 f"✓ Processed document: {len(chunks)} chunks, "
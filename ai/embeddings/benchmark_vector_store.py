@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: VectorStore.store_embeddings_batch vs store_embeddings_bulk
+
+Inserts synthetic 768-dim vectors through both write paths and reports
+rows/sec. Rows are tagged with metadata {"benchmark_run": <id>} and deleted
+afterwards; tender_id/doc_id are left NULL so no foreign keys are touched.
+
+Usage:
+    python ai/embeddings/benchmark_vector_store.py --rows 5000
+    python ai/embeddings/benchmark_vector_store.py --rows 20000 --bulk-batch-size 10000 --skip-legacy
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from db_pool import get_pool, close_pool
+from embeddings import VectorStore, TextChunk
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = 768
+
+
+def make_embeddings(rows: int, run_id: str, seed: int = 0):
+    """Synthetic (chunk, vector) pairs shaped like real pipeline output"""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((rows, DIMENSIONS)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [
+        (
+            TextChunk(
+                text=f"Бенчмарк парче {i} " * 20,
+                chunk_index=i,
+                metadata={'benchmark_run': run_id}
+            ),
+            vectors[i].tolist()
+        )
+        for i in range(rows)
+    ]
+
+
+async def time_path(name: str, store_fn, embeddings) -> float:
+    start = time.perf_counter()
+    embed_ids = await store_fn(embeddings)
+    elapsed = time.perf_counter() - start
+    assert len(embed_ids) == len(embeddings)
+    rate = len(embeddings) / elapsed if elapsed > 0 else float('inf')
+    logger.info(f"{name:>8}: {len(embeddings)} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    return rate
+
+
+async def cleanup(pool, run_id: str):
+    async with pool.acquire() as conn:
+        deleted = await conn.execute(
+            "DELETE FROM embeddings WHERE metadata->>'benchmark_run' = $1", run_id
+        )
+    logger.info(f"Cleanup: {deleted}")
+
+
+async def main(rows: int, bulk_batch_size: int, skip_legacy: bool):
+    run_id = f"vector-store-{uuid.uuid4().hex[:8]}"
+    store = VectorStore(os.getenv('DATABASE_URL', ''))
+    await store.connect()
+    pool = await get_pool()
+
+    try:
+        results = {}
+        if not skip_legacy:
+            results['batch'] = await time_path(
+                'batch', store.store_embeddings_batch, make_embeddings(rows, run_id, seed=1)
+            )
+        results['bulk'] = await time_path(
+            'bulk',
+            lambda e: store.store_embeddings_bulk(e, batch_size=bulk_batch_size),
+            make_embeddings(rows, run_id, seed=2)
+        )
+
+        if 'batch' in results:
+            logger.info(f"Speedup: {results['bulk'] / results['batch']:.1f}x")
+    finally:
+        await cleanup(pool, run_id)
+        await store.close()
+        await close_pool()
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark VectorStore write paths')
+    parser.add_argument('--rows', type=int, default=5000, help='Rows per path')
+    parser.add_argument('--bulk-batch-size', type=int, default=VectorStore.BULK_BATCH_SIZE,
+                        help='Rows per COPY for the bulk path')
+    parser.add_argument('--skip-legacy', action='store_true', help='Only run the bulk path')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.bulk_batch_size, args.skip_legacy))
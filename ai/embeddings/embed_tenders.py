@@ -3,12 +3,16 @@
 import asyncio
 import json
 import os
+import sys
 import logging
 from openai import OpenAI
 import asyncpg
 from dotenv import load_dotenv
 load_dotenv()
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from embedding_cache import EmbeddingCache
+
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
@@ -16,19 +20,23 @@ logger = logging.getLogger(__name__)
 DATABASE_URL = os.environ.get('DATABASE_URL', 
     os.getenv('DATABASE_URL'))
 
+EMBEDDING_MODEL = 'text-embedding-3-small'
+
 client = OpenAI()
 
-def get_embedding(text: str) -> list:
-    """Get embedding from OpenAI."""
-    response = client.embeddings.create(
-        model='text-embedding-3-small',
-        input=text[:8000]  # Limit to 8k chars
-    )
-    return response.data[0].embedding
+def _request_embeddings(texts: list) -> list:
+    response = client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
+    return [d.embedding for d in response.data]
+
+async def get_embedding(text: str, cache: EmbeddingCache) -> list:
+    """Get embedding from the cache, falling back to OpenAI."""
+    # Limit to 8k chars
+    return (await cache.get_or_compute([text[:8000]], EMBEDDING_MODEL, _request_embeddings))[0]
 
 async def embed_tenders(batch_size: int = 100, max_tenders: int = 10000):
     """Generate embeddings for tenders without embeddings."""
     conn = await asyncpg.connect(DATABASE_URL)
+    cache = EmbeddingCache(conn)
     
     # Get tenders with raw_data_json but no embeddings
     tenders = await conn.fetch('''
@@ -61,7 +69,7 @@ Status: {data.get('status', '')}
 """
             
             # Get embedding
-            embedding = get_embedding(text)
+            embedding = await get_embedding(text, cache)
             
             # Store embedding
             await conn.execute('''
@@ -79,6 +87,7 @@ Status: {data.get('status', '')}
     
     await conn.close()
     logger.info(f'Done! Embedded {count} tenders')
+    logger.info(cache.stats.summary())
 
 if __name__ == '__main__':
     import argparse
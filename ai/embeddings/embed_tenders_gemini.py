@@ -6,6 +6,7 @@ NEW script - does not modify existing flows.
 import asyncio
 import json
 import os
+import sys
 import logging
 from google import genai
 from google.genai import types as genai_types
@@ -32,26 +33,36 @@ DATABASE_URL = os.getenv('DATABASE_URL')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'gemini-embedding-001')
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from embedding_cache import EmbeddingCache
+
+# Must match EmbeddingGenerator.cache_key so both paths share cached vectors
+CACHE_KEY = f'{EMBEDDING_MODEL}:RETRIEVAL_DOCUMENT:768'
+
 # Configure Gemini
 _client = genai.Client(api_key=GEMINI_API_KEY)
 
-def get_embedding(text: str) -> str:
-    """Get embedding from Gemini, return as pgvector string format."""
+def _request_embeddings(texts: List[str]) -> List[List[float]]:
     result = _client.models.embed_content(
         model=EMBEDDING_MODEL,
-        contents=text[:8000],
+        contents=texts,
         config=genai_types.EmbedContentConfig(
             task_type='RETRIEVAL_DOCUMENT',
             output_dimensionality=768
         )
     )
+    return [e.values for e in result.embeddings]
+
+async def get_embedding(text: str, cache: EmbeddingCache) -> str:
+    """Get embedding (cache first, then Gemini), return as pgvector string format."""
+    vector = (await cache.get_or_compute([text[:8000]], CACHE_KEY, _request_embeddings))[0]
     # Convert to pgvector string format: '[0.1, 0.2, ...]'
-    embedding_list = result.embeddings[0].values
-    return '[' + ','.join(str(x) for x in embedding_list) + ']'
+    return '[' + ','.join(str(x) for x in vector) + ']'
 
 async def embed_tenders(batch_size: int = 50, max_tenders: int = 10000):
     """Generate embeddings for tenders with raw_data_json but no embeddings."""
     conn = await asyncpg.connect(DATABASE_URL)
+    cache = EmbeddingCache(conn)
     
     # Get tenders with raw_data_json but no tender-level embeddings
     query = """
@@ -105,7 +116,7 @@ async def embed_tenders(batch_size: int = 50, max_tenders: int = 10000):
                 continue  # Skip empty tenders
             
             # Get embedding from Gemini (returns pgvector string format)
-            embedding_str = get_embedding(text)
+            embedding_str = await get_embedding(text, cache)
             
             # Store embedding (doc_id=NULL indicates tender-level embedding)
             await conn.execute("""
@@ -135,6 +146,7 @@ async def embed_tenders(batch_size: int = 50, max_tenders: int = 10000):
     
     await conn.close()
     logger.info(f'Done! Embedded {count} tenders, {errors} errors')
+    logger.info(cache.stats.summary())
 
 if __name__ == '__main__':
     import argparse
@@ -245,12 +245,19 @@ class AutoEmbeddingPipeline:
                 f"{total_embeddings} embeddings, {errors} errors"
             )
 
-            return {
+            stats = {
                 'total_processed': len(documents),
                 'total_embeddings': total_embeddings,
                 'errors': errors
             }
 
+            cache = self.embeddings_pipeline.embedder.cache
+            if cache is not None:
+                logger.info(cache.stats.summary())
+                stats['cache_hit_rate'] = round(cache.stats.hit_rate, 4)
+
+            return stats
+
         except Exception as e:
             logger.error(f"Auto-embedding pipeline failed: {e}")
             raise
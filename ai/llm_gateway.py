@@ -0,0 +1,518 @@
+"""
+Async LLM gateway
+
+Every Gemini text generation in ai/ and backend/api goes through one
+process-wide gateway instead of calling the synchronous
+client.models.generate_content inside async code (which blocked the event
+loop for the whole LLM round-trip) or pushing it to a worker thread.
+
+- Calls use the SDK's native async client (client.aio).
+- A global semaphore (LLM_MAX_CONCURRENCY) bounds requests in flight; a
+  per-user semaphore (LLM_MAX_PER_USER) keeps one user's burst from taking
+  every slot. Calls without a user_id (scripts, background jobs) are only
+  bound by the global limit.
+- Identical requests already in flight are deduplicated: later callers
+  await the first call's result instead of sending the prompt again.
+- Deterministic requests (temperature <= LLM_CACHE_MAX_TEMPERATURE, e.g.
+  tool decisions and grounding checks) are cached in an in-process LRU with
+  a TTL (LLM_CACHE_SIZE entries, LLM_CACHE_TTL seconds).
+- Latency, queue wait and token usage are recorded; get_status() reports them.
+
+Tests swap the Gemini backend for FakeLLMBackend, which needs no network or
+API key.
+
+Usage:
+    from llm_gateway import get_llm_gateway
+
+    response = await get_llm_gateway().generate(
+        prompt,
+        model='gemini-2.5-flash',
+        temperature=0.1,
+        response_mime_type='application/json',
+        user_id=user_id,
+    )
+    data = json.loads(response.text)
+
+    async for piece in get_llm_gateway().stream(prompt, model=model, temperature=0.3):
+        ...
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# ai/ modules import this file both as llm_gateway (ai/ on sys.path) and as
+# ai.llm_gateway; register both names so a process has a single gateway.
+sys.modules.setdefault('llm_gateway', sys.modules[__name__])
+sys.modules.setdefault('ai.llm_gateway', sys.modules[__name__])
+
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '16'))
+LLM_MAX_PER_USER = int(os.getenv('LLM_MAX_PER_USER', '2'))  # 0 = no per-user limit
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '120'))  # seconds per call
+LLM_CACHE_SIZE = int(os.getenv('LLM_CACHE_SIZE', '2048'))
+LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', '3600'))
+LLM_CACHE_MAX_TEMPERATURE = 0.1
+
+DEFAULT_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+
+# Latency samples kept for percentiles in get_status()
+_LATENCY_WINDOW = 1000
+
+
+@dataclass
+class LLMResponse:
+    """Text generated by one call, with usage and timing"""
+    text: str
+    model: str
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: float = 0.0
+    cached: bool = False
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class GeminiBackend:
+    """google-genai async client"""
+
+    def __init__(self, api_key: Optional[str] = None):
+        from google import genai
+        from google.genai import types as genai_types
+
+        self._types = genai_types
+        self._client = genai.Client(api_key=api_key or os.getenv('GEMINI_API_KEY'))
+
+    def _config(self, config: Dict[str, Any]):
+        return self._types.GenerateContentConfig(
+            **{k: v for k, v in config.items() if v is not None}
+        )
+
+    @staticmethod
+    def _text(response) -> str:
+        try:
+            return response.text or ""
+        except ValueError as e:
+            # Blocked candidate - keep any partial content
+            candidates = getattr(response, 'candidates', None) or []
+            if not candidates:
+                logger.warning(f"No candidates in response: {e}")
+                return ""
+            candidate = candidates[0]
+            logger.warning(f"Safety block - finish_reason: {candidate.finish_reason}")
+            parts = candidate.content.parts if candidate.content and candidate.content.parts else []
+            return "".join(part.text for part in parts if getattr(part, 'text', None))
+
+    @staticmethod
+    def _usage(response) -> Tuple[int, int]:
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is None:
+            return 0, 0
+        return (
+            getattr(usage, 'prompt_token_count', None) or 0,
+            getattr(usage, 'candidates_token_count', None) or 0,
+        )
+
+    async def generate(self, model: str, prompt: str, config: Dict[str, Any]) -> LLMResponse:
+        response = await self._client.aio.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=self._config(config)
+        )
+        prompt_tokens, output_tokens = self._usage(response)
+        return LLMResponse(
+            text=self._text(response),
+            model=model,
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens
+        )
+
+    async def stream(self, model: str, prompt: str, config: Dict[str, Any]) -> AsyncIterator[LLMResponse]:
+        chunks = await self._client.aio.models.generate_content_stream(
+            model=model,
+            contents=prompt,
+            config=self._config(config)
+        )
+        async for chunk in chunks:
+            prompt_tokens, output_tokens = self._usage(chunk)
+            yield LLMResponse(
+                text=self._text(chunk),
+                model=model,
+                prompt_tokens=prompt_tokens,
+                output_tokens=output_tokens
+            )
+
+
+class FakeLLMBackend:
+    """
+    Local backend for tests.
+
+    Args:
+        responses: Fixed reply text, a {prompt substring: reply} dict (first
+            match wins), or a callable(prompt, config) -> reply
+        default: Reply when no dict entry matches
+        delay: Seconds each call takes (lets tests overlap calls)
+
+    Every call is appended to .calls as (model, prompt, config).
+    """
+
+    def __init__(
+        self,
+        responses: Union[str, Dict[str, str], Callable[[str, Dict[str, Any]], str], None] = None,
+        default: str = "",
+        delay: float = 0.0
+    ):
+        self.responses = responses
+        self.default = default
+        self.delay = delay
+        self.calls: List[Tuple[str, str, Dict[str, Any]]] = []
+
+    def _reply(self, prompt: str, config: Dict[str, Any]) -> str:
+        if callable(self.responses):
+            return self.responses(prompt, config)
+        if isinstance(self.responses, str):
+            return self.responses
+        for needle, reply in (self.responses or {}).items():
+            if needle in prompt:
+                return reply
+        return self.default
+
+    async def generate(self, model: str, prompt: str, config: Dict[str, Any]) -> LLMResponse:
+        self.calls.append((model, prompt, config))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        text = self._reply(prompt, config)
+        return LLMResponse(
+            text=text,
+            model=model,
+            prompt_tokens=len(prompt.split()),
+            output_tokens=len(text.split())
+        )
+
+    async def stream(self, model: str, prompt: str, config: Dict[str, Any]) -> AsyncIterator[LLMResponse]:
+        response = await self.generate(model, prompt, config)
+        words = response.text.split(' ')
+        for i, word in enumerate(words):
+            last = i == len(words) - 1
+            yield LLMResponse(
+                text=word if last else word + ' ',
+                model=model,
+                prompt_tokens=response.prompt_tokens if last else 0,
+                output_tokens=response.output_tokens if last else 0
+            )
+
+
+# ============================================================================
+# GATEWAY
+# ============================================================================
+
+def request_key(model: str, prompt: str, config: Dict[str, Any]) -> str:
+    """Dedup / cache key of a request (safety settings are not part of it)"""
+    payload = json.dumps(
+        [model, prompt, {k: v for k, v in sorted(config.items()) if k != 'safety_settings'}],
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMGateway:
+    """
+    Process-wide async LLM client with limits, dedup and a response cache.
+
+    Attributes:
+        max_concurrency: Requests in flight across all users
+        max_per_user: Requests in flight for one user_id (0 = unlimited)
+        timeout: Seconds before a backend call is abandoned
+    """
+
+    _instance: Optional["LLMGateway"] = None
+
+    def __init__(
+        self,
+        backend=None,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_per_user: int = LLM_MAX_PER_USER,
+        timeout: float = LLM_TIMEOUT,
+        cache_size: int = LLM_CACHE_SIZE,
+        cache_ttl: float = LLM_CACHE_TTL
+    ):
+        self._backend = backend
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_per_user = max(0, max_per_user)
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+
+        self._global = asyncio.Semaphore(self.max_concurrency)
+        # user_id -> [semaphore, callers holding or waiting]
+        self._user_slots: Dict[str, list] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cache: "OrderedDict[str, Tuple[float, LLMResponse]]" = OrderedDict()
+
+        # Counters for get_status()
+        self._calls = 0
+        self._errors = 0
+        self._cache_hits = 0
+        self._dedup_hits = 0
+        self._streams = 0
+        self._prompt_tokens = 0
+        self._output_tokens = 0
+        self._active = 0
+        self._latencies: deque = deque(maxlen=_LATENCY_WINDOW)
+        self._waits: deque = deque(maxlen=_LATENCY_WINDOW)
+
+    @classmethod
+    def get_instance(cls) -> "LLMGateway":
+        """Return the singleton instance (create if needed)."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def backend(self):
+        # Created on first use so importing this module needs no API key
+        if self._backend is None:
+            self._backend = GeminiBackend()
+        return self._backend
+
+    def set_backend(self, backend):
+        """Replace the backend (tests) and drop cached responses."""
+        self._backend = backend
+        self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None,
+        response_mime_type: Optional[str] = None,
+        safety_settings: Optional[list] = None,
+        user_id: Optional[str] = None,
+        use_cache: Optional[bool] = None
+    ) -> LLMResponse:
+        """
+        Generate text for one prompt.
+
+        Args:
+            prompt: Full prompt
+            model: Model name (GEMINI_MODEL by default)
+            temperature, max_output_tokens, response_mime_type, safety_settings:
+                GenerateContentConfig fields; None leaves the model default
+            user_id: Caller for per-user fairness (None = no per-user limit)
+            use_cache: Force caching on/off; by default only requests with
+                temperature <= LLM_CACHE_MAX_TEMPERATURE are cached
+
+        Returns:
+            LLMResponse; text is "" when the model returned no text
+        """
+        model = model or DEFAULT_MODEL
+        config = {
+            'temperature': temperature,
+            'max_output_tokens': max_output_tokens,
+            'response_mime_type': response_mime_type,
+            'safety_settings': safety_settings,
+        }
+        if use_cache is None:
+            use_cache = temperature is not None and temperature <= LLM_CACHE_MAX_TEMPERATURE
+        key = request_key(model, prompt, config)
+
+        if use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._cache_hits += 1
+                return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._dedup_hits += 1
+            return await asyncio.shield(inflight)
+
+        task = asyncio.ensure_future(
+            self._call(model, prompt, config, user_id, key if use_cache else None)
+        )
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._inflight.pop(key, None) if self._inflight.get(key) is t else None)
+        # Shielded so a cancelled caller doesn't cancel deduplicated waiters
+        return await asyncio.shield(task)
+
+    async def stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None,
+        safety_settings: Optional[list] = None,
+        user_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream text pieces for one prompt (not cached or deduplicated).
+
+        The concurrency slot is held until the stream is exhausted or closed.
+        """
+        model = model or DEFAULT_MODEL
+        config = {
+            'temperature': temperature,
+            'max_output_tokens': max_output_tokens,
+            'safety_settings': safety_settings,
+        }
+        async with self._slot(user_id):
+            self._streams += 1
+            start = time.monotonic()
+            prompt_tokens = output_tokens = 0
+            try:
+                async for chunk in self.backend.stream(model, prompt, config):
+                    prompt_tokens = max(prompt_tokens, chunk.prompt_tokens)
+                    output_tokens = max(output_tokens, chunk.output_tokens)
+                    if chunk.text:
+                        yield chunk.text
+            except Exception:
+                self._errors += 1
+                raise
+            finally:
+                self._record((time.monotonic() - start) * 1000, prompt_tokens, output_tokens)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Limits, cache and dedup counters, latency percentiles and token totals."""
+        return {
+            'backend': type(self._backend).__name__ if self._backend else None,
+            'max_concurrency': self.max_concurrency,
+            'max_per_user': self.max_per_user,
+            'active': self._active,
+            'users_waiting_or_active': len(self._user_slots),
+            'inflight': len(self._inflight),
+            'calls': self._calls,
+            'streams': self._streams,
+            'errors': self._errors,
+            'cache_hits': self._cache_hits,
+            'dedup_hits': self._dedup_hits,
+            'cache_entries': len(self._cache),
+            'prompt_tokens': self._prompt_tokens,
+            'output_tokens': self._output_tokens,
+            'latency_ms': _percentiles(self._latencies),
+            'queue_wait_ms': _percentiles(self._waits),
+        }
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def _slot(self, user_id: Optional[str]):
+        """Hold a per-user slot (if limited) and then a global slot."""
+        queued = time.monotonic()
+        entry = None
+        if user_id is not None and self.max_per_user:
+            entry = self._user_slots.get(user_id)
+            if entry is None:
+                entry = self._user_slots[user_id] = [asyncio.Semaphore(self.max_per_user), 0]
+            entry[1] += 1
+        try:
+            async with AsyncExitStack() as stack:
+                if entry is not None:
+                    await stack.enter_async_context(entry[0])
+                await stack.enter_async_context(self._global)
+                self._waits.append((time.monotonic() - queued) * 1000)
+                self._active += 1
+                try:
+                    yield
+                finally:
+                    self._active -= 1
+        finally:
+            if entry is not None:
+                entry[1] -= 1
+                if entry[1] == 0 and self._user_slots.get(user_id) is entry:
+                    del self._user_slots[user_id]
+
+    async def _call(
+        self,
+        model: str,
+        prompt: str,
+        config: Dict[str, Any],
+        user_id: Optional[str],
+        cache_key: Optional[str]
+    ) -> LLMResponse:
+        async with self._slot(user_id):
+            self._calls += 1
+            start = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    self.backend.generate(model, prompt, config),
+                    self.timeout
+                )
+            except Exception:
+                self._errors += 1
+                raise
+            response.latency_ms = (time.monotonic() - start) * 1000
+            self._record(response.latency_ms, response.prompt_tokens, response.output_tokens)
+
+        if cache_key is not None and response.text:
+            self._cache_put(cache_key, response)
+        return response
+
+    def _record(self, latency_ms: float, prompt_tokens: int, output_tokens: int):
+        self._latencies.append(latency_ms)
+        self._prompt_tokens += prompt_tokens
+        self._output_tokens += output_tokens
+
+    def _cache_get(self, key: str) -> Optional[LLMResponse]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return LLMResponse(
+            text=response.text,
+            model=response.model,
+            prompt_tokens=response.prompt_tokens,
+            output_tokens=response.output_tokens,
+            latency_ms=0.0,
+            cached=True
+        )
+
+    def _cache_put(self, key: str, response: LLMResponse):
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (time.monotonic(), response)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def _percentiles(samples) -> Dict[str, float]:
+    if not samples:
+        return {'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    ordered = sorted(samples)
+    return {
+        'p50': round(ordered[len(ordered) // 2], 1),
+        'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        'max': round(ordered[-1], 1),
+    }
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Process-wide gateway (LLMGateway.get_instance())"""
+    return LLMGateway.get_instance()
@@ -18,10 +18,11 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta, date
 from dateutil.relativedelta import relativedelta
-from google import genai
 from google.genai import types as genai_types
 
 from embeddings import EmbeddingGenerator, VectorStore
+from embedding_cache import get_query_cache
+from tender_search import TenderSearch, PositionalParams
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -73,6 +74,7 @@ SAFETY_SETTINGS = [
     genai_types.SafetySetting(category="HARM_CATEGORY_DANGEROUS_CONTENT", threshold="OFF"),
 ]
 from db_pool import get_pool, get_connection
+from llm_gateway import get_llm_gateway
 from web_research import HybridRAGEngine, WebResearchEngine
 import json
 from followup_handler import FollowUpDetector, QueryModifier, LastQueryContext
@@ -674,15 +676,12 @@ async def verify_answer_grounding(
 }}'''
 
     try:
-        client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
-        response = client.models.generate_content(
+        response = await get_llm_gateway().generate(
+            verification_prompt,
             model=os.getenv('GEMINI_MODEL', 'gemini-2.5-flash'),
-            contents=verification_prompt,
-            config=genai_types.GenerateContentConfig(
-                temperature=0.1,
-                response_mime_type="application/json",
-                safety_settings=SAFETY_SETTINGS
-            )
+            temperature=0.1,
+            response_mime_type="application/json",
+            safety_settings=SAFETY_SETTINGS
         )
 
         result = json.loads(response.text)
@@ -2075,15 +2074,12 @@ Examples of good expansions:
 
 Return ONLY a valid JSON array like: ["term1", "term2", "term3"]'''
 
-        client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
-        response = client.models.generate_content(
+        response = await get_llm_gateway().generate(
+            prompt,
             model=os.getenv('GEMINI_MODEL', 'gemini-2.5-flash'),
-            contents=prompt,
-            config=genai_types.GenerateContentConfig(
-                temperature=0.2,
-                response_mime_type="application/json",
-                safety_settings=SAFETY_SETTINGS
-            )
+            temperature=0.2,
+            response_mime_type="application/json",
+            safety_settings=SAFETY_SETTINGS
         )
 
         # Parse JSON response
@@ -2497,43 +2493,40 @@ async def execute_tool(tool_name: str, tool_args: dict, conn, user_id: str = Non
         if isinstance(keywords, str):
             keywords = [keywords]
 
-        # Build search patterns
-        patterns = [f"%{kw}%" for kw in keywords if len(kw) >= 2]
-        if not patterns:
+        # Bilingual search over the folded search_text/search_tsv columns
+        tender_search = TenderSearch(*[kw for kw in keywords if len(kw) >= 2])
+        if not tender_search:
             return "Премногу кратки клучни зборови."
 
-        # Build query with optional date filters
-        params = [patterns]
+        params = PositionalParams()
         date_filter = ""
 
         if date_from:
-            date_filter += f" AND publication_date >= ${len(params) + 1}"
-            params.append(date_from)
+            date_filter += f" AND publication_date >= {params(date_from)}"
         if date_to:
-            date_filter += f" AND publication_date <= ${len(params) + 1}"
-            params.append(date_to)
+            date_filter += f" AND publication_date <= {params(date_to)}"
 
         query = f"""
             SELECT tender_id, title, procuring_entity,
                    estimated_value_mkd, actual_value_mkd, winner,
-                   publication_date, closing_date, status
+                   publication_date, closing_date, status,
+                   {tender_search.rank_sql("tenders", params)} AS search_rank
             FROM tenders
-            WHERE (title ILIKE ANY($1)
-               OR procuring_entity ILIKE ANY($1)){date_filter}
+            WHERE {tender_search.filter_sql("tenders", params)}{date_filter}
             UNION ALL
             SELECT tender_id, title, contracting_authority as procuring_entity,
                    estimated_value_mkd, awarded_value_mkd as actual_value_mkd,
                    (SELECT supplier_name FROM epazar_offers
                     WHERE epazar_offers.tender_id = epazar_tenders.tender_id
                     AND is_winner = true LIMIT 1) as winner,
-                   publication_date, closing_date, status
+                   publication_date, closing_date, status,
+                   {tender_search.rank_sql("epazar_tenders", params)} AS search_rank
             FROM epazar_tenders
-            WHERE (title ILIKE ANY($1)
-               OR contracting_authority ILIKE ANY($1)){date_filter}
-            ORDER BY publication_date DESC
+            WHERE {tender_search.filter_sql("epazar_tenders", params)}{date_filter}
+            ORDER BY search_rank DESC, publication_date DESC
             LIMIT 15
         """
-        rows = await conn.fetch(query, *params)
+        rows = await conn.fetch(query, *params.values)
 
         # ALWAYS run web search for comprehensive results
         web_result = None
@@ -2754,7 +2747,7 @@ async def execute_tool(tool_name: str, tool_args: dict, conn, user_id: str = Non
         try:
             # 1. Generate query embedding using Gemini
             logger.info(f"Generating embedding for query: {query_text[:100]}...")
-            embedder = EmbeddingGenerator(api_key=os.getenv('GEMINI_API_KEY'))
+            embedder = EmbeddingGenerator(api_key=os.getenv('GEMINI_API_KEY'), cache=get_query_cache())
             query_vector = await embedder.generate_embedding(query_text)
 
             # 2. Perform vector similarity search using pgvector
@@ -5814,7 +5807,6 @@ class LLMDrivenAgent:
     def __init__(self, database_url: str = None, gemini_api_key: str = None):
         self.database_url = database_url or os.getenv('DATABASE_URL')
         self.gemini_api_key = gemini_api_key or os.getenv('GEMINI_API_KEY')
-        self._genai_client = genai.Client(api_key=self.gemini_api_key)
 
         # Initialize follow-up handling components
         self.followup_detector = FollowUpDetector()
@@ -6348,14 +6340,13 @@ class LLMDrivenAgent:
 - Дај конкретен и корисен одговор
 """
             try:
-                response = self._genai_client.models.generate_content(
+                response = await get_llm_gateway().generate(
+                    final_prompt,
                     model=os.getenv('GEMINI_MODEL', 'gemini-2.5-flash'),
-                    contents=final_prompt,
-                    config=genai_types.GenerateContentConfig(
-                        temperature=0.3,
-                        max_output_tokens=4096,
-                        safety_settings=SAFETY_SETTINGS
-                    )
+                    temperature=0.3,
+                    max_output_tokens=4096,
+                    safety_settings=SAFETY_SETTINGS,
+                    user_id=user_id
                 )
                 answer = response.text if response.text else "Не можам да генерирам одговор за овој тендер."
 
@@ -6455,14 +6446,13 @@ class LLMDrivenAgent:
 
             try:
                 _model_name = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
-                response = self._genai_client.models.generate_content(
+                response = await get_llm_gateway().generate(
+                    tool_decision_prompt,
                     model=_model_name,
-                    contents=tool_decision_prompt,
-                    config=genai_types.GenerateContentConfig(
-                        temperature=0.1,
-                        response_mime_type="application/json",
-                        safety_settings=SAFETY_SETTINGS
-                    )
+                    temperature=0.1,
+                    response_mime_type="application/json",
+                    safety_settings=SAFETY_SETTINGS,
+                    user_id=user_id
                 )
 
                 decision = json.loads(response.text)
@@ -6691,14 +6681,13 @@ class LLMDrivenAgent:
 6. КРАТКО И ЈАСНО: За едноставни прашања 2-4 реченици. За комплексни - табела или листа. Не пишувај есеи."""
 
         try:
-            final_response = self._genai_client.models.generate_content(
+            final_response = await get_llm_gateway().generate(
+                final_prompt,
                 model=_model_name,
-                contents=final_prompt,
-                config=genai_types.GenerateContentConfig(
-                    temperature=0.3,
-                    max_output_tokens=4096,
-                    safety_settings=SAFETY_SETTINGS
-                )
+                temperature=0.3,
+                max_output_tokens=4096,
+                safety_settings=SAFETY_SETTINGS,
+                user_id=user_id
             )
             # SECURITY: Validate response before returning
             answer_text = validate_response(final_response.text, question)
@@ -6740,14 +6729,13 @@ class LLMDrivenAgent:
 Дај одговор на македонски:"""
 
                         try:
-                            regeneration_response = self._genai_client.models.generate_content(
+                            regeneration_response = await get_llm_gateway().generate(
+                                regeneration_prompt,
                                 model=_model_name,
-                                contents=regeneration_prompt,
-                                config=genai_types.GenerateContentConfig(
-                                    temperature=0.3,
-                                    max_output_tokens=4096,
-                                    safety_settings=SAFETY_SETTINGS
-                                )
+                                temperature=0.3,
+                                max_output_tokens=4096,
+                                safety_settings=SAFETY_SETTINGS,
+                                user_id=user_id
                             )
                             regenerated_answer = validate_response(regeneration_response.text, question)
 
@@ -7372,7 +7360,6 @@ class RAGQueryPipeline:
         model = model or os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
         fallback_model = fallback_model or os.getenv('GEMINI_FALLBACK_MODEL', 'gemini-2.5-flash')
 
-        self._genai_client = genai.Client(api_key=self.gemini_api_key)
         self.model = model
         self.fallback_model = fallback_model
         self.top_k = top_k
@@ -7381,7 +7368,7 @@ class RAGQueryPipeline:
         self.personalization_weight = personalization_weight
 
         # Initialize components
-        self.embedder = EmbeddingGenerator(api_key=self.gemini_api_key)
+        self.embedder = EmbeddingGenerator(api_key=self.gemini_api_key, cache=get_query_cache())
         self.vector_store = VectorStore(self.database_url)
         self.context_assembler = ContextAssembler()
         self.prompt_builder = PromptBuilder()
@@ -7547,10 +7534,10 @@ class RAGQueryPipeline:
                     conversation_history=conversation_history
                 )
                 try:
-                    answer_text = await self._generate_with_gemini(prompt, self.model)
+                    answer_text = await self._generate_with_gemini(prompt, self.model, user_id)
                 except Exception as e2:
                     logger.warning(f"Primary model failed: {e2}, trying fallback...")
-                    answer_text = await self._generate_with_gemini(prompt, self.fallback_model)
+                    answer_text = await self._generate_with_gemini(prompt, self.fallback_model, user_id)
 
             return RAGAnswer(
                 question=question,
@@ -8018,23 +8005,15 @@ Return ONLY a JSON array of 5-12 product/service terms (NO tender/nabavka words)
 """
 
         try:
-            def _sync_generate():
-                # Explicit OFF safety settings to avoid blocks
-                response = self._genai_client.models.generate_content(
-                    model=os.getenv('GEMINI_MODEL', 'gemini-2.5-flash'),
-                    contents=prompt,
-                    config=genai_types.GenerateContentConfig(
-                        temperature=0.3,
-                        max_output_tokens=200,
-                        safety_settings=SAFETY_SETTINGS
-                    )
-                )
-                try:
-                    return response.text
-                except ValueError:
-                    return "[]"
-
-            response_text = await asyncio.to_thread(_sync_generate)
+            # Explicit OFF safety settings to avoid blocks
+            response = await get_llm_gateway().generate(
+                prompt,
+                model=os.getenv('GEMINI_MODEL', 'gemini-2.5-flash'),
+                temperature=0.3,
+                max_output_tokens=200,
+                safety_settings=SAFETY_SETTINGS
+            )
+            response_text = response.text or "[]"
 
             # Parse JSON array from response
             # Clean up response - remove markdown code blocks if present
@@ -9363,40 +9342,31 @@ CPV код: {cpv_code}
 
             return search_results, context
 
-    async def _generate_with_gemini(self, prompt: str, model: str) -> str:
+    async def _generate_with_gemini(self, prompt: str, model: str, user_id: Optional[str] = None) -> str:
         """
         Generate answer using Gemini model
 
         Args:
             prompt: Full prompt
             model: Model name
+            user_id: Caller, for per-user concurrency limits
 
         Returns:
             Generated answer text
         """
-        def _sync_generate():
-            response = self._genai_client.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=genai_types.GenerateContentConfig(
-                    temperature=0.3,
-                    max_output_tokens=4096,
-                    safety_settings=SAFETY_SETTINGS
-                )
-            )
+        response = await get_llm_gateway().generate(
+            prompt,
+            model=model,
+            temperature=0.3,
+            max_output_tokens=4096,
+            safety_settings=SAFETY_SETTINGS,
+            user_id=user_id
+        )
 
-            try:
-                text = response.text
-                if not text or not text.strip():
-                    logger.warning("Gemini returned empty response")
-                    return "Нема доволно податоци за генерирање одговор."
-                return text
-            except ValueError as e:
-                logger.warning(f"Error accessing response text: {e}")
-                return "Не можам да генерирам одговор моментално. Обидете се повторно."
-
-        answer_text = await asyncio.to_thread(_sync_generate)
-        return answer_text
+        if not response.text.strip():
+            logger.warning("Gemini returned empty response")
+            return "Нема доволно податоци за генерирање одговор."
+        return response.text
 
     async def batch_query(
         self,
@@ -9563,7 +9533,7 @@ async def search_tenders(
     if not database_url:
         raise ValueError("DATABASE_URL not set")
 
-    embedder = EmbeddingGenerator()
+    embedder = EmbeddingGenerator(cache=get_query_cache())
     vector_store = VectorStore(database_url)
 
     await vector_store.connect()
@@ -9616,7 +9586,6 @@ async def generate_tender_summary(context: Dict) -> str:
     if not gemini_api_key:
         raise ValueError("GEMINI_API_KEY not set")
 
-    client = genai.Client(api_key=gemini_api_key)
     model_name = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
 
     # Build context text
@@ -9686,29 +9655,18 @@ async def generate_tender_summary(context: Dict) -> str:
 
 Одговори на македонски јазик. Биди концизен и прецизен. Ако нема доволно информации, кажи што недостасува."""
 
-    def _sync_generate():
-        # Explicit OFF safety settings to avoid blocks
-        response = client.models.generate_content(
-            model=model_name,
-            contents=prompt,
-            config=genai_types.GenerateContentConfig(
-                temperature=0.3,
-                max_output_tokens=800,
-                safety_settings=SAFETY_SETTINGS
-            )
-        )
-
-        try:
-            text = response.text
-            if not text or not text.strip():
-                return "Нема доволно информации за генерирање резиме."
-            return text
-        except ValueError as e:
-            logger.warning(f"Error accessing response text: {e}")
-            return "Не можам да генерирам резиме моментално."
+    # Explicit OFF safety settings to avoid blocks
+    response = await get_llm_gateway().generate(
+        prompt,
+        model=model_name,
+        temperature=0.3,
+        max_output_tokens=800,
+        safety_settings=SAFETY_SETTINGS
+    )
 
-    summary = await asyncio.to_thread(_sync_generate)
-    return summary
+    if not response.text.strip():
+        return "Нема доволно информации за генерирање резиме."
+    return response.text
 
 
 async def generate_supplier_analysis(context: Dict) -> str:
@@ -9725,7 +9683,6 @@ async def generate_supplier_analysis(context: Dict) -> str:
     if not gemini_api_key:
         raise ValueError("GEMINI_API_KEY not set")
 
-    client = genai.Client(api_key=gemini_api_key)
     model_name = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
 
     # Build context text
@@ -9768,26 +9725,15 @@ async def generate_supplier_analysis(context: Dict) -> str:
 
 Одговори на македонски јазик. Биди објективен и аналитичен."""
 
-    def _sync_generate():
-        # Explicit OFF safety settings to avoid blocks
-        response = client.models.generate_content(
-            model=model_name,
-            contents=prompt,
-            config=genai_types.GenerateContentConfig(
-                temperature=0.3,
-                max_output_tokens=800,
-                safety_settings=SAFETY_SETTINGS
-            )
-        )
-
-        try:
-            text = response.text
-            if not text or not text.strip():
-                return "Нема доволно информации за генерирање анализа."
-            return text
-        except ValueError as e:
-            logger.warning(f"Error accessing response text: {e}")
-            return "Не можам да генерирам анализа моментално."
+    # Explicit OFF safety settings to avoid blocks
+    response = await get_llm_gateway().generate(
+        prompt,
+        model=model_name,
+        temperature=0.3,
+        max_output_tokens=800,
+        safety_settings=SAFETY_SETTINGS
+    )
 
-    analysis = await asyncio.to_thread(_sync_generate)
-    return analysis
+    if not response.text.strip():
+        return "Нема доволно информации за генерирање анализа."
+    return response.text
@@ -0,0 +1,120 @@
+"""
+Bilingual tender search query builder
+
+Shared by the tender API (list, search, export) and the RAG agent's
+search_tenders tool so every entry point searches the same way.
+
+Tenders and epazar_tenders carry two generated columns (migration 055) built
+from text folded by mk_search_fold(): lowercase, with Macedonian Cyrillic
+transliterated to Latin. fold_search_text() applies the same folding to the
+user's term, so Latin and Cyrillic input match Latin and Cyrillic text alike.
+
+- search_text: filtered with one LIKE '%token%' per token (GIN trigram index)
+- search_tsv:  ranked with ts_rank_cd against a prefix tsquery; also filters
+               two-letter tokens ("IT", "ул"), which trigrams cannot index,
+               by word prefix
+
+The builder only emits SQL fragments plus parameter values. NamedParams
+renders :name placeholders for SQLAlchemy text(); PositionalParams renders
+$n placeholders for asyncpg.
+
+Usage:
+    search = TenderSearch("Општина Скопје")
+    params = NamedParams()
+    where = search.filter_sql("tenders", params)
+    rank = search.rank_sql("tenders", params)
+    rows = await db.execute(text(f"SELECT ..., {rank} AS rank FROM tenders WHERE {where}"), params.values)
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+# Must stay in sync with mk_search_fold() in db/migrations/055_tender_search_index.sql
+_FOLD_MULTI = [
+    ('џ', 'dzh'), ('ѓ', 'gj'), ('ќ', 'kj'), ('љ', 'lj'), ('њ', 'nj'),
+    ('ѕ', 'dz'), ('ж', 'zh'), ('ч', 'ch'), ('ш', 'sh'),
+    ('č', 'ch'), ('š', 'sh'), ('ž', 'zh'), ('ǵ', 'gj'), ('ḱ', 'kj'),
+]
+_FOLD_SINGLE = str.maketrans('абвгдезијклмнопрстуфхц', 'abvgdezijklmnoprstufhc')
+_TOKEN = re.compile(r'[^\W_]+')
+
+MIN_TOKEN_LENGTH = 2  # Single characters match nearly every tender
+TRIGRAM_MIN_LENGTH = 3  # Shorter tokens match by word prefix instead
+
+
+def fold_search_text(text: Optional[str]) -> str:
+    """Lowercase and fold Cyrillic to Latin, exactly like mk_search_fold()"""
+    folded = (text or '').lower()
+    for src, dst in _FOLD_MULTI:
+        folded = folded.replace(src, dst)
+    return folded.translate(_FOLD_SINGLE)
+
+
+def search_tokens(text: Optional[str]) -> List[str]:
+    """Folded word tokens of a search term (punctuation dropped)"""
+    tokens = _TOKEN.findall(fold_search_text(text))
+    return [t for t in tokens if len(t) >= MIN_TOKEN_LENGTH]
+
+
+class NamedParams:
+    """Collects values and renders :name placeholders (SQLAlchemy text())"""
+
+    def __init__(self, prefix: str = 'search_'):
+        self.prefix = prefix
+        self.values: Dict[str, Any] = {}
+
+    def __call__(self, value: Any) -> str:
+        name = f"{self.prefix}{len(self.values)}"
+        self.values[name] = value
+        return f":{name}"
+
+
+class PositionalParams:
+    """Collects values and renders $n placeholders (asyncpg)"""
+
+    def __init__(self, values: Optional[List[Any]] = None):
+        self.values: List[Any] = list(values or [])
+
+    def __call__(self, value: Any) -> str:
+        self.values.append(value)
+        return f"${len(self.values)}"
+
+
+class TenderSearch:
+    """
+    A parsed search over one or more terms
+
+    Tokens within a term must all match (AND); separate terms are
+    alternatives (OR), which is how the RAG tool passes keyword lists.
+    """
+
+    def __init__(self, *terms: Optional[str]):
+        self.terms = [t for t in terms if t]
+        self.groups: List[List[str]] = [g for g in (search_tokens(t) for t in self.terms) if g]
+
+    def __bool__(self) -> bool:
+        return bool(self.groups)
+
+    @property
+    def tsquery(self) -> str:
+        """Prefix tsquery text for to_tsquery('simple', ...)"""
+        return ' | '.join(
+            '(' + ' & '.join(f"{token}:*" for token in group) + ')'
+            for group in self.groups
+        )
+
+    def filter_sql(self, alias: str, params) -> str:
+        """WHERE fragment matching any term (every token must match)"""
+        clauses = []
+        for group in self.groups:
+            conditions = [
+                f"{alias}.search_text LIKE {params(f'%{token}%')}"
+                if len(token) >= TRIGRAM_MIN_LENGTH else
+                f"{alias}.search_tsv @@ to_tsquery('simple', {params(f'{token}:*')})"
+                for token in group
+            ]
+            clauses.append('(' + ' AND '.join(conditions) + ')')
+        return '(' + ' OR '.join(clauses) + ')'
+
+    def rank_sql(self, alias: str, params) -> str:
+        """Relevance expression (higher is better; 0 for infix-only matches)"""
+        return f"ts_rank_cd({alias}.search_tsv, to_tsquery('simple', {params(self.tsquery)}))"
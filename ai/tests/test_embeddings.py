@@ -19,6 +19,7 @@ from embeddings import (
     EmbeddingsPipeline,
     TextChunk
 )
+from embedding_cache import EmbeddingCache
 
 
 # ============================================================================
@@ -172,6 +173,62 @@ class TestEmbeddingGenerator:
                 assert isinstance(chunk, TextChunk)
                 assert len(vector) == 768
 
+    @pytest.mark.asyncio
+    async def test_cache_deduplicates_chunks(self):
+        """Repeated and previously seen chunks are not sent to the API again"""
+        cache = EmbeddingCache(shared=False)
+        generator = EmbeddingGenerator(api_key="test-key", cache=cache)
+        generator._request_embeddings = AsyncMock(
+            side_effect=lambda texts: [[float(len(t))] * 768 for t in texts]
+        )
+
+        first = await generator.generate_embeddings_batch(["Clause A", "Clause  A ", "Clause B"])
+        second = await generator.generate_embeddings_batch(["Clause B", "Clause C"])
+
+        assert first[0] == first[1]
+        assert second[0] == first[2]
+        sent = [call.args[0] for call in generator._request_embeddings.await_args_list]
+        assert sent == [["Clause A", "Clause B"], ["Clause C"]]
+        assert cache.stats.misses == 4
+        assert cache.stats.memory_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_query_cache_expires_entries(self):
+        """Cached query vectors are re-embedded once their TTL has passed"""
+        cache = EmbeddingCache(shared=False, ttl_seconds=60)
+        generator = EmbeddingGenerator(api_key="test-key", cache=cache)
+        generator._request_embeddings = AsyncMock(return_value=[[0.1] * 768])
+
+        with patch('embedding_cache.time.monotonic', return_value=1000.0):
+            await generator.generate_embedding("набавка на возила")
+            await generator.generate_embedding("набавка на возила")
+        assert generator._request_embeddings.await_count == 1
+
+        with patch('embedding_cache.time.monotonic', return_value=1061.0):
+            await generator.generate_embedding("набавка на возила")
+        assert generator._request_embeddings.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_query_cache_prunes_only_its_namespace(self):
+        """Expiring query vectors never deletes document vectors of the same model"""
+        class FakeConnection:
+            def __init__(self):
+                self.calls = []
+
+            async def execute(self, query, *args):
+                self.calls.append(args)
+                return "DELETE 0"
+
+        conn = FakeConnection()
+        documents = EmbeddingCache(pool=conn)
+        queries = EmbeddingCache(pool=conn, ttl_seconds=60, namespace='query')
+        model_key = "gemini-embedding-001:RETRIEVAL_DOCUMENT:768"
+
+        assert await documents.prune_expired(model_key) == 0
+        await queries.prune_expired(model_key)
+
+        assert conn.calls == [("query:" + model_key, 60)]
+
     def test_missing_api_key(self):
         """Should raise error if API key missing"""
         with patch.dict(os.environ, {}, clear=True):
@@ -264,6 +321,34 @@ class TestVectorStore:
 
         assert mock_db_conn.fetch.called
 
+    @pytest.mark.asyncio
+    async def test_store_embeddings_bulk(self, mock_db_conn):
+        """Bulk path COPYs binary float arrays in batches and returns ids in order"""
+        mock_db_conn.copy_records_to_table = AsyncMock()
+        mock_db_conn.execute = AsyncMock()
+        mock_transaction = AsyncMock()
+        mock_db_conn.transaction = Mock(return_value=mock_transaction)
+
+        mock_acquire = AsyncMock()
+        mock_acquire.__aenter__.return_value = mock_db_conn
+        store = VectorStore("postgresql://test")
+        store._pool = Mock(acquire=Mock(return_value=mock_acquire))
+
+        embeddings = [
+            (TextChunk(text=f"Chunk {i}", chunk_index=i, tender_id="TENDER-123"), [0.1] * 768)
+            for i in range(5)
+        ]
+        embed_ids = await store.store_embeddings_bulk(embeddings, batch_size=2)
+
+        assert len(embed_ids) == 5
+        assert len(set(embed_ids)) == 5
+        assert mock_db_conn.copy_records_to_table.await_count == 3  # 2 + 2 + 1 rows
+
+        first_batch = mock_db_conn.copy_records_to_table.await_args_list[0].kwargs['records']
+        assert [str(r[0]) for r in first_batch] == embed_ids[:2]
+        assert first_batch[0][1] == [0.1] * 768
+        mock_db_conn.fetchrow.assert_not_called()
+
 
 # ============================================================================
 # INTEGRATION TESTS
@@ -0,0 +1,90 @@
+"""
+Tests for the async LLM gateway (fake backend, no network)
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from llm_gateway import FakeLLMBackend, LLMGateway
+
+
+class CountingBackend(FakeLLMBackend):
+    """Fake backend that records the peak number of overlapping calls"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.running = 0
+        self.peak = 0
+
+    async def generate(self, model, prompt, config):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            return await super().generate(model, prompt, config)
+        finally:
+            self.running -= 1
+
+
+class TestLLMGateway:
+
+    @pytest.mark.asyncio
+    async def test_deterministic_prompts_are_cached(self):
+        backend = FakeLLMBackend(responses='{"tool_calls": []}')
+        gateway = LLMGateway(backend=backend)
+
+        first = await gateway.generate("decide tools", temperature=0.1)
+        second = await gateway.generate("decide tools", temperature=0.1)
+        await gateway.generate("final answer", temperature=0.3)
+        await gateway.generate("final answer", temperature=0.3)
+
+        assert first.text == second.text == '{"tool_calls": []}'
+        assert not first.cached and second.cached
+        assert len(backend.calls) == 3  # the temperature 0.3 prompt is not cached
+        assert gateway.get_status()["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_identical_inflight_prompts_share_one_call(self):
+        backend = FakeLLMBackend(responses="answer", delay=0.05)
+        gateway = LLMGateway(backend=backend)
+
+        results = await asyncio.gather(*[
+            gateway.generate("same prompt", temperature=0.3, user_id=f"user-{i}")
+            for i in range(5)
+        ])
+
+        assert [r.text for r in results] == ["answer"] * 5
+        assert len(backend.calls) == 1
+        assert gateway.get_status()["dedup_hits"] == 4
+
+    @pytest.mark.asyncio
+    async def test_global_and_per_user_limits(self):
+        backend = CountingBackend(responses="ok", delay=0.02)
+        gateway = LLMGateway(backend=backend, max_concurrency=3, max_per_user=1)
+
+        await asyncio.gather(*[
+            gateway.generate(f"prompt {i}", user_id="heavy-user") for i in range(4)
+        ])
+        assert backend.peak == 1
+
+        backend.peak = 0
+        await asyncio.gather(*[
+            gateway.generate(f"other {i}", user_id=f"user-{i}") for i in range(6)
+        ])
+        assert backend.peak == 3
+        assert gateway.get_status()["users_waiting_or_active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_and_token_metrics(self):
+        gateway = LLMGateway(backend=FakeLLMBackend(responses="три збора тука"))
+
+        pieces = [p async for p in gateway.stream("прашање", user_id="u1")]
+
+        assert "".join(pieces) == "три збора тука"
+        status = gateway.get_status()
+        assert status["streams"] == 1
+        assert status["prompt_tokens"] == 1
+        assert status["output_tokens"] == 3
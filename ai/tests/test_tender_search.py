@@ -0,0 +1,51 @@
+"""
+Tests for the bilingual tender search query builder
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from tender_search import TenderSearch, NamedParams, PositionalParams, fold_search_text
+
+
+class TestFolding:
+    """Latin and Cyrillic spellings fold to the same text"""
+
+    def test_cyrillic_and_latin_fold_together(self):
+        assert fold_search_text("Општина Кичево") == fold_search_text("opshtina kichevo")
+        assert fold_search_text("Џамија Ѓорче Љубљана") == "dzhamija gjorche ljubljana"
+        assert fold_search_text("Kičevo") == "kichevo"
+
+    def test_punctuation_and_single_letters_are_not_tokens(self):
+        search = TenderSearch("a, b - ...")
+        assert not search
+
+
+class TestTenderSearch:
+    """SQL fragments and parameters"""
+
+    def test_named_filter_and_rank(self):
+        search = TenderSearch("Канцелариски материјал")
+        params = NamedParams()
+
+        where = search.filter_sql("tenders", params)
+        rank = search.rank_sql("tenders", params)
+
+        assert where == "((tenders.search_text LIKE :search_0 AND tenders.search_text LIKE :search_1))"
+        assert rank == "ts_rank_cd(tenders.search_tsv, to_tsquery('simple', :search_2))"
+        assert params.values == {
+            'search_0': '%kancelariski%',
+            'search_1': '%materijal%',
+            'search_2': '(kancelariski:* & materijal:*)',
+        }
+
+    def test_keywords_are_alternatives_and_short_tokens_use_tsvector(self):
+        search = TenderSearch("IT", "softver")
+        params = PositionalParams(["2024-01-01"])
+
+        where = search.filter_sql("t", params)
+
+        assert where == "((t.search_tsv @@ to_tsquery('simple', $2)) OR (t.search_text LIKE $3))"
+        assert params.values == ["2024-01-01", "it:*", "%softver%"]
+        assert search.tsquery == "(it:*) | (softver:*)"
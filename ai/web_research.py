@@ -22,9 +22,9 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import aiohttp
-from google import genai
 from google.genai import types as genai_types
 from dotenv import load_dotenv
+from llm_gateway import get_llm_gateway
 load_dotenv()
 
 
@@ -72,7 +72,6 @@ class WebResearchEngine:
 
     def __init__(self, gemini_api_key: Optional[str] = None):
         self.api_key = gemini_api_key or os.getenv('GEMINI_API_KEY')
-        self._genai_client = genai.Client(api_key=self.api_key) if self.api_key else None
 
         # Model for web research
         self.model_name = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
@@ -410,28 +409,15 @@ Be specific with numbers, names, and dates."""
 Биди специфичен и практичен. ОДГОВОРИ НА МАКЕДОНСКИ ЈАЗИК. Излезот да биде JSON низа од стрингови на македонски."""
 
         try:
-            def _sync_generate():
-                # Explicit OFF safety settings to avoid blocks
-                response = self._genai_client.models.generate_content(
-                    model='gemini-2.5-flash',
-                    contents=prompt,
-                    config=genai_types.GenerateContentConfig(
-                        temperature=0.4,
-                        max_output_tokens=500,
-                        safety_settings=SAFETY_SETTINGS,
-                    ),
-                )
-
-                try:
-                    text = response.text
-                    if not text or not text.strip():
-                        return ""
-                    return text
-                except ValueError as e:
-                    logger.warning(f"Error accessing response text: {e}")
-                    return ""
-
-            response_text = await asyncio.to_thread(_sync_generate)
+            # Explicit OFF safety settings to avoid blocks
+            response = await get_llm_gateway().generate(
+                prompt,
+                model='gemini-2.5-flash',
+                temperature=0.4,
+                max_output_tokens=500,
+                safety_settings=SAFETY_SETTINGS,
+            )
+            response_text = response.text
 
             # Parse recommendations
             json_match = re.search(r'\[[\s\S]*\]', response_text)
@@ -485,23 +471,15 @@ Provide a competitive analysis including strengths and weaknesses.
 Format as JSON with keys: analysis, strengths (array), weaknesses (array), recent_wins (array)."""
 
             try:
-                def _sync_search():
-                    # Explicit OFF safety settings to avoid blocks
-                    response = self._genai_client.models.generate_content(
-                        model='gemini-2.5-flash',
-                        contents=prompt,
-                        config=genai_types.GenerateContentConfig(
-                            temperature=0.3,
-                            max_output_tokens=1000,
-                            safety_settings=SAFETY_SETTINGS,
-                        ),
-                    )
-                    try:
-                        return response.text
-                    except ValueError:
-                        return ""
-
-                response_text = await asyncio.to_thread(_sync_search)
+                # Explicit OFF safety settings to avoid blocks
+                response = await get_llm_gateway().generate(
+                    prompt,
+                    model='gemini-2.5-flash',
+                    temperature=0.3,
+                    max_output_tokens=1000,
+                    safety_settings=SAFETY_SETTINGS,
+                )
+                response_text = response.text
 
                 json_match = re.search(r'\{[\s\S]*\}', response_text)
                 if json_match:
@@ -656,23 +634,18 @@ INSTRUCTIONS:
 - Answer in Macedonian."""
 
         try:
-            def _sync_generate():
-                # Explicit OFF safety settings to avoid blocks
-                response = self.web_research._genai_client.models.generate_content(
-                    model=os.getenv('GEMINI_MODEL', 'gemini-2.5-flash'),
-                    contents=prompt,
-                    config=genai_types.GenerateContentConfig(
-                        temperature=0.3,
-                        max_output_tokens=800,
-                        safety_settings=SAFETY_SETTINGS,
-                    ),
-                )
+            # Explicit OFF safety settings to avoid blocks
+            response = await get_llm_gateway().generate(
+                prompt,
+                model=os.getenv('GEMINI_MODEL', 'gemini-2.5-flash'),
+                temperature=0.3,
+                max_output_tokens=800,
+                safety_settings=SAFETY_SETTINGS,
+            )
 
-                try:
-                    text = response.text
-                    if not text or not text.strip():
-                        # NEVER say "no data" - pivot to helpful guidance
-                        return """Врз основа на поставеното прашање, ве насочувам кон поврзани можности:
+            if not response.text.strip():
+                # NEVER say "no data" - pivot to helpful guidance
+                return """Врз основа на поставеното прашање, ве насочувам кон поврзани можности:
 
 **Алтернативни пристапи:**
 - Разгледајте слични категории производи/услуги
@@ -683,29 +656,7 @@ INSTRUCTIONS:
 - Поставете попрецизно прашање со конкретни термини
 - Барајте поврзани категории наместо точен производ
 - Прашајте за историја на слични набавки"""
-                    return text
-                except ValueError as e:
-                    # Log more details about the block
-                    if response.candidates:
-                        candidate = response.candidates[0]
-                        logger.warning(f"Safety block - finish_reason: {candidate.finish_reason}, safety_ratings: {candidate.safety_ratings}")
-                    else:
-                        logger.warning(f"No candidates in response: {e}")
-                    # Try to extract any partial content
-                    if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
-                        partial = "".join(part.text for part in response.candidates[0].content.parts if hasattr(part, 'text'))
-                        if partial:
-                            logger.info(f"Extracted partial response: {len(partial)} chars")
-                            return partial
-                    # Fallback with helpful guidance
-                    return """Можам да ви помогнам со анализа на јавни набавки. Обидете се со:
-
-- Конкретни категории производи (пр. "медицинска опрема" наместо општи термини)
-- Имиња на институции (пр. "набавки на Министерството за здравство")
-- Временски период (пр. "активни тендери во 2024")
-- Анализа на добавувачи и конкуренција"""
-
-            return await asyncio.to_thread(_sync_generate)
+            return response.text
 
         except Exception as e:
             logger.error(f"Answer generation failed: {e}")
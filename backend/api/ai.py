@@ -49,19 +49,17 @@ from config.plans import ModuleName
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
-# Import Gemini
+# Import Gemini (calls go through the shared async LLM gateway)
 try:
-    from google import genai
-    from google.genai import types as genai_types
+    from google import genai  # noqa: F401 - availability check
     GEMINI_AVAILABLE = bool(os.getenv('GEMINI_API_KEY'))
-    if GEMINI_AVAILABLE:
-        _genai_client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
     GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
 except ImportError:
     GEMINI_AVAILABLE = False
-    _genai_client = None
     GEMINI_MODEL = 'gemini-2.5-flash'
 
+from llm_gateway import get_llm_gateway
+
 
 # ============================================================================
 # REQUEST/RESPONSE SCHEMAS
@@ -235,11 +233,12 @@ Use 8-digit CPV codes (main category level).
 """
 
             # Relaxed safety settings for business content
-            response = _genai_client.models.generate_content(model=GEMINI_MODEL, contents=prompt)
-            try:
-                response_text = response.text
-            except ValueError:
-                response_text = "[]"
+            response = await get_llm_gateway().generate(
+                prompt,
+                model=GEMINI_MODEL,
+                user_id=str(current_user.user_id)
+            )
+            response_text = response.text or "[]"
 
             # Parse JSON from response
             import json
@@ -371,11 +370,12 @@ Return maximum 20 most important requirements.
 """
 
             # Relaxed safety settings for business content
-            response = _genai_client.models.generate_content(model=GEMINI_MODEL, contents=prompt)
-            try:
-                response_text = response.text
-            except ValueError:
-                response_text = "[]"
+            response = await get_llm_gateway().generate(
+                prompt,
+                model=GEMINI_MODEL,
+                user_id=str(current_user.user_id)
+            )
+            response_text = response.text or "[]"
 
             # Parse JSON from response
             import json
@@ -1301,6 +1301,7 @@ async def ai_health_check():
         "gemini_available": GEMINI_AVAILABLE,
         "gemini_api_key_configured": bool(os.getenv('GEMINI_API_KEY')),
         "service": "ai-api",
+        "llm_gateway": get_llm_gateway().get_status(),
         "features": {
             "cpv_suggest": True,  # Always available (fallback to keyword matching)
             "extract_requirements": GEMINI_AVAILABLE,
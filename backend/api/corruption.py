@@ -52,6 +52,10 @@ from utils.active_sampler import (
     get_queue_items,
     refresh_active_queue,
 )
+from utils.pagination import (
+    COUNT_MODE_PATTERN, RELTUPLES_SQL, InvalidCursor, Keyset, PositionalParams, filter_signature,
+    resolve_total
+)
 
 logger = logging.getLogger(__name__)
 
@@ -196,6 +200,8 @@ class FlaggedTendersResponse(BaseModel):
     skip: int
     limit: int
     tenders: List[TenderFlag]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page by keyset
+    total_is_estimate: bool = False
     disclaimer: str = "Оваа анализа е само за информативни цели и не претставува доказ за корупција. Потребна е дополнителна истрага."
 
 
@@ -446,7 +452,9 @@ async def get_flagged_tenders(
     winner: Optional[str] = None,
     min_score: int = Query(0, ge=0, le=100),
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset pagination; skip is ignored)"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="Total count mode: exact or estimate")
 ):
     """
     Get list of flagged tenders with corruption risk indicators
@@ -459,6 +467,8 @@ async def get_flagged_tenders(
     - min_score: Minimum risk score (0-100, default 0)
     - skip: Pagination offset
     - limit: Results per page (max 100)
+    - cursor: Continue after the previous page's next_cursor instead of using skip
+    - count: "exact" or "estimate" (reuse a recent total for the same filters)
 
     Returns list of tenders with corruption flags and risk scores.
     """
@@ -469,6 +479,12 @@ async def get_flagged_tenders(
             detail=f"Invalid flag_type '{flag_type}'. Valid types: {', '.join(sorted(VALID_FLAG_TYPES))}"
         )
 
+    keyset = Keyset(["risk_score", "total_flags"], nullable=False)
+    try:
+        position = keyset.decode(cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     conn = await get_db_connection()
     try:
         where, params, param_count = _build_flagged_tenders_where(
@@ -477,7 +493,24 @@ async def get_flagged_tenders(
 
         # Count query using materialized view (fast)
         count_query = f"SELECT COUNT(*) FROM mv_flagged_tenders {where}"
-        total = await conn.fetchval(count_query, *params)
+        unfiltered = not (severity or flag_type or institution or winner or min_score)
+        total, total_is_estimate = await resolve_total(
+            count,
+            filter_signature("flagged_tenders", {
+                "severity": severity, "flag_type": flag_type, "institution": institution,
+                "winner": winner, "min_score": min_score,
+            }),
+            exact=lambda: conn.fetchval(count_query, *params),
+            estimate=(lambda: conn.fetchval(RELTUPLES_SQL.format(table="mv_flagged_tenders"))) if unfiltered else None,
+        )
+
+        # Keyset seek after the cursor row, otherwise OFFSET; one extra row
+        # tells whether another page follows
+        query_params = PositionalParams(params)
+        seek = keyset.seeks(position)[0](query_params)
+        if seek:
+            where += f" AND {seek}"
+        offset = 0 if position else skip
 
         # Use materialized view for fast queries (1000x faster than CTE)
         query = f"""
@@ -495,12 +528,17 @@ async def get_flagged_tenders(
             flag_types
         FROM mv_flagged_tenders
         {where}
-        ORDER BY risk_score DESC, total_flags DESC
-        LIMIT ${param_count + 1} OFFSET ${param_count + 2}
+        ORDER BY {keyset.order_sql()}
+        LIMIT {query_params(limit + 1)} OFFSET {query_params(offset)}
         """
-        params.extend([limit, skip])
 
-        rows = await conn.fetch(query, *params)
+        rows = await conn.fetch(query, *query_params.values)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = keyset.encode([last['risk_score'], last['total_flags'], last['tender_id']])
 
         tenders = []
         for row in rows:
@@ -524,7 +562,9 @@ async def get_flagged_tenders(
             total=total or 0,
             skip=skip,
             limit=limit,
-            tenders=tenders
+            tenders=tenders,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate
         )
 
     except Exception as e:
@@ -1218,23 +1258,20 @@ class BatchPredictionResponse(BaseModel):
 ML_MODEL_VERSION = "v1.0.0"
 
 
-async def _get_or_create_predictor():
+async def _get_prediction_service():
     """
-    Get or create the ML predictor instance.
-    Lazy-loaded to avoid import issues if ML deps not installed.
+    Get the resident ML prediction service.
+    Loaded at startup; initialized here on first use if startup skipped it.
+    Lazy-imported to avoid import issues if ML deps not installed.
     """
     try:
-        from ai.corruption.ml_models import CorruptionPredictor, PredictionResult
-        from pathlib import Path
-        import os
+        from ai.corruption.ml_models.prediction_service import PredictionService
 
-        models_dir = Path(__file__).parent.parent.parent / "ai" / "corruption" / "ml_models" / "models"
-        predictor = CorruptionPredictor(
-            models_dir=str(models_dir),
-            db_url=os.getenv("DATABASE_URL")
-        )
-        await predictor.initialize()
-        return predictor
+        service = PredictionService.get_instance()
+        if not service.loaded:
+            pool = await get_asyncpg_pool()
+            await service.initialize(pool=pool)
+        return service
     except ImportError as e:
         logger.error(f"ML dependencies not available: {e}")
         raise HTTPException(
@@ -1354,9 +1391,8 @@ async def predict_tender(
 
         # Try to use ML predictor
         try:
-            predictor = await _get_or_create_predictor()
-            result = await predictor.predict_single(tender_id, update_db=False)
-            await predictor.cleanup()
+            service = await _get_prediction_service()
+            result = await service.predict(tender_id)
 
             if not result:
                 raise HTTPException(
@@ -1727,48 +1763,42 @@ async def batch_predict(
 
         # Try to use ML predictor for batch prediction
         try:
-            predictor = await _get_or_create_predictor()
+            service = await _get_prediction_service()
             valid_ids = list(existing_ids)
 
-            # Process in batches of 50
-            batch_size = 50
-            for i in range(0, len(valid_ids), batch_size):
-                batch_ids = valid_ids[i:i + batch_size]
-                results = await predictor.predict_batch(batch_ids)
-
-                for result in results:
-                    # Store prediction if requested
-                    if request.update_db:
-                        try:
-                            await _store_prediction(
-                                conn,
-                                tender_id=result.tender_id,
-                                risk_score=result.risk_score,
-                                risk_level=result.risk_level,
-                                confidence=result.confidence,
-                                model_scores=result.model_scores
-                            )
-                        except Exception as e:
-                            logger.warning(f"Failed to store prediction for {result.tender_id}: {e}")
-
-                    prediction = MLPredictionDetail(
-                        tender_id=result.tender_id,
-                        risk_score=round(result.risk_score, 2),
-                        risk_level=result.risk_level,
-                        confidence=round(result.confidence, 3),
-                        model_scores={k: round(v, 2) for k, v in result.model_scores.items()},
-                        top_features=None,
-                        predicted_at=datetime.utcnow(),
-                        model_version=ML_MODEL_VERSION
-                    )
-                    predictions.append(prediction)
+            results = await service.predict_many(valid_ids)
+
+            for result in results:
+                # Store prediction if requested
+                if request.update_db:
+                    try:
+                        await _store_prediction(
+                            conn,
+                            tender_id=result.tender_id,
+                            risk_score=result.risk_score,
+                            risk_level=result.risk_level,
+                            confidence=result.confidence,
+                            model_scores=result.model_scores
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to store prediction for {result.tender_id}: {e}")
 
-                    if result.risk_level == 'critical':
-                        critical_count += 1
-                    elif result.risk_level == 'high':
-                        high_risk_count += 1
+                prediction = MLPredictionDetail(
+                    tender_id=result.tender_id,
+                    risk_score=round(result.risk_score, 2),
+                    risk_level=result.risk_level,
+                    confidence=round(result.confidence, 3),
+                    model_scores={k: round(v, 2) for k, v in result.model_scores.items()},
+                    top_features=None,
+                    predicted_at=datetime.utcnow(),
+                    model_version=ML_MODEL_VERSION
+                )
+                predictions.append(prediction)
 
-            await predictor.cleanup()
+                if result.risk_level == 'critical':
+                    critical_count += 1
+                elif result.risk_level == 'high':
+                    high_risk_count += 1
 
         except HTTPException:
             raise
@@ -7250,6 +7280,19 @@ async def get_alert_stats(
 # ============================================================================
 
 
+def _relationship_graph_service():
+    """Process-resident graph index service shared by the graph endpoints."""
+    try:
+        from ai.corruption.graph.graph_index import get_graph_service
+    except ImportError:
+        import sys as _sys
+        _ai_path = str(_Path(__file__).parent.parent.parent / "ai" / "corruption")
+        if _ai_path not in _sys.path:
+            _sys.path.insert(0, _ai_path)
+        from graph.graph_index import get_graph_service
+    return get_graph_service()
+
+
 @router.get("/graph/stats", dependencies=[Depends(require_module(ModuleName.RISK_ANALYSIS))])
 async def get_graph_stats():
     """
@@ -7350,51 +7393,22 @@ async def get_entity_neighborhood(
     """
     Get the subgraph around an entity within N hops.
 
-    Uses BFS traversal on the unified_edges table to find all connected
-    entities within the specified hop distance. Each node is enriched with
-    centrality metrics from the cache.
+    Uses BFS traversal on the resident graph index (built from unified_edges)
+    to find all connected entities within the specified hop distance. Each
+    node is enriched with centrality metrics from the cache.
 
     Parameters:
     - entity_id: The central entity identifier (company or institution name)
     - hops: Number of hops to traverse (1-3, default 2)
     """
-    import json as _json
-
     try:
         pool = await get_asyncpg_pool()
-        async with pool.acquire() as conn:
-            # BFS traversal using iterative frontier expansion
-            visited = {entity_id: 0}  # entity_id -> depth
-            frontier = {entity_id}
-
-            for depth in range(1, hops + 1):
-                if not frontier:
-                    break
-
-                # Find all neighbors of the current frontier
-                neighbors_rows = await conn.fetch("""
-                    SELECT DISTINCT
-                        CASE
-                            WHEN source_id = ANY($1::text[]) THEN target_id
-                            ELSE source_id
-                        END AS neighbor,
-                        CASE
-                            WHEN source_id = ANY($1::text[]) THEN target_type
-                            ELSE source_type
-                        END AS neighbor_type
-                    FROM unified_edges
-                    WHERE source_id = ANY($1::text[]) OR target_id = ANY($1::text[])
-                """, list(frontier))
-
-                next_frontier = set()
-                for row in neighbors_rows:
-                    neighbor = row["neighbor"]
-                    if neighbor not in visited:
-                        visited[neighbor] = depth
-                        next_frontier.add(neighbor)
+        index = await _relationship_graph_service().get_index(pool)
 
-                frontier = next_frontier
+        # BFS over the resident graph index
+        visited = index.k_hop(entity_id, hops) or {entity_id: 0}
 
+        async with pool.acquire() as conn:
             # Build node list enriched with centrality data
             node_ids = list(visited.keys())
             nodes = []
@@ -7429,33 +7443,20 @@ async def get_entity_neighborhood(
                     })
 
             # Get all edges between nodes in the subgraph
-            edges = []
-            if node_ids:
-                edge_rows = await conn.fetch("""
-                    SELECT source_id, source_type, target_id, target_type,
-                           edge_type, weight, tender_count, total_value, metadata
-                    FROM unified_edges
-                    WHERE source_id = ANY($1::text[]) AND target_id = ANY($1::text[])
-                """, node_ids)
-
-                for row in edge_rows:
-                    metadata = row["metadata"]
-                    if isinstance(metadata, str):
-                        metadata = _json.loads(metadata) if metadata else {}
-                    elif metadata is None:
-                        metadata = {}
-
-                    edges.append({
-                        "source": row["source_id"],
-                        "source_type": row["source_type"],
-                        "target": row["target_id"],
-                        "target_type": row["target_type"],
-                        "edge_type": row["edge_type"],
-                        "weight": float(row["weight"] or 0),
-                        "tender_count": row["tender_count"] or 0,
-                        "total_value": float(row["total_value"] or 0),
-                        "metadata": metadata,
-                    })
+            edges = [
+                {
+                    "source": edge["source_id"],
+                    "source_type": edge["source_type"],
+                    "target": edge["target_id"],
+                    "target_type": edge["target_type"],
+                    "edge_type": edge["edge_type"],
+                    "weight": edge["weight"],
+                    "tender_count": edge["tender_count"],
+                    "total_value": edge["total_value"],
+                    "metadata": edge["metadata"],
+                }
+                for edge in index.subgraph_edges(node_ids)
+            ]
 
             return {
                 "center": entity_id,
@@ -7485,19 +7486,13 @@ async def get_entity_connections(entity_id: str):
     Parameters:
     - entity_id: The entity identifier (company or institution name)
     """
-    import json as _json
-
     try:
         pool = await get_asyncpg_pool()
+        index = await _relationship_graph_service().get_index(pool)
+
         async with pool.acquire() as conn:
-            # Get all edges involving this entity
-            rows = await conn.fetch("""
-                SELECT source_id, source_type, target_id, target_type,
-                       edge_type, weight, tender_count, total_value, metadata
-                FROM unified_edges
-                WHERE source_id = $1 OR target_id = $1
-                ORDER BY weight DESC
-            """, entity_id)
+            # All edges involving this entity, strongest first
+            rows = index.incident_edges_of(entity_id)
 
             # Group by connected entity
             connections = {}
@@ -7512,10 +7507,6 @@ async def get_entity_connections(entity_id: str):
                     direction = "incoming"
 
                 metadata = row["metadata"]
-                if isinstance(metadata, str):
-                    metadata = _json.loads(metadata) if metadata else {}
-                elif metadata is None:
-                    metadata = {}
 
                 edge_info = {
                     "edge_type": row["edge_type"],
@@ -7607,93 +7598,31 @@ async def get_shortest_path(source_id: str, target_id: str):
     """
     Find the shortest path between two entities in the relationship graph.
 
-    Loads the unified_edges into an in-memory graph and computes the shortest
-    path using Dijkstra's algorithm with inverse weight (stronger connections
-    = shorter distance).
+    Runs a bidirectional Dijkstra on the resident graph index with inverse
+    weight (stronger connections = shorter distance).
 
     Parameters:
     - source_id: Starting entity identifier
     - target_id: Destination entity identifier
     """
-    import json as _json
-
     try:
         pool = await get_asyncpg_pool()
-        async with pool.acquire() as conn:
-            # Verify both entities exist in the graph
-            source_exists = await conn.fetchval(
-                "SELECT EXISTS(SELECT 1 FROM unified_edges WHERE source_id = $1 OR target_id = $1)",
-                source_id,
-            )
-            target_exists = await conn.fetchval(
-                "SELECT EXISTS(SELECT 1 FROM unified_edges WHERE source_id = $1 OR target_id = $1)",
-                target_id,
-            )
-
-            if not source_exists or not target_exists:
-                return {
-                    "found": False,
-                    "source": source_id,
-                    "target": target_id,
-                    "path": [],
-                    "edges": [],
-                    "hop_count": 0,
-                    "error": "One or both entities not found in the graph",
-                }
+        index = await _relationship_graph_service().get_index(pool)
 
-            # Load all edges for in-memory path computation
-            edge_rows = await conn.fetch("""
-                SELECT source_id, source_type, target_id, target_type,
-                       edge_type, weight, tender_count, total_value, metadata
-                FROM unified_edges
-            """)
-
-            if not edge_rows:
-                return {
-                    "found": False,
-                    "source": source_id,
-                    "target": target_id,
-                    "path": [],
-                    "edges": [],
-                    "hop_count": 0,
-                    "error": "Graph is empty",
-                }
-
-            # Build edge list for RelationshipGraph
-            edges = []
-            for row in edge_rows:
-                metadata = row["metadata"]
-                if isinstance(metadata, str):
-                    metadata = _json.loads(metadata) if metadata else {}
-                elif metadata is None:
-                    metadata = {}
-
-                edges.append({
-                    "source_id": row["source_id"],
-                    "source_type": row["source_type"],
-                    "target_id": row["target_id"],
-                    "target_type": row["target_type"],
-                    "edge_type": row["edge_type"],
-                    "weight": float(row["weight"] or 1.0),
-                    "tender_count": row["tender_count"] or 0,
-                    "total_value": float(row["total_value"] or 0),
-                    "metadata": metadata,
-                })
+        if not index.has_node(source_id) or not index.has_node(target_id):
+            return {
+                "found": False,
+                "source": source_id,
+                "target": target_id,
+                "path": [],
+                "edges": [],
+                "hop_count": 0,
+                "error": "One or both entities not found in the graph",
+            }
 
-            # Build in-memory graph and compute shortest path
-            try:
-                from ai.corruption.graph.relationship_graph import RelationshipGraph
-            except ImportError:
-                import sys as _sys
-                from pathlib import Path as _Path
-                _ai_path = str(_Path(__file__).parent.parent.parent / "ai" / "corruption")
-                if _ai_path not in _sys.path:
-                    _sys.path.insert(0, _ai_path)
-                from graph.relationship_graph import RelationshipGraph
-
-            graph = RelationshipGraph(edges)
-            path_result = graph.shortest_path(source_id, target_id)
+        path_result = index.shortest_path(source_id, target_id)
 
+        async with pool.acquire() as conn:
             # Enrich path nodes with centrality data
             if path_result["found"] and path_result["path"]:
                 path_nodes = path_result["path"]
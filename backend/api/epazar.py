@@ -14,6 +14,10 @@ from database import get_db
 from api.auth import get_current_user
 from models import User
 from utils.transliteration import get_search_variants
+from utils.pagination import (
+    COUNT_MODE_PATTERN, RELTUPLES_SQL, InvalidCursor, Keyset, NamedParams, filter_signature,
+    resolve_total
+)
 from middleware.entitlements import require_module
 from config.plans import ModuleName
 from schemas import (
@@ -30,6 +34,9 @@ from schemas import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/epazar", tags=["e-Pazar"])
 
+# Nullable sort columns are paged through their NULL tail separately
+_EPAZAR_NOT_NULL_SORT_FIELDS = {'title'}
+
 
 # ============================================================================
 # TENDER ENDPOINTS
@@ -52,10 +59,15 @@ async def get_epazar_tenders(
     closing_to: Optional[date] = Query(None, description="Closing date to"),
     sort_by: str = Query("publication_date", description="Sort field"),
     sort_order: str = Query("desc", description="Sort order: asc or desc"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset pagination; page is ignored)"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="Total count mode: exact or estimate"),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get list of e-Pazar tenders with filtering and pagination.
+
+    Pass the previous response's next_cursor as cursor to page by keyset
+    instead of OFFSET; count=estimate reuses a recent total for the same filters.
     """
     try:
         # Build base query
@@ -156,40 +168,79 @@ async def get_epazar_tenders(
         if sort_by not in valid_sort_fields:
             sort_by = 'publication_date'
 
-        sort_direction = 'DESC' if sort_order.lower() == 'desc' else 'ASC'
+        keyset = Keyset(
+            [sort_by],
+            descending=sort_order.lower() == 'desc',
+            nullable=sort_by not in _EPAZAR_NOT_NULL_SORT_FIELDS,
+        )
+        try:
+            position = keyset.decode(cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         # Get total count
-        count_result = await db.execute(
-            text(f"SELECT COUNT(*) FROM epazar_tenders WHERE 1=1 {where_clause}"),
-            params
+        async def exact_count():
+            count_result = await db.execute(
+                text(f"SELECT COUNT(*) FROM epazar_tenders WHERE 1=1 {where_clause}"),
+                params
+            )
+            return count_result.scalar()
+
+        async def estimated_count():
+            return (await db.execute(text(RELTUPLES_SQL.format(table="epazar_tenders")))).scalar()
+
+        total, total_is_estimate = await resolve_total(
+            count,
+            filter_signature("epazar_tenders", {
+                "status": status, "category": category, "cpv_code": cpv_code,
+                "contracting_authority": contracting_authority, "search": search,
+                "min_value": min_value, "max_value": max_value,
+                "date_from": date_from, "date_to": date_to,
+                "closing_from": closing_from, "closing_to": closing_to,
+            }),
+            exact=exact_count,
+            estimate=None if conditions else estimated_count,
         )
-        total = count_result.scalar()
 
-        # Get paginated results
-        offset = (page - 1) * page_size
-        params['limit'] = page_size
-        params['offset'] = offset
+        # Get paginated results (one extra row tells whether another page follows)
+        offset = (page - 1) * page_size if position is None else 0
+        rows = []
+        for seek in keyset.seeks(position):
+            seek_params = NamedParams('cursor_')
+            predicate = seek(seek_params)
+            page_params = {
+                **params, **seek_params.values,
+                'limit': page_size + 1 - len(rows), 'offset': offset,
+            }
+            seek_clause = f" AND {predicate}" if predicate else ""
 
-        query_str = f"""
-            SELECT
-                tender_id, title, description,
-                contracting_authority, contracting_authority_id,
-                estimated_value_mkd, estimated_value_eur,
-                awarded_value_mkd, awarded_value_eur,
-                procedure_type, status,
-                publication_date, closing_date, award_date, contract_date,
-                contract_number, contract_duration,
-                cpv_code, category,
-                source_url, source_category, language,
-                scraped_at, created_at, updated_at
-            FROM epazar_tenders
-            WHERE 1=1 {where_clause}
-            ORDER BY {sort_by} {sort_direction} NULLS LAST
-            LIMIT :limit OFFSET :offset
-        """
+            query_str = f"""
+                SELECT
+                    tender_id, title, description,
+                    contracting_authority, contracting_authority_id,
+                    estimated_value_mkd, estimated_value_eur,
+                    awarded_value_mkd, awarded_value_eur,
+                    procedure_type, status,
+                    publication_date, closing_date, award_date, contract_date,
+                    contract_number, contract_duration,
+                    cpv_code, category,
+                    source_url, source_category, language,
+                    scraped_at, created_at, updated_at
+                FROM epazar_tenders
+                WHERE 1=1 {where_clause}{seek_clause}
+                ORDER BY {keyset.order_sql()}
+                LIMIT :limit OFFSET :offset
+            """
 
-        result = await db.execute(text(query_str), params)
-        rows = result.fetchall()
+            result = await db.execute(text(query_str), page_params)
+            rows.extend(result.fetchall())
+            if len(rows) > page_size:
+                break
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = keyset.encode([getattr(rows[-1], sort_by), rows[-1].tender_id])
 
         # Convert to response format
         tenders = []
@@ -226,9 +277,13 @@ async def get_epazar_tenders(
             'total': total,
             'page': page,
             'page_size': page_size,
-            'items': tenders
+            'items': tenders,
+            'next_cursor': next_cursor,
+            'total_is_estimate': total_is_estimate,
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching e-Pazar tenders: {e}")
         raise HTTPException(status_code=500, detail=str(e))
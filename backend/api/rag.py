@@ -11,7 +11,6 @@ import time
 import sys
 import os
 import json
-import asyncio
 
 # Add AI module to path (must be before backend/ to avoid db_pool conflict)
 _ai_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../ai'))
@@ -56,6 +55,7 @@ _cached_db_pool = sys.modules.pop('db_pool', None)
 try:
     from rag_query import RAGQueryPipeline, search_tenders as rag_search_tenders
     from embeddings import EmbeddingsPipeline
+    from llm_gateway import get_llm_gateway
     RAG_AVAILABLE = True
 except Exception as _rag_err:
     RAG_AVAILABLE = False
@@ -321,10 +321,6 @@ async def query_rag(
 
             alerts_context = "\n---\n".join(context_parts)
 
-            from google import genai as _genai_mod
-            from google.genai import types as genai_types
-            _rag_genai_client = _genai_mod.Client(api_key=os.getenv('GEMINI_API_KEY'))
-
             # Detect language of the question to respond in same language
             import re as _re
             has_cyrillic = bool(_re.search('[а-яА-ЯѐЀ-ӿ]', request.question))
@@ -380,10 +376,12 @@ If the user asks a follow-up question, use the conversation history to understan
 Question: {request.question}"""
 
             _alerts_model = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
-            response = _rag_genai_client.models.generate_content(
+            response = await get_llm_gateway().generate(
+                prompt,
                 model=_alerts_model,
-                contents=prompt,
-                config=genai_types.GenerateContentConfig(temperature=0.3, max_output_tokens=4096)
+                temperature=0.3,
+                max_output_tokens=4096,
+                user_id=user_id
             )
 
             query_time_ms = int((time.time() - start_time) * 1000)
@@ -664,17 +662,14 @@ async def query_rag_stream(
             # Initialize RAG pipeline
             pipeline = RAGQueryPipeline(top_k=request.top_k)
 
-            # Import here to access streaming generation
-            from google import genai as _genai_mod2
-            from google.genai import types as genai_types2
-            _stream_genai_client = _genai_mod2.Client(api_key=os.getenv('GEMINI_API_KEY'))
             from rag_query import ContextAssembler, PromptBuilder
 
             # 1. Get query embedding and search
             yield f"data: {json.dumps({'type': 'status', 'message': 'Searching documents...'})}\n\n"
 
             from embeddings import EmbeddingGenerator, VectorStore
-            embedder = EmbeddingGenerator()
+            from embedding_cache import get_query_cache
+            embedder = EmbeddingGenerator(cache=get_query_cache())
             vector_store = VectorStore(pipeline.database_url)
             await vector_store.connect()
 
@@ -739,20 +734,15 @@ async def query_rag_stream(
 
                 # Stream response
                 full_answer = []
-                response = _stream_genai_client.models.generate_content_stream(
+                async for piece in get_llm_gateway().stream(
+                    prompt,
                     model=pipeline.model,
-                    contents=prompt,
-                    config=genai_types2.GenerateContentConfig(
-                        temperature=0.3,
-                        max_output_tokens=4096
-                    ),
-                )
-
-                for chunk in response:
-                    if chunk.text:
-                        full_answer.append(chunk.text)
-                        yield f"data: {json.dumps({'type': 'token', 'content': chunk.text})}\n\n"
-                        await asyncio.sleep(0)  # Allow other tasks to run
+                    temperature=0.3,
+                    max_output_tokens=4096,
+                    user_id=str(current_user.user_id)
+                ):
+                    full_answer.append(piece)
+                    yield f"data: {json.dumps({'type': 'token', 'content': piece})}\n\n"
 
                 # 4. Send metadata
                 answer_text = ''.join(full_answer)
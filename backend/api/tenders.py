@@ -4,25 +4,34 @@ CRUD operations for tenders
 """
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, text
+from sqlalchemy import select, func, and_, or_, text, desc
 from typing import Optional, List
 from datetime import date
 from decimal import Decimal
 import os
+import sys
 import json
 import re
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
-from database import get_db
+from database import get_db, engine
 from models import Tender, TenderBidder, TenderLot, Supplier, Document, User, ProductItem
 from api.auth import get_current_user, oauth2_scheme
 from utils.timezone import get_ai_date_context
 from utils.transliteration import get_search_variants
 from utils.product_quality import product_quality_filter
+from utils.export_stream import (
+    EXPORT_MEDIA_TYPES, csv_chunks, gzip_chunks, json_document_chunks, ndjson_chunks
+)
+from utils.pagination import (
+    COUNT_MODE_PATTERN, RELTUPLES_SQL, InvalidCursor, Keyset, NamedParams, filter_signature,
+    resolve_total
+)
 from middleware.entitlements import require_module
-from config.plans import ModuleName
+from config.plans import ModuleName, AccessLevel, get_module_access_level
 from schemas import (
     TenderCreate,
     TenderUpdate,
@@ -35,6 +44,12 @@ from schemas import (
     TenderChatSource
 )
 
+# Shared bilingual search builder (also used by ai/rag_query.py)
+_ai_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../ai'))
+if _ai_path not in sys.path:
+    sys.path.insert(0, _ai_path)
+from tender_search import TenderSearch
+
 # Import Gemini for AI summaries
 try:
     from google import genai
@@ -106,10 +121,53 @@ async def _log_search(db: AsyncSession, user, query_text: str, filters: dict, re
         logger.warning(f"Search history log failed: {e}")
 
 
+# ============================================================================
+# SEARCH HELPERS (shared by list, search and export)
+# ============================================================================
+
+def _search_filter(tender_search: TenderSearch):
+    """WHERE clause for a bilingual text search over tenders.search_text"""
+    params = NamedParams("search_f")
+    return text(tender_search.filter_sql("tenders", params)).bindparams(**params.values)
+
+
+def _search_rank(tender_search: TenderSearch):
+    """Relevance expression for ORDER BY (ts_rank_cd over tenders.search_tsv)"""
+    params = NamedParams("search_r")
+    return text(tender_search.rank_sql("tenders", params)).bindparams(**params.values)
+
+
+def _apply_search_sort(query, search: TenderSearchRequest, tender_search: TenderSearch):
+    """Order by relevance when requested (sort_by='relevance'), else by the given column"""
+    if search.sort_by == "relevance" and tender_search:
+        return query.order_by(desc(_search_rank(tender_search)), Tender.publication_date.desc().nullslast())
+    sort_column = getattr(Tender, search.sort_by, Tender.created_at)
+    if search.sort_order.lower() == "desc":
+        return query.order_by(sort_column.desc())
+    return query.order_by(sort_column.asc())
+
+
+def _tender_keyset(sort_by: str, sort_order: str):
+    """Keyset over (sort column, tender_id) for cursor pagination of /tenders"""
+    column = Tender.__table__.c.get(sort_by, Tender.__table__.c.created_at)
+    keyset = Keyset(
+        [f"tenders.{column.name}"],
+        descending=sort_order.lower() == "desc",
+        id_column="tenders.tender_id",
+        nullable=column.nullable,
+    )
+    return keyset, column
+
+
 # ============================================================================
 # TENDER STATISTICS (Must be defined BEFORE path parameter routes)
 # ============================================================================
 
+# Served from mv_tender_stats_overview (migration 054), cached per process
+TENDER_STATS_CACHE_TTL = int(os.getenv("TENDER_STATS_CACHE_TTL", "300"))  # 5 minutes
+_tender_stats_cache = {"data": None, "expires": 0.0}
+
+
 @router.get("/stats/overview")
 async def get_tender_stats(
     db: AsyncSession = Depends(get_db)
@@ -124,125 +182,43 @@ async def get_tender_stats(
     - "closing_soon": status='open' AND closing_date is within 7 days
     - "closed": status='closed' OR (status='open' AND closing_date < today)
     - "unknown": status='open' but closing_date is NULL (can't verify)
-    """
-    from datetime import date as date_type, timedelta
-
-    today = date_type.today()
-    week_from_now = today + timedelta(days=7)
-
-    # Total tenders
-    total_query = select(func.count()).select_from(Tender)
-    total_tenders = await db.scalar(total_query)
-
-    # VERIFIED OPEN tenders (have closing_date >= today)
-    open_query = select(func.count()).select_from(Tender).where(
-        and_(
-            Tender.status == "open",
-            Tender.closing_date.isnot(None),
-            Tender.closing_date >= today
-        )
-    )
-    open_tenders = await db.scalar(open_query)
 
-    # CLOSING SOON (within 7 days)
-    closing_soon_query = select(func.count()).select_from(Tender).where(
-        and_(
-            Tender.status == "open",
-            Tender.closing_date.isnot(None),
-            Tender.closing_date >= today,
-            Tender.closing_date <= week_from_now
-        )
-    )
-    closing_soon_tenders = await db.scalar(closing_soon_query)
-
-    # Effectively CLOSED tenders:
-    # - status is 'closed', OR
-    # - status is 'open' but closing_date < today
-    closed_query = select(func.count()).select_from(Tender).where(
-        or_(
-            Tender.status == "closed",
-            and_(
-                Tender.status == "open",
-                Tender.closing_date.isnot(None),
-                Tender.closing_date < today
-            )
-        )
-    )
-    closed_tenders = await db.scalar(closed_query)
-
-    # Awarded tenders (includes 'completed' status with a winner)
-    awarded_query = select(func.count()).select_from(Tender).where(
-        or_(
-            Tender.status == "awarded",
-            and_(Tender.status == "completed", Tender.winner.isnot(None), Tender.winner != "")
-        )
-    )
-    awarded_tenders = await db.scalar(awarded_query)
-
-    # Cancelled tenders
-    cancelled_query = select(func.count()).select_from(Tender).where(Tender.status == "cancelled")
-    cancelled_tenders = await db.scalar(cancelled_query)
-
-    # UNKNOWN status (open but no closing_date - can't verify)
-    unknown_query = select(func.count()).select_from(Tender).where(
-        and_(
-            Tender.status == "open",
-            Tender.closing_date.is_(None)
-        )
-    )
-    unknown_tenders = await db.scalar(unknown_query)
-
-    # Total value
-    value_query = select(func.sum(Tender.estimated_value_mkd)).select_from(Tender)
-    total_value = await db.scalar(value_query) or 0
-
-    # Average value
-    avg_query = select(func.avg(Tender.estimated_value_mkd)).select_from(Tender)
-    avg_value = await db.scalar(avg_query) or 0
-
-    # Tenders by category (top 10)
-    category_query = select(
-        Tender.category,
-        func.count().label('count')
-    ).where(
-        Tender.category.isnot(None)
-    ).group_by(
-        Tender.category
-    ).order_by(
-        func.count().desc()
-    ).limit(10)
-
-    result = await db.execute(category_query)
-    categories = {row[0]: row[1] for row in result}
-
-    # Tenders by source_category
-    source_category_query = select(
-        Tender.source_category,
-        func.count().label('count')
-    ).group_by(
-        Tender.source_category
-    ).order_by(
-        func.count().desc()
-    )
-
-    result = await db.execute(source_category_query)
-    source_categories = {row[0] or 'unknown': row[1] for row in result}
-
-    return {
-        "total_tenders": total_tenders,
-        "open_tenders": open_tenders,  # Verified open (have closing_date >= today)
-        "closing_soon_tenders": closing_soon_tenders,  # Closing within 7 days
-        "closed_tenders": closed_tenders,
-        "awarded_tenders": awarded_tenders,
-        "cancelled_tenders": cancelled_tenders,
-        "unknown_status_tenders": unknown_tenders,  # No closing_date, can't verify
-        "total_value_mkd": float(total_value),
-        "avg_value_mkd": float(avg_value),
-        "tenders_by_category": categories,
-        "tenders_by_source_category": source_categories,
+    Figures come from the mv_tender_stats_overview snapshot, refreshed after
+    each scrape. If the snapshot was taken on an earlier day the open/closed
+    split is recomputed live in a single scan.
+    """
+    today = date.today()
+
+    cached = _tender_stats_cache["data"]
+    if cached and _tender_stats_cache["expires"] > time.monotonic() and cached["current_date"] == today.isoformat():
+        return cached
+
+    result = await db.execute(text("SELECT * FROM mv_tender_stats_overview"))
+    row = result.mappings().first()
+    if row is None or row["as_of_date"] != today:
+        result = await db.execute(text("SELECT * FROM tender_stats_overview()"))
+        row = result.mappings().first()
+
+    data = {
+        "total_tenders": row["total_tenders"],
+        "open_tenders": row["open_tenders"],  # Verified open (have closing_date >= today)
+        "closing_soon_tenders": row["closing_soon_tenders"],  # Closing within 7 days
+        "closed_tenders": row["closed_tenders"],
+        "awarded_tenders": row["awarded_tenders"],
+        "cancelled_tenders": row["cancelled_tenders"],
+        "unknown_status_tenders": row["unknown_status_tenders"],  # No closing_date, can't verify
+        "total_value_mkd": float(row["total_value_mkd"] or 0),
+        "avg_value_mkd": float(row["avg_value_mkd"] or 0),
+        # Stored as [name, count] pairs, largest first
+        "tenders_by_category": {name: count for name, count in row["tenders_by_category"]},
+        "tenders_by_source_category": {name or 'unknown': count for name, count in row["tenders_by_source_category"]},
         "current_date": today.isoformat()  # For UI reference
     }
 
+    _tender_stats_cache["data"] = data
+    _tender_stats_cache["expires"] = time.monotonic() + TENDER_STATS_CACHE_TTL
+    return data
+
 
 @router.get("/stats/recent")
 async def get_recent_tenders(
@@ -449,8 +425,10 @@ async def list_tenders(
     opening_date_to: Optional[date] = Query(None, description="Filter by opening date to"),
     closing_date_from: Optional[date] = Query(None, description="Filter by closing date from"),
     closing_date_to: Optional[date] = Query(None, description="Filter by closing date to"),
-    sort_by: str = Query("publication_date", description="Field to sort by"),
+    sort_by: str = Query("publication_date", description="Field to sort by, or \"relevance\" to rank search matches"),
     sort_order: str = Query("desc", description="asc or desc"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset pagination; page is ignored)"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="Total count mode: exact or estimate"),
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_user)
 ):
@@ -469,8 +447,11 @@ async def list_tenders(
     - max_estimated_mkd: Maximum estimated value in MKD
     - min_estimated_eur: Minimum estimated value in EUR
     - max_estimated_eur: Maximum estimated value in EUR
-    - sort_by: Field to sort by
+    - sort_by: Field to sort by, or "relevance" to rank search matches
     - sort_order: Sort order (asc or desc)
+    - cursor: Continue after the previous page's next_cursor instead of using page
+    - count: "exact" counts every request; "estimate" reuses a recent count for
+      the same filters (or the planner's row count when unfiltered)
     """
     # Build query
     query = select(Tender)
@@ -478,17 +459,20 @@ async def list_tenders(
     # Apply filters
     filters = []
 
-    # Text search in title and description (with bilingual Latin/Cyrillic support)
-    if search:
-        variants = get_search_variants(search)
-        text_filters = []
-        for variant in variants:
-            text_filters.append(or_(
-                Tender.title.ilike(f"%{variant}%"),
-                Tender.description.ilike(f"%{variant}%"),
-                Tender.procuring_entity.ilike(f"%{variant}%")
-            ))
-        filters.append(or_(*text_filters))
+    # Text search (bilingual Latin/Cyrillic, served by the search_text trigram index)
+    tender_search = TenderSearch(search)
+    if tender_search:
+        filters.append(_search_filter(tender_search))
+
+    # Keyset pagination (not available for relevance, whose rank is not indexed)
+    by_relevance = sort_by == "relevance" and bool(tender_search)
+    keyset, sort_column = (None, None) if by_relevance else _tender_keyset(sort_by, sort_order)
+    if cursor and by_relevance:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not available for relevance sort")
+    try:
+        position = keyset.decode(cursor) if keyset else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     if category:
         filters.append(Tender.category == category)
@@ -561,25 +545,51 @@ async def list_tenders(
     count_query = select(func.count()).select_from(Tender)
     if filters:
         count_query = count_query.where(and_(*filters))
-    total = await db.scalar(count_query)
+    count_filters = {
+        "search": search, "category": category, "status": status,
+        "source_category": source_category, "procuring_entity": procuring_entity,
+        "cpv_code": cpv_code, "procedure_type": procedure_type,
+        "min_estimated_mkd": min_estimated_mkd, "max_estimated_mkd": max_estimated_mkd,
+        "min_estimated_eur": min_estimated_eur, "max_estimated_eur": max_estimated_eur,
+        "opening_date_from": opening_date_from, "opening_date_to": opening_date_to,
+        "closing_date_from": closing_date_from, "closing_date_to": closing_date_to,
+    }
+    total, total_is_estimate = await resolve_total(
+        count,
+        filter_signature("tenders", count_filters),
+        exact=lambda: db.scalar(count_query),
+        estimate=None if filters else (lambda: db.scalar(text(RELTUPLES_SQL.format(table="tenders")))),
+    )
 
-    # Sort (nulls last so tenders with dates appear first)
-    sort_column = getattr(Tender, sort_by, Tender.created_at)
-    if sort_order.lower() == "desc":
-        query = query.order_by(sort_column.desc().nullslast())
+    next_cursor = None
+    if by_relevance:
+        query = query.order_by(desc(_search_rank(tender_search)), Tender.publication_date.desc().nullslast())
+        result = await db.execute(query.offset((page - 1) * page_size).limit(page_size))
+        tenders = result.scalars().all()
     else:
-        query = query.order_by(sort_column.asc().nullslast())
+        # Sort (nulls last so tenders with dates appear first), tender_id breaks ties
+        query = query.order_by(text(keyset.order_sql()))
+        if position is None:
+            query = query.offset((page - 1) * page_size)
+
+        # One extra row tells whether another page follows
+        tenders = []
+        for seek in keyset.seeks(position):
+            params = NamedParams("cursor_")
+            predicate = seek(params)
+            page_query = query if predicate is None else query.where(text(predicate).bindparams(**params.values))
+            result = await db.execute(page_query.limit(page_size + 1 - len(tenders)))
+            tenders.extend(result.scalars().all())
+            if len(tenders) > page_size:
+                break
 
-    # Paginate
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
+        if len(tenders) > page_size:
+            tenders = tenders[:page_size]
+            last = tenders[-1]
+            next_cursor = keyset.encode([getattr(last, sort_column.key), last.tender_id])
 
-    # Execute
-    result = await db.execute(query)
-    tenders = result.scalars().all()
-
-    # Log search (only when user has a search query, page 1 only to avoid duplicate logs)
-    if search and page == 1 and current_user:
+    # Log search (only when user has a search query, first page only to avoid duplicate logs)
+    if search and page == 1 and not cursor and current_user:
         await _log_search(db, current_user, search, {
             "category": category, "status": status, "cpv_code": cpv_code,
             "procuring_entity": procuring_entity, "procedure_type": procedure_type,
@@ -590,7 +600,9 @@ async def list_tenders(
         total=total,
         page=page,
         page_size=page_size,
-        items=[TenderResponse.from_orm(t) for t in tenders]
+        items=[TenderResponse.from_orm(t) for t in tenders],
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
     )
 
 
@@ -610,20 +622,11 @@ async def search_tenders(
     query = select(Tender)
     filters = []
 
-    # Text search (search in title, description, procuring_entity, CPV code, and winner)
+    # Text search (title, description, procuring_entity, CPV code, and winner)
     # Supports both Latin and Cyrillic characters (bilingual search)
-    if search.query:
-        variants = get_search_variants(search.query)
-        text_filters = []
-        for variant in variants:
-            text_filters.append(or_(
-                Tender.title.ilike(f"%{variant}%"),
-                Tender.description.ilike(f"%{variant}%"),
-                Tender.procuring_entity.ilike(f"%{variant}%"),
-                Tender.cpv_code.ilike(f"%{variant}%"),
-                Tender.winner.ilike(f"%{variant}%")
-            ))
-        filters.append(or_(*text_filters))
+    tender_search = TenderSearch(search.query)
+    if tender_search:
+        filters.append(_search_filter(tender_search))
 
     # Exact filters
     if search.category:
@@ -681,11 +684,7 @@ async def search_tenders(
     total = await db.scalar(count_query)
 
     # Sort
-    sort_column = getattr(Tender, search.sort_by, Tender.created_at)
-    if search.sort_order.lower() == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
+    query = _apply_search_sort(query, search, tender_search)
 
     # Paginate
     offset = (search.page - 1) * search.page_size
@@ -715,29 +714,61 @@ async def search_tenders(
 # EXPORT ENDPOINTS (Starter+ tiers only)
 # ============================================================================
 
+# Columns written by /tenders/export: (JSON key, CSV header or None for JSON only)
+_EXPORT_COLUMNS = [
+    ("tender_id", "Tender ID"),
+    ("title", "Title"),
+    ("procuring_entity", "Procuring Entity"),
+    ("category", "Category"),
+    ("status", "Status"),
+    ("cpv_code", "CPV Code"),
+    ("estimated_value_mkd", "Estimated Value (MKD)"),
+    ("estimated_value_eur", "Estimated Value (EUR)"),
+    ("opening_date", "Opening Date"),
+    ("closing_date", "Closing Date"),
+    ("procedure_type", "Procedure Type"),
+    ("source_url", "Source URL"),
+    ("dossier_id", None),
+]
+
+EXPORT_MAX_ROWS = int(os.getenv("EXPORT_MAX_ROWS", "1000"))
+# Plans with unlimited exports (enterprise); 0 = no cap
+EXPORT_MAX_ROWS_UNLIMITED = int(os.getenv("EXPORT_MAX_ROWS_UNLIMITED", "0"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+
+def _export_row_limit(user_tier: str) -> Optional[int]:
+    """Maximum rows per export for a tier (None = unlimited)"""
+    if get_module_access_level(user_tier, ModuleName.EXPORT_CSV) == AccessLevel.UNLIMITED:
+        return EXPORT_MAX_ROWS_UNLIMITED or None
+    return EXPORT_MAX_ROWS
+
+
 @router.post("/export", dependencies=[Depends(require_module(ModuleName.EXPORT_CSV))])
 async def export_tenders(
     search: TenderSearchRequest,
-    format: str = Query("csv", regex="^(csv|json)$", description="Export format: csv or json"),
+    format: str = Query("csv", regex="^(csv|json|ndjson)$", description="Export format: csv, json or ndjson"),
+    compress: bool = Query(False, description="gzip-compress the download"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Export tender search results to CSV or JSON format.
+    Export tender search results to CSV, JSON or NDJSON format.
 
     Requires Starter tier or higher.
-    Maximum 1000 results per export.
+    Maximum 1000 results per export (EXPORT_MAX_ROWS); plans with unlimited
+    exports are not capped. Rows are read through a server-side cursor and
+    streamed in batches, so large exports do not grow worker memory.
 
     Args:
         search: Same search criteria as /search endpoint
-        format: Export format (csv or json)
+        format: Export format (csv, json or ndjson)
+        compress: gzip the file (.gz download)
 
     Returns:
-        CSV or JSON file as download
+        CSV, JSON or NDJSON file as a streamed download
     """
     from fastapi.responses import StreamingResponse
-    import csv
-    import io
 
     # Check tier - must be starter or higher
     user_tier = getattr(current_user, 'subscription_tier', 'free').lower()
@@ -750,17 +781,13 @@ async def export_tenders(
             }
         )
 
-    # Build query (same as search)
-    query = select(Tender)
+    # Build query (same filters as search), selecting only the export columns
+    query = select(*[getattr(Tender, key) for key, _ in _EXPORT_COLUMNS])
     filters = []
 
-    if search.query:
-        text_filter = or_(
-            Tender.title.ilike(f"%{search.query}%"),
-            Tender.description.ilike(f"%{search.query}%"),
-            Tender.procuring_entity.ilike(f"%{search.query}%")
-        )
-        filters.append(text_filter)
+    tender_search = TenderSearch(search.query)
+    if tender_search:
+        filters.append(_search_filter(tender_search))
 
     if search.category:
         filters.append(Tender.category == search.category)
@@ -795,83 +822,42 @@ async def export_tenders(
     if filters:
         query = query.where(and_(*filters))
 
-    # Sort and limit to 1000 results
-    sort_column = getattr(Tender, search.sort_by, Tender.created_at)
-    if search.sort_order.lower() == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
-
-    query = query.limit(1000)
-
-    result = await db.execute(query)
-    tenders = result.scalars().all()
-
-    if format == "json":
-        # JSON export
-        export_data = []
-        for t in tenders:
-            export_data.append({
-                "tender_id": t.tender_id,
-                "title": t.title,
-                "procuring_entity": t.procuring_entity,
-                "category": t.category,
-                "status": t.status,
-                "cpv_code": t.cpv_code,
-                "estimated_value_mkd": float(t.estimated_value_mkd) if t.estimated_value_mkd else None,
-                "estimated_value_eur": float(t.estimated_value_eur) if t.estimated_value_eur else None,
-                "opening_date": t.opening_date.isoformat() if t.opening_date else None,
-                "closing_date": t.closing_date.isoformat() if t.closing_date else None,
-                "source_url": t.source_url,
-                "dossier_id": t.dossier_id,
-                "procedure_type": t.procedure_type,
-            })
-
-        return {
-            "total": len(export_data),
-            "format": "json",
-            "data": export_data
-        }
-
+    # Sort and apply the plan's row limit
+    query = _apply_search_sort(query, search, tender_search)
+
+    max_rows = _export_row_limit(user_tier)
+    if max_rows:
+        query = query.limit(max_rows)
+
+    async def export_batches():
+        # Own connection: the request session is closed once the response starts
+        async with engine.connect() as conn:
+            result = await conn.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for partition in result.partitions():
+                yield [dict(row._mapping) for row in partition]
+
+    if format == "csv":
+        csv_columns = [(key, header) for key, header in _EXPORT_COLUMNS if header]
+        chunks = csv_chunks([h for _, h in csv_columns], [k for k, _ in csv_columns], export_batches())
+    elif format == "ndjson":
+        chunks = ndjson_chunks(export_batches())
     else:
-        # CSV export
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Header row
-        writer.writerow([
-            "Tender ID", "Title", "Procuring Entity", "Category", "Status",
-            "CPV Code", "Estimated Value (MKD)", "Estimated Value (EUR)",
-            "Opening Date", "Closing Date", "Procedure Type", "Source URL"
-        ])
-
-        # Data rows
-        for t in tenders:
-            writer.writerow([
-                t.tender_id,
-                t.title,
-                t.procuring_entity,
-                t.category,
-                t.status,
-                t.cpv_code,
-                float(t.estimated_value_mkd) if t.estimated_value_mkd else "",
-                float(t.estimated_value_eur) if t.estimated_value_eur else "",
-                t.opening_date.isoformat() if t.opening_date else "",
-                t.closing_date.isoformat() if t.closing_date else "",
-                t.procedure_type or "",
-                t.source_url or ""
-            ])
-
-        output.seek(0)
+        chunks = json_document_chunks(export_batches(), format="json")
 
+    filename = f"tenders_export_{date.today().isoformat()}.{format}"
+    if compress:
         return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=tenders_export_{date.today().isoformat()}.csv"
-            }
+            gzip_chunks(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f"attachment; filename={filename}.gz"}
         )
 
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 
 # ============================================================================
 # METADATA ENDPOINTS (categories, CPV codes)
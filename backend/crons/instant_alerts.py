@@ -29,13 +29,21 @@ from database import AsyncSessionLocal
 from models import User, Tender
 from models_user_personalization import UserPreferences, TenderAlert
 from services.postmark import postmark_service
-from api.alerts import check_alert_against_tender
+from services.alert_matcher import CompiledAlertMatcher
+from services.email_queue import EmailJob, EmailSendQueue
 from api.notifications import create_notification
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 FRONTEND_URL = os.getenv("FRONTEND_URL", "https://www.nabavkidata.com")
+EMAIL_CONCURRENCY = int(os.getenv("INSTANT_ALERT_EMAIL_CONCURRENCY", "4"))
+# Users with more tender_alert emails than this in one batch get a single digest instead
+MAX_ALERT_EMAILS_PER_USER = int(os.getenv("INSTANT_ALERT_MAX_EMAILS_PER_USER", "5"))
+DIGEST_MAX_TENDERS = 20  # Tenders listed in a digest; the rest are summarised as a count
+# Un-notified matches younger than this are re-sent on every run
+RETRY_LOOKBACK_HOURS = int(os.getenv("INSTANT_ALERT_RETRY_HOURS", "24"))
+RETRY_BATCH_LIMIT = 500
 
 # Track last check time in a simple file
 LAST_CHECK_FILE = "/tmp/nabavkidata_instant_alert_last_check"
@@ -300,114 +308,415 @@ async def send_alert_email(user_email: str, user_name: str, tender: dict, reason
         return False
 
 
-async def process_tender_alert_matches(db: AsyncSession, tenders: List[dict], source: str, already_emailed: set = None) -> tuple:
-    """
-    Match tenders against all active tender_alerts.
-    Creates alert_matches, in-app notifications, and sends emails.
-    Returns (matches_count, emails_sent).
+async def generate_alert_digest_html(user_name: str, items: List[dict]) -> str:
+    """Generate HTML for one email listing several matched tenders."""
+    shown = items[:DIGEST_MAX_TENDERS]
+    rows_html = "".join(
+        f"""
+        <tr>
+            <td style="padding: 10px 0; border-bottom: 1px solid #e5e7eb;">
+                <a href="{FRONTEND_URL}/tenders/{quote(item['tender'].get('tender_id', ''), safe='')}"
+                   style="color: #166534; font-weight: 600; text-decoration: none;">{item['tender'].get('title') or 'Без наслов'}</a>
+                <div style="color: #6b7280; font-size: 13px; margin-top: 4px;">
+                    {item['tender'].get('procuring_entity') or 'N/A'} · {', '.join(item['reasons'][:2])}
+                </div>
+            </td>
+        </tr>"""
+        for item in shown
+    )
+    more_html = (
+        f'<p style="color: #6b7280; font-size: 14px;">...и уште {len(items) - len(shown)} тендери.</p>'
+        if len(items) > len(shown) else ""
+    )
+
+    content = f"""
+    <p>Здраво <strong>{user_name}</strong>,</p>
+    <p><strong>{len(items)}</strong> нови тендери одговараат на вашите алерти.</p>
+    <table style="width: 100%; margin: 20px 0;">{rows_html}
+    </table>
+    {more_html}
     """
-    if not tenders:
-        return 0, 0
 
-    # Get all active tender_alerts with user info
+    return postmark_service._get_email_template(
+        title="🔔 Нови Тендери",
+        content=content,
+        button_text="Погледни ги алертите",
+        button_link=f"{FRONTEND_URL}/alerts"
+    )
+
+
+async def send_alert_digest_email(user_email: str, user_name: str, items: List[dict]) -> bool:
+    """Send one digest email covering several matched tenders."""
+    try:
+        html = await generate_alert_digest_html(user_name, items)
+        return await postmark_service.send_email(
+            to=user_email, subject=f"🔔 {len(items)} нови тендери за вашите алерти",
+            html_content=html, tag="instant-alert-digest", reply_to="support@nabavkidata.com"
+        )
+    except Exception as e:
+        logger.error(f"Error sending alert digest to {user_email}: {e}")
+        return False
+
+
+def _json_list(raw) -> list:
+    """jsonb array column value, whether the driver returns a list or a JSON string"""
+    return raw if isinstance(raw, list) else json.loads(raw) if raw else []
+
+
+async def load_alert_matcher(db: AsyncSession) -> CompiledAlertMatcher:
+    """Compile all active tender_alerts (with user info) into one matcher for this run"""
     result = await db.execute(text("""
         SELECT ta.alert_id, ta.user_id, ta.name, ta.criteria, ta.notification_channels,
-               u.email, u.full_name, u.email_verified
+               u.email, u.full_name
         FROM tender_alerts ta
         JOIN users u ON u.user_id = ta.user_id::uuid
         WHERE ta.is_active = true AND u.email_verified = true
     """))
-    alerts_with_users = result.fetchall()
+    alerts = []
+    for alert_id, user_id, alert_name, criteria_raw, channels_raw, user_email, user_name in result.fetchall():
+        channels = _json_list(channels_raw)
+        alerts.append({
+            'alert_id': alert_id, 'user_id': user_id, 'name': alert_name,
+            'criteria': criteria_raw, 'channels': channels,
+            'email': user_email, 'full_name': user_name
+        })
+    return CompiledAlertMatcher(alerts)
+
+
+def collect_alert_matches(matcher: CompiledAlertMatcher, tenders: List[dict], source: str) -> List[dict]:
+    """Run every tender from one source through the matcher; returns one dict per (alert, tender) match"""
+    matches = []
+    for tender in tenders:
+        for alert, score, reasons in matcher.match(tender):
+            matches.append({
+                'match_id': str(uuid.uuid4()),
+                'alert': alert,
+                'tender': tender,
+                'source': source,
+                'score': score,
+                'reasons': reasons
+            })
+    return matches
+
+
+async def persist_alert_matches(db: AsyncSession, matches: List[dict]) -> List[dict]:
+    """
+    Insert all matches with one multi-row statement.
+
+    If the batch fails (bad alert_id, FK violation on a concurrently deleted
+    alert...) each match is retried on its own savepoint so one bad row does
+    not drop the rest. Returns the matches that were new (pairs already in
+    alert_matches are skipped).
+    """
+    if not matches:
+        return []
+
+    rows = [
+        {
+            'match_id': m['match_id'],
+            'alert_id': str(m['alert']['alert_id']),
+            'tender_id': m['tender']['tender_id'],
+            'tender_source': m['source'],
+            'match_score': m['score'],
+            'match_reasons': m['reasons']
+        }
+        for m in matches
+    ]
+    insert_sql = text("""
+        INSERT INTO alert_matches
+            (match_id, alert_id, tender_id, tender_source, match_score, match_reasons, is_read, created_at)
+        SELECT r.match_id, r.alert_id, r.tender_id, r.tender_source, r.match_score, r.match_reasons, false, NOW()
+        FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r(
+            match_id uuid, alert_id uuid, tender_id text, tender_source text,
+            match_score numeric, match_reasons jsonb
+        )
+        ON CONFLICT (alert_id, tender_id) DO NOTHING
+        RETURNING match_id
+    """)
+    inserted = set()
+    try:
+        async with db.begin_nested():
+            result = await db.execute(insert_sql, {'rows': json.dumps(rows)})
+            inserted = {str(row[0]) for row in result.fetchall()}
+        return [m for m in matches if m['match_id'] in inserted]
+    except Exception as e:
+        logger.warning(f"Batch match insert failed, falling back to per-row: {e}")
+
+    for row in rows:
+        try:
+            async with db.begin_nested():
+                result = await db.execute(insert_sql, {'rows': json.dumps([row])})
+                inserted.update(str(r[0]) for r in result.fetchall())
+        except Exception as e:
+            logger.warning(f"Match insert failed (rolled back): {e}")
+    return [m for m in matches if m['match_id'] in inserted]
+
+
+async def create_match_notifications(db: AsyncSession, matches: List[dict]) -> int:
+    """Create in-app notifications for matches whose alert has the in_app channel"""
+    pending = [m for m in matches if 'in_app' in m['alert']['channels']]
+    if not pending:
+        return 0
+
+    rows = [
+        {
+            'notification_id': str(uuid.uuid4()),
+            'user_id': str(m['alert']['user_id']),
+            'title': f"🔔 {m['alert']['name']}: {(m['tender'].get('title') or '')[:60]}",
+            'message': ', '.join(m['reasons'][:3]),
+            'data': {'tender_id': m['tender']['tender_id'], 'source': m['source'], 'score': m['score']},
+            'tender_id': m['tender']['tender_id'],
+            'alert_id': str(m['alert']['alert_id'])
+        }
+        for m in pending
+    ]
+    try:
+        # Savepoint so an FK failure (e.g. e-pazar tender ids) does not abort the run
+        async with db.begin_nested():
+            await db.execute(text("""
+                INSERT INTO notifications
+                    (notification_id, user_id, type, title, message, data, tender_id, alert_id, is_read, created_at)
+                SELECT n.notification_id, n.user_id, 'alert_match', n.title, n.message, n.data,
+                       n.tender_id, n.alert_id, false, NOW()
+                FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS n(
+                    notification_id uuid, user_id uuid, title text, message text,
+                    data jsonb, tender_id text, alert_id uuid
+                )
+            """), {'rows': json.dumps(rows)})
+        return len(rows)
+    except Exception as e:
+        logger.warning(f"Batch notification insert failed, falling back to per-row: {e}")
+
+    created = 0
+    for row in rows:
+        try:
+            async with db.begin_nested():
+                await create_notification(
+                    db, row['user_id'], 'alert_match',
+                    title=row['title'], message=row['message'], data=row['data'],
+                    tender_id=row['tender_id'], alert_id=row['alert_id']
+                )
+            created += 1
+        except Exception as e:
+            logger.warning(f"Notification create failed (rolled back): {e}")
+    return created
+
+
+async def mark_matches_notified(db: AsyncSession, pairs: List[tuple]):
+    """Set notified_at for (alert_id, tender_id) pairs in one statement"""
+    if not pairs:
+        return
+    await db.execute(text("""
+        UPDATE alert_matches am SET notified_at = NOW()
+        FROM jsonb_to_recordset(CAST(:pairs AS jsonb)) AS p(alert_id uuid, tender_id text)
+        WHERE am.alert_id = p.alert_id AND am.tender_id = p.tender_id
+    """), {'pairs': json.dumps([{'alert_id': str(a), 'tender_id': t} for a, t in pairs])})
+
+
+async def load_unnotified_matches(db: AsyncSession, lookback_hours: int = RETRY_LOOKBACK_HOURS,
+                                  limit: int = RETRY_BATCH_LIMIT) -> List[dict]:
+    """
+    Recent email-channel matches whose email never went out (notified_at NULL).
+
+    Returns match dicts shaped like collect_alert_matches(), with the tender
+    re-read from tenders / epazar_tenders.
+    """
+    result = await db.execute(text("""
+        SELECT am.match_id, am.alert_id, am.tender_id, am.tender_source, am.match_score, am.match_reasons,
+               ta.user_id, ta.name, ta.notification_channels, u.email, u.full_name,
+               COALESCE(t.title, e.title), COALESCE(t.description, e.description),
+               COALESCE(t.procuring_entity, e.contracting_authority),
+               COALESCE(t.estimated_value_mkd, e.estimated_value_mkd),
+               COALESCE(t.cpv_code, e.cpv_code), COALESCE(t.closing_date, e.closing_date),
+               COALESCE(t.winner, '')
+        FROM alert_matches am
+        JOIN tender_alerts ta ON ta.alert_id = am.alert_id
+        JOIN users u ON u.user_id = ta.user_id::uuid
+        LEFT JOIN tenders t ON am.tender_source <> 'e-pazar' AND t.tender_id = am.tender_id
+        LEFT JOIN epazar_tenders e ON am.tender_source = 'e-pazar' AND e.tender_id = am.tender_id
+        WHERE am.notified_at IS NULL
+          AND am.created_at >= NOW() - make_interval(hours => :hours)
+          AND ta.is_active = true AND u.email_verified = true
+          -- Cheap prefilter that works for jsonb and text[]; exact check below
+          AND ta.notification_channels::text LIKE '%email%'
+          AND COALESCE(t.tender_id, e.tender_id) IS NOT NULL
+        ORDER BY am.created_at
+        LIMIT :limit
+    """), {'hours': lookback_hours, 'limit': limit})
+
+    matches = []
+    for (match_id, alert_id, tender_id, source, score, reasons, user_id, alert_name, channels,
+         user_email, user_name, title, description, entity, value, cpv_code, closing_date,
+         winner) in result.fetchall():
+        channels = _json_list(channels)
+        if 'email' not in channels:
+            continue
+        source = source or 'e-nabavki'
+        matches.append({
+            'match_id': str(match_id),
+            'alert': {
+                'alert_id': alert_id, 'user_id': user_id, 'name': alert_name,
+                'channels': channels, 'email': user_email, 'full_name': user_name
+            },
+            'tender': {
+                'tender_id': tender_id, 'title': title, 'description': description,
+                'procuring_entity': entity, 'estimated_value_mkd': float(value) if value else 0,
+                'cpv_code': cpv_code, 'closing_date': closing_date,
+                'winner': winner, 'source': source
+            },
+            'source': source,
+            'score': float(score) if score is not None else 0,
+            'reasons': _json_list(reasons)
+        })
+    return matches
+
+
+async def retry_unnotified_matches(db: AsyncSession, already_emailed: set = None) -> tuple:
+    """
+    Re-send emails for matches a previous run failed to deliver.
 
-    if not alerts_with_users:
+    Without this pass a match whose send failed keeps notified_at NULL and is
+    never emailed, because later runs only look at newly created tenders.
+    Returns (matches_retried, emails_sent).
+    """
+    matches = await load_unnotified_matches(db)
+    if not matches:
         return 0, 0
 
-    matches_count = 0
-    emails_sent = 0
-    MAX_EMAILS_PER_RUN = 20  # Cap to protect rate limits
+    notified_pairs, emails_sent, emails_failed = await send_match_emails(matches, already_emailed)
+    await mark_matches_notified(db, notified_pairs)
+    await db.commit()
 
-    for tender in tenders:
-        for row in alerts_with_users:
-            alert_id, user_id, alert_name, criteria_raw, channels_raw, \
-                user_email, user_name, _ = row
+    if emails_failed:
+        logger.warning(f"{emails_failed} retried alert emails failed again; will retry next run")
+    return len(matches), emails_sent
 
-            # Parse JSONB criteria
-            criteria = criteria_raw if isinstance(criteria_raw, dict) else json.loads(criteria_raw) if criteria_raw else {}
-            channels = channels_raw if isinstance(channels_raw, list) else json.loads(channels_raw) if channels_raw else []
 
-            alert_dict = {'criteria': criteria}
-            matches, score, reasons = await check_alert_against_tender(alert_dict, tender)
+async def send_match_emails(matches: List[dict], already_emailed: set = None,
+                            max_per_user: int = MAX_ALERT_EMAILS_PER_USER) -> tuple:
+    """
+    Queue one email per (user, tender) for matches with the email channel.
 
-            if not matches:
-                continue
+    Pairs already emailed (e.g. via preference alerts) are not re-sent, and
+    every alert match covered by an email is reported as notified. A user
+    with more than max_per_user tenders gets one digest email instead.
+    Returns (notified_pairs, emails_sent, emails_failed).
+    """
+    if already_emailed is None:
+        already_emailed = set()
+
+    notified_pairs = []
+    jobs: Dict[tuple, EmailJob] = {}
+    for m in matches:
+        alert, tender = m['alert'], m['tender']
+        if 'email' not in alert['channels']:
+            continue
+        pair_key = (alert['email'], tender['tender_id'])
+        match_pair = (alert['alert_id'], tender['tender_id'])
+        if pair_key in already_emailed:
+            notified_pairs.append(match_pair)
+        elif pair_key in jobs:
+            # Same user matched the tender through several alerts: one email covers all
+            jobs[pair_key].context['pairs'].append(match_pair)
+        else:
+            jobs[pair_key] = EmailJob(
+                provider='postmark',
+                kwargs={
+                    'user_email': alert['email'],
+                    'user_name': alert['full_name'] or "User",
+                    'tender': tender,
+                    'reasons': m['reasons']
+                },
+                context={'pair_key': pair_key, 'pairs': [match_pair], 'alert_name': alert['name'],
+                         'score': m['score']}
+            )
 
-            # Insert match (ON CONFLICT skip if already exists)
-            match_id = str(uuid.uuid4())
-            try:
-                await db.execute(text("""
-                    INSERT INTO alert_matches
-                        (match_id, alert_id, tender_id, tender_source, match_score, match_reasons, is_read, created_at)
-                    VALUES (:match_id, :alert_id, :tender_id, :source, :score, CAST(:reasons AS jsonb), false, NOW())
-                    ON CONFLICT (alert_id, tender_id) DO NOTHING
-                """), {
-                    'match_id': match_id,
-                    'alert_id': str(alert_id),
-                    'tender_id': tender['tender_id'],
-                    'source': source,
-                    'score': score,
-                    'reasons': json.dumps(reasons)
-                })
-                matches_count += 1
-            except Exception as e:
-                logger.warning(f"Match insert failed: {e}")
+    if not jobs:
+        return notified_pairs, 0, 0
+
+    jobs_by_user: Dict[str, List[EmailJob]] = {}
+    for job in jobs.values():
+        jobs_by_user.setdefault(job.context['pair_key'][0], []).append(job)
+
+    async with EmailSendQueue() as queue:
+        queue.register('postmark', send_alert_email, concurrency=EMAIL_CONCURRENCY)
+        queue.register('postmark-digest', send_alert_digest_email, concurrency=EMAIL_CONCURRENCY)
+        for user_email, user_jobs in jobs_by_user.items():
+            if len(user_jobs) <= max_per_user:
+                for job in user_jobs:
+                    await queue.submit(job)
                 continue
+            # Over the cap: fold every tender for this user into one digest
+            user_jobs.sort(key=lambda j: -j.context['score'])
+            await queue.submit(EmailJob(
+                provider='postmark-digest',
+                kwargs={
+                    'user_email': user_email,
+                    'user_name': user_jobs[0].kwargs['user_name'],
+                    'items': [{'tender': j.kwargs['tender'], 'reasons': j.kwargs['reasons']} for j in user_jobs]
+                },
+                context={
+                    'pair_keys': [j.context['pair_key'] for j in user_jobs],
+                    'pairs': [p for j in user_jobs for p in j.context['pairs']]
+                }
+            ))
+
+    for job in queue.sent:
+        notified_pairs.extend(job.context['pairs'])
+        if job.provider == 'postmark-digest':
+            already_emailed.update(job.context['pair_keys'])
+            print(f"  ✓ Alert digest to {job.kwargs['user_email']} ({len(job.context['pair_keys'])} tenders)")
+            continue
+        already_emailed.add(job.context['pair_key'])
+        user_email, tender_id = job.context['pair_key']
+        print(f"  ✓ Alert email to {user_email} for {tender_id[:20]}... ({job.context['alert_name']})")
+    for job in queue.failed:
+        if job.provider == 'postmark-digest':
+            print(f"  ✗ Alert digest to {job.kwargs['user_email']} failed after {job.attempts} attempts")
+            continue
+        user_email, tender_id = job.context['pair_key']
+        print(f"  ✗ Alert email to {user_email} for {tender_id[:20]}... failed after {job.attempts} attempts")
+
+    return notified_pairs, len(queue.sent), len(queue.failed)
+
+
+async def process_tender_alert_matches(db: AsyncSession, tenders_by_source: Dict[str, List[dict]],
+                                       already_emailed: set = None,
+                                       matcher: Optional[CompiledAlertMatcher] = None) -> tuple:
+    """
+    Match new tenders from every source against all active tender_alerts.
+
+    Matches for the whole run are inserted with one statement, in-app
+    notifications with another, then emails are fanned out through a bounded
+    send queue. Unsent matches keep notified_at NULL and are re-sent by
+    retry_unnotified_matches() on later runs.
+    Returns (matches_count, emails_sent).
+    """
+    if not any(tenders_by_source.values()):
+        return 0, 0
+
+    if matcher is None:
+        matcher = await load_alert_matcher(db)
+
+    if not len(matcher):
+        return 0, 0
+
+    matches = []
+    for source, tenders in tenders_by_source.items():
+        matches.extend(collect_alert_matches(matcher, tenders, source))
 
-            # In-app notification (use savepoint to avoid corrupting main transaction on FK errors)
-            if 'in_app' in channels:
-                try:
-                    async with db.begin_nested():
-                        await create_notification(
-                            db, str(user_id), 'alert_match',
-                            title=f"🔔 {alert_name}: {tender.get('title', '')[:60]}",
-                            message=', '.join(reasons[:3]),
-                            data={'tender_id': tender['tender_id'], 'source': source, 'score': score},
-                            tender_id=tender['tender_id'],
-                            alert_id=str(alert_id)
-                        )
-                except Exception as e:
-                    logger.warning(f"Notification create failed (rolled back): {e}")
-
-            # Email notification (capped, dedup per user+tender across all alerts/sources)
-            if 'email' in channels and emails_sent < MAX_EMAILS_PER_RUN:
-                if already_emailed and (user_email, tender['tender_id']) in already_emailed:
-                    print(f"  ~ Skipped email to {user_email} for {tender['tender_id'][:20]}... (already emailed via prefs)")
-                    # Mark as notified since user got the email via preference system
-                    try:
-                        await db.execute(text("""
-                            UPDATE alert_matches SET notified_at = NOW()
-                            WHERE alert_id = :alert_id AND tender_id = :tender_id
-                        """), {'alert_id': str(alert_id), 'tender_id': tender['tender_id']})
-                    except Exception:
-                        pass
-                else:
-                    success = await send_alert_email(user_email, user_name or "User", tender, reasons)
-                    if success:
-                        emails_sent += 1
-                        # Track this pair so subsequent alerts/sources don't re-send
-                        if already_emailed is not None:
-                            already_emailed.add((user_email, tender['tender_id']))
-                        # Set notified_at on the match
-                        try:
-                            await db.execute(text("""
-                                UPDATE alert_matches SET notified_at = NOW()
-                                WHERE alert_id = :alert_id AND tender_id = :tender_id
-                            """), {'alert_id': str(alert_id), 'tender_id': tender['tender_id']})
-                        except Exception:
-                            pass
-                        print(f"  ✓ Alert email to {user_email} for {tender['tender_id'][:20]}... ({alert_name})")
+    new_matches = await persist_alert_matches(db, matches)
+    await create_match_notifications(db, new_matches)
+    # Commit before emailing so matches are durable even if sending is interrupted
+    await db.commit()
 
+    notified_pairs, emails_sent, emails_failed = await send_match_emails(new_matches, already_emailed)
+    await mark_matches_notified(db, notified_pairs)
     await db.commit()
-    return matches_count, emails_sent
+
+    if emails_failed:
+        logger.warning(f"{emails_failed} alert emails failed; their matches will be retried next run")
+    return len(new_matches), emails_sent
 
 
 async def check_tender_changes(db: AsyncSession, last_check: datetime) -> int:
@@ -481,6 +790,18 @@ async def process_instant_alerts():
         execution_id = await log_cron_start(db, job_name, {"last_check": last_check.isoformat()})
 
         try:
+            # Re-send alert emails that earlier runs failed to deliver
+            emailed_pairs: set = set()  # (email, tender_id) pairs already emailed
+            try:
+                retried, retry_emails = await retry_unnotified_matches(db, emailed_pairs)
+            except Exception as e:
+                # A failed retry pass must not stop new tenders from being matched
+                logger.error(f"Retry of un-notified alert matches failed: {e}")
+                await db.rollback()
+                retried, retry_emails = 0, 0
+            if retried:
+                print(f"Retried {retried} un-notified alert matches: {retry_emails} emails sent")
+
             # Get new tenders since last check
             query = select(Tender).where(
                 and_(
@@ -533,7 +854,10 @@ async def process_instant_alerts():
                 changes = await check_tender_changes(db, last_check)
                 save_last_check_time()
                 print(f"No new tenders. Change notifications: {changes}. Exiting.")
-                await log_cron_complete(db, execution_id, 0, {"message": "No new tenders", "changes": changes})
+                await log_cron_complete(db, execution_id, retry_emails, {
+                    "message": "No new tenders", "changes": changes,
+                    "retried_matches": retried, "retry_emails": retry_emails
+                })
                 return
 
             # Get users with instant notifications enabled
@@ -557,9 +881,8 @@ async def process_instant_alerts():
             alerts_failed = 0
             MAX_PREF_EMAILS_PER_USER = 5  # Cap emails per user per run
 
-            # Track emails per user and (email, tender_id) pairs for dedup
+            # Track emails per user for the cap; emailed_pairs dedups tender_alert emails
             user_email_counts: Dict[str, int] = {}
-            emailed_pairs: set = set()  # (email, tender_id) pairs already emailed
 
             if users_with_prefs:
                 for tender in new_tenders:
@@ -589,15 +912,13 @@ async def process_instant_alerts():
             # Pass emailed_pairs to avoid sending duplicate emails
             print(f"\n--- Processing tender_alerts (e-nabavki: {len(nabavki_dicts)}, e-pazar: {len(new_epazar)}) ---")
 
-            ta_matches_nabavki, ta_emails_nabavki = await process_tender_alert_matches(
-                db, nabavki_dicts, 'e-nabavki', already_emailed=emailed_pairs
-            )
-            ta_matches_epazar, ta_emails_epazar = await process_tender_alert_matches(
-                db, new_epazar, 'e-pazar', already_emailed=emailed_pairs
+            # Compile alert criteria once and match both sources in one fan-out
+            alert_matcher = await load_alert_matcher(db)
+            ta_total_matches, ta_total_emails = await process_tender_alert_matches(
+                db, {'e-nabavki': nabavki_dicts, 'e-pazar': new_epazar},
+                already_emailed=emailed_pairs, matcher=alert_matcher
             )
 
-            ta_total_matches = ta_matches_nabavki + ta_matches_epazar
-            ta_total_emails = ta_emails_nabavki + ta_emails_epazar
             print(f"  tender_alerts: {ta_total_matches} matches, {ta_total_emails} emails")
 
             # ===== Check for tender status changes =====
@@ -617,11 +938,12 @@ async def process_instant_alerts():
             print(f"  Preference alerts failed: {alerts_failed}")
             print(f"  Tender alert matches: {ta_total_matches}")
             print(f"  Tender alert emails: {ta_total_emails}")
+            print(f"  Retried alert emails: {retry_emails}/{retried}")
             print(f"  Change notifications: {changes}")
             print(f"Completed: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
 
             # Log cron completion
-            await log_cron_complete(db, execution_id, alerts_sent + ta_total_emails, {
+            await log_cron_complete(db, execution_id, alerts_sent + ta_total_emails + retry_emails, {
                 "nabavki_tenders": len(new_tenders),
                 "epazar_tenders": len(new_epazar),
                 "users_checked": len(users_with_prefs),
@@ -629,6 +951,8 @@ async def process_instant_alerts():
                 "pref_alerts_failed": alerts_failed,
                 "tender_alert_matches": ta_total_matches,
                 "tender_alert_emails": ta_total_emails,
+                "retried_matches": retried,
+                "retry_emails": retry_emails,
                 "change_notifications": changes
             })
 
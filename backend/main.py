@@ -97,6 +97,15 @@ async def startup():
     except Exception as e:
         print(f"⚠ GNN Inference Service not available: {e}")
 
+    # Keep the corruption prediction models warm (shares the asyncpg pool)
+    try:
+        from ai.corruption.ml_models.prediction_service import PredictionService
+        prediction_service = PredictionService.get_instance()
+        await prediction_service.initialize(pool=pool)
+        print(f"✓ ML Prediction Service initialized ({len(prediction_service.get_status()['models'])} models)")
+    except Exception as e:
+        print(f"⚠ ML Prediction Service not available: {e}")
+
 
 @app.on_event("shutdown")
 async def shutdown():
@@ -110,6 +119,13 @@ async def shutdown():
     except Exception:
         pass
 
+    try:
+        from ai.corruption.ml_models.prediction_service import PredictionService
+        await PredictionService.get_instance().cleanup()
+        print("✓ ML Prediction Service cleaned up")
+    except Exception:
+        pass
+
     await close_db()
     await close_asyncpg_pool()
     print("✓ Database connections closed")
@@ -135,6 +135,8 @@ class TenderListResponse(BaseModel):
     page: int
     page_size: int
     items: List[TenderResponse]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page by keyset
+    total_is_estimate: bool = False
 
 
 # ============================================================================
@@ -406,7 +408,7 @@ class TenderSearchRequest(BaseModel):
 
     page: int = Field(1, ge=1)
     page_size: int = Field(20, ge=1, le=100)
-    sort_by: Optional[str] = Field("created_at", description="Field to sort by")
+    sort_by: Optional[str] = Field("created_at", description="Field to sort by, or \"relevance\" to rank search matches")
     sort_order: Optional[str] = Field("desc", description="asc or desc")
 
 
@@ -678,6 +680,8 @@ class EPazarTenderListResponse(BaseModel):
     page: int
     page_size: int
     items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page by keyset
+    total_is_estimate: bool = False
 
 
 class EPazarItemResponse(BaseModel):
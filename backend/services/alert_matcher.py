@@ -0,0 +1,329 @@
+"""
+Compiled Alert Matcher
+Matches a tender against every active tender_alert in a single pass
+
+check_alert_against_tender() evaluates one (alert, tender) pair at a time and
+re-parses criteria, re-transliterates keywords and compiles regexes on every
+call. For the instant alert cron that is tenders x alerts work. This module
+compiles all alert criteria once per run into:
+
+- an Aho-Corasick automaton over every keyword (lowercased Latin and Cyrillic
+  forms), scanned once over the tender title + description
+- a CPV prefix trie keyed by the first 4 characters of each alert CPV code
+- Aho-Corasick automata over entity and competitor names, scanned once over
+  the procuring entity and winner
+- a budget interval index (alerts sorted by lower bound)
+
+match() returns the same (score, reasons) as check_alert_against_tender for
+every matching alert, in alert order.
+"""
+import json
+from bisect import bisect_right
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from api.corruption import latin_to_cyrillic
+
+# Same weights as check_alert_against_tender
+KEYWORD_SCORE = 25
+CPV_SCORE = 30
+ENTITY_SCORE = 25
+BUDGET_SCORE = 20
+COMPETITOR_SCORE = 25
+MIN_MATCH_SCORE = 25  # Budget-only matches are not enough
+SHORT_KEYWORD_LEN = 3  # Keywords this short must match on word boundaries
+
+
+def parse_criteria(raw: Any) -> dict:
+    """Decode a JSONB criteria value that may arrive as a dict or a JSON string"""
+    if isinstance(raw, dict):
+        return raw
+    return json.loads(raw) if raw else {}
+
+
+def _is_word_char(c: str) -> bool:
+    # Equivalent of the regex \w class for str patterns
+    return c.isalnum() or c == '_'
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring automaton
+
+    Patterns are added with add() and get an integer id; after build(),
+    find_all() reports which pattern ids occur in a text, and (for patterns
+    registered as bounded) which occur with non-word characters on both sides.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._ids: Dict[str, int] = {}
+        self._lengths: List[int] = []
+        self._bounded: List[bool] = []
+        self._empty: List[int] = []  # '' occurs in every text
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, pattern: str, bounded: bool = False) -> int:
+        """Register a pattern (idempotent) and return its id"""
+        pid = self._ids.get(pattern)
+        if pid is None:
+            pid = len(self._lengths)
+            self._ids[pattern] = pid
+            self._lengths.append(len(pattern))
+            self._bounded.append(bounded)
+            if not pattern:
+                self._empty.append(pid)
+                return pid
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pid)
+        elif bounded:
+            self._bounded[pid] = True
+        return pid
+
+    def build(self):
+        """Compute failure links (BFS) and merge outputs along them"""
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text: str) -> Tuple[Set[int], Set[int]]:
+        """
+        Scan text once
+
+        Returns:
+            (ids found anywhere, ids found on word boundaries); the second set
+            only covers patterns registered as bounded
+        """
+        found: Set[int] = set(self._empty)
+        bounded_found: Set[int] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        lengths, bounded = self._lengths, self._bounded
+        text_len = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pid in out[node]:
+                found.add(pid)
+                if bounded[pid] and pid not in bounded_found:
+                    start = i - lengths[pid] + 1
+                    if (start == 0 or not _is_word_char(text[start - 1])) and \
+                            (i + 1 == text_len or not _is_word_char(text[i + 1])):
+                        bounded_found.add(pid)
+        return found, bounded_found
+
+
+class _CompiledAlert:
+    __slots__ = ('alert', 'keywords', 'cpvs', 'entities', 'competitors', 'budget')
+
+    def __init__(self, alert: dict):
+        self.alert = alert
+        # (original keyword, [(pattern id, bounded)]) in criteria order
+        self.keywords: List[Tuple[str, List[Tuple[int, bool]]]] = []
+        self.cpvs: List[str] = []
+        self.entities: List[Tuple[str, int]] = []
+        self.competitors: List[Tuple[str, int]] = []
+        self.budget: Optional[Tuple[float, float]] = None
+
+
+class CompiledAlertMatcher:
+    """
+    All active alerts compiled for repeated matching
+
+    Args:
+        alerts: Alert dicts with a 'criteria' key (dict or JSON string); any
+            other keys are passed through untouched in match() results
+
+    Usage:
+        matcher = CompiledAlertMatcher(alerts)
+        for tender in tenders:
+            for alert, score, reasons in matcher.match(tender):
+                ...
+    """
+
+    def __init__(self, alerts: Iterable[dict]):
+        self._alerts: List[_CompiledAlert] = []
+        self._keywords = AhoCorasick()
+        self._entities = AhoCorasick()
+        self._competitors = AhoCorasick()
+        # pattern id -> alert indexes that use it
+        self._keyword_alerts: Dict[int, Set[int]] = {}
+        self._entity_alerts: Dict[int, Set[int]] = {}
+        self._competitor_alerts: Dict[int, Set[int]] = {}
+        # CPV prefix trie: nested dicts, '$' holds alert indexes ending here
+        self._cpv_trie: Dict[str, Any] = {}
+        # Budget intervals sorted by lower bound
+        self._budget_mins: List[float] = []
+        self._budget_index: List[Tuple[float, int]] = []
+
+        for alert in alerts:
+            self._compile(alert)
+
+        self._keywords.build()
+        self._entities.build()
+        self._competitors.build()
+        budgets = sorted(
+            (compiled.budget[0], idx) for idx, compiled in enumerate(self._alerts)
+            if compiled.budget is not None
+        )
+        self._budget_mins = [low for low, _ in budgets]
+        self._budget_index = [(self._alerts[idx].budget[1], idx) for _, idx in budgets]
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def _compile(self, alert: dict):
+        idx = len(self._alerts)
+        compiled = _CompiledAlert(alert)
+        criteria = parse_criteria(alert.get('criteria'))
+
+        for kw in criteria.get('keywords') or []:
+            if not kw:
+                continue
+            kw_lower = kw.lower()
+            kw_cyrillic = latin_to_cyrillic(kw).lower()
+            bounded = len(kw_lower) <= SHORT_KEYWORD_LEN
+            forms = [kw_lower] if kw_cyrillic == kw_lower else [kw_lower, kw_cyrillic]
+            patterns = []
+            for form in forms:
+                pid = self._keywords.add(form, bounded=bounded)
+                self._keyword_alerts.setdefault(pid, set()).add(idx)
+                patterns.append((pid, bounded))
+            compiled.keywords.append((kw, patterns))
+
+        for cpv in criteria.get('cpv_codes') or []:
+            node = self._cpv_trie
+            for ch in cpv[:4]:
+                node = node.setdefault(ch, {})
+            node.setdefault('$', set()).add(idx)
+            compiled.cpvs.append(cpv)
+
+        for name in criteria.get('entities') or []:
+            pid = self._entities.add(name.lower())
+            self._entity_alerts.setdefault(pid, set()).add(idx)
+            compiled.entities.append((name, pid))
+
+        for name in criteria.get('competitors') or []:
+            pid = self._competitors.add(name.lower())
+            self._competitor_alerts.setdefault(pid, set()).add(idx)
+            compiled.competitors.append((name, pid))
+
+        if criteria.get('budget_min') is not None or criteria.get('budget_max') is not None:
+            low = criteria.get('budget_min')
+            high = criteria.get('budget_max')
+            compiled.budget = (
+                float(low) if low is not None else 0.0,
+                float(high) if high is not None else float('inf'),
+            )
+
+        self._alerts.append(compiled)
+
+    def _cpv_candidates(self, tender_cpv: str) -> Set[int]:
+        candidates: Set[int] = set()
+        node = self._cpv_trie
+        candidates |= node.get('$', set())
+        for ch in tender_cpv[:4]:
+            node = node.get(ch)
+            if node is None:
+                break
+            candidates |= node.get('$', set())
+        return candidates
+
+    def _budget_candidates(self, value: float) -> Set[int]:
+        upto = bisect_right(self._budget_mins, value)
+        return {idx for high, idx in self._budget_index[:upto] if value <= high}
+
+    def match(self, tender: dict) -> List[Tuple[dict, float, List[str]]]:
+        """
+        Evaluate every compiled alert against a tender
+
+        Returns:
+            [(alert, score, reasons)] for matching alerts, in the order the
+            alerts were given
+        """
+        tender_text = f"{tender.get('title', '')} {tender.get('description', '')}".lower()
+        kw_any, kw_bounded = self._keywords.find_all(tender_text) if len(self._keywords) else (set(), set())
+
+        entity_text = (tender.get('procuring_entity') or '').lower()
+        ent_found = self._entities.find_all(entity_text)[0] if len(self._entities) else set()
+
+        winner_text = (tender.get('winner') or '').lower()
+        comp_found = self._competitors.find_all(winner_text)[0] if len(self._competitors) else set()
+
+        tender_cpv = tender.get('cpv_code') or ''
+        cpv_hits = self._cpv_candidates(tender_cpv) if tender_cpv else set()
+
+        candidates: Set[int] = set(cpv_hits)
+        for pid in kw_any:
+            candidates |= self._keyword_alerts[pid]
+        for pid in ent_found:
+            candidates |= self._entity_alerts[pid]
+        for pid in comp_found:
+            candidates |= self._competitor_alerts[pid]
+        if not candidates:
+            return []
+
+        value = tender.get('estimated_value_mkd') or 0
+        budget_hits = self._budget_candidates(value) if self._budget_mins else set()
+
+        results = []
+        for idx in sorted(candidates):
+            compiled = self._alerts[idx]
+            score = 0.0
+            reasons = []
+
+            matched_keywords = [
+                kw for kw, patterns in compiled.keywords
+                if any(pid in (kw_bounded if bounded else kw_any) for pid, bounded in patterns)
+            ]
+            if matched_keywords:
+                score += KEYWORD_SCORE
+                reasons.append(f"Keywords matched: {', '.join(matched_keywords)}")
+
+            if idx in cpv_hits:
+                matched_cpvs = [cpv for cpv in compiled.cpvs if tender_cpv.startswith(cpv[:4])]
+                score += CPV_SCORE
+                reasons.append(f"CPV codes matched: {', '.join(matched_cpvs)}")
+
+            matched_entities = [name for name, pid in compiled.entities if pid in ent_found]
+            if matched_entities:
+                score += ENTITY_SCORE
+                reasons.append(f"Entities matched: {', '.join(matched_entities)}")
+
+            if idx in budget_hits:
+                score += BUDGET_SCORE
+                reasons.append(f"Budget in range: {value:,.0f} MKD")
+
+            matched_competitors = [name for name, pid in compiled.competitors if pid in comp_found]
+            if matched_competitors:
+                score += COMPETITOR_SCORE
+                reasons.append(f"Competitors matched: {', '.join(matched_competitors)}")
+
+            if score >= MIN_MATCH_SCORE:
+                results.append((compiled.alert, min(score, 100.0), reasons))
+
+        return results
@@ -0,0 +1,134 @@
+"""
+Bounded Async Email Send Queue
+Fans emails out to providers with per-provider concurrency and retry
+
+Crons that notify many users at once submit EmailJobs instead of awaiting
+each send inline. Every provider (postmark, mailersend, ...) gets its own
+bounded queue and worker pool, so a burst of alerts is sent in parallel up
+to the provider's concurrency limit, and submit() applies backpressure once
+the queue is full. Failed sends (False or an exception) are retried with
+exponential backoff; jobs that still fail are reported, not dropped.
+
+Usage:
+    async with EmailSendQueue() as queue:
+        queue.register('postmark', send_alert_email, concurrency=4)
+        await queue.submit(EmailJob('postmark', {'user_email': ...}, context=match))
+    for job in queue.sent:
+        ...
+"""
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = int(os.getenv("EMAIL_QUEUE_CONCURRENCY", "4"))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("EMAIL_QUEUE_MAX_ATTEMPTS", "3"))
+DEFAULT_RETRY_DELAY = float(os.getenv("EMAIL_QUEUE_RETRY_DELAY", "2.0"))
+DEFAULT_QUEUE_SIZE = 500
+
+
+@dataclass
+class EmailJob:
+    """One email to send: provider name, send() kwargs and caller context"""
+    provider: str
+    kwargs: Dict[str, Any]
+    context: Any = None
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class _Provider:
+    send: Callable[..., Awaitable[bool]]
+    queue: asyncio.Queue
+    workers: List[asyncio.Task] = field(default_factory=list)
+
+
+class EmailSendQueue:
+    """
+    Per-provider bounded queues drained by concurrent workers
+
+    Args:
+        max_attempts: Send attempts per job before it is marked failed
+        retry_delay: Base backoff in seconds (doubled after each failure)
+        queue_size: Max pending jobs per provider before submit() waits
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        queue_size: int = DEFAULT_QUEUE_SIZE
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.queue_size = queue_size
+        self._providers: Dict[str, _Provider] = {}
+        self.sent: List[EmailJob] = []
+        self.failed: List[EmailJob] = []
+
+    def register(self, name: str, send: Callable[..., Awaitable[bool]], concurrency: int = DEFAULT_CONCURRENCY):
+        """Add a provider; send(**job.kwargs) must return True on success"""
+        if name in self._providers:
+            raise ValueError(f"Email provider already registered: {name}")
+        provider = _Provider(send=send, queue=asyncio.Queue(maxsize=self.queue_size))
+        provider.workers = [
+            asyncio.create_task(self._worker(provider)) for _ in range(max(1, concurrency))
+        ]
+        self._providers[name] = provider
+
+    async def submit(self, job: EmailJob):
+        """Enqueue a job, waiting if its provider's queue is full"""
+        provider = self._providers.get(job.provider)
+        if provider is None:
+            raise ValueError(f"Unknown email provider: {job.provider}")
+        await provider.queue.put(job)
+
+    async def drain(self):
+        """Wait for every submitted job to be sent or to exhaust its retries"""
+        for provider in self._providers.values():
+            await provider.queue.join()
+
+    async def close(self):
+        """Drain, then stop all workers"""
+        try:
+            await self.drain()
+        finally:
+            for provider in self._providers.values():
+                for worker in provider.workers:
+                    worker.cancel()
+                await asyncio.gather(*provider.workers, return_exceptions=True)
+
+    async def __aenter__(self) -> "EmailSendQueue":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _worker(self, provider: _Provider):
+        while True:
+            job = await provider.queue.get()
+            try:
+                await self._send_with_retry(provider, job)
+            finally:
+                provider.queue.task_done()
+
+    async def _send_with_retry(self, provider: _Provider, job: EmailJob):
+        while job.attempts < self.max_attempts:
+            job.attempts += 1
+            try:
+                if await provider.send(**job.kwargs):
+                    job.error = None
+                    self.sent.append(job)
+                    return
+                job.error = "provider returned failure"
+            except Exception as e:
+                job.error = str(e)
+            if job.attempts < self.max_attempts:
+                await asyncio.sleep(self.retry_delay * 2 ** (job.attempts - 1))
+
+        logger.warning(f"Email via {job.provider} failed after {job.attempts} attempts: {job.error}")
+        self.failed.append(job)
@@ -17,6 +17,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../ai'))
 from models import Tender, User
 from models_user_personalization import UserPreferences, UserBehavior, UserInterestVector
 from schemas_user_personalization import RecommendedTender, CompetitorActivity, PersonalizedInsight
+from services.tender_vectors import get_open_tender_vectors, parse_vector
 
 try:
     from embeddings import EmbeddingGenerator
@@ -25,6 +26,13 @@ try:
 except ImportError:
     AI_AVAILABLE = False
 
+# Open tenders scored per personalized feed (most recent first)
+PERSONALIZATION_CANDIDATES = int(os.getenv("PERSONALIZATION_CANDIDATES", "2000"))
+# Description prefix used for sector keyword matching
+DESCRIPTION_SCORING_CHARS = 2000
+# Score added at cosine similarity 1.0 to the user's interest vector
+INTEREST_MATCH_BOOST = 0.3
+
 
 class HybridSearchEngine:
     """Combines preference-based and vector-based search with AI-powered CPV matching"""
@@ -74,74 +82,105 @@ class HybridSearchEngine:
         if not has_preferences:
             return await self._fallback_search(limit)
 
-        # Get all open tenders - preferences are for scoring, not filtering
-        query = select(Tender).where(Tender.status == 'open')
+        # Get open tenders - preferences are for scoring, not filtering.
+        # Only the columns used for scoring are loaded; full rows are fetched
+        # for the final results.
+        query = select(
+            Tender.tender_id,
+            Tender.title,
+            func.left(Tender.description, DESCRIPTION_SCORING_CHARS).label('description'),
+            Tender.cpv_code,
+            Tender.procuring_entity,
+            Tender.estimated_value_mkd,
+        ).where(Tender.status == 'open')
 
         # Only apply hard filters for exclude_keywords (things user explicitly doesn't want)
         if prefs.exclude_keywords:
             for kw in prefs.exclude_keywords:
                 query = query.where(~Tender.title.ilike(f"%{kw}%"))
 
-        # Get recent open tenders - reduced from 200 to 50 for performance
-        result = await self.db.execute(query.order_by(desc(Tender.created_at)).limit(50))
-        all_candidates = result.scalars().all()
+        result = await self.db.execute(
+            query.order_by(desc(Tender.created_at)).limit(PERSONALIZATION_CANDIDATES)
+        )
+        all_candidates = result.all()
+
+        # Similarity to the user's interest vector (stored tender vectors)
+        similarity = {t.tender_id: s for t, s in await self._vector_rank(user_id, all_candidates)}
 
         # Score each tender based on preferences (not filter!)
         scored_candidates = []
         for tender in all_candidates:
-            score = 0.3  # Base score for being an open tender
-            tender_text = f"{tender.title or ''} {tender.description or ''}".lower()
-
-            # Boost score for sector match (keyword matching)
-            if prefs.sectors:
-                for sector in prefs.sectors:
-                    keywords = self.SECTOR_KEYWORDS.get(sector, [])
-                    for keyword in keywords:
-                        if keyword.lower() in tender_text:
-                            score += 0.25  # Sector match boost
-                            break
+            score = self._preference_score(prefs, tender)
+            score += INTEREST_MATCH_BOOST * max(similarity.get(tender.tender_id, 0.0), 0.0)
+            scored_candidates.append((tender.tender_id, score))
 
-            # Boost score for CPV match (optimized - skip AI inference for speed)
-            if prefs.cpv_codes:
-                if tender.cpv_code and tender.cpv_code not in ["Услуги", "Стоки", "Работи"]:
-                    for cpv in prefs.cpv_codes:
-                        if tender.cpv_code.startswith(cpv[:2]):
-                            score += 0.2  # CPV code match boost
-                            break
-                # Skip slow AI inference - use keyword matching instead
-                elif tender.title:
-                    title_lower = tender.title.lower()
-                    for cpv in prefs.cpv_codes:
-                        cpv_div = cpv[:2]
-                        if cpv_div in self.SECTOR_KEYWORDS:
-                            keywords = self.SECTOR_KEYWORDS.get(cpv_div, [])
-                            if any(kw.lower() in title_lower for kw in keywords[:5]):
-                                score += 0.15
-                                break
-
-            # Boost score for entity match
-            if prefs.entities and tender.procuring_entity:
-                for entity in prefs.entities:
-                    if entity.lower() in tender.procuring_entity.lower():
-                        score += 0.2  # Entity match boost
+        # Sort by score (highest first) and load the top results
+        scored_candidates.sort(key=lambda x: x[1], reverse=True)
+        top = scored_candidates[:limit]
+        if not top:
+            return []
+
+        result = await self.db.execute(
+            select(Tender).where(Tender.tender_id.in_([tender_id for tender_id, _ in top]))
+        )
+        tenders_by_id = {t.tender_id: t for t in result.scalars().all()}
+
+        return [
+            (tenders_by_id[tender_id], min(score, 1.0))
+            for tender_id, score in top
+            if tender_id in tenders_by_id
+        ]
+
+    def _preference_score(self, prefs: UserPreferences, tender) -> float:
+        """Preference match score of one candidate (base 0.3 plus boosts)"""
+        score = 0.3  # Base score for being an open tender
+        tender_text = f"{tender.title or ''} {tender.description or ''}".lower()
+
+        # Boost score for sector match (keyword matching)
+        if prefs.sectors:
+            for sector in prefs.sectors:
+                keywords = self.SECTOR_KEYWORDS.get(sector, [])
+                for keyword in keywords:
+                    if keyword.lower() in tender_text:
+                        score += 0.25  # Sector match boost
                         break
 
-            # Boost score for budget match (only if user has budget preferences)
-            if tender.estimated_value_mkd and (prefs.min_budget or prefs.max_budget):
-                in_budget = True
-                if prefs.min_budget and tender.estimated_value_mkd < float(prefs.min_budget):
-                    in_budget = False
-                if prefs.max_budget and tender.estimated_value_mkd > float(prefs.max_budget):
-                    in_budget = False
-                if in_budget:
-                    score += 0.1  # Budget match boost
+        # Boost score for CPV match (optimized - skip AI inference for speed)
+        if prefs.cpv_codes:
+            if tender.cpv_code and tender.cpv_code not in ["Услуги", "Стоки", "Работи"]:
+                for cpv in prefs.cpv_codes:
+                    if tender.cpv_code.startswith(cpv[:2]):
+                        score += 0.2  # CPV code match boost
+                        break
+            # Skip slow AI inference - use keyword matching instead
+            elif tender.title:
+                title_lower = tender.title.lower()
+                for cpv in prefs.cpv_codes:
+                    cpv_div = cpv[:2]
+                    if cpv_div in self.SECTOR_KEYWORDS:
+                        keywords = self.SECTOR_KEYWORDS.get(cpv_div, [])
+                        if any(kw.lower() in title_lower for kw in keywords[:5]):
+                            score += 0.15
+                            break
 
-            scored_candidates.append((tender, min(score, 1.0)))
+        # Boost score for entity match
+        if prefs.entities and tender.procuring_entity:
+            for entity in prefs.entities:
+                if entity.lower() in tender.procuring_entity.lower():
+                    score += 0.2  # Entity match boost
+                    break
 
-        # Sort by score (highest first) and return top results
-        scored_candidates.sort(key=lambda x: x[1], reverse=True)
+        # Boost score for budget match (only if user has budget preferences)
+        if tender.estimated_value_mkd and (prefs.min_budget or prefs.max_budget):
+            in_budget = True
+            if prefs.min_budget and tender.estimated_value_mkd < float(prefs.min_budget):
+                in_budget = False
+            if prefs.max_budget and tender.estimated_value_mkd > float(prefs.max_budget):
+                in_budget = False
+            if in_budget:
+                score += 0.1  # Budget match boost
 
-        return scored_candidates[:limit]
+        return score
 
     async def _get_preferences(self, user_id: str) -> Optional[UserPreferences]:
         query = select(UserPreferences).where(UserPreferences.user_id == user_id)
@@ -153,10 +192,15 @@ class HybridSearchEngine:
         user_id: str,
         tenders: List[Tender]
     ) -> List[Tuple[Tender, float]]:
-        """Rank tenders by interest vector similarity"""
-
-        if not AI_AVAILABLE or not tenders:
-            return [(t, 0.5) for t in tenders]
+        """
+        Rank tenders by interest vector similarity
+
+        Uses the stored open-tender vectors (one matrix-vector product), so no
+        embeddings are generated per request. Tenders without a stored vector
+        are omitted; empty when the user has no interest vector yet.
+        """
+        if not tenders:
+            return []
 
         # Get user interest vector
         query = select(UserInterestVector).where(UserInterestVector.user_id == user_id)
@@ -164,24 +208,21 @@ class HybridSearchEngine:
         user_vector = result.scalar_one_or_none()
 
         if not user_vector:
-            return [(t, 0.5) for t in tenders]
+            return []
 
-        # Compute similarity scores
-        scored = []
-        for tender in tenders:
-            text = f"{tender.title} {tender.description or ''} {tender.category or ''}"
-            tender_emb = await self.embedder.generate_embedding(text)
+        vectors = await get_open_tender_vectors(self.db)
+        if vectors is None:
+            return []
 
-            similarity = self._cosine_similarity(user_vector.embedding, tender_emb)
-            scored.append((tender, float(similarity)))
+        similarities = vectors.similarities(user_vector.embedding)
+        scored = [
+            (tender, float(similarities[vectors.index[tender.tender_id]]))
+            for tender in tenders
+            if tender.tender_id in vectors.index
+        ]
 
         return sorted(scored, key=lambda x: x[1], reverse=True)
 
-    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
-        a_np = np.array(a)
-        b_np = np.array(b)
-        return np.dot(a_np, b_np) / (np.linalg.norm(a_np) * np.linalg.norm(b_np))
-
     async def _fallback_search(self, limit: int) -> List[Tuple[Tender, float]]:
         query = select(Tender).where(Tender.status == 'open').order_by(desc(Tender.created_at)).limit(limit)
         result = await self.db.execute(query)
@@ -198,10 +239,12 @@ class InterestVectorBuilder:
             self.embedder = EmbeddingGenerator()
 
     async def update_user_vector(self, user_id: str):
-        """Update user interest vector from recent behavior"""
+        """
+        Update user interest vector from recent behavior
 
-        if not AI_AVAILABLE:
-            return
+        Uses the tenders' stored vectors (mean of their embedding chunks);
+        only tenders without stored vectors are embedded on the fly.
+        """
 
         # Get recent interactions (last 90 days)
         cutoff = datetime.utcnow() - timedelta(days=90)
@@ -218,36 +261,51 @@ class InterestVectorBuilder:
         if not behaviors:
             return
 
-        # Get tender texts
-        tender_texts = []
-        weights = []
-
+        # Weight by action type (repeat interactions add up)
+        weights_by_tender: Dict[str, float] = {}
         for behavior in behaviors:
-            tender_query = select(Tender).where(Tender.tender_id == behavior.tender_id)
-            tender_result = await self.db.execute(tender_query)
-            tender = tender_result.scalar_one_or_none()
-
-            if tender:
-                text = f"{tender.title} {tender.description or ''} {tender.category or ''}"
-                tender_texts.append(text)
+            weight = {'view': 1.0, 'click': 1.5, 'save': 2.0, 'share': 2.5}.get(behavior.action, 1.0)
+            weights_by_tender[behavior.tender_id] = weights_by_tender.get(behavior.tender_id, 0.0) + weight
 
-                # Weight by action type
-                weight = {'view': 1.0, 'click': 1.5, 'save': 2.0, 'share': 2.5}.get(behavior.action, 1.0)
-                weights.append(weight)
-
-        if not tender_texts:
+        if not weights_by_tender:
             return
 
-        # Generate embeddings
-        embeddings = await self.embedder.generate_embeddings_batch(tender_texts)
+        from sqlalchemy import text as sql_text
+        stored = await self.db.execute(
+            sql_text(
+                "SELECT tender_id, AVG(vector)::text AS embedding FROM embeddings "
+                "WHERE tender_id = ANY(CAST(:tender_ids AS text[])) AND vector IS NOT NULL "
+                "GROUP BY tender_id"
+            ),
+            {"tender_ids": list(weights_by_tender)}
+        )
+        vectors = {row.tender_id: parse_vector(row.embedding) for row in stored.fetchall()}
+
+        # Embed tenders that have no stored vectors yet
+        missing = [tid for tid in weights_by_tender if tid not in vectors]
+        if missing and AI_AVAILABLE:
+            tender_result = await self.db.execute(select(Tender).where(Tender.tender_id.in_(missing)))
+            tenders = tender_result.scalars().all()
+            if tenders:
+                texts = [f"{t.title} {t.description or ''} {t.category or ''}" for t in tenders]
+                generated = await self.embedder.generate_embeddings_batch(texts)
+                for tender, embedding in zip(tenders, generated):
+                    vectors[tender.tender_id] = parse_vector(embedding)
+
+        if not vectors:
+            return
 
         # Weighted average
-        weighted_emb = np.average(embeddings, axis=0, weights=weights)
+        tender_ids = list(vectors)
+        weighted_emb = np.average(
+            np.vstack([vectors[tid] for tid in tender_ids]),
+            axis=0,
+            weights=[weights_by_tender[tid] for tid in tender_ids]
+        )
         # Convert to string format for pgvector via raw SQL
         interest_vector = "[" + ",".join(str(float(x)) for x in weighted_emb) + "]"
 
         # Use raw SQL with CAST() to avoid asyncpg :: parameter conflict
-        from sqlalchemy import text as sql_text
         await self.db.execute(
             sql_text(
                 "INSERT INTO user_interest_vectors (user_id, embedding, interaction_count, last_updated, version) "
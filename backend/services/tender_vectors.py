@@ -0,0 +1,103 @@
+"""
+Open Tender Vector Matrix
+In-memory float32 matrix of stored open-tender embeddings
+
+mv_open_tender_vectors (migration 057) holds the mean of each open tender's
+stored chunk vectors. The matrix is loaded once per process, rows
+L2-normalized, and scoring a user interest vector against every open tender
+is a single matrix-vector product. The view is refreshed after scrapes and
+embedding runs; every OPEN_TENDER_VECTORS_TTL seconds one cheap query checks
+its refreshed_at and the matrix is only reloaded when it changed.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+OPEN_TENDER_VECTORS_TTL = int(os.getenv("OPEN_TENDER_VECTORS_TTL", "300"))  # 5 minutes
+
+
+def parse_vector(value) -> np.ndarray:
+    """pgvector text ('[0.1,0.2,...]') or a sequence -> float32 array"""
+    if isinstance(value, str):
+        return np.array(value.strip("[]").split(","), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+class TenderVectorMatrix:
+    """Row-normalized tender vectors with a tender_id -> row index"""
+
+    def __init__(self, tender_ids: Sequence[str], vectors: np.ndarray, refreshed_at=None):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = vectors / norms
+        self.tender_ids = list(tender_ids)
+        self.index: Dict[str, int] = {tid: i for i, tid in enumerate(self.tender_ids)}
+        self.refreshed_at = refreshed_at
+
+    def __len__(self) -> int:
+        return len(self.tender_ids)
+
+    def similarities(self, vector) -> np.ndarray:
+        """Cosine similarity of every tender to vector (aligned with tender_ids)"""
+        query = parse_vector(vector)
+        norm = np.linalg.norm(query)
+        if not norm or not len(self):
+            return np.zeros(len(self), dtype=np.float32)
+        return self.matrix @ (query / norm)
+
+    def top_k(self, vector, k: int) -> List[Tuple[str, float]]:
+        """k most similar tenders, best first"""
+        scores = self.similarities(vector)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.tender_ids[i], float(scores[i])) for i in top]
+
+
+_matrix: Optional[TenderVectorMatrix] = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+
+
+async def get_open_tender_vectors(db: AsyncSession) -> Optional[TenderVectorMatrix]:
+    """Process-wide open tender matrix (None until the view has rows)"""
+    global _matrix, _checked_at
+
+    if _matrix is not None and time.monotonic() - _checked_at < OPEN_TENDER_VECTORS_TTL:
+        return _matrix
+
+    async with _lock:
+        if _matrix is not None and time.monotonic() - _checked_at < OPEN_TENDER_VECTORS_TTL:
+            return _matrix
+
+        result = await db.execute(text("SELECT refreshed_at FROM mv_open_tender_vectors LIMIT 1"))
+        refreshed_at = result.scalar()
+        _checked_at = time.monotonic()
+        if refreshed_at is None:
+            _matrix = None
+            return None
+        if _matrix is not None and _matrix.refreshed_at == refreshed_at:
+            return _matrix
+
+        started = time.monotonic()
+        result = await db.execute(text(
+            "SELECT tender_id, embedding::text AS embedding FROM mv_open_tender_vectors"
+        ))
+        rows = result.fetchall()
+        vectors = np.vstack([parse_vector(row.embedding) for row in rows])
+        _matrix = TenderVectorMatrix([row.tender_id for row in rows], vectors, refreshed_at)
+        logger.info(
+            f"Loaded {len(_matrix)} open tender vectors in {time.monotonic() - started:.2f}s"
+        )
+        return _matrix
@@ -0,0 +1,59 @@
+"""
+Tests for the compiled tender alert matcher
+"""
+import json
+
+import pytest
+
+from api.alerts import check_alert_against_tender
+from services.alert_matcher import CompiledAlertMatcher
+
+
+ALERTS = [
+    {'alert_id': 1, 'criteria': {'keywords': ['IT', 'softver']}},
+    {'alert_id': 2, 'criteria': {'cpv_codes': ['45000000', '3021'], 'budget_min': 1000}},
+    {'alert_id': 3, 'criteria': {'entities': ['Општина Скопје'], 'budget_max': 10000}},
+    {'alert_id': 4, 'criteria': '{"competitors": ["Makpetrol"], "keywords": ["gorivo"]}'},
+    {'alert_id': 5, 'criteria': {'budget_min': 0, 'budget_max': 1000000}},
+]
+
+TENDERS = [
+    {'title': 'Набавка на софтвер за ИТ сектор', 'description': '', 'procuring_entity': 'Општина Скопје',
+     'cpv_code': '30213000', 'estimated_value_mkd': 5000, 'winner': ''},
+    {'title': 'Digitalni uslugi', 'description': 'Гориво за возила', 'procuring_entity': 'ЈП Пелагонија',
+     'cpv_code': '45000000', 'estimated_value_mkd': 2500000, 'winner': 'Makpetrol AD'},
+    {'title': 'Canteen food', 'description': None, 'procuring_entity': '',
+     'cpv_code': None, 'estimated_value_mkd': 0, 'winner': ''},
+]
+
+
+class TestCompiledAlertMatcher:
+    """CompiledAlertMatcher must agree with check_alert_against_tender"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('tender', TENDERS)
+    async def test_matches_pairwise_engine(self, tender):
+        expected = []
+        for alert in ALERTS:
+            criteria = alert['criteria']
+            if isinstance(criteria, str):
+                criteria = json.loads(criteria)
+            matches, score, reasons = await check_alert_against_tender({'criteria': criteria}, tender)
+            if matches:
+                expected.append((alert['alert_id'], score, reasons))
+
+        matcher = CompiledAlertMatcher(ALERTS)
+        got = [(alert['alert_id'], score, reasons) for alert, score, reasons in matcher.match(tender)]
+
+        assert got == expected
+
+    def test_short_keywords_need_word_boundaries(self):
+        matcher = CompiledAlertMatcher([{'alert_id': 1, 'criteria': {'keywords': ['IT']}}])
+
+        assert matcher.match({'title': 'Набавка на ИТ опрема', 'description': ''})
+        assert not matcher.match({'title': 'Editing services', 'description': ''})
+
+    def test_budget_alone_does_not_match(self):
+        matcher = CompiledAlertMatcher([{'alert_id': 1, 'criteria': {'budget_min': 0}}])
+
+        assert matcher.match({'title': 'x', 'description': '', 'estimated_value_mkd': 100}) == []
@@ -0,0 +1,118 @@
+"""
+Tests for the COPY/staging bulk upserts of the nightly graph build
+"""
+import os
+import sys
+from contextlib import asynccontextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ai.corruption.graph.batch_graph_build import upsert_centrality_bulk, upsert_edges_bulk
+
+
+class FakeConn:
+    """Records statements; COUNT(*) queries answer (existing, stale) in order"""
+
+    def __init__(self, existing=0, stale=0, inserted=0, deleted=0):
+        self.counts = [existing, stale]
+        self.inserted = inserted
+        self.deleted = deleted
+        self.statements = []
+        self.copied = {}
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, query, *args):
+        self.statements.append(" ".join(query.split()))
+        if "INSERT INTO" in query:
+            return f"INSERT 0 {self.inserted}"
+        if "DELETE FROM" in query:
+            return f"DELETE {self.deleted}"
+        return "CREATE TABLE"
+
+    async def fetchval(self, query, *args):
+        self.statements.append(" ".join(query.split()))
+        return self.counts.pop(0)
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copied[table] = records
+
+    def index_of(self, prefix):
+        return next(i for i, q in enumerate(self.statements) if q.startswith(prefix))
+
+    def ran(self, prefix):
+        return any(q.startswith(prefix) for q in self.statements)
+
+
+EDGES = [
+    {"source_id": "A", "target_id": "B", "edge_type": "co_bid", "weight": 1.0},
+    {"source_id": "A", "target_id": "C", "edge_type": "co_bid", "weight": 2.0},
+    {"source_id": "A", "target_id": "B", "edge_type": "co_bid", "weight": 3.0},
+]
+
+
+def centrality_args():
+    entities = ["A", "B", "C"]
+    return dict(
+        pagerank={e: 0.3 for e in entities},
+        betweenness={e: 0.0 for e in entities},
+        communities={"A": 1, "B": 1},
+        node_types={},
+        degrees={"A": (2, 1, 1)},
+    )
+
+
+class TestUpsertEdgesBulk:
+
+    @pytest.mark.asyncio
+    async def test_stages_all_rows_and_prunes_stale_edges(self):
+        conn = FakeConn(existing=10, stale=2, inserted=2, deleted=2)
+
+        assert await upsert_edges_bulk(conn, EDGES) == (2, 2)
+
+        staged = conn.copied["unified_edges_staging"]
+        assert [(r[0], r[6]) for r in staged] == [(0, 1.0), (1, 2.0), (2, 3.0)]
+        assert conn.index_of("SELECT COUNT(*)") < conn.index_of("INSERT INTO unified_edges")
+        assert conn.ran("DELETE FROM unified_edges")
+
+    @pytest.mark.asyncio
+    async def test_prune_guard_skips_mass_delete(self):
+        conn = FakeConn(existing=10, stale=6, inserted=2)
+
+        assert await upsert_edges_bulk(conn, EDGES) == (2, 0)
+        assert not conn.ran("DELETE FROM")
+
+    @pytest.mark.asyncio
+    async def test_no_prune_skips_counts(self):
+        conn = FakeConn(inserted=2)
+
+        assert await upsert_edges_bulk(conn, EDGES, prune=False) == (2, 0)
+        assert not conn.ran("SELECT COUNT(*)")
+        assert await upsert_edges_bulk(conn, []) == (0, 0)
+
+
+class TestUpsertCentralityBulk:
+
+    @pytest.mark.asyncio
+    async def test_stages_defaults_and_prunes(self):
+        conn = FakeConn(existing=4, stale=1, inserted=3, deleted=1)
+
+        assert await upsert_centrality_bulk(conn, **centrality_args()) == (3, 1)
+
+        staged = {r[0]: r for r in conn.copied["entity_centrality_staging"]}
+        assert staged["A"][1] == "company"
+        assert staged["A"][5:] == (2, 1, 1, 1)
+        assert staged["C"][5:] == (0, 0, 0, None)
+        assert conn.index_of("SELECT COUNT(*)") < conn.index_of("INSERT INTO entity_centrality_cache")
+        assert conn.ran("DELETE FROM entity_centrality_cache")
+
+    @pytest.mark.asyncio
+    async def test_prune_guard_skips_mass_delete(self):
+        conn = FakeConn(existing=4, stale=3, inserted=3)
+
+        assert await upsert_centrality_bulk(conn, **centrality_args()) == (3, 0)
+        assert not conn.ran("DELETE FROM")
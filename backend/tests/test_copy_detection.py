@@ -0,0 +1,85 @@
+"""
+Tests for shingle/MinHash copy-paste detection
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ai.corruption.nlp.copy_detection import (
+    LSHIndex,
+    MinHasher,
+    common_blocks,
+    compare_texts,
+    word_shingles,
+)
+
+SPEC = (
+    "набавка на канцелариски материјал за потребите на министерството "
+    "хартија а4 80 грама бела со висока белина пакување од 500 листови "
+    "рок на испорака пет дена од денот на нарачката франко магацин"
+)
+OTHER = (
+    "изведување градежни работи за реконструкција на училишна зграда "
+    "замена на столарија кровна конструкција и фасада со термоизолација "
+    "гарантен рок десет години од примопредавањето на објектот"
+)
+
+
+class TestCommonBlocks:
+    """Greedy tiling reports each copied block once, in text1 order"""
+
+    def test_copied_sections_and_fraction(self):
+        copied = "вовед од понудувачот. " + SPEC + " дополнителни услови."
+
+        result = compare_texts(copied, SPEC)
+
+        assert result["copied_sections"][0]["length"] == len(SPEC)
+        assert result["copied_fraction"] == round(len(SPEC) / len(copied), 4)
+        assert result["is_suspicious"] is True
+
+    def test_reordered_sections_are_found(self):
+        first, second = SPEC[:100], SPEC[100:]
+
+        blocks = common_blocks(second + " | " + first, SPEC)
+
+        assert [(a, b) for a, b, _ in blocks] == [(0, 100), (len(second) + 3, 0)]
+
+    def test_source_text_is_tiled_once(self):
+        result = compare_texts("ab" * 1000, "ab" * 50)
+
+        assert result["copied_fraction"] == 0.05
+        assert [s["length"] for s in result["copied_sections"]] == [100]
+
+    def test_unrelated_and_empty_texts(self):
+        assert compare_texts(SPEC, OTHER)["copied_fraction"] == 0.0
+        assert compare_texts("", SPEC) == {
+            "similarity_ratio": 0.0,
+            "copied_sections": [],
+            "copied_fraction": 0.0,
+            "is_suspicious": False,
+        }
+
+
+class TestMinHashLSH:
+    """Near-duplicate specs become candidates, unrelated ones do not"""
+
+    def test_candidate_pairs(self):
+        hasher = MinHasher()
+        index = LSHIndex()
+        for key, text in {"a": SPEC, "b": SPEC + " измена на рокот", "c": OTHER}.items():
+            index.add(key, hasher.signature(word_shingles(text)))
+
+        pairs = index.candidate_pairs(min_jaccard=0.5)
+
+        assert [(a, b) for a, b, _ in pairs] == [("a", "b")]
+        assert pairs[0][2] > 0.7
+
+    def test_oversized_buckets_are_skipped(self):
+        hasher = MinHasher()
+        index = LSHIndex(max_bucket_size=2)
+        for key in ("a", "b", "c"):
+            index.add(key, hasher.signature(word_shingles(SPEC)))
+
+        assert index.candidate_pairs() == []
+        assert index.skipped_buckets == index.bands
@@ -0,0 +1,52 @@
+"""
+Tests for the bounded async email send queue
+"""
+import asyncio
+
+import pytest
+
+from services.email_queue import EmailJob, EmailSendQueue
+
+
+class TestEmailSendQueue:
+    """EmailSendQueue concurrency and retry behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_respects_provider_concurrency(self):
+        in_flight = 0
+        peak = 0
+
+        async def send(to):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return True
+
+        async with EmailSendQueue(queue_size=5) as queue:
+            queue.register('postmark', send, concurrency=3)
+            for i in range(20):
+                await queue.submit(EmailJob('postmark', {'to': f'user{i}@example.com'}))
+
+        assert len(queue.sent) == 20
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_then_reports_failures(self):
+        attempts = {}
+
+        async def send(to):
+            attempts[to] = attempts.get(to, 0) + 1
+            if to == 'flaky@example.com' and attempts[to] == 1:
+                raise RuntimeError('timeout')
+            return to != 'broken@example.com'
+
+        async with EmailSendQueue(max_attempts=3, retry_delay=0) as queue:
+            queue.register('postmark', send)
+            await queue.submit(EmailJob('postmark', {'to': 'flaky@example.com'}, context='a'))
+            await queue.submit(EmailJob('postmark', {'to': 'broken@example.com'}, context='b'))
+
+        assert [job.context for job in queue.sent] == ['a']
+        assert [job.context for job in queue.failed] == ['b']
+        assert attempts == {'flaky@example.com': 2, 'broken@example.com': 3}
@@ -0,0 +1,62 @@
+"""
+Tests for the incremental export encoders
+"""
+import gzip
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from utils.export_stream import csv_chunks, gzip_chunks, json_document_chunks, ndjson_chunks
+
+ROWS = [
+    {"tender_id": "1/2024", "title": "Канцелариски материјал", "value": Decimal("1500.50"), "closing": date(2024, 5, 1)},
+    {"tender_id": "2/2024", "title": 'Gorivo, "Euro 5"', "value": None, "closing": None},
+]
+
+
+async def batches(*groups):
+    for group in groups:
+        yield group
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestExportStream:
+    """Each encoder yields one chunk per batch and reassembles to a valid file"""
+
+    @pytest.mark.asyncio
+    async def test_csv(self):
+        chunks = await collect(csv_chunks(
+            ["ID", "Title", "Value", "Closing"], ["tender_id", "title", "value", "closing"],
+            batches(ROWS[:1], ROWS[1:]),
+        ))
+
+        assert len(chunks) == 3
+        assert "".join(chunks).splitlines() == [
+            "ID,Title,Value,Closing",
+            "1/2024,Канцелариски материјал,1500.5,2024-05-01",
+            '2/2024,"Gorivo, ""Euro 5""",,',
+        ]
+
+    @pytest.mark.asyncio
+    async def test_json_document_and_ndjson(self):
+        document = json.loads("".join(await collect(json_document_chunks(batches(ROWS[:1], [], ROWS[1:]), format="json"))))
+        lines = "".join(await collect(ndjson_chunks(batches(ROWS)))).splitlines()
+
+        assert document["format"] == "json"
+        assert document["total"] == 2
+        assert document["data"][0]["value"] == 1500.5
+        assert [json.loads(line)["tender_id"] for line in lines] == ["1/2024", "2/2024"]
+
+        empty = json.loads("".join(await collect(json_document_chunks(batches()))))
+        assert empty == {"data": [], "total": 0}
+
+    @pytest.mark.asyncio
+    async def test_gzip(self):
+        chunks = await collect(gzip_chunks(ndjson_chunks(batches(ROWS))))
+
+        assert gzip.decompress(b"".join(chunks)).decode().count("\n") == 2
@@ -0,0 +1,99 @@
+"""
+Tests for the GNN inference service's graph snapshot lookups
+"""
+import os
+import sys
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ai.corruption.ml_models.gnn_inference import GNNInferenceService
+from ai.corruption.ml_models.graph_builder import CSRAdjacency
+
+
+def make_snapshot(names, edges, weights, checksum="c1"):
+    edge_index = np.array(edges, dtype=np.int64).T
+    return SimpleNamespace(
+        names=names,
+        node_index={n: i for i, n in enumerate(names)},
+        edge_index=edge_index,
+        edge_weight=np.array(weights, dtype=np.float32),
+        adjacency=CSRAdjacency(edge_index, len(names)),
+        checksum=checksum,
+        version=checksum,
+        num_nodes=lambda: len(names),
+    )
+
+
+class FakePool:
+    def __init__(self, checksum):
+        self.checksum = checksum
+        self.queries = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    async def fetchval(self, query, *args):
+        self.queries += 1
+        return self.checksum
+
+
+def make_service(snapshot, pool=None):
+    service = GNNInferenceService()
+    service._loaded = True
+    service._clusters = []
+    service._company_cluster_idx = {}
+    service._graph_snapshot = snapshot
+    service._pool = pool
+    return service
+
+
+class TestSnapshotNetwork:
+
+    def test_keeps_strongest_co_bidders(self):
+        snapshot = make_snapshot(
+            ["center", "weak", "strong", "mid"],
+            [(0, 1), (0, 2), (0, 3)],
+            [1.0, 9.0, 4.0],
+        )
+        service = make_service(snapshot)
+
+        network = service._network_from_snapshot("center", depth=1, max_nodes=3)
+
+        assert [n["id"] for n in network["nodes"]] == ["center", "strong", "mid"]
+        assert {e["target"] for e in network["edges"]} == {"strong", "mid"}
+
+
+class TestSnapshotRefresh:
+
+    @pytest.mark.asyncio
+    async def test_miss_reloads_changed_snapshot(self):
+        old = make_snapshot(["A", "B"], [(0, 1)], [1.0], checksum="c1")
+        new = make_snapshot(["A", "B", "C"], [(0, 1), (1, 2)], [1.0, 2.0], checksum="c2")
+        pool = FakePool("c2")
+        service = make_service(old, pool)
+
+        with patch("ai.corruption.ml_models.graph_cache.get_cached_graph",
+                   AsyncMock(return_value=new)):
+            network = await service.get_company_network("C", depth=1)
+
+        assert service._graph_snapshot is new
+        assert network["center_node"] == "C"
+        assert [n["id"] for n in network["nodes"]] == ["C", "B"]
+
+    @pytest.mark.asyncio
+    async def test_recheck_is_throttled(self):
+        snapshot = make_snapshot(["A", "B"], [(0, 1)], [1.0], checksum="c1")
+        pool = FakePool("c1")
+        service = make_service(snapshot, pool)
+
+        assert await service._refresh_graph_snapshot() is False
+        assert await service._refresh_graph_snapshot(miss=True) is False
+        assert pool.queries == 1
+        assert service._graph_snapshot is snapshot
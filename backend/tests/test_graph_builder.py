@@ -0,0 +1,52 @@
+"""
+Tests for the CSR adjacency index used by the bidder graph
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ai.corruption.ml_models.graph_builder import CSRAdjacency
+
+
+class TestCoreNumbers:
+    """Bucket peeling gives the standard k-core numbers"""
+
+    def test_clique_with_tail(self):
+        # 4-clique 0-3, tail 3-4-5, isolated node 6, one parallel edge
+        edges = [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3), (3, 4), (4, 5), (0, 1)]
+        adjacency = CSRAdjacency(np.array(edges).T, num_nodes=7)
+
+        assert adjacency.core_numbers().tolist() == [3, 3, 3, 3, 1, 1, 0]
+
+    def test_cycle_and_self_loop(self):
+        edges = [(0, 1), (1, 2), (2, 0), (3, 3)]
+        adjacency = CSRAdjacency(np.array(edges).T, num_nodes=4)
+
+        assert adjacency.core_numbers().tolist() == [2, 2, 2, 0]
+
+    def test_empty_graph(self):
+        adjacency = CSRAdjacency(np.zeros((2, 0)), num_nodes=3)
+
+        assert adjacency.core_numbers().tolist() == [0, 0, 0]
+
+
+class TestKHop:
+    """Truncated expansions keep the strongest neighbors when weights are given"""
+
+    EDGES = np.array([(0, 1), (0, 2), (0, 3), (3, 4), (1, 5)]).T
+    WEIGHTS = np.array([1.0, 5.0, 3.0, 9.0, 2.0])
+
+    def test_truncates_by_node_id_without_weights(self):
+        adjacency = CSRAdjacency(self.EDGES, num_nodes=6)
+
+        assert adjacency.k_hop(0, 2, max_nodes=3) == {0: 0, 1: 1, 2: 1}
+
+    def test_truncates_by_edge_weight(self):
+        adjacency = CSRAdjacency(self.EDGES, num_nodes=6)
+
+        hops = adjacency.k_hop(0, 2, max_nodes=5, edge_weight=self.WEIGHTS)
+
+        assert list(hops.items()) == [(0, 0), (2, 1), (3, 1), (1, 1), (4, 2)]
@@ -0,0 +1,172 @@
+"""
+Tests for instant alert email fan-out (per-user digest cap, retry pass)
+"""
+import json
+import os
+import sys
+from contextlib import asynccontextmanager
+from functools import partial
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crons import instant_alerts
+
+
+def make_match(alert_id, email, tender_id, score=50.0, channels=('email',)):
+    return {
+        'match_id': f"m-{alert_id}-{tender_id}",
+        'alert': {
+            'alert_id': alert_id, 'user_id': f"u-{email}", 'name': 'Alert',
+            'channels': list(channels), 'email': email, 'full_name': 'User'
+        },
+        'tender': {'tender_id': tender_id, 'title': f"Tender {tender_id}", 'source': 'e-nabavki'},
+        'source': 'e-nabavki',
+        'score': score,
+        'reasons': ['CPV']
+    }
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.commits = 0
+        self.savepoints = 0
+
+    async def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        if 'INSERT INTO alert_matches' in str(statement):
+            rows = json.loads(params['rows'])
+            if any(r['alert_id'] == 'not-a-uuid' for r in rows):
+                raise ValueError('invalid input syntax for type uuid')
+            return FakeResult([(r['match_id'],) for r in rows])
+        return FakeResult(self.rows if 'FROM alert_matches am' in str(statement) else [])
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        self.savepoints += 1
+        yield
+
+    async def commit(self):
+        self.commits += 1
+
+
+class TestSendMatchEmails:
+
+    @pytest.mark.asyncio
+    async def test_user_over_cap_gets_one_digest(self):
+        single = AsyncMock(return_value=True)
+        digest = AsyncMock(return_value=True)
+        matches = [make_match('a1', 'busy@example.com', f"T-{i}", score=i) for i in range(4)]
+        matches.append(make_match('a2', 'quiet@example.com', 'T-9'))
+
+        with patch.object(instant_alerts, 'send_alert_email', single), \
+                patch.object(instant_alerts, 'send_alert_digest_email', digest):
+            pairs, sent, failed = await instant_alerts.send_match_emails(matches, max_per_user=3)
+
+        assert (sent, failed) == (2, 0)
+        assert single.await_count == 1
+        assert single.await_args.kwargs['user_email'] == 'quiet@example.com'
+        items = digest.await_args.kwargs['items']
+        assert [item['tender']['tender_id'] for item in items] == ['T-3', 'T-2', 'T-1', 'T-0']
+        assert sorted(pairs) == sorted(('a1', f"T-{i}") for i in range(4)) + [('a2', 'T-9')]
+
+    @pytest.mark.asyncio
+    async def test_failed_sends_are_not_reported_notified(self):
+        single = AsyncMock(return_value=False)
+        matches = [make_match('a1', 'user@example.com', 'T-1')]
+
+        with patch.object(instant_alerts, 'send_alert_email', single), \
+                patch.object(instant_alerts, 'EmailSendQueue',
+                             partial(instant_alerts.EmailSendQueue, retry_delay=0)):
+            pairs, sent, failed = await instant_alerts.send_match_emails(matches)
+
+        assert pairs == []
+        assert (sent, failed) == (0, 1)
+
+
+class TestPersistAlertMatches:
+
+    @pytest.mark.asyncio
+    async def test_one_statement_for_valid_rows(self):
+        db = FakeSession([])
+        matches = [make_match('a1', 'user@example.com', f"T-{i}") for i in range(3)]
+
+        new = await instant_alerts.persist_alert_matches(db, matches)
+
+        assert new == matches
+        assert len(db.statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_bad_row_falls_back_to_per_row_inserts(self):
+        db = FakeSession([])
+        good = [make_match('a1', 'user@example.com', 'T-1'), make_match('a2', 'user@example.com', 'T-2')]
+        bad = make_match('not-a-uuid', 'user@example.com', 'T-3')
+
+        new = await instant_alerts.persist_alert_matches(db, [good[0], bad, good[1]])
+
+        assert new == good
+        assert len(db.statements) == 4  # failed batch + one insert per row
+
+
+class TestRetryUnnotifiedMatches:
+
+    @pytest.mark.asyncio
+    async def test_resends_and_marks_unnotified_matches(self):
+        row = (
+            'm-1', 'a1', 'T-1', 'e-pazar', 80, ['CPV'],
+            'u-1', 'Alert', ['email', 'in_app'], 'user@example.com', 'User',
+            'Title', 'Desc', 'Entity', 1000, '301', None, ''
+        )
+        db = FakeSession([row])
+        single = AsyncMock(return_value=True)
+
+        with patch.object(instant_alerts, 'send_alert_email', single):
+            retried, sent = await instant_alerts.retry_unnotified_matches(db, set())
+
+        assert (retried, sent) == (1, 1)
+        tender = single.await_args.kwargs['tender']
+        assert tender['source'] == 'e-pazar' and tender['procuring_entity'] == 'Entity'
+        update_sql, params = db.statements[-1]
+        assert 'SET notified_at' in update_sql
+        assert '"tender_id": "T-1"' in params['pairs']
+        assert db.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_decodes_jsonb_strings_and_skips_non_email_alerts(self):
+        rows = [
+            ('m-1', 'a1', 'T-1', 'e-nabavki', 80, '["CPV", "Entity"]',
+             'u-1', 'Alert', '["email"]', 'user@example.com', 'User',
+             'Title', 'Desc', 'Entity', 1000, '301', None, ''),
+            ('m-2', 'a2', 'T-2', 'e-nabavki', 60, '[]',
+             'u-1', 'In-app only', '["in_app"]', 'user@example.com', 'User',
+             'Title', 'Desc', 'Entity', 1000, '301', None, ''),
+        ]
+
+        matches = await instant_alerts.load_unnotified_matches(FakeSession(rows))
+
+        assert [m['match_id'] for m in matches] == ['m-1']
+        assert matches[0]['alert']['channels'] == ['email']
+        assert matches[0]['reasons'] == ['CPV', 'Entity']
+
+    @pytest.mark.asyncio
+    async def test_nothing_pending_sends_nothing(self):
+        db = FakeSession([])
+        single = AsyncMock(return_value=True)
+
+        with patch.object(instant_alerts, 'send_alert_email', single):
+            assert await instant_alerts.retry_unnotified_matches(db) == (0, 0)
+
+        single.assert_not_awaited()
+        assert db.commits == 0
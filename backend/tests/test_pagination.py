@@ -0,0 +1,82 @@
+"""
+Tests for keyset pagination cursors and estimated totals
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from utils.pagination import (
+    COUNT_ESTIMATE, COUNT_EXACT, InvalidCursor, Keyset, NamedParams, PositionalParams, resolve_total
+)
+
+
+class TestKeyset:
+    """Cursor round-trips and seek predicates"""
+
+    def test_cursor_round_trip_keeps_types(self):
+        keyset = Keyset(["estimated_value_mkd"])
+        cursor = keyset.encode([Decimal("1500.50"), "21234/2024"])
+
+        assert keyset.decode(cursor) == [Decimal("1500.50"), "21234/2024"]
+        assert keyset.decode(None) is None
+
+    def test_cursor_is_bound_to_its_sort(self):
+        cursor = Keyset(["publication_date"]).encode([date(2024, 5, 1), "1/2024"])
+
+        with pytest.raises(InvalidCursor):
+            Keyset(["publication_date"], descending=False).decode(cursor)
+        with pytest.raises(InvalidCursor):
+            Keyset(["publication_date"]).decode("not-a-cursor")
+
+    def test_nullable_sort_reads_null_tail_after_values(self):
+        keyset = Keyset(["publication_date"])
+        seeks = keyset.seeks([date(2024, 5, 1), "1/2024"])
+
+        params = PositionalParams()
+        assert seeks[0](params) == "(publication_date, tender_id) < ($1, $2)"
+        assert params.values == [date(2024, 5, 1), "1/2024"]
+        assert seeks[1](PositionalParams()) == "publication_date IS NULL"
+
+        # Once inside the NULL tail only tender_id moves
+        params = PositionalParams()
+        [seek] = keyset.seeks([None, "9/2023"])
+        assert seek(params) == "(publication_date IS NULL AND tender_id < $1)"
+        assert params.values == ["9/2023"]
+
+    def test_multi_column_order(self):
+        keyset = Keyset(["risk_score", "total_flags"], nullable=False)
+
+        assert keyset.order_sql() == "risk_score DESC NULLS LAST, total_flags DESC NULLS LAST, tender_id DESC"
+        [seek] = keyset.seeks([80, 3, "5/2024"])
+        assert seek(PositionalParams()) == "(risk_score, total_flags, tender_id) < ($1, $2, $3)"
+
+    def test_named_params_continue_existing_filters(self):
+        keyset = Keyset(["closing_date"], descending=False, nullable=False)
+        params = NamedParams("cursor_")
+
+        [seek] = keyset.seeks([date(2024, 6, 1), "7/2024"])
+
+        assert seek(params) == "(closing_date, tender_id) > (:cursor_0, :cursor_1)"
+        assert params.values == {"cursor_0": date(2024, 6, 1), "cursor_1": "7/2024"}
+
+
+class TestResolveTotal:
+    """Exact counts seed the estimate cache"""
+
+    @pytest.mark.asyncio
+    async def test_estimate_reuses_exact_count(self):
+        calls = []
+
+        async def exact():
+            calls.append(1)
+            return 42
+
+        async def estimate():
+            return 1000
+
+        key = "test:estimate_reuses_exact_count"
+        assert await resolve_total(COUNT_ESTIMATE, key + ":cold", exact, estimate) == (1000, True)
+        assert await resolve_total(COUNT_EXACT, key, exact, estimate) == (42, False)
+        assert await resolve_total(COUNT_ESTIMATE, key, exact, estimate) == (42, True)
+        assert len(calls) == 1
@@ -0,0 +1,109 @@
+"""
+Tests for the resident corruption prediction service (micro-batching, reload)
+"""
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ai.corruption.ml_models.predict_pipeline import anomaly_probability
+from ai.corruption.ml_models.prediction_service import PredictionService
+
+
+class FakeExtractor:
+    def __init__(self):
+        self.batches = []
+
+    async def extract_features_batch(self, tender_ids):
+        self.batches.append(list(tender_ids))
+        return list(tender_ids)
+
+
+class FakePredictor:
+    """Scores feature 'vectors' (tender ids); 'bad' ids make scoring raise"""
+
+    def __init__(self, name="v1"):
+        self.name = name
+        self.models = {"random_forest": object()}
+        self.feature_extractor = FakeExtractor()
+
+    def score_features(self, feature_vectors):
+        if any(fv.startswith("bad") for fv in feature_vectors):
+            raise ValueError("corrupt feature row")
+        return [SimpleNamespace(tender_id=fv, model=self.name) for fv in feature_vectors]
+
+
+async def start_service(predictor, **kwargs):
+    service = PredictionService(reload_interval=0, **kwargs)
+    service._model_signature = AsyncMock(return_value=((), ()))
+    service._load_predictor = AsyncMock(return_value=predictor)
+    await service.initialize(pool=None)
+    return service
+
+
+class TestPredictionService:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_a_batch(self):
+        predictor = FakePredictor()
+        service = await start_service(predictor, max_batch=8, max_wait_ms=50)
+        try:
+            results = await asyncio.gather(*[service.predict(f"T-{i}") for i in range(5)])
+        finally:
+            await service.cleanup()
+
+        assert [r.tender_id for r in results] == [f"T-{i}" for i in range(5)]
+        assert predictor.feature_extractor.batches == [[f"T-{i}" for i in range(5)]]
+        assert service.get_status()["batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_request_does_not_fail_its_batch(self):
+        service = await start_service(FakePredictor(), max_batch=8, max_wait_ms=50)
+        try:
+            results = await asyncio.gather(
+                service.predict("T-1"),
+                service.predict("bad-2"),
+                service.predict("T-3"),
+                return_exceptions=True,
+            )
+        finally:
+            await service.cleanup()
+
+        assert results[0].tender_id == "T-1"
+        assert isinstance(results[1], ValueError)
+        assert results[2].tender_id == "T-3"
+
+    @pytest.mark.asyncio
+    async def test_reload_swaps_models_only_on_change(self):
+        service = await start_service(FakePredictor("v1"))
+        try:
+            assert await service.reload_if_changed() is False
+
+            service._model_signature = AsyncMock(return_value=((("xgboost", "2"),), ()))
+            service._load_predictor = AsyncMock(return_value=FakePredictor("v2"))
+            assert await service.reload_if_changed() is True
+
+            result = await service.predict("T-1")
+        finally:
+            await service.cleanup()
+
+        assert result.model == "v2"
+        assert service.get_status()["reloads"] == 1
+        assert service.get_status()["active_versions"] == {"xgboost": "2"}
+
+
+def test_anomaly_probability_is_per_row():
+    """Training and serving share one batch-independent mapping"""
+    raw = np.array([-0.2, 0.0, 0.3])
+
+    scores = anomaly_probability(raw)
+
+    assert scores[1] == pytest.approx(0.5)
+    assert scores[0] > scores[1] > scores[2]
+    assert anomaly_probability(raw[:1])[0] == pytest.approx(scores[0])
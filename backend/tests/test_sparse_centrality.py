@@ -0,0 +1,81 @@
+"""
+Tests for the SciPy centrality engine against the NetworkX computations it replaces
+"""
+import os
+import sys
+
+import pytest
+
+nx = pytest.importorskip("networkx")
+pytest.importorskip("scipy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ai.corruption.graph import sparse_centrality
+from ai.corruption.graph.relationship_graph import RelationshipGraph
+from ai.corruption.graph.sparse_centrality import SparseCentralityEngine
+
+EDGES = [
+    # Two edge types between the same pair collapse to one summed edge
+    ("inst-1", "co-a", "awarded", 3.0),
+    ("inst-1", "co-a", "contracted", 1.0),
+    ("inst-1", "co-b", "awarded", 2.0),
+    ("inst-2", "co-b", "awarded", 1.0),
+    ("inst-2", "co-c", "awarded", 1.0),
+    ("co-a", "co-b", "co_bid", 1.0),
+    ("co-b", "co-a", "co_bid", 1.0),
+    ("co-c", "co-d", "co_bid", 2.0),
+    ("co-d", "co-e", "co_bid", 1.0),
+    ("co-e", "co-c", "co_bid", 1.0),
+    ("co-e", "co-e", "subsidiary", 1.0),
+    ("inst-3", "co-f", "awarded", 1.0),  # separate component, dangling target
+]
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return RelationshipGraph([
+        {"source_id": s, "target_id": t, "edge_type": kind, "weight": w}
+        for s, t, kind, w in EDGES
+    ])
+
+
+def test_pagerank_matches_networkx(graph):
+    expected = graph.compute_pagerank()
+
+    result = SparseCentralityEngine(graph).compute_pagerank()
+
+    assert result.keys() == expected.keys()
+    for node, value in expected.items():
+        assert result[node] == pytest.approx(value, abs=1e-7)
+
+
+def test_betweenness_matches_networkx(graph):
+    expected = nx.betweenness_centrality(graph._undirected_graph, weight="weight", normalized=True)
+
+    result = SparseCentralityEngine(graph).compute_betweenness_centrality(workers=1)
+
+    assert result.keys() == expected.keys()
+    for node, value in expected.items():
+        assert result[node] == pytest.approx(value, abs=1e-8)
+
+
+def test_parallel_betweenness_matches_in_process(graph, monkeypatch):
+    engine = SparseCentralityEngine(graph)
+    in_process = engine.compute_betweenness_centrality(workers=1)
+
+    monkeypatch.setattr(sparse_centrality, "PARALLEL_MIN_NODES", 0)
+    parallel = engine.compute_betweenness_centrality(workers=2, chunks_per_worker=2)
+
+    assert parallel == pytest.approx(in_process)
+
+
+def test_degrees_match_networkx(graph):
+    result = SparseCentralityEngine(graph).compute_degrees()
+
+    directed = graph._graph
+    undirected = graph._undirected_graph
+    assert result == {
+        node: (undirected.degree(node), directed.in_degree(node), directed.out_degree(node))
+        for node in directed.nodes()
+    }
@@ -0,0 +1,88 @@
+"""
+Incremental CSV / JSON / NDJSON encoders for file exports
+
+Exports are produced from an async iterator of row batches (one batch per
+server-side cursor fetch) and yield one chunk per batch, so worker memory is
+bounded by the batch size rather than by the export size. Any stream can be
+wrapped in gzip_chunks() for a compressed download.
+
+Usage:
+    chunks = csv_chunks(["Tender ID", "Title"], ["tender_id", "title"], batches)
+    return StreamingResponse(gzip_chunks(chunks), media_type="application/gzip")
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+Batch = List[Dict[str, Any]]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_value(value: Any) -> Any:
+    """JSON-safe value (Decimal -> float, dates -> ISO 8601)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+async def csv_chunks(header: Sequence[str], keys: Sequence[str], batches: AsyncIterator[Batch]) -> AsyncIterator[str]:
+    """Header line, then one CSV chunk per batch (None becomes an empty cell)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for record in batch:
+            writer.writerow(["" if record[k] is None else export_value(record[k]) for k in keys])
+        yield buffer.getvalue()
+
+
+async def ndjson_chunks(batches: AsyncIterator[Batch]) -> AsyncIterator[str]:
+    """One JSON object per line"""
+    async for batch in batches:
+        if batch:
+            yield "".join(json.dumps(record, ensure_ascii=False, default=export_value) + "\n" for record in batch)
+
+
+async def json_document_chunks(batches: AsyncIterator[Batch], **fields: Any) -> AsyncIterator[str]:
+    """
+    {"<fields>": ..., "data": [...], "total": N} written incrementally
+
+    total is only known at the end, so it is emitted after the data array.
+    """
+    head = json.dumps(fields, ensure_ascii=False)[:-1]
+    yield (head + ", " if fields else "{") + '"data": ['
+
+    total = 0
+    async for batch in batches:
+        if not batch:
+            continue
+        body = ", ".join(json.dumps(record, ensure_ascii=False, default=export_value) for record in batch)
+        yield (", " if total else "") + body
+        total += len(batch)
+
+    yield f'], "total": {total}}}'
+
+
+async def gzip_chunks(chunks: AsyncIterator[str], level: int = 6) -> AsyncIterator[bytes]:
+    """gzip-compress a text stream chunk by chunk"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,265 @@
+"""
+Keyset (cursor) pagination and estimated totals for list endpoints
+
+OFFSET pagination makes Postgres walk and discard every row before the
+requested page, and an exact COUNT(*) rescans the whole filtered set on every
+page. List endpoints keep their page-number API and additionally accept:
+
+- cursor:  opaque token from the previous page's next_cursor. The page is
+           fetched with a row comparison on (sort key, tender_id), which an
+           index on the same columns serves directly.
+- count:   "exact" (default) or "estimate". Estimates come from a per-process
+           cache of exact counts keyed by the filter signature, or from
+           pg_class.reltuples for an unfiltered list.
+
+Cursors carry the sort they were issued for, so a cursor cannot be replayed
+against a different ordering. Values are type-tagged so dates and decimals
+bind with their original Python types.
+
+Usage:
+    keyset = Keyset(["publication_date"], descending=True)
+    position = keyset.decode(cursor)            # raises InvalidCursor
+    for seek in keyset.seeks(position):
+        params = NamedParams("cursor_")
+        predicate = seek(params)                # None on the first page
+        ...
+    next_cursor = keyset.encode([row.publication_date, row.tender_id])
+"""
+import base64
+import binascii
+import json
+import os
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+COUNT_MODE_PATTERN = f"^({COUNT_EXACT}|{COUNT_ESTIMATE})$"
+
+LIST_COUNT_CACHE_TTL = int(os.getenv("LIST_COUNT_CACHE_TTL", "300"))  # 5 minutes
+LIST_COUNT_CACHE_SIZE = int(os.getenv("LIST_COUNT_CACHE_SIZE", "2048"))
+
+
+class InvalidCursor(ValueError):
+    """Cursor is malformed or was issued for a different sort"""
+
+
+# ============================================================================
+# PLACEHOLDER COLLECTORS
+# ============================================================================
+
+class NamedParams:
+    """Collects values and renders :name placeholders (SQLAlchemy text())"""
+
+    def __init__(self, prefix: str = 'search_'):
+        self.prefix = prefix
+        self.values: Dict[str, Any] = {}
+
+    def __call__(self, value: Any) -> str:
+        name = f"{self.prefix}{len(self.values)}"
+        self.values[name] = value
+        return f":{name}"
+
+
+class PositionalParams:
+    """Collects values and renders $n placeholders (asyncpg)"""
+
+    def __init__(self, values: Optional[List[Any]] = None):
+        self.values: List[Any] = list(values or [])
+
+    def __call__(self, value: Any) -> str:
+        self.values.append(value)
+        return f"${len(self.values)}"
+
+
+# ============================================================================
+# CURSOR ENCODING
+# ============================================================================
+
+def _tag(value: Any) -> Any:
+    """JSON-safe representation that keeps the Python type"""
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _untag(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+        raise ValueError(f"unknown cursor value {value!r}")
+    return value
+
+
+class Keyset:
+    """
+    Sort keys of a keyset-paginated list
+
+    columns are the SQL expressions of the sort keys, in order; id_column is
+    appended as the unique tie-breaker. All keys share one direction so the
+    seek predicate is a single row comparison. Only a single sort column may
+    be nullable: NULLs sort last, and are read by a second "tail" query once
+    the non-NULL rows run out, because `(a, b) < (x, y) OR a IS NULL` cannot
+    be answered from the index.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        descending: bool = True,
+        id_column: str = "tender_id",
+        nullable: bool = True,
+    ):
+        if nullable and len(columns) != 1:
+            raise ValueError("Only single-column keysets may be nullable")
+        self.columns = list(columns)
+        self.id_column = id_column
+        self.descending = descending
+        self.nullable = nullable
+
+    @property
+    def signature(self) -> str:
+        return ",".join(self.columns + [self.id_column]) + (":desc" if self.descending else ":asc")
+
+    def order_sql(self) -> str:
+        """ORDER BY clause matching the seek predicates"""
+        direction = "DESC" if self.descending else "ASC"
+        keys = [f"{c} {direction} NULLS LAST" for c in self.columns]
+        keys.append(f"{self.id_column} {direction}")
+        return ", ".join(keys)
+
+    def encode(self, values: Sequence[Any]) -> str:
+        """Cursor pointing just after a row; values are its sort keys then its id"""
+        payload = {"s": self.signature, "k": [_tag(v) for v in values]}
+        raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode(self, cursor: Optional[str]) -> Optional[List[Any]]:
+        """Sort keys stored in a cursor (None when no cursor was given)"""
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            values = [_untag(v) for v in payload["k"]]
+            signature = payload["s"]
+        except (binascii.Error, ValueError, TypeError, KeyError) as e:
+            raise InvalidCursor("Malformed cursor") from e
+        if signature != self.signature:
+            raise InvalidCursor("Cursor was issued for a different sort order")
+        if len(values) != len(self.columns) + 1 or values[-1] is None:
+            raise InvalidCursor("Malformed cursor")
+        if not self.nullable and any(v is None for v in values):
+            raise InvalidCursor("Malformed cursor")
+        return values
+
+    def seeks(self, position: Optional[List[Any]]) -> List[Callable[[Any], Optional[str]]]:
+        """
+        Predicate builders for the queries that make up one page, in order
+
+        Each builder takes a params collector (NamedParams / PositionalParams)
+        and returns a WHERE fragment. Run them in turn until the page is full.
+        """
+        if position is None:
+            return [lambda params: None]
+        if self.nullable and position[0] is None:
+            return [partial(self._null_after, position[-1])]
+        seeks = [partial(self._after, position)]
+        if self.nullable:
+            seeks.append(self._null_tail)
+        return seeks
+
+    def _after(self, position: List[Any], params) -> str:
+        op = "<" if self.descending else ">"
+        keys = ", ".join(self.columns + [self.id_column])
+        values = ", ".join(params(v) for v in position)
+        return f"({keys}) {op} ({values})"
+
+    def _null_after(self, last_id: Any, params) -> str:
+        op = "<" if self.descending else ">"
+        return f"({self.columns[0]} IS NULL AND {self.id_column} {op} {params(last_id)})"
+
+    def _null_tail(self, params) -> str:
+        return f"{self.columns[0]} IS NULL"
+
+
+# ============================================================================
+# ESTIMATED TOTALS
+# ============================================================================
+
+def filter_signature(endpoint: str, filters: Dict[str, Any]) -> str:
+    """Cache key for a list's filter set (unset filters are ignored)"""
+    active = {k: v for k, v in filters.items() if v is not None and v != ""}
+    return endpoint + ":" + json.dumps(active, sort_keys=True, default=str)
+
+
+class CountCache:
+    """Exact list totals per filter signature, expiring after ttl seconds"""
+
+    def __init__(self, ttl: int = LIST_COUNT_CACHE_TTL, max_size: int = LIST_COUNT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: Dict[str, Tuple[float, int]] = {}
+
+    def get(self, key: str) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            self._entries.pop(key, None)
+            return None
+        return entry[1]
+
+    def set(self, key: str, total: int) -> None:
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_size:
+            now = time.monotonic()
+            for stale in [k for k, (t, _) in self._entries.items() if now - t >= self.ttl]:
+                del self._entries[stale]
+            while len(self._entries) >= self.max_size:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic(), total)
+
+
+_count_cache = CountCache()
+
+
+async def resolve_total(
+    mode: str,
+    key: str,
+    exact: Callable[[], Awaitable[Optional[int]]],
+    estimate: Optional[Callable[[], Awaitable[Optional[int]]]] = None,
+) -> Tuple[int, bool]:
+    """
+    Total row count for a list response
+
+    Returns (total, is_estimate). Exact counts are always cached so later
+    pages requested with count=estimate reuse them; estimate() is only
+    consulted on a cache miss and may return None to fall back to exact().
+    """
+    if mode == COUNT_ESTIMATE:
+        cached = _count_cache.get(key)
+        if cached is not None:
+            return cached, True
+        if estimate is not None:
+            approx = await estimate()
+            if approx is not None and approx >= 0:
+                return int(approx), True
+    total = await exact() or 0
+    _count_cache.set(key, total)
+    return total, False
+
+
+# reltuples is -1 for a table that has never been analyzed
+RELTUPLES_SQL = "SELECT reltuples::bigint FROM pg_class WHERE oid = '{table}'::regclass"
@@ -0,0 +1,34 @@
+-- Migration 048: Corruption analysis run log (incremental watermark)
+-- corruption_detector.py records every analysis run here. Incremental runs
+-- re-evaluate only tenders changed since the watermark of the last completed
+-- run (plus the entity/winner/bidder groups they touch).
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/048_corruption_analysis_runs.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS corruption_analysis_runs (
+    run_id SERIAL PRIMARY KEY,
+    mode TEXT NOT NULL CHECK (mode IN ('full', 'incremental')),
+    watermark TIMESTAMPTZ NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'completed', 'failed')),
+    changed_tenders INTEGER DEFAULT 0,
+    scoped_tenders INTEGER DEFAULT 0,
+    flags_written INTEGER DEFAULT 0,
+    started_at TIMESTAMPTZ DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+COMMENT ON TABLE corruption_analysis_runs IS 'Log of corruption_detector.py runs; the latest completed watermark drives incremental analysis.';
+COMMENT ON COLUMN corruption_analysis_runs.watermark IS 'DB time captured before detectors ran; the next incremental run picks up changes after it';
+COMMENT ON COLUMN corruption_analysis_runs.changed_tenders IS 'Tenders changed since the previous watermark';
+COMMENT ON COLUMN corruption_analysis_runs.scoped_tenders IS 'Changed tenders plus tenders sharing their entity, winner or bidders';
+
+CREATE INDEX IF NOT EXISTS idx_corruption_runs_completed
+    ON corruption_analysis_runs(watermark DESC) WHERE status = 'completed';
+
+-- Change detection scans
+CREATE INDEX IF NOT EXISTS idx_tenders_updated_at ON tenders(updated_at);
+CREATE INDEX IF NOT EXISTS idx_tender_bidders_created_at ON tender_bidders(created_at);
+
+COMMIT;
@@ -0,0 +1,22 @@
+-- Migration 049: Binary graph snapshots for gnn_graph_cache
+-- graph_cache.py now writes the co-bidding graph as a versioned, memory-mapped
+-- NumPy snapshot on disk (ai/corruption/ml_models/graph_snapshot.py). The
+-- graph_data column keeps only the snapshot manifest instead of the full graph.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/049_gnn_graph_snapshots.sql
+
+BEGIN;
+
+ALTER TABLE gnn_graph_cache ADD COLUMN IF NOT EXISTS snapshot_path TEXT;
+ALTER TABLE gnn_graph_cache ADD COLUMN IF NOT EXISTS snapshot_version TEXT;
+ALTER TABLE gnn_graph_cache ADD COLUMN IF NOT EXISTS snapshot_checksum TEXT;
+
+COMMENT ON COLUMN gnn_graph_cache.graph_data IS 'Snapshot manifest: format version, counts, feature names, per-file sha256';
+COMMENT ON COLUMN gnn_graph_cache.snapshot_path IS 'Directory of the binary graph snapshot (.npy arrays + names.json)';
+COMMENT ON COLUMN gnn_graph_cache.snapshot_version IS 'Snapshot version (UTC build timestamp)';
+COMMENT ON COLUMN gnn_graph_cache.snapshot_checksum IS 'sha256 over the snapshot files; readers reject a mismatching snapshot';
+
+-- Legacy rows hold the full JSON graph; drop them so the next cron run rebuilds
+DELETE FROM gnn_graph_cache WHERE snapshot_path IS NULL;
+
+COMMIT;
@@ -0,0 +1,23 @@
+-- Migration 050: Content-addressed embedding cache
+-- ai/embedding_cache.py keys vectors by sha256(model config + normalized chunk
+-- text), so identical chunks across documents and re-runs are embedded once.
+-- The model column is informational; it is already part of the hash.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/050_embedding_cache.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    content_hash TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    vector vector NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_model ON embedding_cache(model);
+
+COMMENT ON TABLE embedding_cache IS 'Embedding vectors keyed by content hash; shared by the embeddings pipeline and scripts';
+COMMENT ON COLUMN embedding_cache.content_hash IS 'sha256 hex of model key + NUL + NFC/whitespace-normalized text';
+COMMENT ON COLUMN embedding_cache.model IS 'Model key, e.g. gemini-embedding-001:RETRIEVAL_DOCUMENT:768';
+
+COMMIT;
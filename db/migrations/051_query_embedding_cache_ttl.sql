@@ -0,0 +1,15 @@
+-- Migration 051: TTL support for query embeddings in embedding_cache
+-- RAG search queries are cached in embedding_cache with a time-to-live
+-- (ai/embedding_cache.py get_query_cache). Lookups filter on created_at and
+-- expired rows are pruned per model, so index both.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/051_query_embedding_cache_ttl.sql
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_embedding_cache_model;
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_model_created ON embedding_cache(model, created_at);
+
+COMMENT ON COLUMN embedding_cache.created_at IS 'Write/refresh time; TTL-bound entries (search queries) expire relative to it';
+
+COMMIT;
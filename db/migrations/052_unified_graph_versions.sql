@@ -0,0 +1,24 @@
+-- Migration 052: Published versions of the unified relationship graph
+-- batch_graph_build.py records a row here after upserting unified_edges.
+-- API workers keep a resident graph index (ai/corruption/graph/graph_index.py)
+-- and, when a new version appears, fetch only edges with last_seen after the
+-- version they hold instead of rescanning unified_edges per request.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/052_unified_graph_versions.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS unified_graph_versions (
+    version_id BIGSERIAL PRIMARY KEY,
+    published_at TIMESTAMP DEFAULT NOW(),
+    edge_count INTEGER,
+    node_count INTEGER,
+    stats JSONB DEFAULT '{}'
+);
+
+-- Incremental index refresh filters on last_seen
+CREATE INDEX IF NOT EXISTS idx_unified_edges_last_seen ON unified_edges(last_seen);
+
+COMMENT ON TABLE unified_graph_versions IS 'One row per batch_graph_build edge publish; resident graph indexes refresh when version_id changes';
+
+COMMIT;
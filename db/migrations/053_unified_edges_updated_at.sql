@@ -0,0 +1,19 @@
+-- Migration 053: Change tracking for bulk unified_edges upserts
+-- batch_graph_build.py now merges edges from a COPY-loaded staging table and
+-- deletes edges not seen in the run. last_seen moves for every edge on every
+-- run; updated_at only moves when an edge's values change, so resident graph
+-- indexes (ai/corruption/graph/graph_index.py) fetch just the changed rows.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/053_unified_edges_updated_at.sql
+
+BEGIN;
+
+ALTER TABLE unified_edges ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+UPDATE unified_edges SET updated_at = last_seen WHERE updated_at IS NULL OR updated_at > last_seen;
+
+DROP INDEX IF EXISTS idx_unified_edges_last_seen;
+CREATE INDEX IF NOT EXISTS idx_unified_edges_updated_at ON unified_edges(updated_at);
+
+COMMENT ON COLUMN unified_edges.updated_at IS 'Last time weight/counts/metadata/types changed; drives incremental graph index refresh';
+
+COMMIT;
@@ -0,0 +1,97 @@
+-- Migration 054: Single-pass tender statistics snapshot
+-- /tenders/stats/overview used to run ~10 COUNT/SUM/AVG/GROUP BY queries over
+-- tenders per request. tender_stats_overview() computes every figure in one
+-- scan (FILTER aggregates + GROUPING SETS for the category breakdowns) and
+-- mv_tender_stats_overview stores the result. The scraper refreshes the view
+-- after each run and close_expired_tenders.sh after its nightly update; the
+-- API serves it from an in-process TTL cache.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/054_tender_stats_snapshot.sql
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION tender_stats_overview()
+RETURNS TABLE (
+    id INTEGER,
+    as_of_date DATE,
+    refreshed_at TIMESTAMP WITH TIME ZONE,
+    total_tenders BIGINT,
+    open_tenders BIGINT,
+    closing_soon_tenders BIGINT,
+    closed_tenders BIGINT,
+    awarded_tenders BIGINT,
+    cancelled_tenders BIGINT,
+    unknown_status_tenders BIGINT,
+    total_value_mkd NUMERIC,
+    avg_value_mkd NUMERIC,
+    tenders_by_category JSONB,
+    tenders_by_source_category JSONB
+)
+LANGUAGE sql STABLE AS $$
+    WITH agg AS (
+        SELECT
+            GROUPING(category) AS g_category,
+            GROUPING(source_category) AS g_source,
+            category,
+            source_category,
+            COUNT(*) AS total,
+            COUNT(*) FILTER (
+                WHERE status = 'open' AND closing_date >= CURRENT_DATE
+            ) AS open_count,
+            COUNT(*) FILTER (
+                WHERE status = 'open' AND closing_date >= CURRENT_DATE
+                  AND closing_date <= CURRENT_DATE + 7
+            ) AS closing_soon_count,
+            COUNT(*) FILTER (
+                WHERE status = 'closed' OR (status = 'open' AND closing_date < CURRENT_DATE)
+            ) AS closed_count,
+            COUNT(*) FILTER (
+                WHERE status = 'awarded'
+                   OR (status = 'completed' AND winner IS NOT NULL AND winner <> '')
+            ) AS awarded_count,
+            COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled_count,
+            COUNT(*) FILTER (WHERE status = 'open' AND closing_date IS NULL) AS unknown_count,
+            SUM(estimated_value_mkd) AS value_sum,
+            AVG(estimated_value_mkd) AS value_avg
+        FROM tenders
+        GROUP BY GROUPING SETS ((), (category), (source_category))
+    )
+    SELECT
+        1,
+        CURRENT_DATE,
+        NOW(),
+        o.total,
+        o.open_count,
+        o.closing_soon_count,
+        o.closed_count,
+        o.awarded_count,
+        o.cancelled_count,
+        o.unknown_count,
+        COALESCE(o.value_sum, 0),
+        COALESCE(o.value_avg, 0),
+        -- [name, count] pairs, largest first (jsonb objects do not keep order)
+        (SELECT COALESCE(jsonb_agg(jsonb_build_array(c.category, c.total) ORDER BY c.total DESC), '[]'::jsonb)
+         FROM (
+             SELECT category, total FROM agg
+             WHERE g_category = 0 AND g_source = 1 AND category IS NOT NULL
+             ORDER BY total DESC
+             LIMIT 10
+         ) c),
+        (SELECT COALESCE(jsonb_agg(jsonb_build_array(s.source_category, s.total) ORDER BY s.total DESC), '[]'::jsonb)
+         FROM agg s
+         WHERE s.g_source = 0 AND s.g_category = 1)
+    FROM agg o
+    WHERE o.g_category = 1 AND o.g_source = 1
+$$;
+
+DROP MATERIALIZED VIEW IF EXISTS mv_tender_stats_overview;
+CREATE MATERIALIZED VIEW mv_tender_stats_overview AS
+SELECT * FROM tender_stats_overview();
+
+-- Unique index required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_tender_stats_overview_id ON mv_tender_stats_overview(id);
+
+COMMENT ON FUNCTION tender_stats_overview() IS 'Single-scan tender statistics for /tenders/stats/overview';
+COMMENT ON MATERIALIZED VIEW mv_tender_stats_overview IS 'Snapshot of tender_stats_overview(); refreshed after scrapes and nightly status updates';
+
+COMMIT;
@@ -0,0 +1,84 @@
+-- Migration 055: Bilingual tender search columns
+-- Tender search used ILIKE '%term%' on title/description/procuring_entity for
+-- every Latin/Cyrillic variant of the term, which cannot use an index.
+-- mk_search_fold() lowercases text and folds Macedonian Cyrillic (and Latin
+-- diacritics) onto the Latin transliteration used by latin_to_cyrillic(), so
+-- "Скопје", "skopje" and "Skopje" all become "skopje". Each tender table gets
+-- two generated columns over the folded text:
+--   search_text - title, entity, winner, CPV and description; GIN trigram
+--                 index serves LIKE '%token%' filters
+--   search_tsv  - weighted tsvector (title A, entity/winner B, description C)
+--                 for relevance ranking
+-- Query side: ai/tender_search.py (fold_search_text mirrors mk_search_fold).
+--
+-- Adding STORED generated columns rewrites both tables; run off-peak.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/055_tender_search_index.sql
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION mk_search_fold(input TEXT)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT translate(
+        replace(replace(replace(replace(replace(replace(replace(replace(replace(
+        replace(replace(replace(replace(replace(
+            lower(coalesce(input, '')),
+            'џ', 'dzh'), 'ѓ', 'gj'), 'ќ', 'kj'), 'љ', 'lj'), 'њ', 'nj'),
+            'ѕ', 'dz'), 'ж', 'zh'), 'ч', 'ch'), 'ш', 'sh'),
+            'č', 'ch'), 'š', 'sh'), 'ž', 'zh'), 'ǵ', 'gj'), 'ḱ', 'kj'),
+        'абвгдезијклмнопрстуфхц',
+        'abvgdezijklmnoprstufhc'
+    )
+$$;
+
+COMMENT ON FUNCTION mk_search_fold(TEXT) IS 'Lowercase + fold Macedonian Cyrillic to Latin for script-independent search';
+
+-- ============================================================================
+-- tenders (e-nabavki)
+-- ============================================================================
+
+ALTER TABLE tenders ADD COLUMN IF NOT EXISTS search_text TEXT
+    GENERATED ALWAYS AS (mk_search_fold(
+        coalesce(title, '') || ' ' || coalesce(procuring_entity, '') || ' ' ||
+        coalesce(winner, '') || ' ' || coalesce(cpv_code, '') || ' ' ||
+        coalesce(description, '')
+    )) STORED;
+
+ALTER TABLE tenders ADD COLUMN IF NOT EXISTS search_tsv TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple'::regconfig, mk_search_fold(title)), 'A') ||
+        setweight(to_tsvector('simple'::regconfig, mk_search_fold(
+            coalesce(procuring_entity, '') || ' ' || coalesce(winner, ''))), 'B') ||
+        setweight(to_tsvector('simple'::regconfig, mk_search_fold(description)), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_tenders_search_text_trgm ON tenders USING gin(search_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_tenders_search_tsv ON tenders USING gin(search_tsv);
+
+-- ============================================================================
+-- epazar_tenders
+-- ============================================================================
+
+ALTER TABLE epazar_tenders ADD COLUMN IF NOT EXISTS search_text TEXT
+    GENERATED ALWAYS AS (mk_search_fold(
+        coalesce(title, '') || ' ' || coalesce(contracting_authority, '') || ' ' ||
+        coalesce(cpv_code, '') || ' ' || coalesce(description, '')
+    )) STORED;
+
+ALTER TABLE epazar_tenders ADD COLUMN IF NOT EXISTS search_tsv TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple'::regconfig, mk_search_fold(title)), 'A') ||
+        setweight(to_tsvector('simple'::regconfig, mk_search_fold(contracting_authority)), 'B') ||
+        setweight(to_tsvector('simple'::regconfig, mk_search_fold(description)), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_epazar_tenders_search_text_trgm ON epazar_tenders USING gin(search_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_epazar_tenders_search_tsv ON epazar_tenders USING gin(search_tsv);
+
+ANALYZE tenders;
+ANALYZE epazar_tenders;
+
+COMMIT;
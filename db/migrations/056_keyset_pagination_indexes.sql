@@ -0,0 +1,28 @@
+-- Migration 056: Indexes for keyset (cursor) pagination
+-- /tenders, /api/epazar/tenders and /corruption/flagged-tenders accept a
+-- cursor and fetch the next page with a row comparison on (sort key,
+-- tender_id) instead of OFFSET (backend/utils/pagination.py). These indexes
+-- match the default descending orderings, including the tender_id
+-- tie-breaker and NULLS LAST, so each page is a short index range scan.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/056_keyset_pagination_indexes.sql
+
+BEGIN;
+
+-- tenders: default list order plus the closing-date and newest-first views
+CREATE INDEX IF NOT EXISTS idx_tenders_keyset_publication_date
+    ON tenders(publication_date DESC NULLS LAST, tender_id DESC);
+CREATE INDEX IF NOT EXISTS idx_tenders_keyset_closing_date
+    ON tenders(closing_date DESC NULLS LAST, tender_id DESC);
+CREATE INDEX IF NOT EXISTS idx_tenders_keyset_created_at
+    ON tenders(created_at DESC NULLS LAST, tender_id DESC);
+
+-- epazar_tenders: default list order
+CREATE INDEX IF NOT EXISTS idx_epazar_tenders_keyset_publication_date
+    ON epazar_tenders(publication_date DESC NULLS LAST, tender_id DESC);
+
+-- mv_flagged_tenders: ORDER BY risk_score DESC, total_flags DESC, tender_id DESC
+CREATE INDEX IF NOT EXISTS idx_mv_flagged_tenders_keyset
+    ON mv_flagged_tenders(risk_score DESC NULLS LAST, total_flags DESC NULLS LAST, tender_id DESC);
+
+COMMIT;
@@ -0,0 +1,34 @@
+-- Migration 057: Stored vectors for open tenders (personalized ranking)
+-- Personalized feeds re-embedded every candidate tender through the Gemini
+-- API on each request. mv_open_tender_vectors holds one vector per open
+-- tender - the mean of its stored chunk vectors in embeddings - so the API
+-- can keep all of them in an in-memory float32 matrix and score every open
+-- tender against a user's interest vector with one matrix-vector product
+-- (backend/services/tender_vectors.py).
+--
+-- Refreshed by the scraper after each run, by close_expired_tenders.sh and
+-- by auto_embeddings.sh; refreshed_at tells the API when to reload.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/057_open_tender_vectors.sql
+
+BEGIN;
+
+DROP MATERIALIZED VIEW IF EXISTS mv_open_tender_vectors;
+CREATE MATERIALIZED VIEW mv_open_tender_vectors AS
+SELECT
+    e.tender_id,
+    AVG(e.vector)::vector(768) AS embedding,
+    NOW() AS refreshed_at
+FROM embeddings e
+JOIN tenders t ON t.tender_id = e.tender_id
+WHERE t.status = 'open'
+  AND (t.closing_date IS NULL OR t.closing_date >= CURRENT_DATE)
+  AND e.vector IS NOT NULL
+GROUP BY e.tender_id;
+
+-- Unique index required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_open_tender_vectors_tender_id ON mv_open_tender_vectors(tender_id);
+
+COMMENT ON MATERIALIZED VIEW mv_open_tender_vectors IS 'Mean embedding per open tender; loaded into memory for personalized ranking';
+
+COMMIT;
@@ -0,0 +1,26 @@
+-- Migration 058: Checkpoints for the batch scoring engine
+-- ai/corruption/ml_models/batch_scoring.py streams tenders in tender_id
+-- order (optionally split into hash shards, one per worker process) and
+-- writes each chunk of predictions to ml_predictions in the same
+-- transaction that advances its checkpoint here. An interrupted run
+-- restarted with --resume continues after last_tender_id of every shard.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/058_ml_scoring_checkpoints.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS ml_scoring_checkpoints (
+    run_name VARCHAR(100) NOT NULL,
+    shard INTEGER NOT NULL DEFAULT 0,
+    shard_count INTEGER NOT NULL DEFAULT 1,
+    last_tender_id VARCHAR(100),
+    processed_count INTEGER NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    started_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (run_name, shard_count, shard)
+);
+
+COMMENT ON TABLE ml_scoring_checkpoints IS 'Per-shard resume position of batch_scoring.py runs';
+
+COMMIT;
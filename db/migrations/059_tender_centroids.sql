@@ -0,0 +1,151 @@
+-- Migration 059: Per-tender centroid vectors with an HNSW index
+-- Specification similarity (ai/corruption/nlp/batch_similarity.py) used to
+-- AVG the chunk vectors of every tender in embeddings once per tender it
+-- scored - a full aggregation repeated N times. tender_centroids stores that
+-- mean once per tender and is kept current by statement-level triggers on
+-- embeddings, so only tenders whose chunks changed are re-averaged.
+--
+-- similarity_computed_at < updated_at marks tenders whose similarity pairs
+-- are stale; batch_similarity.py --mode incremental refreshes only those
+-- through the HNSW index after every embeddings run.
+--
+-- mv_open_tender_vectors (057) now reads the stored centroids instead of
+-- re-aggregating embeddings on every refresh.
+--
+-- Run: psql -h $DB_HOST -U $DB_USER -d nabavkidata -f db/migrations/059_tender_centroids.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS tender_centroids (
+    tender_id VARCHAR(100) PRIMARY KEY REFERENCES tenders(tender_id) ON DELETE CASCADE,
+    centroid vector(768) NOT NULL,
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    similarity_computed_at TIMESTAMP
+);
+
+COMMENT ON TABLE tender_centroids IS 'Mean embedding per tender, maintained by triggers on embeddings';
+
+-- ============================================================================
+-- Incremental maintenance
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION refresh_tender_centroids(p_tender_ids TEXT[])
+RETURNS void AS $$
+BEGIN
+    DELETE FROM tender_centroids c
+    WHERE c.tender_id = ANY(p_tender_ids)
+      AND NOT EXISTS (
+          SELECT 1 FROM embeddings e
+          WHERE e.tender_id = c.tender_id AND e.vector IS NOT NULL
+      );
+
+    -- embeddings also holds e-pazar chunks whose tender_id is not in tenders;
+    -- skip them instead of failing the embeddings INSERT on the FK
+    INSERT INTO tender_centroids (tender_id, centroid, chunk_count, updated_at)
+    SELECT e.tender_id, AVG(e.vector)::vector(768), COUNT(*), NOW()
+    FROM embeddings e
+    WHERE e.tender_id = ANY(p_tender_ids)
+      AND e.vector IS NOT NULL
+      AND EXISTS (SELECT 1 FROM tenders t WHERE t.tender_id = e.tender_id)
+    GROUP BY e.tender_id
+    ON CONFLICT (tender_id) DO UPDATE SET
+        centroid = EXCLUDED.centroid,
+        chunk_count = EXCLUDED.chunk_count,
+        updated_at = EXCLUDED.updated_at
+    WHERE tender_centroids.centroid IS DISTINCT FROM EXCLUDED.centroid
+       OR tender_centroids.chunk_count <> EXCLUDED.chunk_count;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_tender_centroids()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM tender_centroids;
+    ELSIF TG_OP = 'INSERT' THEN
+        PERFORM refresh_tender_centroids(ARRAY(
+            SELECT DISTINCT tender_id FROM new_embeddings WHERE tender_id IS NOT NULL
+        ));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM refresh_tender_centroids(ARRAY(
+            SELECT DISTINCT tender_id FROM old_embeddings WHERE tender_id IS NOT NULL
+        ));
+    ELSE
+        -- Only rows whose vector or tender changed: metadata-only updates must
+        -- not bump updated_at and mark similarity pairs stale. (UPDATE OF
+        -- vector is not allowed together with transition tables.)
+        PERFORM refresh_tender_centroids(ARRAY(
+            SELECT t.tender_id
+            FROM new_embeddings n
+            JOIN old_embeddings o ON o.embed_id = n.embed_id
+            CROSS JOIN LATERAL (VALUES (n.tender_id), (o.tender_id)) AS t(tender_id)
+            WHERE t.tender_id IS NOT NULL
+              AND (n.vector IS DISTINCT FROM o.vector
+                   OR n.tender_id IS DISTINCT FROM o.tender_id)
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_embeddings_centroids_insert ON embeddings;
+CREATE TRIGGER trg_embeddings_centroids_insert
+    AFTER INSERT ON embeddings
+    REFERENCING NEW TABLE AS new_embeddings
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_tender_centroids();
+
+DROP TRIGGER IF EXISTS trg_embeddings_centroids_update ON embeddings;
+CREATE TRIGGER trg_embeddings_centroids_update
+    AFTER UPDATE ON embeddings
+    REFERENCING OLD TABLE AS old_embeddings NEW TABLE AS new_embeddings
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_tender_centroids();
+
+DROP TRIGGER IF EXISTS trg_embeddings_centroids_delete ON embeddings;
+CREATE TRIGGER trg_embeddings_centroids_delete
+    AFTER DELETE ON embeddings
+    REFERENCING OLD TABLE AS old_embeddings
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_tender_centroids();
+
+DROP TRIGGER IF EXISTS trg_embeddings_centroids_truncate ON embeddings;
+CREATE TRIGGER trg_embeddings_centroids_truncate
+    AFTER TRUNCATE ON embeddings
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_tender_centroids();
+
+-- ============================================================================
+-- Backfill, then index (building HNSW over a filled table is faster)
+-- ============================================================================
+
+INSERT INTO tender_centroids (tender_id, centroid, chunk_count, updated_at)
+SELECT e.tender_id, AVG(e.vector)::vector(768), COUNT(*), NOW()
+FROM embeddings e
+JOIN tenders t ON t.tender_id = e.tender_id
+WHERE e.vector IS NOT NULL
+GROUP BY e.tender_id
+ON CONFLICT (tender_id) DO NOTHING;
+
+CREATE INDEX IF NOT EXISTS idx_tender_centroids_hnsw
+    ON tender_centroids USING hnsw (centroid vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_tender_centroids_updated_at
+    ON tender_centroids(updated_at);
+
+-- ============================================================================
+-- mv_open_tender_vectors: read the stored centroids
+-- ============================================================================
+
+DROP MATERIALIZED VIEW IF EXISTS mv_open_tender_vectors;
+CREATE MATERIALIZED VIEW mv_open_tender_vectors AS
+SELECT
+    c.tender_id,
+    c.centroid AS embedding,
+    NOW() AS refreshed_at
+FROM tender_centroids c
+JOIN tenders t ON t.tender_id = c.tender_id
+WHERE t.status = 'open'
+  AND (t.closing_date IS NULL OR t.closing_date >= CURRENT_DATE);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_open_tender_vectors_tender_id ON mv_open_tender_vectors(tender_id);
+
+COMMENT ON MATERIALIZED VIEW mv_open_tender_vectors IS 'Mean embedding per open tender; loaded into memory for personalized ranking';
+
+COMMIT;
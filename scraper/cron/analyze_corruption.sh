@@ -47,10 +47,16 @@ log "============================================================"
 cd "$PROJECT_DIR/ai"
 
 
-# Run corruption analysis
-log "Running full corruption analysis..."
+# Run corruption analysis (incremental since last run; FULL_REBUILD=1 forces a full rebuild)
+ANALYZE_ARGS=""
+if [ "${FULL_REBUILD:-0}" = "1" ]; then
+    ANALYZE_ARGS="--full"
+    log "Running full corruption analysis..."
+else
+    log "Running incremental corruption analysis..."
+fi
 
-python3 corruption_detector.py analyze 2>&1 | while read line; do
+python3 corruption_detector.py analyze $ANALYZE_ARGS 2>&1 | while read line; do
     log "$line"
 done
 
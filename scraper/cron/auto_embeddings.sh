@@ -39,4 +39,12 @@ cd "$AI_DIR"
 # Run embeddings pipeline (batch of 20, max 500 docs per run)
 /usr/bin/python3 embeddings/pipeline.py --batch-size=20 --max-documents=500
 
+# Pick up the new vectors in the personalized ranking matrix
+psql "$DATABASE_URL" -q -c "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_open_tender_vectors;" \
+    || echo "$(date): Warning - failed to refresh mv_open_tender_vectors"
+
+# Refresh similarity pairs for tenders whose centroids just changed
+/usr/bin/python3 corruption/nlp/batch_similarity.py --mode incremental \
+    || echo "$(date): Warning - incremental spec similarity failed"
+
 echo "$(date): Auto-embeddings pipeline completed"
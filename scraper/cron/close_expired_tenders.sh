@@ -37,4 +37,15 @@ if [ "$COUNT" -gt 0 ]; then
     echo "$RESULT" | head -10 >> "$LOG_FILE"
 fi
 
+# Refresh the stats snapshot: open/closed counts depend on the date
+PGPASSWORD="$POSTGRES_PASSWORD" psql -h "$DB_HOST" -U "$DB_USER" -d "$DB_NAME" -q -c "
+REFRESH MATERIALIZED VIEW CONCURRENTLY mv_tender_stats_overview;
+" >> "$LOG_FILE" 2>&1 || echo "[$TIMESTAMP] Warning: failed to refresh mv_tender_stats_overview" >> "$LOG_FILE"
+
+# Closed tenders drop out of the personalized ranking matrix
+PGPASSWORD="$POSTGRES_PASSWORD" psql -h "$DB_HOST" -U "$DB_USER" -d "$DB_NAME" -q -c "
+REFRESH MATERIALIZED VIEW CONCURRENTLY mv_open_tender_vectors;
+" >> "$LOG_FILE" 2>&1 || echo "[$TIMESTAMP] Warning: failed to refresh mv_open_tender_vectors" >> "$LOG_FILE"
+
+TIMESTAMP=$(date '+%Y-%m-%d %H:%M:%S')
 echo "[$TIMESTAMP] Job completed successfully" >> "$LOG_FILE"
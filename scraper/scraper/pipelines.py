@@ -482,6 +482,21 @@ class DatabasePipeline:
                 except Exception as e:
                     logger.error(f"Failed to finalize scrape history: {e}")
 
+            # Refresh the /tenders/stats/overview snapshot (migration 054)
+            if self.stats['tenders_new'] or self.stats['tenders_updated']:
+                try:
+                    async with self.pool.acquire() as conn:
+                        await conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_tender_stats_overview")
+                    logger.info("✓ Refreshed mv_tender_stats_overview")
+                except Exception as e:
+                    logger.error(f"Failed to refresh tender stats snapshot: {e}")
+                try:
+                    async with self.pool.acquire() as conn:
+                        await conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_open_tender_vectors")
+                    logger.info("✓ Refreshed mv_open_tender_vectors")
+                except Exception as e:
+                    logger.error(f"Failed to refresh open tender vectors: {e}")
+
             await self.pool.close()
             logger.info("DatabasePipeline: Connection pool closed")
 